@@ -162,4 +162,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the spawned inference worker in frozen builds
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark — built-in corrections: single-pass matcher vs rule-by-rule loop.
+
+Times EnhancedTextProcessor's correction step over growing text lengths
+and rule counts (the real Russian rules, padded with synthetic ones).
+The rule-by-rule loop rescans the text once per rule, so its time grows
+with rules x length; the single-pass matcher should grow with length only.
+
+Usage:
+    python scripts/bench_text_processing.py [--repeat N]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+# Project root = parent of scripts/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(PROJECT_ROOT, "src")
+sys.path.insert(0, SRC_DIR)
+
+from text_processor import CorrectionMatcher  # noqa: E402
+from text_processor_enhanced import EnhancedTextProcessor  # noqa: E402
+
+TEXT_WORDS = (50, 500, 5000)
+RULE_COUNTS = (150, 500, 2000)
+LETTERS = "абвгдежзиклмнопрстуфхцчшщыэюя"
+
+
+def sequential_patterns(corrections):
+    """Compiled patterns of the previous rule-by-rule implementation."""
+    patterns = []
+    for wrong, correct in sorted(corrections.items(), key=lambda x: len(x[0]), reverse=True):
+        if len(wrong) <= 10:
+            pattern = re.compile(r'\b' + re.escape(wrong) + r'\b', re.IGNORECASE)
+        else:
+            pattern = re.compile(re.escape(wrong), re.IGNORECASE)
+        patterns.append((pattern, correct))
+    return patterns
+
+
+def run_sequential(patterns, text):
+    for pattern, correct in patterns:
+        text = pattern.sub(correct, text)
+    return text
+
+
+def synthetic_rules(base, count, rnd):
+    rules = dict(base)
+    while len(rules) < count:
+        word = "".join(rnd.choice(LETTERS) for _ in range(rnd.randint(4, 14)))
+        rules[word] = word[::-1]
+    return rules
+
+
+def make_text(rules, words, rnd):
+    vocab = [w for k in rules for w in k.split()] + ["и", "мир", "привет", "сегодня", "очень"] * 20
+    return " ".join(rnd.choice(vocab) for _ in range(words))
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case (best is reported)")
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    base = EnhancedTextProcessor(language="ru").corrections
+
+    print(f"{'rules':>6} {'words':>6} {'loop ms':>10} {'single ms':>10} {'speedup':>8}")
+    for count in RULE_COUNTS:
+        rules = synthetic_rules(base, count, rnd)
+        patterns = sequential_patterns(rules)
+        matcher = CorrectionMatcher(tuple(rules.items()))
+        for words in TEXT_WORDS:
+            text = make_text(rules, words, rnd)
+            assert matcher.sub(text) == run_sequential(patterns, text)
+            loop = best_of(lambda: run_sequential(patterns, text), args.repeat)
+            single = best_of(lambda: matcher.sub(text), args.repeat)
+            print(f"{len(rules):>6} {words:>6} {loop * 1000:>10.2f} {single * 1000:>10.2f} {loop / single:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Build the compiled proper noun index used for capitalization.
+
+Compiles src/data/{cities,names,countries}.json into src/data/proper_nouns.idx,
+a memory-mapped phrase table (see src/proper_noun_index.py), so ProperNounDict
+loads in milliseconds instead of parsing the JSON files. With pymorphy2
+installed, every case form of each name is added ("москве", "нижнем
+новгороде", "ростове-на-дону"), and forms that are also common words
+("вера", "находка") are left out.
+
+Usage:
+    python scripts/build_proper_noun_index.py [--data-dir DIR] [--no-pymorphy] [--output PATH]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Project root = parent of scripts/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(PROJECT_ROOT, "src")
+sys.path.insert(0, SRC_DIR)
+
+from proper_noun_index import (  # noqa: E402
+    DEFAULT_INDEX_PATH, SOURCES, ProperNounIndex, build_index, compile_entries, load_sources,
+)
+
+CASES = ("nomn", "gent", "datv", "accs", "ablt", "loct")
+PROPER_TAGS = {"Name", "Surn", "Patr", "Geox", "Orgn"}
+COMMON_SCORE = 0.1  # a common-word parse this likely makes a form ambiguous
+
+
+def pymorphy_helpers():
+    """(inflect, is_ambiguous) backed by pymorphy2."""
+    import pymorphy2
+    morph = pymorphy2.MorphAnalyzer()
+
+    def proper_parse(word):
+        parses = morph.parse(word)
+        for parse in parses:
+            if PROPER_TAGS & parse.tag.grammemes:
+                return parse
+        return None
+
+    def inflect(name):
+        words = name.lower().split()
+        parses = [proper_parse(word) for word in words]
+        if not any(parses):
+            return []
+        if len(words) > 1:
+            # "Нижний" in "Нижний Новгород" is a plain adjective agreeing in case
+            parses = [parse or morph.parse(word)[0] for word, parse in zip(words, parses)]
+        forms = []
+        for case in CASES:
+            phrase = []
+            for word, parse in zip(words, parses):
+                inflected = parse.inflect({case}) if parse is not None else None
+                phrase.append(inflected.word if inflected is not None else word)
+            forms.append(" ".join(phrase))
+        return forms
+
+    def is_ambiguous(word):
+        return any(parse.score >= COMMON_SCORE and not (PROPER_TAGS & parse.tag.grammemes)
+                   for parse in morph.parse(word))
+
+    return inflect, is_ambiguous
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=os.path.join(SRC_DIR, "data"),
+                        help="directory with cities.json, names.json, countries.json")
+    parser.add_argument("--no-pymorphy", action="store_true", help="dictionary spellings only, no inflected forms")
+    parser.add_argument("--output", default=str(DEFAULT_INDEX_PATH), help="index file to write")
+    args = parser.parse_args()
+
+    inflect = is_ambiguous = None
+    if not args.no_pymorphy:
+        try:
+            inflect, is_ambiguous = pymorphy_helpers()
+        except ImportError:
+            print("[ERROR] pymorphy2 not installed. Install with: pip install pymorphy2 "
+                  "(or pass --no-pymorphy)")
+            return 1
+
+    t0 = time.perf_counter()
+    sources = load_sources(args.data_dir)
+    if not any(sources.values()):
+        print(f"[ERROR] No proper noun data in {args.data_dir}")
+        return 1
+    table = compile_entries(sources, inflect=inflect, is_ambiguous=is_ambiguous)
+    entries = build_index(table, args.output, {name: len(sources[name]) for name in SOURCES})
+
+    t1 = time.perf_counter()
+    index = ProperNounIndex(args.output)
+    load_ms = (time.perf_counter() - t1) * 1000
+    size_kb = os.path.getsize(args.output) / 1024
+    index.close()
+    print(f"[SUCCESS] {entries} phrases -> {args.output} "
+          f"({size_kb:.0f} KB, built in {t1 - t0:.1f}s, opens in {load_ms:.2f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
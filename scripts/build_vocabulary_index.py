@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Build the Russian vocabulary index used by phonetic correction.
+
+Exports every word form known to the pymorphy2 dictionary (plus any extra
+word lists) into src/data/ru_vocabulary.idx, a sorted memory-mapped word
+list (see src/vocabulary_index.py). With the index in place,
+PhoneticCorrector validates candidates without loading pymorphy2.
+
+Words with "ё" are also stored spelled with "е", since ASR output and
+pymorphy2 treat them as the same letter.
+
+Usage:
+    python scripts/build_vocabulary_index.py [--words FILE ...] [--no-pymorphy] [--output PATH]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Project root = parent of scripts/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(PROJECT_ROOT, "src")
+sys.path.insert(0, SRC_DIR)
+
+from vocabulary_index import DEFAULT_INDEX_PATH, VocabularyIndex, build_index  # noqa: E402
+
+
+def pymorphy_words():
+    """All word forms of the pymorphy2 dictionary."""
+    import pymorphy2
+    morph = pymorphy2.MorphAnalyzer()
+    return (parse.word for parse in morph.iter_known_word_parses())
+
+
+def file_words(path):
+    """One word per line, '#' comments allowed."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            word = line.split("#", 1)[0].strip()
+            if word:
+                yield word
+
+
+def with_yo_variants(words):
+    for word in words:
+        yield word
+        if "ё" in word:
+            yield word.replace("ё", "е")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", action="append", default=[], metavar="FILE",
+                        help="extra word list, one word per line (repeatable)")
+    parser.add_argument("--no-pymorphy", action="store_true", help="don't export the pymorphy2 dictionary")
+    parser.add_argument("--output", default=str(DEFAULT_INDEX_PATH), help="index file to write")
+    args = parser.parse_args()
+
+    sources = [file_words(path) for path in args.words]
+    if not args.no_pymorphy:
+        try:
+            sources.append(pymorphy_words())
+        except ImportError:
+            print("[ERROR] pymorphy2 not installed. Install with: pip install pymorphy2")
+            return 1
+    if not sources:
+        print("[ERROR] Nothing to index: pass --words or drop --no-pymorphy")
+        return 1
+
+    t0 = time.perf_counter()
+    words = (w for source in sources for w in with_yo_variants(source))
+    count = build_index(words, args.output)
+    index = VocabularyIndex(args.output)
+    size_mb = os.path.getsize(args.output) / (1024 * 1024)
+    index.close()
+    print(f"[SUCCESS] {count} words -> {args.output} ({size_mb:.1f} MB, {time.perf_counter() - t0:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Export the punctuation model to int8 ONNX for src/punctuation_onnx.py.
+
+Converts the HuggingFace token classifier used by deepmultilingualpunctuation
+(oliverguhr/fullstop-punctuation-multilang-large by default) to ONNX,
+quantizes its weights to int8 and writes model.int8.onnx, tokenizer.json
+and config.json into models/punctuation/<name>. Needs torch, transformers
+and onnxruntime at export time only; the app then needs only onnxruntime
+and tokenizers.
+
+Usage:
+    python scripts/export_punctuation_onnx.py [--model HF_ID] [--output DIR] [--keep-fp32]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Project root = parent of scripts/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(PROJECT_ROOT, "src")
+sys.path.insert(0, SRC_DIR)
+
+from punctuation_onnx import default_model_dir  # noqa: E402
+
+DEFAULT_MODEL = "oliverguhr/fullstop-punctuation-multilang-large"
+OPSET = 14
+
+
+def export(model_id: str, output: Path, keep_fp32: bool):
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModelForTokenClassification, AutoTokenizer
+
+    output.mkdir(parents=True, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModelForTokenClassification.from_pretrained(model_id)
+    model.eval()
+
+    sample = tokenizer(["привет мир как дела"], return_tensors="pt")
+    fp32_path = output / "model.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            str(fp32_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch", 1: "sequence"},
+            },
+            opset_version=OPSET,
+        )
+    print(f"[INFO] Exported {fp32_path} ({fp32_path.stat().st_size / 2**20:.0f} MB)")
+
+    int8_path = output / "model.int8.onnx"
+    quantize_dynamic(model_input=str(fp32_path), model_output=str(int8_path), weight_type=QuantType.QInt8)
+    print(f"[INFO] Quantized {int8_path} ({int8_path.stat().st_size / 2**20:.0f} MB)")
+    if not keep_fp32:
+        fp32_path.unlink()
+
+    tokenizer.backend_tokenizer.save(str(output / "tokenizer.json"))
+    model.config.save_pretrained(str(output))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="HuggingFace token classification model")
+    parser.add_argument("--output", default=str(default_model_dir()), help="model directory to write")
+    parser.add_argument("--keep-fp32", action="store_true", help="keep the unquantized model.onnx")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    try:
+        export(args.model, Path(args.output), args.keep_fp32)
+    except ImportError as e:
+        print(f"[ERROR] {e}. Install with: pip install torch transformers onnx onnxruntime")
+        return 1
+    print(f"[SUCCESS] Punctuation model exported to {args.output} ({time.perf_counter() - t0:.0f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -78,6 +78,10 @@ class AudioRecorder:
         self.auto_stop_silence_sec = 2.0
         self.on_auto_stop: Optional[Callable[[], None]] = None
         self._silence_frames = 0
+
+        # Live audio tap: called from the collect thread with each block
+        # (same gain as the array returned by stop())
+        self.on_audio_chunk: Optional[Callable[[np.ndarray], None]] = None
         self._silence_threshold = 0.01  # RMS below this = silence
 
         # Initialize WebRTC processor if enabled
@@ -226,6 +230,25 @@ class AudioRecorder:
                 self._shutting_down = False
                 return False
 
+    def _apply_boost(self, audio: np.ndarray) -> np.ndarray:
+        """Apply software boost ONLY if WebRTC AGC is not available."""
+        # WebRTC AGC handles gain adaptation automatically
+        if not self.webrtc_enabled and self.mic_boost != 1.0:
+            audio = audio * self.mic_boost
+            # Clip to prevent distortion
+            audio = np.clip(audio, -1.0, 1.0)
+        return audio
+
+    def _emit_chunk(self, data: np.ndarray):
+        """Forward a block to on_audio_chunk; listener errors never stop recording."""
+        callback = self.on_audio_chunk
+        if callback is None:
+            return
+        try:
+            callback(self._apply_boost(data))
+        except Exception as e:
+            logger.warning("AUDIO_CHUNK_CALLBACK_FAILED | %s", e)
+
     def _collect_audio(self):
         """Collect audio data from queue. Sentinel (None) signals clean exit."""
         while True:
@@ -234,6 +257,7 @@ class AudioRecorder:
                 if data is None:
                     break  # Sentinel received — drain remaining and exit
                 self._audio_data.append(data)
+                self._emit_chunk(data)
             except queue.Empty:
                 if not self._recording:
                     break  # Fallback: exit if recording stopped without sentinel
@@ -246,6 +270,7 @@ class AudioRecorder:
                 data = self._audio_queue.get_nowait()
                 if data is not None:
                     self._audio_data.append(data)
+                    self._emit_chunk(data)
             except queue.Empty:
                 break
 
@@ -288,14 +313,7 @@ class AudioRecorder:
             except ValueError:
                 return None  # Empty or incompatible arrays
 
-            # Apply software boost ONLY if WebRTC AGC is not available
-            # WebRTC AGC handles gain adaptation automatically
-            if not self.webrtc_enabled and self.mic_boost != 1.0:
-                audio = audio * self.mic_boost
-                # Clip to prevent distortion
-                audio = np.clip(audio, -1.0, 1.0)
-
-            return audio
+            return self._apply_boost(audio)
 
     def save_to_file(self, audio: np.ndarray, filepath: Optional[Path] = None) -> Path:
         """Save audio data to a WAV file."""
@@ -6,13 +6,14 @@ This module provides a unified interface for multiple speech recognition backend
 - PodlodkaTurboBackend: Whisper-Podlodka-Turbo (Russian fine-tuned)
 """
 
-from .base import BaseBackend
+from .base import BackendCapabilities, BaseBackend
 from .whisper_backend import WhisperBackend
 from .sherpa_backend import SherpaBackend
 from .podlodka_turbo_backend import PodlodkaTurboBackend
 from .groq_backend import GroqBackend
 
 __all__ = [
+    "BackendCapabilities",
     "BaseBackend",
     "WhisperBackend",
     "SherpaBackend",
@@ -1,8 +1,61 @@
 """Abstract base class for speech recognition backends."""
+import time
 from abc import ABC, abstractmethod
-from typing import Callable, Optional, Tuple
+from dataclasses import dataclass, field, replace
+from typing import Callable, List, Optional, Tuple
 import numpy as np
 
+from .segmentation import split_at_silence
+
+
+@dataclass(frozen=True)
+class BackendCapabilities:
+    """What a backend's raw output already provides.
+
+    Post-processing is assembled from these flags, so stages the backend
+    already covers (e.g. punctuation restoration) are skipped.
+    """
+    punctuation: bool = False   # output is punctuated
+    casing: bool = False        # output is properly cased
+    timestamps: bool = False    # model produces segment/word timestamps
+    streaming: bool = False     # model decodes incrementally while audio arrives
+    confidence: bool = False    # model produces confidence scores
+
+
+@dataclass
+class TranscriptionCheckpoint:
+    """Where a partial transcription stopped; pass back to resume."""
+    audio: np.ndarray                    # mono audio the plan refers to
+    sample_rate: int
+    chunk_bounds: List[Tuple[int, int]]  # planned (start, end) samples
+    texts: List[str] = field(default_factory=list)  # raw text per completed chunk
+
+    @property
+    def next_index(self) -> int:
+        return len(self.texts)
+
+    @property
+    def decoded_samples(self) -> int:
+        return sum(end - start for start, end in self.chunk_bounds[:self.next_index])
+
+    @property
+    def completeness(self) -> float:
+        total = sum(end - start for start, end in self.chunk_bounds)
+        return self.decoded_samples / total if total else 1.0
+
+
+@dataclass
+class PartialTranscription:
+    """Text of the completed chunks plus what is needed to finish the rest."""
+    text: str
+    completeness: float   # fraction of audio decoded (0.0-1.0)
+    elapsed: float        # seconds spent in this call
+    checkpoint: Optional[TranscriptionCheckpoint] = None  # None when complete
+
+    @property
+    def complete(self) -> bool:
+        return self.checkpoint is None
+
 
 class BaseBackend(ABC):
     """Abstract base class for speech recognition backends.
@@ -11,6 +64,9 @@ class BaseBackend(ABC):
     with the Transcriber class.
     """
 
+    # What the output of this backend provides (see capabilities_for())
+    CAPABILITIES = BackendCapabilities()
+
     def __init__(
         self,
         model_size: str = "base",
@@ -74,6 +130,82 @@ class BaseBackend(ABC):
         """
         pass
 
+    # Chunking used by transcribe_partial() for long audio
+    PARTIAL_CHUNK_THRESHOLD_SEC = 45.0
+    PARTIAL_CHUNK_MIN_SEC = 15.0
+    PARTIAL_CHUNK_MAX_SEC = 30.0
+
+    def _plan_chunks(self, audio: np.ndarray, sample_rate: int) -> List[Tuple[int, int]]:
+        """Split long audio at pauses into independently decodable chunks."""
+        if len(audio) <= self.PARTIAL_CHUNK_THRESHOLD_SEC * sample_rate:
+            return [(0, len(audio))]
+        return split_at_silence(audio, sample_rate, self.PARTIAL_CHUNK_MIN_SEC, self.PARTIAL_CHUNK_MAX_SEC)
+
+    def transcribe_partial(
+        self,
+        audio: Optional[np.ndarray] = None,
+        sample_rate: int = 16000,
+        deadline: Optional[float] = None,
+        cancel_event=None,
+        checkpoint: Optional[TranscriptionCheckpoint] = None,
+    ) -> PartialTranscription:
+        """
+        Transcribe chunk by chunk, stopping at a deadline or on cancel.
+
+        Work finished before the stop is kept: the result carries the text of
+        all completed chunks, the fraction of audio they cover and a
+        checkpoint from which the rest can be resumed. A chunk is not started
+        if, at the speed observed so far, it would end after the deadline.
+
+        Args:
+            audio: Audio data (ignored when resuming from checkpoint)
+            sample_rate: Sample rate in Hz (ignored when resuming)
+            deadline: time.monotonic() value to stop by (None = no deadline)
+            cancel_event: Optional threading.Event to stop between chunks
+            checkpoint: Checkpoint of an earlier partial result to resume
+
+        Returns:
+            PartialTranscription with raw (not post-processed) text
+        """
+        start = time.monotonic()
+        if checkpoint is None:
+            if audio.dtype != np.float32:
+                audio = audio.astype(np.float32)
+            if len(audio.shape) > 1:
+                audio = audio.mean(axis=1)
+            checkpoint = TranscriptionCheckpoint(audio, sample_rate, self._plan_chunks(audio, sample_rate))
+        else:
+            # Leave the caller's checkpoint untouched so it can be resumed again
+            checkpoint = replace(checkpoint, texts=list(checkpoint.texts))
+        sr = checkpoint.sample_rate
+
+        sec_per_audio_sec = None  # decode speed observed in this call
+        for start_sample, end_sample in checkpoint.chunk_bounds[checkpoint.next_index:]:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            chunk_sec = (end_sample - start_sample) / sr
+            if deadline is not None:
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                if sec_per_audio_sec is not None and now + sec_per_audio_sec * chunk_sec > deadline:
+                    break
+            t0 = time.monotonic()
+            text, _ = self.transcribe(checkpoint.audio[start_sample:end_sample], sr, cancel_event=cancel_event)
+            if cancel_event is not None and cancel_event.is_set() and not text:
+                break  # interrupted mid-chunk: nothing usable
+            checkpoint.texts.append(text)
+            sec_per_audio_sec = (time.monotonic() - t0) / max(chunk_sec, 1e-3)
+
+        text = " ".join(t for t in checkpoint.texts if t)
+        done = checkpoint.next_index >= len(checkpoint.chunk_bounds)
+        return PartialTranscription(
+            text=text,
+            completeness=checkpoint.completeness,
+            elapsed=time.monotonic() - start,
+            checkpoint=None if done else checkpoint,
+        )
+
     def get_model_info(self) -> dict:
         """Get information about the current model.
 
@@ -87,6 +219,20 @@ class BaseBackend(ABC):
             "device": self.device,
         }
 
+    @classmethod
+    def capabilities_for(cls, model_size: str) -> BackendCapabilities:
+        """Capabilities of a model of this backend, without creating the backend.
+
+        Backends whose models differ (e.g. with and without punctuation)
+        override this.
+        """
+        return cls.CAPABILITIES
+
+    @property
+    def capabilities(self) -> BackendCapabilities:
+        """Capabilities of the current model."""
+        return self.capabilities_for(self.model_size)
+
     def is_model_loaded(self) -> bool:
         """Check if model is currently loaded in memory.
 
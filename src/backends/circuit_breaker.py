@@ -0,0 +1,142 @@
+"""Circuit breaker for cloud backends.
+
+Tracks the failure rate of recent calls. When it crosses the threshold the
+circuit opens and calls are skipped outright for a cool-down period; after
+that a single half-open probe decides whether to close it again.
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker with half-open probes.
+
+    States:
+        closed    - calls go through, outcomes are recorded in a sliding window
+        open      - calls are rejected until open_duration_sec has passed
+        half_open - one probe call is allowed; success closes, failure re-opens
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        window_size: int = 10,
+        failure_rate_threshold: float = 0.5,
+        min_calls: int = 3,
+        open_duration_sec: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            window_size: Number of recent outcomes used for the failure rate
+            failure_rate_threshold: Failure rate (0.0-1.0) that opens the circuit
+            min_calls: Minimum outcomes in the window before the rate is trusted
+            open_duration_sec: Time to stay open before allowing a probe
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.window_size = window_size
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.open_duration_sec = open_duration_sec
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window_size)  # True = success
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._times_opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state (an expired open circuit reports half_open)."""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self):
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.open_duration_sec:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        """Return True if a call may be attempted now.
+
+        In half_open state only one caller gets True until its outcome
+        is recorded.
+        """
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self):
+        """Record a successful call."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._outcomes.clear()
+                self._probe_in_flight = False
+            self._outcomes.append(True)
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit if the rate is too high."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append(False)
+            if self._state == self.CLOSED and len(self._outcomes) >= self.min_calls:
+                if self._failure_rate() >= self.failure_rate_threshold:
+                    self._open()
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+        self._times_opened += 1
+
+    def _failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for ok in self._outcomes if not ok) / len(self._outcomes)
+
+    def reset(self):
+        """Return to closed state and forget recorded outcomes."""
+        with self._lock:
+            self._outcomes.clear()
+            self._state = self.CLOSED
+            self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        """Get breaker state for diagnostics.
+
+        Returns:
+            Dictionary with state, failure rate, window size and counters
+        """
+        with self._lock:
+            self._maybe_half_open()
+            retry_in = 0.0
+            if self._state == self.OPEN:
+                retry_in = max(0.0, self.open_duration_sec - (self._clock() - self._opened_at))
+            return {
+                "state": self._state,
+                "failure_rate": round(self._failure_rate(), 3),
+                "window_calls": len(self._outcomes),
+                "times_opened": self._times_opened,
+                "rejected_calls": self._rejected,
+                "retry_in_sec": round(retry_in, 1),
+            }
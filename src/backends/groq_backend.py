@@ -2,14 +2,24 @@
 import io
 import logging
 import os
+import threading
 import time
 import wave
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Callable, Optional, Tuple
 
 import numpy as np
 
-from .base import BaseBackend
+try:
+    from stage_timing import stage
+except ImportError:  # imported as src.backends (src not on sys.path)
+    from ..stage_timing import stage
+
+from .base import BackendCapabilities, BaseBackend
+from .circuit_breaker import CircuitBreaker
+from .model_manager import get_model_manager
+from .segmentation import split_at_silence
 
 logger = logging.getLogger("transkribator")
 
@@ -20,13 +30,52 @@ except ImportError:
     GROQ_AVAILABLE = False
     Groq = None
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    httpx = None
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except (ImportError, OSError):
+    SOUNDFILE_AVAILABLE = False
+    sf = None
+
+FALLBACK_MODEL = "giga-am-v3-ru-punct"
 GROQ_API_TIMEOUT = 15  # seconds (enough for ~2-3 min audio)
 
+# Upload encoding: lossless FLAC by default, low-bitrate Opus when the FLAC
+# body would take longer than the budget on the measured uplink.
+UPLOAD_BUDGET_SEC = 3.0             # max expected upload time before switching to Opus
+UPLOAD_DEFAULT_BYTES_PER_SEC = 125_000  # 1 Mbit/s until a real request is measured
+# Request time = latency floor (round trip + server decode) + body / uplink.
+# Requests with a body this small are timed as the floor itself.
+LATENCY_PROBE_MAX_BYTES = 64_000    # ~3 s of speech as FLAC
+UPLOAD_DEFAULT_LATENCY_SEC = 0.5    # floor until a short request is measured
+MIN_TRANSFER_SEC = 0.05             # upload time not resolvable against latency jitter
+FLAC_SIZE_RATIO = 0.6               # typical FLAC size vs 16-bit PCM for speech
+OPUS_COMPRESSION_LEVEL = 0.9        # libsndfile scale (1.0 = smallest); 0.9 is ~32 kbit/s at 16 kHz
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+# A successful but slow response is an early sign of trouble: pre-warm fallback
+SLOW_RESPONSE_SEC = GROQ_API_TIMEOUT * 0.5
+
+# Long clips are split at pauses and the segments uploaded concurrently
+SEGMENT_THRESHOLD_SEC = 45.0  # split only audio longer than this
+SEGMENT_MIN_SEC = 15.0
+SEGMENT_MAX_SEC = 30.0
+GROQ_MAX_CONCURRENCY = 4      # worker threads and HTTP connections
+
 
 class GroqBackend(BaseBackend):
     """Cloud speech recognition via Groq Whisper API.
     Falls back to SherpaBackend on any failure."""
 
+    CAPABILITIES = BackendCapabilities(punctuation=True, casing=True)
+
     def __init__(
         self,
         model_size: str = "whisper-large-v3-turbo",
@@ -43,17 +92,84 @@ class GroqBackend(BaseBackend):
         super().__init__(model_size, device, compute_type, language, on_progress)
         self._client = None
         self._fallback = None
+        self._fallback_key = None  # ModelManager key while the fallback is pinned
+        self._fallback_lock = threading.Lock()
+        self._prewarm_thread: Optional[threading.Thread] = None
+        # Skip Groq outright while it is known to be failing
+        self._breaker = CircuitBreaker()
         self.last_used_fallback = False  # True if last transcription used Sherpa fallback
+        # Uplink estimate (body bytes / request time above the latency floor, EMA)
+        # for the encoding heuristic
+        self._uplink_bytes_per_sec = UPLOAD_DEFAULT_BYTES_PER_SEC
+        self._latency_floor_sec: Optional[float] = None  # EMA of short request times
+        # Persistent pool for segment uploads (created on first long clip)
+        self._segment_pool: Optional[ThreadPoolExecutor] = None
+        # Local decoder is not shared between threads
+        self._fallback_decode_lock = threading.Lock()
+        self.last_fallback_segments = 0  # Segments of last transcription decoded locally
+
+    @property
+    def fallback_capabilities(self) -> BackendCapabilities:
+        """Capabilities of the Sherpa fallback's output."""
+        from .sherpa_backend import SherpaBackend
+        return SherpaBackend.capabilities_for(FALLBACK_MODEL)
 
     def _get_fallback(self):
-        """Lazy-init SherpaBackend for fallback."""
-        if self._fallback is None:
-            from .sherpa_backend import SherpaBackend
-            self._fallback = SherpaBackend(
-                model_size="giga-am-v3-ru-punct",
-                on_progress=self.on_progress,
-            )
-        return self._fallback
+        """Get the SherpaBackend fallback from the model manager (pinned
+        while this backend is loaded, so it is shared with later instances
+        and counted against the RAM budget)."""
+        with self._fallback_lock:
+            if self._fallback is None:
+                from .sherpa_backend import SherpaBackend
+                key = (SherpaBackend, "groq-fallback", FALLBACK_MODEL)
+                self._fallback = get_model_manager().get(
+                    key,
+                    lambda: SherpaBackend(model_size=FALLBACK_MODEL, on_progress=self.on_progress),
+                    pin=True,
+                )
+                self._fallback_key = key
+            return self._fallback
+
+    def _load_fallback(self, fallback):
+        """Load the fallback through the model manager (RSS measured, budget enforced)."""
+        if fallback.is_model_loaded():
+            return
+        if self._fallback_key is not None:
+            get_model_manager().ensure_loaded(self._fallback_key)
+        else:
+            fallback.load_model()
+
+    def _prewarm_fallback(self, reason: str):
+        """Load and warm the Sherpa fallback in the background.
+
+        Called on the first sign of Groq trouble so that a later fallback does
+        not pay model load time on top of the failed API call.
+        """
+        if self._prewarm_thread is not None and self._prewarm_thread.is_alive():
+            return
+        if self._fallback is not None and self._fallback.is_model_loaded():
+            return
+
+        def _warm():
+            t0 = time.time()
+            try:
+                fallback = self._get_fallback()
+                self._load_fallback(fallback)
+                # One short decode initializes ONNX Runtime buffers
+                fallback.transcribe(np.zeros(8000, dtype=np.float32), 16000)
+                logger.info("GROQ_FALLBACK_PREWARMED | reason=%s | elapsed=%.2fs", reason, time.time() - t0)
+            except Exception as e:
+                logger.warning("GROQ_FALLBACK_PREWARM_FAILED | reason=%s | %s", reason, e)
+
+        logger.info("GROQ_FALLBACK_PREWARM_START | reason=%s", reason)
+        self._prewarm_thread = threading.Thread(target=_warm, daemon=True)
+        self._prewarm_thread.start()
+
+    def _wait_for_prewarm(self):
+        """Block until an in-flight background pre-warm has finished."""
+        thread = self._prewarm_thread
+        if thread is not None and thread.is_alive():
+            thread.join()
 
     @staticmethod
     def _ensure_groq_api_key():
@@ -72,24 +188,40 @@ class GroqBackend(BaseBackend):
             logger.warning("groq package not installed, using Sherpa fallback")
             if self.on_progress:
                 self.on_progress("Groq SDK not installed, using Sherpa fallback")
-            self._get_fallback().load_model()
+            self._load_fallback(self._get_fallback())
             return
         try:
             self._ensure_groq_api_key()
-            self._client = Groq()  # reads GROQ_API_KEY from env
+            kwargs = {}
+            if HTTPX_AVAILABLE:
+                # Bounded keep-alive pool sized to the segment upload concurrency
+                kwargs["http_client"] = httpx.Client(limits=httpx.Limits(
+                    max_connections=GROQ_MAX_CONCURRENCY,
+                    max_keepalive_connections=GROQ_MAX_CONCURRENCY,
+                ))
+            self._client = Groq(**kwargs)  # reads GROQ_API_KEY from env
             if self.on_progress:
                 self.on_progress("Groq Whisper ready")
         except Exception as e:
             logger.warning("Groq client init failed: %s", e)
             if self.on_progress:
                 self.on_progress(f"Groq unavailable ({e}), using Sherpa")
-            self._get_fallback().load_model()
+            self._load_fallback(self._get_fallback())
 
     def unload_model(self):
         self._client = None
-        if self._fallback is not None:
-            self._fallback.unload_model()
+        if self._segment_pool is not None:
+            self._segment_pool.shutdown(wait=True)
+            self._segment_pool = None
+        self._wait_for_prewarm()
+        with self._fallback_lock:
+            if self._fallback_key is not None:
+                # Stays resident while the RAM budget allows
+                get_model_manager().unpin(self._fallback_key)
+            elif self._fallback is not None:
+                self._fallback.unload_model()
             self._fallback = None
+            self._fallback_key = None
 
     def is_model_loaded(self) -> bool:
         return self._client is not None or (
@@ -97,14 +229,19 @@ class GroqBackend(BaseBackend):
         )
 
     @staticmethod
-    def _numpy_to_wav_bytes(audio: np.ndarray, sample_rate: int) -> bytes:
-        """Convert numpy float32 array to WAV bytes in memory."""
+    def _to_pcm16(audio: np.ndarray) -> np.ndarray:
+        """Convert float audio (any shape) to mono int16 PCM."""
         if audio.dtype != np.float32:
             audio = audio.astype(np.float32)
         if len(audio.shape) > 1:
             audio = audio.mean(axis=1)
         audio = np.clip(audio, -1.0, 1.0)
-        pcm = (audio * 32767).astype(np.int16)
+        return (audio * 32767).astype(np.int16)
+
+    @staticmethod
+    def _numpy_to_wav_bytes(audio: np.ndarray, sample_rate: int) -> bytes:
+        """Convert numpy float32 array to WAV bytes in memory."""
+        pcm = GroqBackend._to_pcm16(audio)
         buf = io.BytesIO()
         with wave.open(buf, 'wb') as wf:
             wf.setnchannels(1)
@@ -114,45 +251,197 @@ class GroqBackend(BaseBackend):
         buf.seek(0)
         return buf.read()
 
-    def transcribe(self, audio: np.ndarray, sample_rate: int = 16000, cancel_event=None) -> Tuple[str, float]:
-        start_time = time.time()
-        self.last_used_fallback = False
+    def _choose_upload_format(self, num_samples: int, sample_rate: int) -> str:
+        """Pick "flac" or "opus" from the expected FLAC upload time.
 
-        if cancel_event and cancel_event.is_set():
-            return "", 0.0
+        FLAC is lossless and ~40% smaller than WAV. If even FLAC would exceed
+        UPLOAD_BUDGET_SEC on the measured uplink (long clips, slow office
+        links), use Opus, which is ~10x smaller still.
+        """
+        if not SOUNDFILE_AVAILABLE:
+            return "wav"
+        expected_flac_bytes = num_samples * 2 * FLAC_SIZE_RATIO
+        expected_upload_sec = expected_flac_bytes / max(self._uplink_bytes_per_sec, 1.0)
+        if expected_upload_sec > UPLOAD_BUDGET_SEC and sample_rate in OPUS_SAMPLE_RATES:
+            return "opus"
+        return "flac"
+
+    def _encode_audio(self, audio: np.ndarray, sample_rate: int) -> Tuple[str, bytes]:
+        """Encode audio for upload in memory.
 
-        if self._client is not None:
+        Returns:
+            Tuple of (filename, encoded bytes). Falls back to WAV if the
+            compressed encoding is unavailable or fails.
+        """
+        pcm = self._to_pcm16(audio)
+        fmt = self._choose_upload_format(len(pcm), sample_rate)
+        t0 = time.perf_counter()
+        filename, data = "audio.wav", None
+        if fmt != "wav":
             try:
-                wav_bytes = self._numpy_to_wav_bytes(audio, sample_rate)
-                audio_duration = len(audio) / sample_rate
-                logger.info("GROQ_API_CALL | model=%s | audio=%.1fs | wav_size=%d bytes",
-                            self.model_size, audio_duration, len(wav_bytes))
+                buf = io.BytesIO()
+                if fmt == "opus":
+                    sf.write(buf, pcm, sample_rate, format="OGG", subtype="OPUS",
+                             compression_level=OPUS_COMPRESSION_LEVEL)
+                    filename = "audio.ogg"
+                else:
+                    sf.write(buf, pcm, sample_rate, format="FLAC", subtype="PCM_16")
+                    filename = "audio.flac"
+                data = buf.getvalue()
+            except Exception as e:
+                logger.warning("GROQ_ENCODE_FAILED | format=%s | %s, using wav", fmt, e)
+                fmt, filename, data = "wav", "audio.wav", None
+        if data is None:
+            data = self._numpy_to_wav_bytes(audio, sample_rate)
+        encode_ms = (time.perf_counter() - t0) * 1000
+        raw_size = len(pcm) * 2 + 44
+        logger.info("GROQ_ENCODE | format=%s | raw=%d bytes | encoded=%d bytes (%.0f%%) | encode=%.1fms",
+                    fmt, raw_size, len(data), 100.0 * len(data) / raw_size, encode_ms)
+        return filename, data
+
+    def _record_upload(self, num_bytes: int, elapsed: float):
+        """Update the uplink estimate from a completed request.
+
+        Short requests measure the latency floor (round trip and server
+        decode); longer ones measure the uplink from the time above it.
+        Dividing by the whole request time would count the latency as upload
+        time and send long clips as Opus even on fast links.
+        """
+        if elapsed <= 0 or num_bytes <= 0:
+            return
+        if num_bytes <= LATENCY_PROBE_MAX_BYTES:
+            floor = self._latency_floor_sec
+            self._latency_floor_sec = elapsed if floor is None else 0.7 * floor + 0.3 * elapsed
+            return
+        floor = self._latency_floor_sec
+        if floor is None:
+            floor = UPLOAD_DEFAULT_LATENCY_SEC
+        # At or below the floor the body went up faster than the jitter: a fast link
+        observed = num_bytes / max(elapsed - floor, MIN_TRANSFER_SEC)
+        self._uplink_bytes_per_sec = 0.7 * self._uplink_bytes_per_sec + 0.3 * observed
+
+    def _api_transcribe(self, audio: np.ndarray, sample_rate: int) -> str:
+        """Send one clip to the Groq API and record the outcome.
+
+        Raises:
+            Exception: Any encoding or API error (already recorded as a
+                breaker failure, fallback pre-warm started)
+        """
+        try:
+            with stage("encode"):
+                filename, body = self._encode_audio(audio, sample_rate)
+            audio_duration = len(audio) / sample_rate
+            logger.info("GROQ_API_CALL | model=%s | audio=%.1fs | file=%s | size=%d bytes",
+                        self.model_size, audio_duration, filename, len(body))
+            request_start = time.time()
+            with stage("api_request"):
                 resp = self._client.audio.transcriptions.create(
-                    file=("audio.wav", wav_bytes),
+                    file=(filename, body),
                     model=self.model_size,
                     language=self.language if self.language != "auto" else None,
                     temperature=0.0,  # deterministic decoding reduces Russian hallucinations
                     prompt="Диктовка на русском языке.",  # hints Groq to expect RU dictation
                     timeout=GROQ_API_TIMEOUT,
                 )
-                text = resp.text.strip()
+            text = resp.text.strip()
+        except Exception:
+            self._breaker.record_failure()
+            self._prewarm_fallback("api_error")
+            raise
+        request_time = time.time() - request_start
+        self._breaker.record_success()
+        self._record_upload(len(body), request_time)
+        if request_time > SLOW_RESPONSE_SEC:
+            self._prewarm_fallback("slow_response")
+        return text
+
+    def _fallback_transcribe(self, audio: np.ndarray, sample_rate: int, cancel_event=None) -> Tuple[str, float]:
+        """Decode with the local Sherpa fallback (one caller at a time)."""
+        self._wait_for_prewarm()
+        fallback = self._get_fallback()
+        with self._fallback_decode_lock:
+            self._load_fallback(fallback)
+            return fallback.transcribe(audio, sample_rate, cancel_event=cancel_event)
+
+    def _transcribe_segment(self, index: int, audio: np.ndarray, sample_rate: int,
+                            cancel_event=None) -> Tuple[str, bool]:
+        """Transcribe one segment via Groq, falling back locally for it alone.
+
+        Returns:
+            Tuple of (text, used_fallback)
+        """
+        if cancel_event and cancel_event.is_set():
+            return "", False
+        if self._breaker.allow_request():
+            try:
+                return self._api_transcribe(audio, sample_rate), False
+            except Exception as e:
+                logger.warning("GROQ_SEGMENT_FALLBACK | segment=%d | reason=%s", index, e)
+        else:
+            logger.info("GROQ_SEGMENT_CIRCUIT_OPEN | segment=%d", index)
+        text, _ = self._fallback_transcribe(audio, sample_rate, cancel_event=cancel_event)
+        return text, True
+
+    def _transcribe_segmented(self, audio: np.ndarray, sample_rate: int,
+                              bounds, cancel_event=None) -> str:
+        """Upload segments concurrently and join the texts in original order."""
+        if self._segment_pool is None:
+            self._segment_pool = ThreadPoolExecutor(
+                max_workers=GROQ_MAX_CONCURRENCY, thread_name_prefix="groq-segment"
+            )
+        futures = [
+            self._segment_pool.submit(self._transcribe_segment, i, audio[s:e], sample_rate, cancel_event)
+            for i, (s, e) in enumerate(bounds)
+        ]
+        # Results are collected by index, so completion order does not matter
+        results = [f.result() for f in futures]
+        self.last_fallback_segments = sum(1 for _, used in results if used)
+        self.last_used_fallback = self.last_fallback_segments > 0
+        return " ".join(text for text, _ in results if text)
+
+    def transcribe(self, audio: np.ndarray, sample_rate: int = 16000, cancel_event=None) -> Tuple[str, float]:
+        start_time = time.time()
+        self.last_used_fallback = False
+        self.last_fallback_segments = 0
+
+        if cancel_event and cancel_event.is_set():
+            return "", 0.0
+
+        if self._client is not None and len(audio) > SEGMENT_THRESHOLD_SEC * sample_rate:
+            mono = audio.mean(axis=1) if len(audio.shape) > 1 else audio
+            with stage("segment"):
+                bounds = split_at_silence(mono, sample_rate, SEGMENT_MIN_SEC, SEGMENT_MAX_SEC)
+            if len(bounds) > 1:
+                text = self._transcribe_segmented(mono, sample_rate, bounds, cancel_event)
+                elapsed = time.time() - start_time
+                logger.info("GROQ_SEGMENTED | segments=%d | fallback_segments=%d | elapsed=%.2fs | text_len=%d",
+                            len(bounds), self.last_fallback_segments, elapsed, len(text))
+                return text, elapsed
+
+        if self._client is not None and not self._breaker.allow_request():
+            logger.info("GROQ_CIRCUIT_OPEN | skipping API call | %s", self._breaker.snapshot())
+        elif self._client is not None:
+            try:
+                text = self._api_transcribe(audio, sample_rate)
                 elapsed = time.time() - start_time
                 logger.info("GROQ_API_OK | elapsed=%.2fs | text_len=%d", elapsed, len(text))
                 return text, elapsed
             except Exception as e:
-                logger.warning("GROQ_FALLBACK | reason=%s | falling back to sherpa", e)
+                logger.warning("GROQ_FALLBACK | reason=%s | circuit=%s | falling back to sherpa",
+                               e, self._breaker.state)
                 if self.on_progress:
                     self.on_progress("Groq failed, using Sherpa...")
 
         # Fallback
         self.last_used_fallback = True
-        fallback = self._get_fallback()
-        if not fallback.is_model_loaded():
-            fallback.load_model()
-        return fallback.transcribe(audio, sample_rate, cancel_event=cancel_event)
+        return self._fallback_transcribe(audio, sample_rate, cancel_event=cancel_event)
 
     def get_model_info(self) -> dict:
         info = super().get_model_info()
         info["groq_connected"] = self._client is not None
         info["fallback_loaded"] = self._fallback is not None and self._fallback.is_model_loaded()
+        breaker = self._breaker.snapshot()
+        info["circuit_state"] = breaker["state"]
+        info["circuit"] = breaker
+        info["max_concurrency"] = GROQ_MAX_CONCURRENCY
         return info
@@ -0,0 +1,252 @@
+"""Process-wide manager for loaded speech models.
+
+Switching backends used to unload the previous model right away, so
+switching back paid the full load again, and nothing bounded the combined
+RAM of all models (Groq's Sherpa fallback comes on top of the main one).
+The manager keeps recently used models resident and evicts the least
+recently used ones once their measured RSS footprint exceeds the budget.
+
+- Each model is registered under a key (backend class + settings) and
+  created by a factory; the same key returns the same instance.
+- The footprint is the RSS growth measured around load_model() (plus the
+  worker process RSS for out-of-process backends).
+- Pinned models (the active backend, a fallback in use) are never evicted.
+- A budget of 0 keeps nothing that is not pinned, i.e. the old behaviour.
+"""
+import gc
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger("transkribator")
+
+MB = 1024 * 1024
+
+
+def process_rss_mb(pid: Optional[int] = None) -> float:
+    """Resident set size of a process in MB (0 if unknown)."""
+    if not PSUTIL_AVAILABLE:
+        return 0.0
+    try:
+        return psutil.Process(pid).memory_info().rss / MB
+    except (psutil.Error, OSError):
+        return 0.0
+
+
+@dataclass
+class _Entry:
+    model: Any
+    footprint_mb: float = 0.0
+    pins: int = 0
+    last_used: float = 0.0
+
+
+class ModelManager:
+    """LRU of loaded models within a RAM budget."""
+
+    def __init__(self, budget_mb: float = 0.0, rss_fn: Callable[[Optional[int]], float] = process_rss_mb):
+        """
+        Args:
+            budget_mb: RAM allowed for all loaded models; unpinned ones are
+                evicted beyond it (0 = keep only pinned models)
+            rss_fn: RSS probe in MB for a pid (None = this process); injectable for tests
+        """
+        self.budget_mb = budget_mb
+        self._rss = rss_fn
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()  # one load at a time keeps RSS deltas attributable
+        self.evictions = 0
+
+    def set_budget(self, budget_mb: float):
+        with self._lock:
+            self.budget_mb = budget_mb
+        self._enforce_budget()
+
+    def get(self, key: Hashable, factory: Callable[[], Any], pin: bool = False) -> Any:
+        """Return the model registered under key, creating it if needed.
+
+        The model is not loaded; use ensure_loaded(). A factory exception
+        propagates and nothing is registered.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(factory())
+                self._entries[key] = entry
+            self._entries.move_to_end(key)
+            entry.last_used = time.time()
+            if pin:
+                entry.pins += 1
+            return entry.model
+
+    def ensure_loaded(self, key: Hashable) -> Any:
+        """Load the model under key if needed, record its footprint and
+        evict other models beyond the budget.
+
+        Raises:
+            KeyError: If key is not registered
+            Exception: Whatever load_model() raises
+        """
+        with self._lock:
+            entry = self._entries[key]
+            self._entries.move_to_end(key)
+            entry.last_used = time.time()
+            entry.pins += 1  # not evictable while loading
+        try:
+            with self._load_lock:
+                if not entry.model.is_model_loaded():
+                    before = self._rss(None)
+                    t0 = time.time()
+                    entry.model.load_model()
+                    footprint = max(0.0, self._rss(None) - before)
+                    worker_pid = getattr(entry.model, "worker_pid", None)
+                    if worker_pid:
+                        footprint += self._rss(worker_pid)
+                    entry.footprint_mb = footprint
+                    logger.info("MODEL_MANAGER_LOAD | key=%s | footprint=%.0fMB | elapsed=%.2fs | resident=%.0fMB",
+                                _describe(key), footprint, time.time() - t0, self.resident_mb())
+        finally:
+            with self._lock:
+                entry.pins -= 1
+        self._enforce_budget()
+        return entry.model
+
+    def touch(self, key: Hashable):
+        """Mark key as most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.last_used = time.time()
+
+    def pin(self, key: Hashable):
+        with self._lock:
+            self._entries[key].pins += 1
+
+    def unpin(self, key: Hashable):
+        """Release a pin; the model stays resident while the budget allows."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.pins = max(0, entry.pins - 1)
+        self._enforce_budget()
+
+    def contains(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def resident_mb(self) -> float:
+        """Measured footprint of all loaded models."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return sum(e.footprint_mb for e in entries if _is_loaded(e.model))
+
+    def _enforce_budget(self):
+        """Evict unpinned models, least recently used first, until the
+        total footprint fits the budget."""
+        while True:
+            with self._lock:
+                unpinned = [(k, e) for k, e in self._entries.items() if e.pins == 0]
+                used = sum(e.footprint_mb for e in self._entries.values() if _is_loaded(e.model))
+                if not unpinned or (self.budget_mb > 0 and used <= self.budget_mb):
+                    return
+                key, entry = unpinned[0]  # OrderedDict order = LRU first
+                del self._entries[key]
+                self.evictions += 1
+            # Outside the lock: unloading may call back into the manager
+            self._unload(key, entry, "budget" if self.budget_mb > 0 else "unused")
+
+    def evict(self, key: Hashable) -> bool:
+        """Unload and forget key regardless of pins. Returns False if unknown."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._unload(key, entry, "explicit")
+        return True
+
+    def evict_unpinned(self):
+        """Unload every model that is not pinned (e.g. when the app goes idle)."""
+        with self._lock:
+            entries = [(k, e) for k, e in self._entries.items() if e.pins == 0]
+            for key, _ in entries:
+                del self._entries[key]
+            self.evictions += len(entries)
+        for key, entry in entries:
+            self._unload(key, entry, "idle")
+
+    def unload_all(self):
+        """Unload every model (application exit)."""
+        with self._lock:
+            entries = list(self._entries.items())
+            self._entries.clear()
+        for key, entry in entries:
+            self._unload(key, entry, "shutdown")
+
+    def _unload(self, key: Hashable, entry: _Entry, reason: str):
+        try:
+            entry.model.unload_model()
+        except Exception as e:
+            logger.warning("MODEL_MANAGER_UNLOAD_FAILED | key=%s | error=%s", _describe(key), e)
+        gc.collect()
+        logger.info("MODEL_MANAGER_EVICT | key=%s | reason=%s | footprint=%.0fMB | idle=%.0fs",
+                    _describe(key), reason, entry.footprint_mb, time.time() - entry.last_used)
+
+    def stats(self) -> dict:
+        """Resident models (LRU first) and budget usage."""
+        with self._lock:
+            entries = list(self._entries.items())
+            budget = self.budget_mb
+            evictions = self.evictions
+        models = [
+            {
+                "key": _describe(k),
+                "footprint_mb": round(e.footprint_mb, 1),
+                "loaded": _is_loaded(e.model),
+                "pinned": e.pins > 0,
+            }
+            for k, e in entries
+        ]
+        return {
+            "budget_mb": budget,
+            "resident_mb": round(sum(m["footprint_mb"] for m in models if m["loaded"]), 1),
+            "evictions": evictions,
+            "models": models,
+        }
+
+
+def _is_loaded(model) -> bool:
+    try:
+        return bool(model.is_model_loaded())
+    except Exception:
+        return False
+
+
+def _describe(key: Hashable) -> str:
+    if isinstance(key, tuple):
+        return "/".join(getattr(p, "__name__", str(p)) for p in key)
+    return str(key)
+
+
+_manager: Optional[ModelManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_model_manager() -> ModelManager:
+    """Get or create the shared ModelManager instance."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ModelManager()
+        return _manager
@@ -9,10 +9,15 @@ import numpy as np
 
 logger = logging.getLogger("transkribator")
 
-from .base import BaseBackend
+try:
+    from stage_timing import stage
+except ImportError:  # imported as src.backends (src not on sys.path)
+    from ..stage_timing import stage
+
+from .base import BackendCapabilities, BaseBackend
 
 try:
-    from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor
+    from transformers import AutoModelForCausalLM, AutoModelForSpeechSeq2Seq, AutoProcessor
     import torch
     TRANSFORMERS_AVAILABLE = True
 except ImportError:
@@ -32,6 +37,86 @@ try:
 except ImportError:
     SCIPY_AVAILABLE = False
 
+# Default draft model for assisted (speculative) decoding. Only the decoder is
+# loaded (AutoModelForCausalLM); it reuses Podlodka's encoder outputs and shares
+# the large-v3 tokenizer, so verified output is identical to plain greedy.
+DEFAULT_ASSISTANT_MODEL = "distil-whisper/distil-large-v3"
+
+# With a draft model loaded, the first call and every Nth call after it run
+# plain greedy decoding to keep the baseline for the logged speedup current
+# (the output is the same either way)
+PLAIN_BASELINE_EVERY = 20
+
+
+class _ForwardCounter:
+    """Counts forward passes of a torch module via a pre-hook.
+
+    Also remembers the input length of the first call after reset(). For
+    the decoder in plain greedy decoding and for the draft model in assisted
+    decoding that is the decoder prompt (start and forced tokens); the main
+    decoder's first assisted pass already includes draft candidates.
+    """
+
+    def __init__(self, module):
+        self.calls = 0
+        self.first_input_len = 0
+        self._handle = module.register_forward_pre_hook(self._hook, with_kwargs=True)
+
+    def _hook(self, module, args, kwargs):
+        if self.calls == 0:
+            ids = kwargs.get("input_ids")
+            if ids is None and args:
+                ids = args[0]
+            if ids is not None and hasattr(ids, "shape"):
+                self.first_input_len = int(ids.shape[-1])
+        self.calls += 1
+
+    def reset(self):
+        self.calls = 0
+        self.first_input_len = 0
+
+    def remove(self):
+        self._handle.remove()
+
+
+def assisted_decoding_stats(
+    new_tokens: int,
+    target_passes: int,
+    draft_passes: int,
+    elapsed: float,
+    plain_ms_per_token: Optional[float] = None,
+) -> dict:
+    """Summarize one assisted-generation call.
+
+    Every target (verification) pass emits its accepted draft tokens plus one
+    token of its own, so accepted = new_tokens - target_passes.
+
+    Args:
+        new_tokens: Tokens generated after the decoder prompt
+        target_passes: Forward passes of the main (verifying) decoder
+        draft_passes: Forward passes of the draft model
+        elapsed: Wall time of the generate() call in seconds
+        plain_ms_per_token: Recent plain greedy cost, if known
+
+    Returns:
+        Dict with acceptance_rate, tokens_per_pass, ms_per_token and
+        speedup (None until a plain greedy baseline has been observed)
+    """
+    accepted = max(0, new_tokens - target_passes)
+    ms_per_token = elapsed * 1000.0 / new_tokens if new_tokens > 0 else 0.0
+    speedup = None
+    if plain_ms_per_token and ms_per_token > 0:
+        speedup = plain_ms_per_token / ms_per_token
+    return {
+        "new_tokens": new_tokens,
+        "target_passes": target_passes,
+        "draft_passes": draft_passes,
+        "acceptance_rate": accepted / draft_passes if draft_passes > 0 else 0.0,
+        "tokens_per_pass": new_tokens / target_passes if target_passes > 0 else 0.0,
+        "ms_per_token": ms_per_token,
+        "speedup": speedup,
+    }
+
 
 class PodlodkaTurboBackend(BaseBackend):
     """Speech recognition backend using Whisper-Podlodka-Turbo (Russian fine-tuned).
@@ -41,6 +126,8 @@ class PodlodkaTurboBackend(BaseBackend):
     for Russian speech than standard Whisper models.
     """
 
+    CAPABILITIES = BackendCapabilities(punctuation=True, casing=True, timestamps=True)
+
     def __init__(
         self,
         model_size: str = "podlodka-turbo",
@@ -53,10 +140,22 @@ class PodlodkaTurboBackend(BaseBackend):
         vad_threshold: float = 0.5,
         min_silence_duration_ms: int = 800,
         min_speech_duration_ms: int = 500,
+        # Assisted (speculative) decoding with a small draft model
+        assistant_model: Optional[str] = None,
     ):
         super().__init__(model_size, device, compute_type, language, on_progress)
         self._model = None
         self._processor = None
+
+        # Assisted decoding: draft model id (None/"" = plain greedy decoding)
+        self.assistant_model_id = assistant_model or None
+        self._assistant_model = None
+        self._target_counter = None
+        self._draft_counter = None
+        self._plain_ms_per_token = None  # EMA of plain greedy cost, for speedup
+        self._calls_since_baseline = 0
+        self.last_new_tokens = 0
+        self.last_assisted_stats = None
         self._loading = False
         self._lock = threading.Lock()
         self._detected_device = device
@@ -76,7 +175,8 @@ class PodlodkaTurboBackend(BaseBackend):
         if ENHANCED_PROCESSOR_AVAILABLE:
             self.text_processor = EnhancedTextProcessor(
                 language=self.language,
-                backend=self.backend_name
+                backend=self.backend_name,
+                capabilities=self.capabilities,
             )
         else:
             self.text_processor = AdvancedTextProcessor(language=self.language)
@@ -153,6 +253,24 @@ class PodlodkaTurboBackend(BaseBackend):
             # Load processor
             self._processor = AutoProcessor.from_pretrained(model_id)
 
+            # Load draft model for assisted decoding (optional, never fatal)
+            self._assistant_model = None
+            if self.assistant_model_id:
+                try:
+                    if self.on_progress:
+                        self.on_progress(f"Loading draft model {self.assistant_model_id}...")
+                    self._assistant_model = AutoModelForCausalLM.from_pretrained(
+                        self.assistant_model_id,
+                        torch_dtype=torch_dtype,
+                        low_cpu_mem_usage=True,
+                        use_safetensors=True
+                    ).to(device)
+                    logger.info("PODLODKA_ASSISTANT_LOADED | model=%s", self.assistant_model_id)
+                except Exception as e:
+                    logger.warning("PODLODKA_ASSISTANT_LOAD_FAILED | model=%s | %s",
+                                   self.assistant_model_id, e)
+                    self._assistant_model = None
+
             # Initialize Silero VAD if enabled
             self._vad = None
             if self._vad_enabled:
@@ -198,8 +316,10 @@ class PodlodkaTurboBackend(BaseBackend):
     def unload_model(self):
         """Unload the model to free memory."""
         with self._lock:
+            self._remove_counters()
             self._model = None
             self._processor = None
+            self._assistant_model = None
             gc.collect()
             try:
                 if torch.cuda.is_available():
@@ -235,72 +355,73 @@ class PodlodkaTurboBackend(BaseBackend):
             if self.on_progress:
                 self.on_progress("Transcribing with Podlodka-Turbo...")
 
-            # Ensure audio is float32 and mono
-            if audio.dtype != np.float32:
-                audio = audio.astype(np.float32)
-
-            if len(audio.shape) > 1:
-                audio = audio.mean(axis=1)
-
-            # Resample if necessary (model & VAD expect 16kHz)
-            if sample_rate != 16000:
-                if SCIPY_AVAILABLE:
-                    num_samples = int(len(audio) * 16000 / sample_rate)
-                    audio = scipy.signal.resample(audio, num_samples)
-                else:
-                    # Simple linear interpolation
-                    import math
-                    ratio = 16000 / sample_rate
-                    num_samples = int(len(audio) * ratio)
-                    indices = np.linspace(0, len(audio) - 1, num_samples)
-                    audio = np.interp(indices, np.arange(len(audio)), audio)
-                audio = audio.astype(np.float32)
+            with stage("preprocess"):
+                # Ensure audio is float32 and mono
+                if audio.dtype != np.float32:
+                    audio = audio.astype(np.float32)
+
+                if len(audio.shape) > 1:
+                    audio = audio.mean(axis=1)
+
+                # Resample if necessary (model & VAD expect 16kHz)
+                if sample_rate != 16000:
+                    if SCIPY_AVAILABLE:
+                        num_samples = int(len(audio) * 16000 / sample_rate)
+                        audio = scipy.signal.resample(audio, num_samples)
+                    else:
+                        # Simple linear interpolation
+                        import math
+                        ratio = 16000 / sample_rate
+                        num_samples = int(len(audio) * ratio)
+                        indices = np.linspace(0, len(audio) - 1, num_samples)
+                        audio = np.interp(indices, np.arange(len(audio)), audio)
+                    audio = audio.astype(np.float32)
 
             # Apply VAD to filter silence if enabled (after resample to 16kHz)
             if self._vad_enabled and self._vad is not None:
-                try:
-                    window_size = self._vad.window_size()
-                    speech_windows = []
-                    has_speech = False
-                    for i in range(0, len(audio), window_size):
-                        window = audio[i:i + window_size]
-                        if len(window) < window_size:
-                            padded = np.zeros(window_size, dtype=np.float32)
-                            padded[:len(window)] = window
-                            is_speech = self._vad.is_speech(padded.tolist())
+                with stage("vad"):
+                    try:
+                        window_size = self._vad.window_size()
+                        speech_windows = []
+                        has_speech = False
+                        for i in range(0, len(audio), window_size):
+                            window = audio[i:i + window_size]
+                            if len(window) < window_size:
+                                padded = np.zeros(window_size, dtype=np.float32)
+                                padded[:len(window)] = window
+                                is_speech = self._vad.is_speech(padded.tolist())
+                            else:
+                                is_speech = self._vad.is_speech(window.tolist())
+                            if is_speech:
+                                has_speech = True
+                                speech_windows.append(audio[i:min(i + window_size, len(audio))])
+                        self._vad.reset()
+                        if has_speech and speech_windows:
+                            audio = np.concatenate(speech_windows)
                         else:
-                            is_speech = self._vad.is_speech(window.tolist())
-                        if is_speech:
-                            has_speech = True
-                            speech_windows.append(audio[i:min(i + window_size, len(audio))])
-                    self._vad.reset()
-                    if has_speech and speech_windows:
-                        audio = np.concatenate(speech_windows)
-                    else:
-                        return "", 0.0
-                except Exception as e:
-                    logger.warning("PODLODKA_VAD_FILTER_FAILED | %s", e)
-                    # Continue with original audio on VAD failure
-
-            # Prepare input
-            inputs = self._processor(
-                audio,
-                sampling_rate=16000,
-                return_tensors="pt"
-            ).to(self._model.device)
-
-            # Generate transcription
-            with torch.no_grad():
-                predicted_ids = self._model.generate(
-                    **inputs,
+                            return "", 0.0
+                    except Exception as e:
+                        logger.warning("PODLODKA_VAD_FILTER_FAILED | %s", e)
+                        # Continue with original audio on VAD failure
+
+            with stage("decode"):
+                # Prepare input
+                inputs = self._processor(
+                    audio,
+                    sampling_rate=16000,
+                    return_tensors="pt"
+                ).to(self._model.device)
+
+                # Generate transcription
+                predicted_ids = self._generate(
+                    inputs,
                     language="ru",
                     task="transcribe",
-                    do_sample=False,
                     temperature=1.0,
                 )
 
-            # Decode
-            text = self._processor.batch_decode(predicted_ids, skip_special_tokens=True)[0]
+                # Decode
+                text = self._processor.batch_decode(predicted_ids, skip_special_tokens=True)[0]
 
             # Clean up text
             text = text.strip()
@@ -322,6 +443,79 @@ class PodlodkaTurboBackend(BaseBackend):
             logger.error("PODLODKA_TRANSCRIBE_FAILED | %s", e, exc_info=True)
             return "", 0.0
 
+    def _remove_counters(self):
+        """Detach forward-pass counters from the models."""
+        for counter in (self._target_counter, self._draft_counter):
+            if counter is not None:
+                counter.remove()
+        self._target_counter = None
+        self._draft_counter = None
+
+    def _ensure_counters(self, assisted: bool):
+        """Attach forward-pass counters used for decoding metrics."""
+        if self._target_counter is None:
+            self._target_counter = _ForwardCounter(self._model.get_decoder())
+        if assisted and self._draft_counter is None:
+            self._draft_counter = _ForwardCounter(self._assistant_model)
+
+    def _generate(self, inputs, **gen_kwargs):
+        """Run greedy generation, assisted by the draft model when loaded.
+
+        Assisted decoding only changes how tokens are proposed; every token is
+        verified by the main model, so the output matches plain greedy decoding.
+        Logs acceptance rate and speedup for assisted calls; the plain greedy
+        baseline comes from unassisted calls (see PLAIN_BASELINE_EVERY).
+        """
+        use_assistant = self._assistant_model is not None
+        if use_assistant and (self._plain_ms_per_token is None
+                              or self._calls_since_baseline >= PLAIN_BASELINE_EVERY):
+            use_assistant = False
+            self._calls_since_baseline = 0
+        self._ensure_counters(use_assistant)
+        self._target_counter.reset()
+        if use_assistant:
+            self._draft_counter.reset()
+            self._calls_since_baseline += 1
+            gen_kwargs["assistant_model"] = self._assistant_model
+
+        t0 = time.time()
+        with torch.no_grad():
+            predicted_ids = self._model.generate(**inputs, do_sample=False, **gen_kwargs)
+        elapsed = time.time() - t0
+
+        # Both paths count tokens after the same decoder prompt
+        prompt_counter = self._draft_counter if use_assistant else self._target_counter
+        new_tokens = max(0, predicted_ids.shape[-1] - prompt_counter.first_input_len)
+        self.last_new_tokens = new_tokens
+
+        if use_assistant:
+            stats = assisted_decoding_stats(
+                new_tokens=new_tokens,
+                target_passes=self._target_counter.calls,
+                draft_passes=self._draft_counter.calls,
+                elapsed=elapsed,
+                plain_ms_per_token=self._plain_ms_per_token,
+            )
+            self.last_assisted_stats = stats
+            logger.info(
+                "PODLODKA_ASSISTED | tokens=%d | target_passes=%d | draft_passes=%d | "
+                "acceptance=%.2f | tokens_per_pass=%.2f | ms_per_token=%.1f | speedup=%s",
+                stats["new_tokens"], stats["target_passes"], stats["draft_passes"],
+                stats["acceptance_rate"], stats["tokens_per_pass"], stats["ms_per_token"],
+                f"{stats['speedup']:.2f}x" if stats["speedup"] else "n/a",
+            )
+        elif new_tokens > 0:
+            ms_per_token = elapsed * 1000.0 / new_tokens
+            if self._plain_ms_per_token is None:
+                self._plain_ms_per_token = ms_per_token
+            else:
+                self._plain_ms_per_token = 0.8 * self._plain_ms_per_token + 0.2 * ms_per_token
+            if self._assistant_model is not None:
+                logger.info("PODLODKA_PLAIN_BASELINE | tokens=%d | ms_per_token=%.1f | ema=%.1f",
+                            new_tokens, ms_per_token, self._plain_ms_per_token)
+
+        return predicted_ids
+
     def is_model_loaded(self) -> bool:
         """Check if model is loaded."""
         return self._model is not None
@@ -335,5 +529,9 @@ class PodlodkaTurboBackend(BaseBackend):
             "dtype": self._dtype,
             "model_source": "HuggingFace: bond005/whisper-podlodka-turbo",
             "language": "ru (Russian fine-tuned)",
+            "assistant_model": self.assistant_model_id,
+            "assistant_loaded": self._assistant_model is not None,
         })
+        if self.last_assisted_stats:
+            info["assisted_acceptance_rate"] = round(self.last_assisted_stats["acceptance_rate"], 3)
         return info
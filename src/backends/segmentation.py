@@ -0,0 +1,184 @@
+"""Silence-aware audio segmentation.
+
+Splits long recordings into segments whose boundaries fall inside pauses,
+so each piece can be decoded independently without cutting words in half.
+Uses a lightweight frame-energy VAD (no model download) so it works for
+every backend, including the cloud one.
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+FRAME_MS = 20            # analysis frame
+SMOOTH_MS = 300          # energy is averaged over this window when picking a cut
+NOISE_PERCENTILE = 10    # frames below this percentile approximate the noise floor
+SILENCE_MARGIN = 3.0     # a frame is silent if its RMS is below noise floor * margin
+SILENCE_RMS_CAP = 0.01   # live threshold never exceeds AudioRecorder's auto-stop silence level
+
+
+def frame_rms(audio: np.ndarray, sample_rate: int, frame_ms: int = FRAME_MS) -> np.ndarray:
+    """RMS energy per non-overlapping frame."""
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[: n_frames * frame_len].astype(np.float32).reshape(n_frames, frame_len)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+def silence_mask(rms: np.ndarray) -> np.ndarray:
+    """Boolean mask of silent frames relative to the estimated noise floor."""
+    if len(rms) == 0:
+        return np.zeros(0, dtype=bool)
+    noise_floor = float(np.percentile(rms, NOISE_PERCENTILE))
+    threshold = max(noise_floor * SILENCE_MARGIN, 1e-4)
+    return rms < threshold
+
+
+def split_at_silence(
+    audio: np.ndarray,
+    sample_rate: int,
+    min_segment_sec: float = 20.0,
+    max_segment_sec: float = 40.0,
+) -> List[Tuple[int, int]]:
+    """Split audio into segments cut at the quietest point between limits.
+
+    Each cut is placed in the lowest-energy region (smoothed over SMOOTH_MS)
+    between min_segment_sec and max_segment_sec after the previous cut; for
+    normal speech that is the middle of a pause. Audio without any pause is
+    cut at max_segment_sec.
+
+    Args:
+        audio: Mono float audio
+        sample_rate: Sample rate in Hz
+        min_segment_sec: Shortest segment to produce (except the last one)
+        max_segment_sec: Longest segment to produce
+
+    Returns:
+        List of (start_sample, end_sample) covering the whole input in order
+    """
+    total = len(audio)
+    if total <= int(max_segment_sec * sample_rate):
+        return [(0, total)]
+
+    frame_len = max(1, int(sample_rate * FRAME_MS / 1000))
+    rms = frame_rms(audio, sample_rate)
+    smooth_frames = max(1, SMOOTH_MS // FRAME_MS)
+    smoothed = np.convolve(rms, np.ones(smooth_frames) / smooth_frames, mode="same")
+    silent = silence_mask(rms)
+
+    min_frames = int(min_segment_sec * 1000 / FRAME_MS)
+    max_frames = int(max_segment_sec * 1000 / FRAME_MS)
+
+    bounds = []
+    start_frame = 0
+    n_frames = len(rms)
+    while n_frames - start_frame > max_frames:
+        lo = start_frame + min_frames
+        hi = min(start_frame + max_frames, n_frames)
+        window = smoothed[lo:hi]
+        if silent[lo:hi].any():
+            # Quietest smoothed point among silent frames = middle of the pause
+            candidates = np.where(silent[lo:hi], window, np.inf)
+            cut = lo + int(np.argmin(candidates))
+        else:
+            cut = hi
+        bounds.append((start_frame * frame_len, cut * frame_len))
+        start_frame = cut
+    bounds.append((start_frame * frame_len, total))
+    return bounds
+
+
+class StreamingSegmenter:
+    """Closes speech segments on pauses while audio is still arriving.
+
+    Feed recorder blocks as they come in; feed() returns the segments that
+    closed (a pause of at least min_silence_ms after min_segment_sec of
+    audio), cut in the middle of the pause. Segments are force-closed at the
+    quietest frame once they reach max_segment_sec. Segments without a
+    single speech frame are dropped. flush() returns the final open segment.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        min_silence_ms: int = 600,
+        min_segment_sec: float = 3.0,
+        max_segment_sec: float = 30.0,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_len = max(1, int(sample_rate * FRAME_MS / 1000))
+        self.min_silence_frames = max(1, min_silence_ms // FRAME_MS)
+        self.min_segment_frames = int(min_segment_sec * 1000 / FRAME_MS)
+        self.max_segment_frames = int(max_segment_sec * 1000 / FRAME_MS)
+
+        self._pending = np.zeros(0, dtype=np.float32)  # samples of the open segment
+        self._silent: list = []                        # per full frame of _pending
+        self._rms: list = []                           # per full frame of _pending
+        self._history: list = []                       # recent rms, for the noise floor
+        self._silent_run = 0
+
+    def _threshold(self) -> float:
+        if len(self._history) < 50:  # < 1s: no reliable floor yet
+            return 1e-3
+        floor = float(np.percentile(self._history, NOISE_PERCENTILE))
+        # Capped: without pauses in the history the "floor" is speech level
+        return min(max(floor * SILENCE_MARGIN, 1e-3), SILENCE_RMS_CAP)
+
+    def feed(self, chunk: np.ndarray) -> List[np.ndarray]:
+        """Add audio; return segments closed by it (oldest first)."""
+        chunk = np.asarray(chunk, dtype=np.float32)
+        if chunk.ndim > 1:
+            chunk = chunk.mean(axis=1)
+        self._pending = np.concatenate([self._pending, chunk])
+
+        closed = []
+        while len(self._rms) < len(self._pending) // self.frame_len:
+            i = len(self._rms)
+            frame = self._pending[i * self.frame_len:(i + 1) * self.frame_len]
+            rms = float(np.sqrt(np.mean(frame * frame)))
+            threshold = self._threshold()
+            self._history.append(rms)
+            if len(self._history) > 1500:  # 30 s
+                del self._history[:500]
+            is_silent = rms < threshold
+            self._rms.append(rms)
+            self._silent.append(is_silent)
+            self._silent_run = self._silent_run + 1 if is_silent else 0
+
+            n = len(self._rms)
+            if n >= self.min_segment_frames and self._silent_run >= self.min_silence_frames:
+                cut = n - self._silent_run // 2  # middle of the pause
+            elif n >= self.max_segment_frames:
+                tail = self._rms[-self.min_segment_frames:]
+                cut = n - len(tail) + int(np.argmin(tail))
+            else:
+                continue
+            segment = self._close(cut)
+            if segment is not None:
+                closed.append(segment)
+        return closed
+
+    def _close(self, cut_frame: int) -> Optional[np.ndarray]:
+        """Split the open segment at cut_frame; None if it held no speech."""
+        cut = cut_frame * self.frame_len
+        segment = self._pending[:cut]
+        has_speech = not all(self._silent[:cut_frame])
+        self._pending = self._pending[cut:]
+        self._rms = self._rms[cut_frame:]
+        self._silent = self._silent[cut_frame:]
+        self._silent_run = 0
+        for flag in reversed(self._silent):
+            if not flag:
+                break
+            self._silent_run += 1
+        return segment if has_speech else None
+
+    def flush(self) -> np.ndarray:
+        """Return the open segment and reset."""
+        segment = self._pending
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._rms = []
+        self._silent = []
+        self._silent_run = 0
+        return segment
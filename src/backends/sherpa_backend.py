@@ -9,7 +9,12 @@ from pathlib import Path
 from typing import Callable, Optional, Tuple
 import numpy as np
 
-from .base import BaseBackend
+try:
+    from stage_timing import stage
+except ImportError:  # imported as src.backends (src not on sys.path)
+    from ..stage_timing import stage
+
+from .base import BackendCapabilities, BaseBackend
 
 logger = logging.getLogger("transkribator")
 
@@ -64,6 +69,7 @@ class SherpaBackend(BaseBackend):
             "files": ["model.int8.onnx", "tokens.txt"],
             "ctc_model_file": "model.int8.onnx",
             "language": "ru",
+            "capabilities": BackendCapabilities(punctuation=True, casing=True),
         },
     }
 
@@ -71,6 +77,15 @@ class SherpaBackend(BaseBackend):
     CHUNK_DURATION_SEC = 25    # 25 seconds per chunk (safe for NeMo Transducer)
     CHUNK_THRESHOLD_SEC = 30   # Apply chunking only for audio longer than this
     CHUNK_SAMPLE_RATE = 16000  # Always 16kHz after resampling
+    # transcribe_partial(): chunks cut at pauses, each short enough to skip internal chunking
+    PARTIAL_CHUNK_THRESHOLD_SEC = CHUNK_DURATION_SEC
+    PARTIAL_CHUNK_MIN_SEC = 15.0
+    PARTIAL_CHUNK_MAX_SEC = CHUNK_DURATION_SEC
+
+    @classmethod
+    def capabilities_for(cls, model_size: str) -> BackendCapabilities:
+        """GigaAM models output raw lowercase text, except the -punct one."""
+        return cls.MODELS.get(model_size, {}).get("capabilities", cls.CAPABILITIES)
 
     def __init__(
         self,
@@ -333,7 +348,8 @@ class SherpaBackend(BaseBackend):
             chunk = audio[offset: offset + chunk_size]
             if len(chunk) < 1600:   # Skip chunks < 0.1s (noise/silence tail)
                 break
-            chunk_text = self._transcribe_single_chunk(chunk, chunk_index)
+            with stage("decode_chunk"):
+                chunk_text = self._transcribe_single_chunk(chunk, chunk_index)
             if chunk_text:
                 texts.append(chunk_text)
             offset += chunk_size
@@ -365,69 +381,72 @@ class SherpaBackend(BaseBackend):
         start_time = time.time()
 
         try:
-            # Ensure audio is float32 and mono
-            if audio.dtype != np.float32:
-                audio = audio.astype(np.float32)
+            with stage("preprocess"):
+                # Ensure audio is float32 and mono
+                if audio.dtype != np.float32:
+                    audio = audio.astype(np.float32)
 
-            if len(audio.shape) > 1:
-                audio = audio.mean(axis=1)
+                if len(audio.shape) > 1:
+                    audio = audio.mean(axis=1)
 
-            # Pad with 200ms silence at start — CTC models need a clean onset
-            # to properly align the first token (avoids dropping first 1-2 words)
-            pad_samples = int(0.2 * 16000)  # 200ms = 3200 samples
-            audio = np.concatenate([np.zeros(pad_samples, dtype=np.float32), audio])
+                # Pad with 200ms silence at start — CTC models need a clean onset
+                # to properly align the first token (avoids dropping first 1-2 words)
+                pad_samples = int(0.2 * 16000)  # 200ms = 3200 samples
+                audio = np.concatenate([np.zeros(pad_samples, dtype=np.float32), audio])
 
-            # Resample if necessary (Sherpa-ONNX expects 16kHz)
-            if sample_rate != 16000:
-                try:
-                    # Use librosa if available (faster than scipy)
-                    import librosa
-                    audio = librosa.resample(audio, orig_sr=sample_rate, target_sr=16000)
-                except ImportError:
-                    # Fallback to scipy (slower)
+                # Resample if necessary (Sherpa-ONNX expects 16kHz)
+                if sample_rate != 16000:
                     try:
-                        import scipy.signal
-                        num_samples = int(len(audio) * 16000 / sample_rate)
-                        audio = scipy.signal.resample(audio, num_samples)
+                        # Use librosa if available (faster than scipy)
+                        import librosa
+                        audio = librosa.resample(audio, orig_sr=sample_rate, target_sr=16000)
                     except ImportError:
-                        pass
+                        # Fallback to scipy (slower)
+                        try:
+                            import scipy.signal
+                            num_samples = int(len(audio) * 16000 / sample_rate)
+                            audio = scipy.signal.resample(audio, num_samples)
+                        except ImportError:
+                            pass
 
             # Apply VAD to filter silence if enabled
             if self._vad_enabled and self._vad is not None:
-                window_size = self._vad.window_size()
-                speech_windows = []
-                has_speech = False
-                for i in range(0, len(audio), window_size):
-                    window = audio[i:i + window_size]
-                    if len(window) < window_size:
-                        # Pad last window for VAD check
-                        padded = np.zeros(window_size, dtype=np.float32)
-                        padded[:len(window)] = window
-                        is_speech = self._vad.is_speech(padded.tolist())
-                    else:
-                        is_speech = self._vad.is_speech(window.tolist())
-                    if is_speech:
-                        has_speech = True
-                        speech_windows.append(audio[i:min(i + window_size, len(audio))])
-
-                if has_speech and speech_windows:
-                    audio = np.concatenate(speech_windows)
-                    logger.debug("VAD_FILTER | kept %d/%d windows", len(speech_windows),
-                                 len(audio) // window_size + 1)
-                elif not has_speech:
-                    logger.debug("VAD_NO_SPEECH | audio=%.1fs", len(audio) / 16000.0)
-                    return "", 0.0
-                self._vad.reset()
+                with stage("vad"):
+                    window_size = self._vad.window_size()
+                    speech_windows = []
+                    has_speech = False
+                    for i in range(0, len(audio), window_size):
+                        window = audio[i:i + window_size]
+                        if len(window) < window_size:
+                            # Pad last window for VAD check
+                            padded = np.zeros(window_size, dtype=np.float32)
+                            padded[:len(window)] = window
+                            is_speech = self._vad.is_speech(padded.tolist())
+                        else:
+                            is_speech = self._vad.is_speech(window.tolist())
+                        if is_speech:
+                            has_speech = True
+                            speech_windows.append(audio[i:min(i + window_size, len(audio))])
+
+                    if has_speech and speech_windows:
+                        audio = np.concatenate(speech_windows)
+                        logger.debug("VAD_FILTER | kept %d/%d windows", len(speech_windows),
+                                     len(audio) // window_size + 1)
+                    elif not has_speech:
+                        logger.debug("VAD_NO_SPEECH | audio=%.1fs", len(audio) / 16000.0)
+                        return "", 0.0
+                    self._vad.reset()
 
             # Route: chunk long audio to avoid ONNX crash
             audio_duration_sec = len(audio) / 16000.0
             if audio_duration_sec > self.CHUNK_THRESHOLD_SEC:
                 text = self._transcribe_chunks(audio, cancel_event=cancel_event)
             else:
-                stream = self._recognizer.create_stream()
-                stream.accept_waveform(16000, audio)
-                self._recognizer.decode_stream(stream)
-                text = stream.result.text.strip()
+                with stage("decode"):
+                    stream = self._recognizer.create_stream()
+                    stream.accept_waveform(16000, audio)
+                    self._recognizer.decode_stream(stream)
+                    text = stream.result.text.strip()
 
             process_time = time.time() - start_time
             num_chunks = len(audio) // (self.CHUNK_DURATION_SEC * 16000) + 1 if audio_duration > self.CHUNK_THRESHOLD_SEC else 1
@@ -7,7 +7,12 @@ from pathlib import Path
 from typing import Callable, Optional, Tuple
 import numpy as np
 
-from .base import BaseBackend
+try:
+    from stage_timing import stage
+except ImportError:  # imported as src.backends (src not on sys.path)
+    from ..stage_timing import stage
+
+from .base import BackendCapabilities, BaseBackend
 
 # Import enhanced text processor
 try:
@@ -34,6 +39,9 @@ except ImportError:
 class WhisperBackend(BaseBackend):
     """Speech recognition backend using OpenAI Whisper."""
 
+    # Whisper segments carry timestamps and average log-probabilities
+    CAPABILITIES = BackendCapabilities(punctuation=True, casing=True, timestamps=True, confidence=True)
+
     def __init__(
         self,
         model_size: str = "base",
@@ -65,7 +73,8 @@ class WhisperBackend(BaseBackend):
         if ENHANCED_PROCESSOR_AVAILABLE:
             self.text_processor = EnhancedTextProcessor(
                 language=language,
-                backend=self.backend_name
+                backend=self.backend_name,
+                capabilities=self.capabilities,
             )
         else:
             self.text_processor = AdvancedTextProcessor(language=language)
@@ -221,79 +230,82 @@ class WhisperBackend(BaseBackend):
         start_time = time.time()
 
         try:
-            # Ensure audio is float32 and mono
-            if audio.dtype != np.float32:
-                audio = audio.astype(np.float32)
+            with stage("preprocess"):
+                # Ensure audio is float32 and mono
+                if audio.dtype != np.float32:
+                    audio = audio.astype(np.float32)
 
-            if len(audio.shape) > 1:
-                audio = audio.mean(axis=1)
+                if len(audio.shape) > 1:
+                    audio = audio.mean(axis=1)
 
-            # Resample if necessary (Whisper & VAD expect 16kHz)
-            if sample_rate != 16000:
-                try:
-                    # Use librosa if available (faster than scipy)
-                    import librosa
-                    audio = librosa.resample(audio, orig_sr=sample_rate, target_sr=16000)
-                except ImportError:
-                    # Fallback to scipy (slower)
+                # Resample if necessary (Whisper & VAD expect 16kHz)
+                if sample_rate != 16000:
                     try:
-                        import scipy.signal
-                        num_samples = int(len(audio) * 16000 / sample_rate)
-                        audio = scipy.signal.resample(audio, num_samples)
+                        # Use librosa if available (faster than scipy)
+                        import librosa
+                        audio = librosa.resample(audio, orig_sr=sample_rate, target_sr=16000)
                     except ImportError:
-                        pass
+                        # Fallback to scipy (slower)
+                        try:
+                            import scipy.signal
+                            num_samples = int(len(audio) * 16000 / sample_rate)
+                            audio = scipy.signal.resample(audio, num_samples)
+                        except ImportError:
+                            pass
 
             # Apply VAD to filter silence if enabled (after resample to 16kHz)
             if self._vad_enabled and self._vad is not None:
-                try:
-                    window_size = self._vad.window_size()
-                    speech_windows = []
-                    has_speech = False
-                    for i in range(0, len(audio), window_size):
-                        window = audio[i:i + window_size]
-                        if len(window) < window_size:
-                            padded = np.zeros(window_size, dtype=np.float32)
-                            padded[:len(window)] = window
-                            is_speech = self._vad.is_speech(padded.tolist())
+                with stage("vad"):
+                    try:
+                        window_size = self._vad.window_size()
+                        speech_windows = []
+                        has_speech = False
+                        for i in range(0, len(audio), window_size):
+                            window = audio[i:i + window_size]
+                            if len(window) < window_size:
+                                padded = np.zeros(window_size, dtype=np.float32)
+                                padded[:len(window)] = window
+                                is_speech = self._vad.is_speech(padded.tolist())
+                            else:
+                                is_speech = self._vad.is_speech(window.tolist())
+                            if is_speech:
+                                has_speech = True
+                                speech_windows.append(audio[i:min(i + window_size, len(audio))])
+                        self._vad.reset()
+                        if has_speech and speech_windows:
+                            audio = np.concatenate(speech_windows)
                         else:
-                            is_speech = self._vad.is_speech(window.tolist())
-                        if is_speech:
-                            has_speech = True
-                            speech_windows.append(audio[i:min(i + window_size, len(audio))])
-                    self._vad.reset()
-                    if has_speech and speech_windows:
-                        audio = np.concatenate(speech_windows)
-                    else:
-                        return "", 0.0
-                except Exception as e:
-                    print(f"WhisperBackend: VAD filtering failed: {e}")
-                    # Continue with original audio on VAD failure
+                            return "", 0.0
+                    except Exception as e:
+                        print(f"WhisperBackend: VAD filtering failed: {e}")
+                        # Continue with original audio on VAD failure
 
             language = "ru"  # Force Russian for optimal accuracy
 
-            if WHISPER_BACKEND == "faster-whisper":
-                segments, info = self._model.transcribe(
-                    audio,
-                    language=language,
-                    beam_size=5,  # Quality mode - optimal for Russian accuracy
-                    temperature=0.0,  # Deterministic decoding, no hallucinations
-                    vad_filter=True,
-                    vad_parameters=dict(
-                        min_silence_duration_ms=300,  # Optimized for Russian speech patterns
-                        speech_pad_ms=400,  # Prevents cutting off word endings
+            with stage("decode"):
+                if WHISPER_BACKEND == "faster-whisper":
+                    segments, info = self._model.transcribe(
+                        audio,
+                        language=language,
+                        beam_size=5,  # Quality mode - optimal for Russian accuracy
+                        temperature=0.0,  # Deterministic decoding, no hallucinations
+                        vad_filter=True,
+                        vad_parameters=dict(
+                            min_silence_duration_ms=300,  # Optimized for Russian speech patterns
+                            speech_pad_ms=400,  # Prevents cutting off word endings
+                        )
                     )
-                )
-                text = " ".join([segment.text for segment in segments]).strip()
+                    text = " ".join([segment.text for segment in segments]).strip()
 
-            else:
-                # OpenAI Whisper
-                result = self._model.transcribe(
-                    audio,
-                    language=language,
-                    temperature=0.0,  # Add deterministic decoding
-                    fp16=False
-                )
-                text = result["text"].strip()
+                else:
+                    # OpenAI Whisper
+                    result = self._model.transcribe(
+                        audio,
+                        language=language,
+                        temperature=0.0,  # Add deterministic decoding
+                        fp16=False
+                    )
+                    text = result["text"].strip()
 
             # Apply text post-processing (backend-aware)
             if hasattr(self, 'text_processor') and self.text_processor:
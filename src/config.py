@@ -31,6 +31,14 @@ class Config:
     device: str = "auto"  # auto, cpu, cuda
     compute_type: str = "auto"  # auto, int8, float16, float32
     enable_post_processing: bool = True  # Enable text post-processing for better accuracy
+    podlodka_assistant_model: str = ""  # Draft model for Podlodka assisted decoding ("" = off)
+    speculative_segments: bool = False  # Decode pause-closed segments while still recording
+    out_of_process_inference: bool = False  # Run the model in a child process (killable on timeout/crash)
+    profile_transcription: bool = False  # Write per-call profiles to the crash dir (also TRANSKRIBATOR_PROFILE=1)
+    idle_unload_minutes: int = 15  # Unload models after this much inactivity (0 = never)
+    model_ram_budget_mb: int = 3072  # Models kept loaded across backend switches (0 = only the active one)
+    result_cache_size: int = 32  # Recent clips whose results are cached for retries (0 = off)
+    inference_timeout_sec: float = 0.0  # Per-request child timeout (0 = max(60s, 2x audio duration))
 
     # Audio settings
     sample_rate: int = 16000
@@ -68,6 +76,8 @@ class Config:
 
     # Remote processing settings
     enable_remote_fallback: bool = False  # Enable remote server fallback (disabled by default for speed)
+    hedging_enabled: bool = True  # Start remote once local exceeds its p95 latency (else fixed 30s/40% timeout)
+    hedge_min_delay_sec: float = 3.0  # Never hedge sooner than this
 
     # Paste method: "clipboard" (safe, uses Ctrl+Shift+V) or "type" (legacy, types characters)
     # "clipboard" is recommended - it's faster and doesn't crash terminal apps like Claude Code
@@ -164,6 +174,7 @@ class Config:
         self.vad_threshold = settings["vad_threshold"]
         self.min_silence_duration_ms = settings["min_silence_duration_ms"]
         self.enable_post_processing = settings["enable_post_processing"]
+        self.podlodka_assistant_model = settings.get("podlodka_assistant_model", "")
         self.save()
 
 
@@ -262,6 +273,7 @@ QUALITY_PROFILES = {
         "vad_threshold": 0.5,
         "min_silence_duration_ms": 800,
         "enable_post_processing": False,
+        "podlodka_assistant_model": "distil-whisper/distil-large-v3",  # Lossless speedup
         "description": "⚡ Fast — Максимальная скорость",
     },
     "balanced": {
@@ -271,6 +283,7 @@ QUALITY_PROFILES = {
         "vad_threshold": 0.5,
         "min_silence_duration_ms": 800,
         "enable_post_processing": True,
+        "podlodka_assistant_model": "distil-whisper/distil-large-v3",
         "description": "⚖️ Balanced — Баланс скорости и качества",
     },
     "quality": {
@@ -280,6 +293,7 @@ QUALITY_PROFILES = {
         "vad_threshold": 0.3,
         "min_silence_duration_ms": 500,
         "enable_post_processing": True,
+        "podlodka_assistant_model": "",  # Skip draft model RAM
         "description": "🎯 Quality — Максимальное качество (Sherpa)",
     },
 }
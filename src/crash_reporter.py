@@ -26,13 +26,18 @@ def get_reporter():
     return _instance
 
 
+def default_crash_dir():
+    """Crash directory used when none is configured."""
+    return os.path.join(
+        os.environ.get("LOCALAPPDATA", os.path.expanduser("~")),
+        "WhisperTyping", "WhisperTyping", "crashes"
+    )
+
+
 class CrashReporter:
     def __init__(self, crash_dir=None, log_path=None):
         if crash_dir is None:
-            crash_dir = os.path.join(
-                os.environ.get("LOCALAPPDATA", os.path.expanduser("~")),
-                "WhisperTyping", "WhisperTyping", "crashes"
-            )
+            crash_dir = default_crash_dir()
         self.crash_dir = crash_dir
         self.log_path = log_path or os.path.join(
             os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "debug.log"
@@ -109,6 +114,15 @@ class CrashReporter:
         except ImportError:
             pass
 
+        # Latest per-call profile (TRANSKRIBATOR_PROFILE=1), if any
+        try:
+            from profiling import PROFILE_SUBDIR, latest_profile
+            profile = latest_profile(os.path.join(self.crash_dir, PROFILE_SUBDIR))
+            if profile:
+                report["profile"] = profile
+        except Exception:
+            pass
+
         return report
 
     def _save_report(self, report):
@@ -0,0 +1,279 @@
+"""Hedged execution across transcription paths.
+
+Instead of waiting for the primary path to time out before trying the next
+one, a secondary path is launched as soon as the primary runs past its own
+p95 latency. The first acceptable result wins and the other paths are
+cancelled. Winners are counted so it is visible how often hedging pays off.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("transkribator")
+
+# Latency is tracked as seconds per second of audio so that the p95 of short
+# and long clips is comparable; clips shorter than this count as this long.
+MIN_AUDIO_SEC = 1.0
+
+
+class LatencyTracker:
+    """Rolling per-path latency samples, normalized by audio duration."""
+
+    def __init__(self, window: int = 50, min_samples: int = 5):
+        """
+        Args:
+            window: Number of recent samples kept per path
+            min_samples: Samples needed before p95 is reported
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, path: str, elapsed: float, audio_sec: float):
+        """Record how long a path took for a clip of audio_sec seconds."""
+        with self._lock:
+            samples = self._samples.setdefault(path, deque(maxlen=self.window))
+            samples.append(elapsed / max(audio_sec, MIN_AUDIO_SEC))
+
+    def p95(self, path: str, audio_sec: float) -> Optional[float]:
+        """Expected p95 latency (seconds) of path for a clip of audio_sec.
+
+        Returns None until min_samples have been recorded.
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(path, ()))
+        if len(samples) < self.min_samples:
+            return None
+        idx = min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))
+        return samples[idx] * max(audio_sec, MIN_AUDIO_SEC)
+
+    def count(self, path: str) -> int:
+        with self._lock:
+            return len(self._samples.get(path, ()))
+
+
+@dataclass
+class HedgePath:
+    """One way of producing a transcription.
+
+    run receives a threading.Event that is set when the path loses and must
+    return the result (or raise). cancel, if given, is called in addition to
+    setting the event, for paths with their own cancellation mechanism.
+    """
+    name: str
+    run: Callable[[threading.Event], Any]
+    cancel: Optional[Callable[[], None]] = None
+
+
+@dataclass
+class HedgeResult:
+    """Outcome of a hedged execution."""
+    path: str
+    value: Any
+    elapsed: float
+    hedged: bool                     # more than one path was launched
+    launched: List[str] = field(default_factory=list)
+
+
+class HedgingPolicy:
+    """Decides when the next path is launched.
+
+    Enabled: after the running path's p95 (never sooner than min_delay_sec).
+    Until enough samples exist, and when disabled, the legacy fixed timeout
+    max(legacy_min_sec, legacy_ratio * duration) is used, which reproduces
+    the old sequential local-then-remote behaviour.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        min_delay_sec: float = 3.0,
+        legacy_min_sec: float = 30.0,
+        legacy_ratio: float = 0.4,
+    ):
+        self.enabled = enabled
+        self.min_delay_sec = min_delay_sec
+        self.legacy_min_sec = legacy_min_sec
+        self.legacy_ratio = legacy_ratio
+
+    def legacy_delay(self, audio_sec: float) -> float:
+        return max(self.legacy_min_sec, audio_sec * self.legacy_ratio)
+
+    def hedge_delay(self, tracker: LatencyTracker, path: str, audio_sec: float) -> float:
+        """Seconds to wait on path before launching the next one."""
+        if not self.enabled:
+            return self.legacy_delay(audio_sec)
+        p95 = tracker.p95(path, audio_sec)
+        if p95 is None:
+            return self.legacy_delay(audio_sec)
+        return max(self.min_delay_sec, p95)
+
+
+class HedgedExecutor:
+    """Runs HedgePaths on a persistent thread pool with hedging.
+
+    Paths are launched in order: the first immediately, each next one when
+    the most recently launched path exceeds its hedge delay or fails. The
+    first acceptable result wins; every other launched path is cancelled.
+    Once no path is left to launch, the running ones get the legacy timeout
+    from the last launch; then they are cancelled and the run times out.
+    """
+
+    def __init__(
+        self,
+        policy: Optional[HedgingPolicy] = None,
+        tracker: Optional[LatencyTracker] = None,
+        max_workers: int = 4,
+    ):
+        self.policy = policy or HedgingPolicy()
+        self.tracker = tracker or LatencyTracker()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self._wins: Dict[str, int] = {}
+        self._runs = 0
+        self._hedged_runs = 0
+        self._hedge_wins = 0  # a path other than the first won
+
+    def run(
+        self,
+        paths: List[HedgePath],
+        audio_sec: float,
+        is_acceptable: Callable[[Any], bool] = bool,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> HedgeResult:
+        """Run paths with hedging and return the first acceptable result.
+
+        Args:
+            paths: Paths in priority order
+            audio_sec: Clip duration (scales latency expectations)
+            is_acceptable: Predicate on a path's return value
+            cancel_event: External cancellation; all paths are cancelled
+
+        Raises:
+            TimeoutError: No acceptable result within the legacy timeout of
+                the last launched path
+            Exception: The last path error (or a summary) if no path produced
+                an acceptable result
+        """
+        if not paths:
+            raise ValueError("No paths to run")
+
+        start = time.time()
+        pending = list(paths)
+        running = {}  # future -> (path, cancel event, launch time)
+        launched: List[str] = []
+        last_error: Optional[BaseException] = None
+        next_launch_at = start
+        give_up_at = start
+
+        def launch():
+            nonlocal next_launch_at, give_up_at
+            path = pending.pop(0)
+            event = threading.Event()
+            future = self._pool.submit(path.run, event)
+            running[future] = (path, event, time.time())
+            launched.append(path.name)
+            next_launch_at = time.time() + self.policy.hedge_delay(self.tracker, path.name, audio_sec)
+            give_up_at = time.time() + self.policy.legacy_delay(audio_sec)
+            if len(launched) > 1:
+                logger.info("HEDGE_LAUNCH | path=%s | after=%.2fs", path.name, time.time() - start)
+
+        launch()
+        while running:
+            if cancel_event is not None and cancel_event.is_set():
+                self._cancel_all(running, None, audio_sec)
+                raise Exception("Cancelled")
+
+            timeout = max(0.0, (next_launch_at if pending else give_up_at) - time.time())
+            if cancel_event is not None:
+                timeout = min(timeout, 0.1)
+            done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                path, _, launched_at = running.pop(future)
+                try:
+                    value = future.result()
+                except Exception as e:
+                    last_error = e
+                    logger.info("HEDGE_PATH_FAILED | path=%s | %s", path.name, e)
+                    continue
+                if not is_acceptable(value):
+                    last_error = Exception(f"{path.name} returned unacceptable result")
+                    logger.info("HEDGE_PATH_REJECTED | path=%s", path.name)
+                    continue
+                elapsed = time.time() - start
+                self.tracker.record(path.name, time.time() - launched_at, audio_sec)
+                self._cancel_all(running, path.name, audio_sec)
+                result = HedgeResult(path.name, value, elapsed, len(launched) > 1, launched)
+                self._record_win(result, paths[0].name)
+                return result
+
+            if pending and (not running or time.time() >= next_launch_at):
+                launch()
+            elif running and not pending and time.time() >= give_up_at:
+                names = ",".join(path.name for path, _, _ in running.values())
+                logger.warning("HEDGE_TIMEOUT | paths=%s | after=%.2fs", names, time.time() - start)
+                self._cancel_all(running, None, audio_sec)
+                raise TimeoutError(f"Transcription timeout ({names})")
+
+        raise last_error or Exception("All transcription paths failed")
+
+    def _cancel_all(self, running: dict, winner: Optional[str], audio_sec: float):
+        """Cancel every still-running path.
+
+        Their time so far is recorded as a latency sample: it is a lower bound,
+        but dropping it would bias the p95 of a usually-losing path downwards.
+        """
+        now = time.time()
+        for future, (path, event, launched_at) in list(running.items()):
+            event.set()
+            if path.cancel is not None:
+                try:
+                    path.cancel()
+                except Exception as e:
+                    logger.warning("HEDGE_CANCEL_FAILED | path=%s | %s", path.name, e)
+            future.cancel()
+            self.tracker.record(path.name, now - launched_at, audio_sec)
+            logger.info("HEDGE_CANCELLED | path=%s | winner=%s", path.name, winner)
+        running.clear()
+
+    def _record_win(self, result: HedgeResult, primary: str):
+        with self._lock:
+            self._runs += 1
+            self._wins[result.path] = self._wins.get(result.path, 0) + 1
+            if result.hedged:
+                self._hedged_runs += 1
+                if result.path != primary:
+                    self._hedge_wins += 1
+            stats = self._stats_locked()
+        logger.info("HEDGE_RESULT | winner=%s | hedged=%s | launched=%s | elapsed=%.2fs | wins=%s | hedge_win_rate=%.2f",
+                    result.path, result.hedged, ",".join(result.launched), result.elapsed,
+                    stats["wins"], stats["hedge_win_rate"])
+
+    def _stats_locked(self) -> dict:
+        return {
+            "runs": self._runs,
+            "hedged_runs": self._hedged_runs,
+            "hedge_wins": self._hedge_wins,
+            "hedge_win_rate": self._hedge_wins / self._hedged_runs if self._hedged_runs else 0.0,
+            "wins": dict(self._wins),
+        }
+
+    def stats(self) -> dict:
+        """Get win counters.
+
+        Returns:
+            Dictionary with runs, hedged_runs, hedge_wins (a secondary path
+            won), hedge_win_rate and per-path wins
+        """
+        with self._lock:
+            return self._stats_locked()
+
+    def shutdown(self):
+        """Stop the worker pool without waiting for abandoned paths."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,197 @@
+"""Idle model unloading with predictive reload.
+
+Dictation is bursty: between bursts the models sit in RAM doing nothing.
+After idle_minutes without activity the policy unloads them; when the user
+starts recording again the reload is started immediately, so by the time
+they stop talking the model is usually warm again. Every reload is logged
+against the recording time to show how often it was fully hidden.
+
+Qt-free: the main window calls check() from a timer and the
+on_recording_start/stop hooks from _start()/_stop().
+
+check() runs the unload on a worker thread. A recording that starts while
+an unload is in flight doesn't preload at once (the unload would drop the
+fresh model); the reload is started by check() as soon as the unload ends.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger("transkribator")
+
+
+class IdleUnloadPolicy:
+    """Unloads models after inactivity and reloads them on the next recording."""
+
+    def __init__(
+        self,
+        idle_minutes: float,
+        unload: Callable[[], None],
+        preload: Callable[[Callable[[bool, float], None]], bool],
+        is_loaded: Callable[[], bool],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            idle_minutes: Inactivity before unloading (0 = never unload)
+            unload: Frees the models
+            preload: Starts a background reload; gets a callback
+                (success, elapsed_sec) and returns False if nothing was started
+            is_loaded: Whether the main model is currently loaded
+            clock: Time source (injectable for tests)
+        """
+        self.idle_sec = idle_minutes * 60
+        self._unload = unload
+        self._preload = preload
+        self._is_loaded = is_loaded
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_activity = clock()
+        self._unloaded = False
+        self._unloading = False         # check() is inside unload()
+        self._reload_requested = False  # a recording started meanwhile
+
+        # Current reload, reported once both the reload and the recording ended
+        self._reload_start: Optional[float] = None
+        self._reload_sec: Optional[float] = None
+        self._reload_ok = False
+        self._recording_start: Optional[float] = None
+        self._recording_sec: Optional[float] = None
+
+        self.unloads = 0
+        self.reloads = 0
+        self.hidden_reloads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.idle_sec > 0
+
+    def touch(self):
+        """Record user activity (a transcription finished, settings changed...)."""
+        with self._lock:
+            self._last_activity = self._clock()
+
+    def check(self, busy: bool = False) -> bool:
+        """Unload if idle for long enough. Returns True if models were unloaded.
+
+        Args:
+            busy: Recording or transcription in progress (never unload then)
+        """
+        with self._lock:
+            if busy:
+                self._last_activity = self._clock()
+                return False
+            idle = self._clock() - self._last_activity
+            if (not self.enabled or self._unloaded or self._unloading
+                    or self._reload_start is not None or idle < self.idle_sec):
+                return False
+            self._unloaded = True
+            self._unloading = True
+        unloaded = False
+        try:
+            if self._is_loaded():
+                with self._lock:
+                    skip = self._reload_requested
+                if skip:
+                    logger.info("IDLE_UNLOAD_SKIPPED | reason=recording_started")
+                else:
+                    t0 = time.time()
+                    try:
+                        self._unload()
+                        unloaded = True
+                    except Exception as e:
+                        logger.warning("IDLE_UNLOAD_FAILED | error=%s", e)
+                    if unloaded:
+                        self.unloads += 1
+                        logger.info("IDLE_UNLOAD | idle=%.0fs | elapsed=%.2fs", idle, time.time() - t0)
+        finally:
+            with self._lock:
+                self._unloading = False
+                reload = self._reload_requested
+                self._reload_requested = False
+            if reload:
+                self._start_reload(None)
+        return unloaded
+
+    def on_recording_start(self):
+        """Start reloading right away if the models were unloaded."""
+        with self._lock:
+            now = self._clock()
+            self._last_activity = now
+            if self._reload_start is not None:
+                return  # previous reload still running
+            self._unloaded = False
+            if self._unloading:
+                # Reloading now would race the unload; check() reloads after it
+                self._reload_requested = True
+                self._recording_start = now
+                self._recording_sec = None
+                return
+        self._start_reload(now)
+
+    def _start_reload(self, recording_start: Optional[float]):
+        """Preload the models if unloaded; recording_start None keeps the
+        recording already noted by on_recording_start()."""
+        with self._lock:
+            if self._reload_start is not None:
+                return
+            if self._is_loaded():
+                if recording_start is None:
+                    self._recording_start = self._recording_sec = None
+                return
+            self._reload_start = self._clock()
+            self._reload_sec = None
+            if recording_start is not None:
+                self._recording_start = recording_start
+                self._recording_sec = None
+        logger.info("IDLE_RELOAD_START")
+        try:
+            started = self._preload(self._on_reload_done)
+        except Exception as e:
+            logger.warning("IDLE_RELOAD_FAILED | error=%s", e)
+            started = False
+        if not started:
+            with self._lock:
+                self._reload_start = None
+
+    def on_recording_stop(self):
+        """Mark the end of the recording the reload is racing against."""
+        with self._lock:
+            self._last_activity = self._clock()
+            if self._recording_start is None or self._recording_sec is not None:
+                return
+            self._recording_sec = self._clock() - self._recording_start
+        self._maybe_report()
+
+    def _on_reload_done(self, success: bool, elapsed: float):
+        with self._lock:
+            if self._reload_start is None:
+                return
+            self._reload_sec = elapsed
+            self._reload_ok = success
+        self._maybe_report()
+
+    def _maybe_report(self):
+        """Log reload vs recording time once both are known."""
+        with self._lock:
+            if self._reload_sec is None or self._recording_sec is None:
+                return
+            reload_sec, recording_sec, ok = self._reload_sec, self._recording_sec, self._reload_ok
+            hidden = ok and reload_sec <= recording_sec
+            self.reloads += 1
+            self.hidden_reloads += hidden
+            self._reload_start = self._recording_start = None
+            self._reload_sec = self._recording_sec = None
+            rate = self.hidden_reloads / self.reloads
+        logger.info("IDLE_RELOAD | reload=%.2fs | recording=%.2fs | hidden=%s | success=%s | hidden_rate=%.2f",
+                    reload_sec, recording_sec, hidden, ok, rate)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "unloads": self.unloads,
+                "reloads": self.reloads,
+                "hidden_reloads": self.hidden_reloads,
+                "hidden_rate": self.hidden_reloads / self.reloads if self.reloads else 0.0,
+            }
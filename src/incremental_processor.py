@@ -0,0 +1,114 @@
+"""Incremental post-processing of a growing transcript.
+
+A live preview shows the text decoded so far while recording continues.
+Running the whole post-processing pipeline over the full text on every
+update costs O(n^2) over a dictation; IncrementalTextProcessor keeps the
+processed text of finished sentences and reprocesses only the tail after
+the last stable sentence boundary.
+
+A boundary becomes stable (committed) when the text after it, processed
+on its own, comes out exactly as it did in context: nothing before the
+boundary influences what follows. Committed output is reused as is.
+
+Stages like the punctuation model may still change earlier sentences as
+more context arrives, so the final text always comes from one full
+process() run (finish()), identical to non-incremental processing.
+"""
+import logging
+from typing import List, Optional, Tuple
+
+from text_tokens import SENTENCE_END, Token, serialize, tokenize
+
+logger = logging.getLogger("transkribator")
+
+MIN_TAIL_WORDS = 3  # a sentence end this close to the end may still move
+
+
+class IncrementalTextProcessor:
+    """Post-processes append-only partial transcripts with a reused prefix."""
+
+    def __init__(self, processor, min_tail_words: int = MIN_TAIL_WORDS):
+        """
+        Args:
+            processor: Text processor with process(text) (EnhancedTextProcessor)
+            min_tail_words: Processed words that must follow a sentence end
+                            before it can be committed
+        """
+        self.processor = processor
+        self.min_tail_words = min_tail_words
+        self.reset()
+
+    def reset(self):
+        """Forget the committed prefix (e.g. a new recording starts)."""
+        self._raw_words: List[str] = []      # committed raw words
+        self._output = ""                    # their processed text
+        self._last_tail_out = ""             # processed text after the prefix
+        self._last: Optional[Tuple[str, str]] = None  # (raw text, result) of the last update
+        self.processed_words = 0             # raw words run through process(), for stats
+
+    @property
+    def committed_words(self) -> int:
+        """Raw words whose processed text is reused."""
+        return len(self._raw_words)
+
+    def update(self, text: str) -> str:
+        """Processed preview of the partial transcript text.
+
+        Text that doesn't extend the committed prefix (a revised
+        hypothesis) starts over.
+        """
+        if self._last is not None and self._last[0] == text:
+            return self._last[1]
+        words = text.split()
+        n = len(self._raw_words)
+        if words[:n] != self._raw_words:
+            logger.debug("INCREMENTAL_RESET | committed_words=%d", n)
+            self.reset()
+            n = 0
+        tail = words[n:]
+        tail_out = self._process(tail)
+        self._commit(tail, tail_out)
+        result = self._join(self._output, self._last_tail_out)
+        self._last = (text, result)
+        return result
+
+    def finish(self, text: str) -> str:
+        """Final text: one full process() run, then the state is reset."""
+        self.reset()
+        return self.processor.process(text)
+
+    def _process(self, words: List[str]) -> str:
+        self.processed_words += len(words)
+        return self.processor.process(" ".join(words)) if words else ""
+
+    @staticmethod
+    def _join(left: str, right: str) -> str:
+        return f"{left} {right}" if left and right else left or right
+
+    def _commit(self, tail: List[str], tail_out: str):
+        """Move the finished sentences of the tail into the committed prefix."""
+        self._last_tail_out = tail_out
+        out_tokens = tokenize(tail_out)
+        boundary = self._last_boundary(out_tokens)
+        if boundary is None:
+            return
+        rest_out = serialize(out_tokens[boundary:])
+        rest_len = len(out_tokens) - boundary
+        # Align the rest from the end first: corrections that change the word
+        # count are likelier in the long committed part than in the short rest
+        for k in dict.fromkeys((len(tail) - rest_len, boundary)):
+            if 0 < k < len(tail) and self._process(tail[k:]) == rest_out:
+                self._raw_words.extend(tail[:k])
+                self._output = self._join(self._output, serialize(out_tokens[:boundary]))
+                self._last_tail_out = rest_out
+                logger.debug("INCREMENTAL_COMMIT | committed_words=%d | tail_words=%d",
+                             len(self._raw_words), len(tail) - k)
+                return
+
+    def _last_boundary(self, tokens: List[Token]) -> Optional[int]:
+        """Index of the token starting the last sentence that leaves at least
+        min_tail_words tokens, or None."""
+        for i in range(len(tokens) - self.min_tail_words, 0, -1):
+            if tokens[i - 1].last_char() in SENTENCE_END:
+                return i
+        return None
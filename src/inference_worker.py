@@ -0,0 +1,325 @@
+"""Out-of-process inference worker.
+
+ONNX Runtime and torch calls cannot be interrupted from Python, and a native
+crash inside them kills the whole process. ProcessBackend hosts any backend
+in a persistent child process instead:
+
+- the model is loaded once in the child and stays loaded across requests
+- audio is handed over through multiprocessing.shared_memory (the child maps
+  the parent's buffer, nothing is pickled)
+- results and progress messages come back over a Pipe
+- cancellation is cooperative first (the child's cancel_event), then hard:
+  on timeout or a stuck cancel the child is killed and respawned
+"""
+import logging
+import multiprocessing as mp
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from backends.base import BaseBackend
+
+logger = logging.getLogger("transkribator")
+
+POLL_INTERVAL_SEC = 0.05
+CANCEL_GRACE_SEC = 2.0        # wait for a cooperative cancel before killing
+START_TIMEOUT_SEC = 120.0     # child start + model load
+MIN_REQUEST_TIMEOUT_SEC = 60.0
+REQUEST_TIMEOUT_RATIO = 2.0   # auto timeout = max(MIN, ratio * audio duration)
+
+
+def _worker_main(conn, backend_class, backend_kwargs):
+    """Child process entry point: serve requests until "stop" or EOF."""
+    cancel_event = threading.Event()
+    send_lock = threading.Lock()
+
+    def send(msg):
+        with send_lock:
+            conn.send(msg)
+
+    backend = backend_class(on_progress=lambda m: send(("progress", m)), **backend_kwargs)
+    requests = []
+    has_request = threading.Condition()
+
+    def reader():
+        # Separate thread so "cancel" is seen while a request is running
+        while True:
+            try:
+                msg = conn.recv()
+            except (EOFError, OSError):
+                msg = ("stop",)
+            if msg[0] == "cancel":
+                cancel_event.set()
+                continue
+            with has_request:
+                requests.append(msg)
+                has_request.notify()
+            if msg[0] == "stop":
+                return
+
+    threading.Thread(target=reader, daemon=True).start()
+
+    while True:
+        with has_request:
+            while not requests:
+                has_request.wait()
+            msg = requests.pop(0)
+        op = msg[0]
+        if op == "stop":
+            break
+        try:
+            if op == "load":
+                backend.load_model()
+                send(("loaded", None))
+            elif op == "transcribe":
+                _, request_id, shm_name, shape, dtype, sample_rate = msg
+                cancel_event.clear()
+                shm = shared_memory.SharedMemory(name=shm_name)
+                try:
+                    audio = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+                    text, elapsed = backend.transcribe(audio, sample_rate, cancel_event=cancel_event)
+                    del audio  # release the view before closing the mapping
+                finally:
+                    shm.close()
+                attrs = {"last_used_fallback": getattr(backend, "last_used_fallback", False)}
+                send(("result", request_id, text, elapsed, attrs))
+        except Exception as e:
+            if op == "transcribe":
+                send(("error", msg[1], f"{type(e).__name__}: {e}"))
+            else:
+                send(("error", None, f"{type(e).__name__}: {e}"))
+    try:
+        backend.unload_model()
+    except Exception:
+        pass
+
+
+class WorkerError(Exception):
+    """The worker process failed, died or timed out."""
+
+
+class ProcessBackend(BaseBackend):
+    """Runs another backend in a persistent child process."""
+
+    def __init__(
+        self,
+        backend_class: type,
+        backend_kwargs: Optional[dict] = None,
+        on_progress: Optional[Callable[[str], None]] = None,
+        request_timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            backend_class: Backend class to host (must be importable by the child)
+            backend_kwargs: Constructor kwargs for backend_class (picklable,
+                without on_progress)
+            on_progress: Callback for progress messages forwarded from the child
+            request_timeout: Per-request timeout in seconds (None = scale with audio)
+        """
+        kwargs = dict(backend_kwargs or {})
+        super().__init__(
+            kwargs.get("model_size", "base"), kwargs.get("device", "auto"),
+            kwargs.get("compute_type", "auto"), kwargs.get("language", "auto"), on_progress,
+        )
+        self.backend_class = backend_class
+        self.backend_kwargs = kwargs
+        self.request_timeout = request_timeout
+        self.last_used_fallback = False
+        self.restarts = 0
+
+        self._ctx = mp.get_context("spawn")  # fork is unsafe with Qt/ONNX threads
+        self._process = None
+        self._conn = None
+        self._loaded = False
+        self._request_id = 0
+        self._lock = threading.Lock()  # one request at a time
+
+    # --- process lifecycle -------------------------------------------------
+
+    def _spawn(self):
+        parent_conn, child_conn = self._ctx.Pipe()
+        self._process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.backend_class, self.backend_kwargs),
+            name=f"inference-{self.backend_class.__name__}",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self._loaded = False
+        logger.info("INFERENCE_WORKER_START | backend=%s | pid=%s",
+                    self.backend_class.__name__, self._process.pid)
+
+    def _kill(self, reason: str):
+        """Hard-stop the child; the next request spawns a new one."""
+        if self._process is None:
+            return
+        pid = self._process.pid
+        if self._process.is_alive():
+            self._process.kill()
+        self._process.join(timeout=5)
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+        self._loaded = False
+        logger.warning("INFERENCE_WORKER_KILLED | pid=%s | reason=%s", pid, reason)
+
+    def _respawn(self, reason: str):
+        """Kill the child and start loading a fresh one in the background."""
+        self._kill(reason)
+        self.restarts += 1
+        self._spawn()
+        self._conn.send(("load",))  # reply consumed by the next _ensure_loaded
+
+    def _alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def _wait_reply(self, expected: str, timeout: float, cancel_event=None, request_id=None):
+        """Wait for a reply, forwarding progress and discarding stale results.
+
+        Returns:
+            The reply tuple
+
+        Raises:
+            WorkerError: On timeout, child death or an error reply
+        """
+        deadline = time.monotonic() + timeout
+        cancel_sent_at = None
+        while True:
+            if cancel_event is not None and cancel_event.is_set() and cancel_sent_at is None:
+                self._conn.send(("cancel",))
+                cancel_sent_at = time.monotonic()
+            if cancel_sent_at is not None and time.monotonic() - cancel_sent_at > CANCEL_GRACE_SEC:
+                self._respawn("cancel_timeout")
+                raise WorkerError("Cancelled (worker restarted)")
+            if time.monotonic() > deadline:
+                self._respawn(f"{expected}_timeout")
+                raise WorkerError(f"Worker timed out after {timeout:.0f}s")
+
+            try:
+                ready = self._conn.poll(POLL_INTERVAL_SEC)
+            except (EOFError, OSError):
+                ready = True
+            if not ready:
+                if not self._alive():
+                    self._respawn("died")
+                    raise WorkerError("Worker process died")
+                continue
+            try:
+                msg = self._conn.recv()
+            except (EOFError, OSError):
+                self._respawn("died")
+                raise WorkerError("Worker process died")
+
+            if msg[0] == "progress":
+                if self.on_progress:
+                    self.on_progress(msg[1])
+                continue
+            if msg[0] == "loaded" and expected != "loaded":
+                self._loaded = True  # background reload after a restart
+                continue
+            if msg[0] in ("result", "error") and request_id is not None and msg[1] != request_id:
+                continue  # reply to an abandoned request
+            if msg[0] == "error":
+                raise WorkerError(msg[2])
+            if msg[0] == expected:
+                return msg
+
+    def _ensure_loaded(self):
+        if not self._alive():
+            self._spawn()
+            self._conn.send(("load",))
+        if not self._loaded:
+            t0 = time.time()
+            self._wait_reply("loaded", START_TIMEOUT_SEC)
+            self._loaded = True
+            logger.info("INFERENCE_WORKER_LOADED | backend=%s | elapsed=%.2fs",
+                        self.backend_class.__name__, time.time() - t0)
+
+    # --- BaseBackend -------------------------------------------------------
+
+    def load_model(self):
+        with self._lock:
+            self._ensure_loaded()
+
+    def unload_model(self):
+        """Stop the child process; all model memory goes with it."""
+        with self._lock:
+            # A child still booting (e.g. after a restart) has no state worth a clean stop
+            if self._alive() and self._loaded:
+                try:
+                    self._conn.send(("stop",))
+                    self._process.join(timeout=5)
+                except OSError:
+                    pass
+            if self._alive():
+                self._kill("unload")
+            elif self._process is not None:
+                self._conn.close()
+                logger.info("INFERENCE_WORKER_STOPPED | pid=%s", self._process.pid)
+                self._process = None
+                self._conn = None
+                self._loaded = False
+
+    def is_model_loaded(self) -> bool:
+        return self._alive() and self._loaded
+
+    @property
+    def worker_pid(self) -> Optional[int]:
+        """PID of the child holding the model (its RSS is the model footprint)."""
+        return self._process.pid if self._alive() else None
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        sample_rate: int = 16000,
+        cancel_event=None
+    ) -> Tuple[str, float]:
+        """Transcribe in the child process.
+
+        Raises:
+            WorkerError: If the worker fails, dies, times out or is cancelled
+        """
+        self.last_used_fallback = False
+        if cancel_event is not None and cancel_event.is_set():
+            return "", 0.0
+
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        timeout = self.request_timeout or max(
+            MIN_REQUEST_TIMEOUT_SEC, REQUEST_TIMEOUT_RATIO * len(audio) / sample_rate
+        )
+        with self._lock:
+            self._ensure_loaded()
+            shm = shared_memory.SharedMemory(create=True, size=max(audio.nbytes, 1))
+            try:
+                np.ndarray(audio.shape, dtype=audio.dtype, buffer=shm.buf)[...] = audio
+                self._request_id += 1
+                self._conn.send(("transcribe", self._request_id, shm.name, audio.shape,
+                                 audio.dtype.str, sample_rate))
+                _, _, text, elapsed, attrs = self._wait_reply(
+                    "result", timeout, cancel_event=cancel_event, request_id=self._request_id
+                )
+            finally:
+                shm.close()
+                shm.unlink()
+        self.last_used_fallback = attrs.get("last_used_fallback", False)
+        return text, elapsed
+
+    def get_model_info(self) -> dict:
+        info = super().get_model_info()
+        info["backend"] = f"{self.backend_class.__name__} (out-of-process)"
+        info["worker_pid"] = self._process.pid if self._alive() else None
+        info["worker_restarts"] = self.restarts
+        return info
+
+    @property
+    def backend_name(self) -> str:
+        class_name = self.backend_class.__name__
+        if class_name.endswith('Backend'):
+            class_name = class_name[:-7]
+        return class_name.lower()
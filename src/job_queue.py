@@ -0,0 +1,126 @@
+"""Priority job queue for the persistent transcription worker.
+
+Qt-free so it can be tested without a QApplication. Live dictation is served
+ahead of retries and background jobs; every job carries its own cancellation
+token, so cancelling one job never affects another.
+"""
+import itertools
+import queue
+import threading
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Dict, Optional
+
+
+class JobPriority(IntEnum):
+    """Lower value is served first."""
+    LIVE = 0        # dictation the user is waiting for
+    RETRY = 1       # re-run of the last clip
+    BACKGROUND = 2  # anything nobody is waiting for
+
+
+class CancelToken:
+    """Per-job cancellation flag (wraps a threading.Event)."""
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def cancel(self):
+        self.event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.event.is_set()
+
+
+@dataclass(order=True)
+class Job:
+    """A unit of work; ordered by (priority, submission order)."""
+    priority: JobPriority
+    seq: int
+    job_id: int = field(compare=False)
+    payload: Any = field(compare=False)
+    token: CancelToken = field(compare=False, default_factory=CancelToken)
+
+
+class JobQueue:
+    """Thread-safe priority queue of Jobs with per-job cancellation."""
+
+    def __init__(self):
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self._jobs: Dict[int, Job] = {}  # submitted and not yet finished
+        self._closed = False
+
+    def submit(self, payload: Any, priority: JobPriority = JobPriority.LIVE) -> Job:
+        """Queue a job and return it (job.token cancels it).
+
+        Raises:
+            RuntimeError: If the queue has been closed
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Job queue is closed")
+            n = next(self._counter)
+            job = Job(JobPriority(priority), n, n, payload)
+            self._jobs[job.job_id] = job
+        self._queue.put(job)
+        return job
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Job]:
+        """Next job that has not been cancelled, or None when closed/timed out."""
+        while True:
+            try:
+                job = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            if isinstance(job, _Sentinel):
+                self._queue.put(job)  # keep later get() calls returning None
+                return None
+            if job.token.cancelled:
+                self.finish(job)
+                continue
+            return job
+
+    def finish(self, job: Job):
+        """Forget a job once the worker is done with it."""
+        with self._lock:
+            self._jobs.pop(job.job_id, None)
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a queued or running job. Returns False if it is unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        job.token.cancel()
+        return True
+
+    def cancel_all(self, max_priority: JobPriority = JobPriority.BACKGROUND):
+        """Cancel every job with priority value <= max_priority."""
+        with self._lock:
+            jobs = [j for j in self._jobs.values() if j.priority <= max_priority]
+        for job in jobs:
+            job.token.cancel()
+
+    def close(self):
+        """Cancel everything and wake the worker so it can exit."""
+        with self._lock:
+            self._closed = True
+        self.cancel_all()
+        self._queue.put(_Sentinel())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+
+class _Sentinel:
+    """Shutdown marker that sorts ahead of every Job."""
+
+    def __lt__(self, other):
+        return True
+
+    def __gt__(self, other):
+        return False
@@ -25,6 +25,7 @@ from PyQt6 import sip
 from config import Config, MODEL_METADATA
 from audio_recorder import AudioRecorder
 from transcriber import Transcriber, get_available_backends
+from backends.model_manager import get_model_manager
 from crash_reporter import get_reporter
 from notifier import TelegramNotifier
 from quality_monitor import QualityMonitor
@@ -32,6 +33,13 @@ from hotkeys import HotkeyManager, type_text, safe_paste_text, paste_from_clipbo
 from history_manager import HistoryManager
 from mouse_handler import MouseButtonHandler
 from remote_client import RemoteTranscriptionClient
+from hedging import HedgedExecutor, HedgePath, HedgingPolicy
+from job_queue import Job, JobPriority, JobQueue
+from idle_policy import IdleUnloadPolicy
+from warmup import ComponentWarmup, WarmupStatus
+from stage_timing import get_stage_timings, stage
+from tracing import get_tracer
+from profiling import configure_profiler
 from widgets import (
     COLORS, COLORS_HEX, COMPACT_HEIGHT, COMPACT_WIDTH,
     RecordButton, CopyButton, SettingsButton, CloseButton, CancelButton,
@@ -84,110 +92,132 @@ class TranscriptionThread(QThread):
         self._is_cancelled = True
 
 
-class HybridTranscriptionThread(QThread):
-    """Thread for hybrid transcription: LOCAL first, then remote fallback.
+class TranscriptionWorker(QThread):
+    """Long-lived worker serving transcription jobs from a priority queue.
 
-    Strategy:
-    1. Try local transcription (Sherpa) first with timeout
-    2. If local fails or takes >20 seconds, try remote
-    3. If remote also fails, return error
+    Created once at startup. Each job is hybrid: the local transcriber runs
+    first and the remote server is started as a hedge once local exceeds its
+    p95 latency (or fails); the first non-empty result wins.
     """
-    transcription_done = pyqtSignal(str, float, bool)  # text, duration, is_remote
-    transcription_error = pyqtSignal(str)
+    job_done = pyqtSignal(int, str, float, bool)  # job_id, text, duration, is_remote
+    job_error = pyqtSignal(int, str)  # job_id, message
+    job_partial = pyqtSignal(int, object)  # job_id, TranscriptionCheckpoint; sent before job_done
+
+    # The local path stops this long before the hedger gives up on it, so
+    # the chunks decoded by then are returned instead of timing out
+    LOCAL_DEADLINE_MARGIN_SEC = 1.0
 
-    def __init__(self, remote_client, transcriber, audio, sample_rate: int, enable_remote: bool = False):
+    def __init__(self, remote_client, transcriber, hedger: HedgedExecutor, enable_remote=lambda: False):
         super().__init__()
         self.remote_client = remote_client
         self.transcriber = transcriber
-        self.audio = audio
-        self.sample_rate = sample_rate
-        self._is_cancelled = False
-        self._enable_remote = enable_remote  # Allow disabling remote fallback
-        # Dynamic timeout: min 30s, or 40% of audio duration (for chunked processing)
-        audio_duration_sec = len(audio) / sample_rate
-        self._local_timeout = max(30.0, audio_duration_sec * 0.4)
+        self.queue = JobQueue()
+        self._hedger = hedger
+        self._enable_remote = enable_remote  # read per job so settings changes apply
+
+    def submit(self, audio, sample_rate: int, priority: JobPriority = JobPriority.LIVE, session=None,
+               trace_id=None, checkpoint=None) -> Job:
+        """Queue a clip; the returned job's token cancels it.
+
+        session is a speculative segment session (Transcriber.stop_segmented)
+        whose segments were already decoded while recording. trace_id is the
+        dictation trace the job's spans belong to (tracing.get_tracer()).
+        checkpoint (from job_partial) resumes an earlier job of the same clip
+        that hit its deadline.
+        """
+        get_tracer().instant("job_queued", trace_id, priority=int(priority))
+        return self.queue.submit((audio, sample_rate, session, trace_id, checkpoint), priority)
 
-    def run(self):
-        try:
-            if self._is_cancelled:
-                return
+    def stop(self, wait_ms: int = 2000):
+        """Cancel all jobs and let run() return."""
+        self.queue.close()
+        if self.isRunning():
+            self.wait(wait_ms)
 
-            # === STEP 1: Try LOCAL transcription first ===
-            local_start = time.time()
-            try:
-                # Use threading.Timer to implement timeout
-                import concurrent.futures
-
-                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(
-                        self.transcriber.transcribe,
-                        self.audio,
-                        self.sample_rate
-                    )
+    def _build_paths(self, audio, sample_rate: int, session=None, trace_id=None, checkpoint=None):
+        """Paths in priority order: local transcriber, then remote server.
 
-                    try:
-                        # Wait for local transcription with timeout
-                        text, duration = future.result(timeout=self._local_timeout)
-
-                        if not self._is_cancelled and text:
-                            # Local transcription successful!
-                            self.transcription_done.emit(text, duration, False)  # is_remote=False
-                            return
-
-                    except concurrent.futures.TimeoutError:
-                        # Local transcription took too long - cancel and try remote
-                        future.cancel()
-                        self.transcriber.cancel()
-                        logger.debug("Local transcription timeout (%.1fs)", self._local_timeout)
-                        raise Exception("Local transcription timeout")
-
-            except Exception as local_error:
-                # Local transcription failed - try remote fallback
-                if not self._is_cancelled:
-                    logger.debug("Local transcription failed: %s", local_error)
-                    logger.debug("Trying remote fallback...")
-
-            # === STEP 2: Try REMOTE transcription as fallback (if enabled) ===
-            if not self._is_cancelled and self._enable_remote:
-                try:
-                    remote_start = time.time()
-                    text = self.remote_client.transcribe_remote(
-                        self.audio,
-                        self.sample_rate
+        Each path returns (text, duration, checkpoint); checkpoint is set
+        when the local path stopped at its deadline with chunks left.
+        """
+        tracer = get_tracer()
+        timeout_sec = self._hedger.policy.legacy_delay(len(audio) / sample_rate) - self.LOCAL_DEADLINE_MARGIN_SEC
+
+        def run_local(cancel_event):
+            with tracer.bind(trace_id), tracer.span("local_path"):
+                if session is not None:
+                    text, duration = self.transcriber.finish_segmented(session, audio)
+                    if text or cancel_event.is_set():
+                        return text, duration, None
+                    logger.debug("Speculative segments gave no text, decoding full clip")
+                if checkpoint is not None:
+                    partial = self.transcriber.resume(checkpoint, timeout_sec, cancel_event=cancel_event)
+                else:
+                    partial = self.transcriber.transcribe_with_deadline(
+                        audio, sample_rate, timeout_sec, cancel_event=cancel_event
                     )
-                    duration = time.time() - remote_start
+                return partial.text, partial.elapsed, partial.checkpoint
 
-                    if not self._is_cancelled and text:
-                        # Remote transcription successful (fallback)
-                        self.transcription_done.emit(text, duration, True)  # is_remote=True
-                        return
-                    else:
-                        raise Exception("Remote transcription returned empty text")
+        def run_remote(cancel_event):
+            with tracer.bind(trace_id), tracer.span("remote_path"):
+                remote_start = time.time()
+                text = self.remote_client.transcribe_remote(audio, sample_rate, cancel_event=cancel_event)
+                return text, time.time() - remote_start, None
 
-                except Exception as remote_error:
-                    # Both local and remote failed
-                    if not self._is_cancelled:
-                        logger.debug("Remote transcription also failed: %s", remote_error)
-                        self.transcription_error.emit(f"Local and remote failed: {remote_error}")
+        def cancel_local():
+            # The path's own event already stops transcribe(); the session
+            # belongs to this job only
+            if session is not None:
+                self.transcriber.cancel_segmented(session)
 
-            # === Remote fallback disabled or not available ===
-            elif not self._is_cancelled:
-                logger.debug("Local transcription failed, remote fallback disabled")
-                self.transcription_error.emit("Local transcription failed. Enable remote fallback in settings if needed.")
+        paths = [HedgePath(self.transcriber.backend_name, run_local, cancel=cancel_local)]
+        if self._enable_remote():
+            paths.append(HedgePath("remote", run_remote))
+        return paths
 
-        except Exception as e:
-            if not self._is_cancelled:
-                logger.debug("HybridTranscriptionThread error: %s", e)
-                self.transcription_error.emit(str(e))
-
-    def cancel(self):
-        self._is_cancelled = True
+    def run(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            audio, sample_rate, session, trace_id, checkpoint = job.payload
+            remote = self._enable_remote()
+            try:
+                with get_tracer().span("worker_job", trace_id, job_id=job.job_id):
+                    result = self._hedger.run(
+                        self._build_paths(audio, sample_rate, session, trace_id, checkpoint),
+                        audio_sec=len(audio) / sample_rate,
+                        is_acceptable=lambda r: bool(r and r[0]),
+                        cancel_event=job.token.event,
+                    )
+                if not job.token.cancelled:
+                    text, duration, checkpoint = result.value
+                    if checkpoint is not None:
+                        logger.info("JOB_PARTIAL | job=%d | completeness=%.0f%%",
+                                    job.job_id, checkpoint.completeness * 100)
+                        self.job_partial.emit(job.job_id, checkpoint)
+                    get_tracer().instant("job_done_emit", trace_id, path=result.path)
+                    self.job_done.emit(job.job_id, text, duration, result.path == "remote")
+            except Exception as e:
+                if not job.token.cancelled:
+                    if remote:
+                        logger.debug("Local and remote transcription failed: %s", e)
+                        self.job_error.emit(job.job_id, f"Local and remote failed: {e}")
+                    elif isinstance(e, TimeoutError):
+                        logger.debug("Local transcription timeout, remote fallback disabled: %s", e)
+                        self.job_error.emit(job.job_id, "Local transcription timeout. Enable remote fallback in settings if needed.")
+                    else:
+                        logger.debug("Local transcription failed, remote fallback disabled: %s", e)
+                        self.job_error.emit(job.job_id, "Local transcription failed. Enable remote fallback in settings if needed.")
+            finally:
+                self.queue.finish(job)
 
 
 class MainWindow(QMainWindow):
     status_update = pyqtSignal(str)
+    warmup_update = pyqtSignal(object)  # WarmupStatus of post-processing components
     audio_level_update = pyqtSignal(float)
-    _request_toggle = pyqtSignal()  # Thread-safe signal for hotkey/mouse callbacks
+    _request_toggle = pyqtSignal(str, float)  # trigger, press time (tracer clock); hotkey/mouse callbacks
 
     def __init__(self):
         super().__init__()
@@ -207,6 +237,7 @@ class MainWindow(QMainWindow):
         self.recorder.auto_stop_silence_sec = self.config.auto_stop_silence_sec
         self.recorder.on_auto_stop = self._on_auto_stop
 
+        configure_profiler(self.config.profile_transcription)
         self.transcriber = Transcriber(
             backend=self.config.backend,
             model_size=self.config.model_size,
@@ -222,6 +253,23 @@ class MainWindow(QMainWindow):
             min_speech_duration_ms=self.config.min_speech_duration_ms,
             # User dictionary
             user_dictionary=self.config.user_dictionary,
+            # Podlodka assisted decoding (per quality profile)
+            assistant_model=self.config.podlodka_assistant_model or None,
+            # Out-of-process inference
+            out_of_process=self.config.out_of_process_inference,
+            worker_timeout_sec=self.config.inference_timeout_sec or None,
+            # Retries of unchanged audio/settings are served from cache
+            result_cache_size=self.config.result_cache_size,
+            # Previous backends stay loaded within this budget
+            model_ram_budget_mb=self.config.model_ram_budget_mb,
+        )
+
+        # Unload models when dictation pauses for long; reload on next recording
+        self.idle_policy = IdleUnloadPolicy(
+            idle_minutes=self.config.idle_unload_minutes,
+            unload=self.transcriber.trim_memory,
+            preload=self._idle_preload,
+            is_loaded=lambda: self.transcriber.is_loaded,
         )
 
         self.hotkey_manager = HotkeyManager(on_hotkey=self._on_hotkey)
@@ -230,6 +278,11 @@ class MainWindow(QMainWindow):
 
         # Initialize remote transcription client
         self.remote_client = RemoteTranscriptionClient()
+        # Shared across utterances: keeps per-path latency history and win counts
+        self.hedger = HedgedExecutor(HedgingPolicy(
+            enabled=self.config.hedging_enabled,
+            min_delay_sec=self.config.hedge_min_delay_sec,
+        ))
 
         # Initialize mouse button handler
         self.mouse_handler = MouseButtonHandler(
@@ -237,7 +290,14 @@ class MainWindow(QMainWindow):
             on_click=self._on_mouse_click
         )
 
-        self._thread: Optional[TranscriptionThread] = None
+        # Single long-lived transcription worker (started once, below)
+        self._worker = TranscriptionWorker(
+            self.remote_client,
+            self.transcriber,
+            self.hedger,
+            enable_remote=lambda: getattr(self.config, 'enable_remote_fallback', False),
+        )
+        self._current_job: Optional[Job] = None
         self._rec_start = 0.0
         self._rec_duration = 0.0  # Длительность записи
         self._transcription_start = 0.0  # Время начала транскрибации
@@ -245,11 +305,14 @@ class MainWindow(QMainWindow):
         self._settings = None
         self._recording = False
         self._processing = False  # Защита от повторных вызовов во время обработки
+        self._trace_id = None  # Dictation trace (tracing.get_tracer(), None when disabled); Qt thread only
+        self._toggle_press = None  # (trigger, press time) of the toggle being handled
         self._last_toggle_time = 0.0  # Для debounce
         self._last_text = ""
         self._hover = False
         self._shutting_down = False  # Флаг для безопасного завершения
         self._starting = False  # Guard against double start press
+        self._warmup: Optional[ComponentWarmup] = None  # Post-processing warmup (after model load)
 
         self._setup_ui()
         self._setup_tray()
@@ -386,6 +449,12 @@ class MainWindow(QMainWindow):
         self._rec_timer = QTimer()
         self._rec_timer.timeout.connect(self._update_timer)
 
+        # Idle unload check
+        self._idle_timer = QTimer()
+        self._idle_timer.timeout.connect(self._check_idle)
+        if self.idle_policy.enabled:
+            self._idle_timer.start(30_000)
+
     def _set_corner_opacity(self, opacity: float):
         for btn in self._corner_btns:
             btn.set_opacity(opacity)
@@ -439,6 +508,7 @@ class MainWindow(QMainWindow):
         self._text_popup.text_discarded.connect(self._on_popup_discarded)
         self._text_popup.hide()
         self._last_audio = None  # Cached audio for retry
+        self._last_checkpoint = None  # Where a partial result of _last_audio stopped
 
     def _copy_from_popup(self):
         """Копировать текст из всплывающей панели."""
@@ -487,18 +557,9 @@ class MainWindow(QMainWindow):
         self.status_label.setText("Обработка...")
         self.status_label.show()
         self._transcription_start = time.time()
-        self._cleanup_thread()
-        self._thread = HybridTranscriptionThread(
-            self.remote_client,
-            self.transcriber,
-            self._last_audio,
-            self.config.sample_rate,
-            enable_remote=getattr(self.config, 'enable_remote_fallback', False)
-        )
-        self._thread.transcription_done.connect(self._done)
-        self._thread.transcription_error.connect(self._error)
-        self._thread.finished.connect(self._on_thread_finished)
-        self._thread.start()
+        # A clip that hit its deadline continues from where it stopped
+        checkpoint, self._last_checkpoint = self._last_checkpoint, None
+        self._submit_job(self._last_audio, JobPriority.RETRY, checkpoint=checkpoint)
         logger.debug("_retry_transcription(): retry started")
 
     def _show_text_popup(self, text: str):
@@ -531,7 +592,7 @@ class MainWindow(QMainWindow):
         """Called from audio thread when silence exceeds auto_stop threshold."""
         try:
             if not self._shutting_down and self._recording:
-                self._request_toggle.emit()
+                self._request_toggle.emit("auto_stop", get_tracer().now_us())
         except RuntimeError:
             pass
 
@@ -562,49 +623,110 @@ class MainWindow(QMainWindow):
 
     def _connect_signals(self):
         self.status_update.connect(self._set_status)
+        self.warmup_update.connect(self._on_warmup_status)
         self.audio_level_update.connect(self._set_level)
         # Connect toggle signal for thread-safe hotkey/mouse callbacks
         # This ensures _toggle_recording runs in the main Qt thread
-        self._request_toggle.connect(self._toggle_recording, Qt.ConnectionType.QueuedConnection)
+        self._request_toggle.connect(self._on_toggle_request, Qt.ConnectionType.QueuedConnection)
+        # Persistent transcription worker: wired and started once for the app lifetime
+        self._worker.job_done.connect(self._on_job_done)
+        self._worker.job_error.connect(self._on_job_error)
+        self._worker.job_partial.connect(self._on_job_partial)
+        self._worker.start()
 
     def _load_model(self):
         def _load_with_status():
             self.status_update.emit("Загрузка модели...")
             success = self.transcriber.load_model()
             self.status_update.emit("Готово" if success else "Ошибка загрузки")
+            if success:
+                self._start_warmup()
         threading.Thread(target=_load_with_status, daemon=True).start()
 
-    def _cleanup_thread(self):
-        """Safely cleanup the transcription thread."""
-        if self._thread is not None:
-            try:
-                # Cancel thread to prevent signal emission
-                self._thread.cancel()
-                # Disconnect signals to prevent callbacks to deleted objects
-                try:
-                    self._thread.transcription_done.disconnect()
-                    self._thread.transcription_error.disconnect()
-                    self._thread.finished.disconnect()
-                except (TypeError, RuntimeError):
-                    pass  # Already disconnected
-                # Wait for thread to finish (with timeout)
-                if self._thread.isRunning():
-                    self._thread.wait(2000)  # 2 second timeout
-                # Schedule for deletion
-                self._thread.deleteLater()
-            except RuntimeError:
-                pass  # Thread already deleted
-            self._thread = None
-
-    def _on_thread_finished(self):
-        """Called when QThread finishes (after run() completes)."""
-        # This is called from QThread.finished signal
-        # We schedule deleteLater here for safety
-        if self._thread is not None and not self._shutting_down:
-            try:
-                self._thread.deleteLater()
-            except RuntimeError:
-                pass
+    def _is_busy(self) -> bool:
+        return self._recording or self._starting or self._processing or self._current_job is not None
+
+    def _idle_preload(self, on_done) -> bool:
+        """Reload after an idle unload: the model, then the post-processing
+        components trim_memory() released."""
+        def _done(success: bool, elapsed: float):
+            on_done(success, elapsed)
+            if success:
+                self._start_warmup()
+        return self.transcriber.preload(_done)
+
+    def _start_warmup(self):
+        """Warm the post-processing components in the background, pausing
+        while the user records or a dictation is processed."""
+        if self._warmup is not None:
+            self._warmup.stop()
+        self._warmup = ComponentWarmup(
+            self.transcriber.warmup_steps(),
+            is_busy=self._is_busy,
+            on_change=self.warmup_update.emit,
+        )
+        self._warmup.start()
+
+    def _on_warmup_status(self, status: WarmupStatus):
+        done, total = status.progress
+        if status.ready:
+            tip = "Обработка текста готова"
+        else:
+            tip = f"Подготовка обработки текста ({done}/{total})"
+        self.tray.setToolTip(f"Transkribator — {tip}")
+        self.status_label.setToolTip(tip)
+        if self._is_busy():
+            return  # keep "Слушаю"/processing statuses
+        if status.ready:
+            if self.status_label.text().startswith("Подготовка"):
+                self._set_status("Готово")
+        elif status.state == "warming":
+            self._set_status(f"Подготовка… {done}/{total}")
+
+    def _submit_job(self, audio, priority: JobPriority, session=None, checkpoint=None):
+        """Queue audio on the persistent worker, superseding the current job."""
+        self._cancel_current_job()
+        if self._trace_id is None:
+            self._trace_id = get_tracer().start_trace("dictation", trigger=priority.name.lower())
+        self._current_job = self._worker.submit(audio, self.config.sample_rate, priority, session,
+                                                self._trace_id, checkpoint)
+
+    def _cancel_current_job(self):
+        """Cancel the job whose result the UI is waiting for (if any)."""
+        if self._current_job is not None:
+            self._current_job.token.cancel()
+            session = self._current_job.payload[2]
+            if session is not None:
+                self.transcriber.cancel_segmented(session)
+            self._current_job = None
+
+    def _check_idle(self):
+        busy = self._is_busy()
+        # Unloading can take a moment (GC, CUDA cache): keep it off the UI thread
+        threading.Thread(target=self.idle_policy.check, args=(busy,), daemon=True).start()
+
+    def _on_job_done(self, job_id: int, text: str, duration: float, is_remote: bool):
+        """Route worker results; results of superseded jobs are dropped."""
+        if self._current_job is None or job_id != self._current_job.job_id:
+            return
+        self._current_job = None
+        self.idle_policy.touch()
+        with get_tracer().span("done", self._trace_id):
+            self._done(text, duration, is_remote)
+
+    def _on_job_partial(self, job_id: int, checkpoint):
+        """Keep where the current job stopped; retry resumes from there."""
+        if self._current_job is None or job_id != self._current_job.job_id:
+            return
+        self._last_checkpoint = checkpoint
+        logger.info("PARTIAL_RESULT | completeness=%.0f%%", checkpoint.completeness * 100)
+
+    def _on_job_error(self, job_id: int, err: str):
+        if self._current_job is None or job_id != self._current_job.job_id:
+            return
+        self._current_job = None
+        self._error(err)
+        self._end_trace(error=True)
 
     def _on_audio_level(self, level):
         try:
@@ -645,7 +767,9 @@ class MainWindow(QMainWindow):
         """Called from hotkey thread - emit signal for thread-safe handling."""
         try:
             if not self._shutting_down:
-                self._request_toggle.emit()
+                # A stop press starts the latency the user notices: pass its time
+                # along, the trace itself is opened on the Qt thread
+                self._request_toggle.emit("hotkey", get_tracer().now_us())
         except RuntimeError:
             pass  # Widget destroyed
 
@@ -653,10 +777,18 @@ class MainWindow(QMainWindow):
         """Called from mouse handler thread - emit signal for thread-safe handling."""
         try:
             if not self._shutting_down:
-                self._request_toggle.emit()
+                self._request_toggle.emit("mouse", get_tracer().now_us())
         except RuntimeError:
             pass  # Widget destroyed
 
+    def _on_toggle_request(self, trigger: str, pressed_us: float):
+        """Qt-thread slot of _request_toggle."""
+        self._toggle_press = (trigger, pressed_us)
+        try:
+            self._toggle_recording()
+        finally:
+            self._toggle_press = None
+
     def _toggle_recording(self):
         # Защита от повторных вызовов во время обработки транскрибации
         if self._processing:
@@ -691,6 +823,17 @@ class MainWindow(QMainWindow):
             self.vad_level_bar.setValue(0)
 
         self._play_sound()  # Play BEFORE opening audio stream to avoid device conflict
+
+        # Models unloaded while idle start loading now, hidden behind the recording
+        self.idle_policy.on_recording_start()
+
+        # Speculative segments: decode closed segments while still recording
+        if self.config.speculative_segments:
+            self.transcriber.start_segmented(self.config.sample_rate)
+            self.recorder.on_audio_chunk = self.transcriber.feed_audio
+        else:
+            self.recorder.on_audio_chunk = None
+
         if self.recorder.start():
             self._recording = True
             self._rec_start = time.time()
@@ -712,6 +855,7 @@ class MainWindow(QMainWindow):
             logger.debug("_start() SUCCESS: recording started")
         else:
             self._starting = False
+            self.transcriber.cancel_segmented()
             logger.debug("_start() FAILED: recorder.start() returned False")
 
     def _stop(self):
@@ -724,8 +868,17 @@ class MainWindow(QMainWindow):
         # Сохраняем время записи
         self._rec_duration = time.time() - self._rec_start
 
-        audio = self.recorder.stop()
+        if self._trace_id is None:
+            # Backdated to the stop press when it came from a hotkey/mouse/auto-stop thread
+            trigger, pressed_us = self._toggle_press or ("stop", None)
+            self._trace_id = get_tracer().start_trace("dictation", start_us=pressed_us, trigger=trigger)
+        with get_tracer().bind(self._trace_id), stage("recorder_stop"):
+            audio = self.recorder.stop()
+        self.idle_policy.on_recording_stop()
         self._last_audio = audio  # Cache for retry
+        self._last_checkpoint = None
+        # Recorder has stopped feeding: queue the open tail, keep earlier segments
+        session = self.transcriber.stop_segmented()
         QTimer.singleShot(200, self._play_sound)  # 200ms for WASAPI to fully release device
 
         # Check audio quality and prepare warning header
@@ -751,6 +904,8 @@ class MainWindow(QMainWindow):
             if not self._hover:
                 self.status_label.hide()
             self._processing = False  # Разблокируем
+            self.transcriber.cancel_segmented(session)
+            self._end_trace(too_short=True)
             logger.debug("_stop(): audio too short, _processing set to False")
             return
 
@@ -758,23 +913,10 @@ class MainWindow(QMainWindow):
         self.status_label.show()  # Показываем статус при обработке
         self._transcription_start = time.time()  # Фиксируем начало транскрибации
 
-        # Cleanup previous thread if exists
-        self._cleanup_thread()
-
-        # Use hybrid transcription (LOCAL first, then remote fallback if enabled)
-        self._thread = HybridTranscriptionThread(
-            self.remote_client,
-            self.transcriber,
-            audio,
-            self.config.sample_rate,
-            enable_remote=getattr(self.config, 'enable_remote_fallback', False)
-        )
-        self._thread.transcription_done.connect(self._done)
-        self._thread.transcription_error.connect(self._error)
-        self._thread.finished.connect(self._on_thread_finished)  # QThread.finished for cleanup
-        self._thread.start()
+        # Live dictation goes ahead of any queued retry/background work
+        self._submit_job(audio, JobPriority.LIVE, session)
 
-        logger.debug("_stop(): transcription thread started, _processing=%s", self._processing)
+        logger.debug("_stop(): transcription job queued, _processing=%s", self._processing)
 
     def _cancel_recording(self):
         """Отменить запись без транскрибации."""
@@ -794,6 +936,9 @@ class MainWindow(QMainWindow):
 
         # Останавливаем рекордер
         self.recorder.stop()
+        self.idle_policy.on_recording_stop()
+        self.transcriber.cancel_segmented()
+        self._end_trace(cancelled=True)
 
         # Сбрасываем UI
         self.timer_label.hide()
@@ -896,7 +1041,11 @@ class MainWindow(QMainWindow):
 
         # Auto-paste immediately, then show popup for reference/editing
         if self.config.auto_paste:
-            QTimer.singleShot(100, lambda: self._type(text))
+            trace_id = self._trace_id
+            self._trace_id = None  # the next dictation may start before the paste
+            QTimer.singleShot(100, lambda: self._type(text, trace_id))
+        else:
+            self._end_trace()
         self._show_text_popup(text)
 
         logger.debug("_done() finished, _processing=%s", self._processing)
@@ -962,18 +1111,28 @@ class MainWindow(QMainWindow):
         self._text_popup.show_with_timeout(8000)
         self._text_popup.raise_()
 
-    def _type(self, text):
-        """Paste or type text based on config.paste_method."""
+    def _end_trace(self, **args):
+        """Close the current dictation trace (no-op when tracing is off)."""
+        get_tracer().end_trace(self._trace_id, **args)
+        self._trace_id = None
+
+    def _type(self, text, trace_id=None):
+        """Paste or type text based on config.paste_method.
+
+        trace_id: dictation trace to record the paste in and close
+        """
         try:
-            if self.config.paste_method == "clipboard":
-                # Safe method: copy to clipboard + Ctrl+Shift+V
-                # This doesn't crash terminal apps like Claude Code
-                safe_paste_text(text, use_terminal_shortcut=True, delay_before_paste=self.config.paste_delay)
-            else:
-                # Legacy method: type characters one by one (can crash Claude Code!)
-                type_text(text)
+            with get_tracer().bind(trace_id), stage("paste"):
+                if self.config.paste_method == "clipboard":
+                    # Safe method: copy to clipboard + Ctrl+Shift+V
+                    # This doesn't crash terminal apps like Claude Code
+                    safe_paste_text(text, use_terminal_shortcut=True, delay_before_paste=self.config.paste_delay)
+                else:
+                    # Legacy method: type characters one by one (can crash Claude Code!)
+                    type_text(text)
         except Exception as e:
             logger.warning("PASTE_TYPE_ERROR | %s", e)
+        get_tracer().end_trace(trace_id)
 
     def _set_status(self, msg):
         self.status_label.setText(msg)
@@ -1161,6 +1320,7 @@ class MainWindow(QMainWindow):
                 self.config.apply_quality_profile(profile)
 
                 # Update transcriber settings
+                self.transcriber.assistant_model = self.config.podlodka_assistant_model or None
                 self.transcriber.switch_backend(self.config.backend, self.config.model_size)
                 self.transcriber.vad_threshold = self.config.vad_threshold
                 self.transcriber.min_silence_duration_ms = self.config.min_silence_duration_ms
@@ -1347,12 +1507,29 @@ class MainWindow(QMainWindow):
             except Exception:
                 pass
 
-        # Cleanup transcription thread
-        self._cleanup_thread()
+        # Stop transcription worker
+        if self._warmup is not None:
+            self._warmup.stop()
+        self._idle_timer.stop()
+        self._cancel_current_job()
+        self._worker.stop()
+        self.hedger.shutdown()
+
+        # Keep this session's stage timings for offline analysis
+        try:
+            get_stage_timings().export_json(os.path.join(os.path.dirname(_log_dir), "stage_timings.json"))
+        except Exception as e:
+            logger.warning("STAGE_TIMINGS_EXPORT_FAILED | %s", e)
+        if get_tracer().enabled:
+            try:
+                get_tracer().export_chrome(os.path.join(os.path.dirname(_log_dir), "traces.json"))
+            except Exception as e:
+                logger.warning("TRACE_EXPORT_FAILED | %s", e)
 
-        # Unload model to free memory
+        # Unload models to free memory
         try:
             self.transcriber.unload_model()
+            get_model_manager().unload_all()
         except Exception:
             pass
 
@@ -1,8 +1,12 @@
 """Shared pymorphy2 MorphAnalyzer singleton.
 
 Provides a single MorphAnalyzer instance shared across phonetics.py and morphology.py,
-saving ~50MB RAM and ~1.5s startup time.
+saving ~50MB RAM and ~1.5s startup time, and a bounded cache of per-word parse
+facts on top of it (get_morph_cache()).
 """
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
 
 try:
     import pymorphy2
@@ -24,3 +28,141 @@ def get_morph():
     if PYMORPHY2_AVAILABLE and _morph_instance is None:
         _morph_instance = pymorphy2.MorphAnalyzer()
     return _morph_instance
+
+
+# Parses with at least this score make a word "valid" vocabulary
+VALID_SCORE = 0.1
+MORPH_CACHE_SIZE = 20000
+
+
+class MorphFacts(NamedTuple):
+    """What the correctors need from a word's parses (instead of the Parse list)."""
+    valid: bool                 # any parse scores above VALID_SCORE
+    score: float                # top parse
+    pos: Optional[str]
+    gender: Optional[str]
+    normal_form: str
+
+
+class MorphCache:
+    """Process-wide bounded LRU of MorphFacts (and inflections) per word.
+
+    Shared by PhoneticCorrector and MorphologyCorrector, so a word parsed by
+    one stage is free for the other and for later dictations.
+    """
+
+    def __init__(self, maxsize: int = MORPH_CACHE_SIZE, analyzer=None):
+        self.maxsize = maxsize
+        self._analyzer = analyzer
+        self._shared_analyzer = analyzer is None  # get_morph(), dropped by release()
+        self._entries: "OrderedDict[tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def available(self) -> bool:
+        return self._analyzer is not None or PYMORPHY2_AVAILABLE
+
+    def _morph(self):
+        if self._analyzer is None:
+            self._analyzer = get_morph()
+        return self._analyzer
+
+    def _lookup(self, key: tuple, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def facts(self, word: str) -> Optional[MorphFacts]:
+        """Parse facts for a word (None if it has no parses or pymorphy2 is missing)."""
+        if not word or not self.available:
+            return None
+        return self._lookup(("facts", word.lower()), lambda: self._compute_facts(word.lower()))
+
+    def _compute_facts(self, word: str) -> Optional[MorphFacts]:
+        parsed = self._morph().parse(word)
+        if not parsed:
+            return None
+        top = parsed[0]
+        return MorphFacts(
+            valid=any(p.score > VALID_SCORE for p in parsed),
+            score=top.score,
+            pos=top.tag.POS,
+            gender=top.tag.gender,
+            normal_form=top.normal_form,
+        )
+
+    def is_valid(self, word: str) -> bool:
+        """Whether the word is known vocabulary."""
+        facts = self.facts(word)
+        return facts is not None and facts.valid
+
+    def inflect(self, word: str, grammemes: frozenset) -> Optional[str]:
+        """The word's top parse inflected to grammemes (None if impossible)."""
+        if not word or not self.available:
+            return None
+        word = word.lower()
+
+        def compute():
+            parsed = self._morph().parse(word)
+            inflected = parsed[0].inflect(set(grammemes)) if parsed else None
+            return inflected.word if inflected else None
+
+        return self._lookup(("inflect", word, grammemes), compute)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def release(self):
+        """Clear, and forget the shared analyzer so release_morph() can free it."""
+        self.clear()
+        with self._lock:
+            if self._shared_analyzer:
+                self._analyzer = None
+
+
+_morph_cache = None
+_morph_cache_lock = threading.Lock()
+
+
+def get_morph_cache() -> MorphCache:
+    """Get the shared MorphCache around the shared MorphAnalyzer."""
+    global _morph_cache
+    with _morph_cache_lock:
+        if _morph_cache is None:
+            _morph_cache = MorphCache()
+        return _morph_cache
+
+
+def release_morph():
+    """Free the shared MorphAnalyzer and empty the parse cache (e.g. when the
+    app has been idle); both are recreated on next use."""
+    global _morph_instance
+    with _morph_cache_lock:
+        if _morph_cache is not None:
+            _morph_cache.release()
+    _morph_instance = None
@@ -1,13 +1,14 @@
 """Morphological correction module using pymorphy2 for Russian language.
 
 This module provides gender agreement and case ending corrections for ASR output.
-Uses singleton pattern for pymorphy2.MorphAnalyzer to avoid performance issues.
+Uses singleton pattern for pymorphy2.MorphAnalyzer to avoid performance issues,
+and the shared bounded parse cache (morph_singleton.get_morph_cache()).
 """
 
-import re
 from typing import Optional, List, Tuple
 
-from morph_singleton import PYMORPHY2_AVAILABLE, get_morph
+from morph_singleton import PYMORPHY2_AVAILABLE, MorphFacts, get_morph, get_morph_cache
+from text_tokens import Token, serialize, tokenize
 
 
 class MorphologyCorrector:
@@ -21,29 +22,21 @@ class MorphologyCorrector:
         """Initialize morphological corrector with shared MorphAnalyzer."""
         self._morph = get_morph()
 
-        # Word-level cache to avoid re-parsing
-        self._cache = {}
+        # Process-wide bounded word cache, shared with PhoneticCorrector
+        self._cache = get_morph_cache()
 
-    def _parse_word(self, word: str) -> Optional[list]:
+    def _parse_word(self, word: str) -> Optional[MorphFacts]:
         """Parse word with caching.
 
         Args:
             word: Word to parse
 
         Returns:
-            List of Parse objects from pymorphy2, or None if unavailable
+            Facts of the most likely parse, or None if unavailable
         """
         if not PYMORPHY2_AVAILABLE:
             return None
-
-        # Check cache first
-        if word in self._cache:
-            return self._cache[word]
-
-        # Parse and cache
-        parsed = self._morph.parse(word)
-        self._cache[word] = parsed
-        return parsed
+        return self._cache.facts(word)
 
     def fix_gender_agreement(self, text: str) -> str:
         """Fix gender agreement between adjectives and nouns.
@@ -62,42 +55,41 @@ class MorphologyCorrector:
         if not PYMORPHY2_AVAILABLE:
             return text
 
-        words = text.split()
+        tokens = tokenize(text)
+        self._fix_gender_agreement_tokens(tokens)
+        return serialize(tokens)
 
-        for i in range(len(words) - 1):
-            word1, word2 = words[i], words[i + 1]
+    def _fix_gender_agreement_tokens(self, tokens: List[Token]):
+        for i in range(len(tokens) - 1):
+            word1, word2 = tokens[i].word, tokens[i + 1].word
+            if not word1 or not word2:
+                continue
 
             # Parse both words
-            p1 = self._parse_word(word1)
-            p2 = self._parse_word(word2)
+            parse1 = self._parse_word(word1)
+            parse2 = self._parse_word(word2)
 
-            if not p1 or not p2:
+            if not parse1 or not parse2:
                 continue
 
-            # Get most likely parse (first result)
-            parse1 = p1[0]
-            parse2 = p2[0]
-
             # Check confidence scores - only correct high-confidence cases
             if parse1.score <= 0.5 or parse2.score <= 0.5:
                 continue
 
             # Check if we have adjective + noun pattern
-            if (parse1.tag.POS == 'ADJF' and  # Adjective
-                parse2.tag.POS == 'NOUN'):   # Noun
+            if (parse1.pos == 'ADJF' and  # Adjective
+                parse2.pos == 'NOUN'):   # Noun
 
                 # Check gender mismatch
-                gender1 = parse1.tag.gender
-                gender2 = parse2.tag.gender
+                gender1 = parse1.gender
+                gender2 = parse2.gender
 
                 if gender1 and gender2 and gender1 != gender2:
                     # Try to inflect adjective to match noun's gender
-                    corrected = parse1.inflect({gender2})
+                    corrected = self._cache.inflect(word1, frozenset({gender2}))
 
                     if corrected:
-                        words[i] = corrected.word
-
-        return ' '.join(words)
+                        tokens[i].set_word(corrected)
 
     def fix_case_endings(self, text: str) -> str:
         """Fix basic case ending errors in low-confidence parses.
@@ -114,24 +106,40 @@ class MorphologyCorrector:
         if not PYMORPHY2_AVAILABLE:
             return text
 
-        words = text.split()
+        tokens = tokenize(text)
+        self._fix_case_endings_tokens(tokens)
+        return serialize(tokens)
 
-        for i, word in enumerate(words):
+    def _fix_case_endings_tokens(self, tokens: List[Token]):
+        for tok in tokens:
+            word = tok.word
+            if not word:
+                continue
             parsed = self._parse_word(word)
 
-            if not parsed or parsed[0].score > 0.5:
+            if not parsed or parsed.score > 0.5:
                 continue  # Skip high-confidence words
 
             # Low confidence - try normal form
-            normal = parsed[0].normal_form
+            normal = parsed.normal_form
 
             # Check if normal form is common and original is rare variant
             # Only apply if normal form is similar length (avoid over-correction)
             if normal != word and len(normal) <= len(word) + 2:
                 # Use normal form if it fits context (simplified check)
-                words[i] = normal
+                tok.set_word(normal)
 
-        return ' '.join(words)
+    def process_tokens(self, tokens: List[Token]):
+        """Apply all morphological corrections to tokens in place.
+
+        Words are parsed without their surrounding punctuation, which is
+        kept as is.
+        """
+        if not PYMORPHY2_AVAILABLE:
+            return
+
+        self._fix_gender_agreement_tokens(tokens)
+        self._fix_case_endings_tokens(tokens)
 
     def process(self, text: str) -> str:
         """Apply all morphological corrections to text.
@@ -145,13 +153,9 @@ class MorphologyCorrector:
         if not PYMORPHY2_AVAILABLE:
             return text
 
-        # Apply gender agreement corrections
-        text = self.fix_gender_agreement(text)
-
-        # Apply case ending corrections
-        text = self.fix_case_endings(text)
-
-        return text
+        tokens = tokenize(text)
+        self.process_tokens(tokens)
+        return serialize(tokens)
 
 
 def fix_gender_agreement(text: str) -> str:
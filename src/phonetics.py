@@ -4,10 +4,11 @@ Handles voiced/unvoiced consonant substitutions common in ASR:
 - Word-end devoicing: неверо -> небе
 - Pre-voiced assimilation: готов (ASR: "кото")
 """
-import re
-from typing import Optional
+from typing import List, Optional
 
-from morph_singleton import PYMORPHY2_AVAILABLE as PYMORPHY_AVAILABLE, get_morph
+from morph_singleton import PYMORPHY2_AVAILABLE as PYMORPHY_AVAILABLE, get_morph, get_morph_cache
+from text_tokens import Token, serialize, tokenize
+from vocabulary_index import get_vocabulary_index
 
 
 # Voiced/unvoiced consonant pairs in Russian
@@ -31,7 +32,10 @@ class PhoneticCorrector:
     """Corrects phonetic errors in Russian ASR output.
 
     Focuses on voiced/unvoiced consonant substitutions with vocabulary
-    validation to avoid over-correction.
+    validation to avoid over-correction. Validation uses the precomputed
+    vocabulary index when it has been built (scripts/build_vocabulary_index.py),
+    so pymorphy2 isn't loaded for phonetics; otherwise it falls back to the
+    shared pymorphy2 parse cache.
     """
 
     def __init__(self, enable_validation: bool = True):
@@ -41,10 +45,13 @@ class PhoneticCorrector:
             enable_validation: Whether to validate corrections against vocabulary.
                              If False, applies corrections more aggressively.
         """
-        self.enable_validation = enable_validation and PYMORPHY_AVAILABLE
+        self._vocabulary = get_vocabulary_index() if enable_validation else None
+        self.enable_validation = enable_validation and (self._vocabulary is not None or PYMORPHY_AVAILABLE)
 
-        # Use shared MorphAnalyzer singleton
-        self._morph = get_morph() if self.enable_validation else None
+        # Use shared MorphAnalyzer singleton only without the vocabulary index
+        use_morph = self.enable_validation and self._vocabulary is None
+        self._morph = get_morph() if use_morph else None
+        self._morph_cache = get_morph_cache() if use_morph else None
 
     def _is_valid_russian_word(self, word: str) -> bool:
         """Check if word is valid Russian vocabulary.
@@ -55,18 +62,18 @@ class PhoneticCorrector:
         Returns:
             True if word exists in Russian vocabulary
         """
-        if not self.enable_validation or not self._morph:
+        if not self.enable_validation:
             return True  # Assume valid if validation disabled
 
         if not word:
             return False
 
-        # Parse with pymorphy2
-        parsed = self._morph.parse(word)
+        if self._vocabulary is not None:
+            return word in self._vocabulary
 
         # Word is valid if it has at least one parse with high confidence
-        # Score > 0.1 indicates a legitimate morphological analysis
-        return any(p.score > 0.1 for p in parsed)
+        # (score > VALID_SCORE); parses are shared with MorphologyCorrector
+        return self._morph_cache.is_valid(word)
 
     def fix_word_end_devoicing(self, text: str) -> str:
         """Fix word-end devoicing/voicing errors.
@@ -88,46 +95,31 @@ class PhoneticCorrector:
         if not text:
             return text
 
-        words = text.split()
-        corrected_words = []
+        tokens = tokenize(text)
+        for tok in tokens:
+            if tok.is_cyrillic:
+                tok.set_word(self._fix_word_end(tok.word))
+        return serialize(tokens)
 
-        for word in words:
-            # Extract leading/trailing punctuation
-            match = re.match(r'^([^а-яА-ЯёЁ]*)([а-яА-ЯёЁ]+)([^а-яА-ЯёЁ]*)$', word)
-            if not match:
-                corrected_words.append(word)
-                continue
-
-            prefix, core, suffix = match.groups()
-            lower_core = core.lower()
-
-            # Skip short words (likely prepositions, particles)
-            if len(lower_core) <= 2:
-                corrected_words.append(word)
-                continue
-
-            corrected_core = core
-            last_char = lower_core[-1]
+    def _fix_word_end(self, core: str) -> str:
+        """Word-end devoicing fix for one word (Cyrillic letters only)."""
+        lower_core = core.lower()
 
-            # Case 1: Word ends in voiced consonant -> try unvoiced
-            if last_char in VOICED_CONSONANTS:
-                unvoiced = VOICED_UNVOICED_MAP[last_char]
-                candidate = lower_core[:-1] + unvoiced
+        # Skip short words (likely prepositions, particles)
+        if len(lower_core) <= 2:
+            return core
 
-                if not self._is_valid_russian_word(lower_core) and self._is_valid_russian_word(candidate):
-                    corrected_core = self._preserve_case(core, candidate)
+        last_char = lower_core[-1]
 
-            # Case 2: Word ends in unvoiced consonant -> try voiced
-            elif last_char in UNVOICED_CONSONANTS:
-                voiced = VOICED_UNVOICED_MAP[last_char]
-                candidate = lower_core[:-1] + voiced
+        # Case 1: Word ends in voiced consonant -> try unvoiced
+        # Case 2: Word ends in unvoiced consonant -> try voiced
+        if last_char in VOICED_CONSONANTS or last_char in UNVOICED_CONSONANTS:
+            candidate = lower_core[:-1] + VOICED_UNVOICED_MAP[last_char]
 
-                if not self._is_valid_russian_word(lower_core) and self._is_valid_russian_word(candidate):
-                    corrected_core = self._preserve_case(core, candidate)
+            if not self._is_valid_russian_word(lower_core) and self._is_valid_russian_word(candidate):
+                return self._preserve_case(core, candidate)
 
-            corrected_words.append(prefix + corrected_core + suffix)
-
-        return ' '.join(corrected_words)
+        return core
 
     def fix_pre_voiced_assimilation(self, text: str) -> str:
         """Fix pre-voiced assimilation errors within words.
@@ -147,52 +139,48 @@ class PhoneticCorrector:
         if not text:
             return text
 
-        words = text.split()
-        corrected_words = []
-
-        for word in words:
-            # Extract leading/trailing punctuation
-            match = re.match(r'^([^а-яА-ЯёЁ]*)([а-яА-ЯёЁ]+)([^а-яА-ЯёЁ]*)$', word)
-            if not match:
-                corrected_words.append(word)
+        tokens = tokenize(text)
+        for tok in tokens:
+            if tok.is_cyrillic:
+                tok.set_word(self._fix_assimilation(tok.word))
+        return serialize(tokens)
+
+    def _fix_assimilation(self, core: str) -> str:
+        """Pre-voiced assimilation fix for one word (Cyrillic letters only)."""
+        # Find consonant clusters within word
+        # Pattern: voiced + unvoiced or unvoiced + voiced
+        for i in range(len(core) - 1):
+            char1, char2 = core[i].lower(), core[i + 1].lower()
+
+            # Case: voiced consonant followed by unvoiced
+            # Russian: voiced devoices before unvoiced (готВот -> готфот)
+            # ASR may get this wrong
+            if char1 in VOICED_CONSONANTS and char2 in UNVOICED_CONSONANTS:
+                # Try voicing the second consonant
+                # Example: кото (ASR error for готов)
+                candidate = core[:i+1] + VOICED_UNVOICED_MAP[char2] + core[i+2:]
+                lower_core = core.lower()
+                lower_candidate = candidate.lower()
+
+                # Apply if original invalid and candidate valid
+                if not self._is_valid_russian_word(lower_core) and self._is_valid_russian_word(lower_candidate):
+                    return self._preserve_case(core, lower_candidate)
+
+        return core
+
+    def process_tokens(self, tokens: List[Token]):
+        """Apply all phonetic corrections to tokens in place (see process())."""
+        # Without vocabulary validation every word counts as valid, so no
+        # correction can ever apply
+        if not self.enable_validation:
+            return
+
+        for tok in tokens:
+            if not tok.is_cyrillic:
                 continue
-
-            prefix, core, suffix = match.groups()
-            corrected_core = core
-
-            # Find consonant clusters within word
-            # Pattern: voiced + unvoiced or unvoiced + voiced
-            for i in range(len(core) - 1):
-                char1, char2 = core[i].lower(), core[i + 1].lower()
-
-                # Skip if not both consonants
-                if not (char1 in VOICED_CONSONANTS or char1 in UNVOICED_CONSONANTS):
-                    continue
-                if not (char2 in VOICED_CONSONANTS or char2 in UNVOICED_CONSONANTS):
-                    continue
-
-                # Case: voiced consonant followed by unvoiced
-                # Russian: voiced devoices before unvoiced (готВот -> готфот)
-                # ASR may get this wrong
-                if char1 in VOICED_CONSONANTS and char2 in UNVOICED_CONSONANTS:
-                    # Try voicing the second consonant
-                    # Example: кото (ASR error for готов)
-                    unvoiced_char2 = char2
-                    voiced_char2 = VOICED_UNVOICED_MAP.get(unvoiced_char2)
-
-                    if voiced_char2:
-                        candidate = core[:i+1] + voiced_char2 + core[i+2:]
-                        lower_core = core.lower()
-                        lower_candidate = candidate.lower()
-
-                        # Apply if original invalid and candidate valid
-                        if not self._is_valid_russian_word(lower_core) and self._is_valid_russian_word(lower_candidate):
-                            corrected_core = self._preserve_case(core, lower_candidate)
-                            break
-
-            corrected_words.append(prefix + corrected_core + suffix)
-
-        return ' '.join(corrected_words)
+            word = self._fix_assimilation(self._fix_word_end(tok.word))
+            if word != tok.word:
+                tok.set_word(word)
 
     def process(self, text: str) -> str:
         """Apply all phonetic corrections to text.
@@ -210,13 +198,9 @@ class PhoneticCorrector:
         if not text:
             return text
 
-        # Step 1: Fix word-end devoicing
-        text = self.fix_word_end_devoicing(text)
-
-        # Step 2: Fix pre-voiced assimilation
-        text = self.fix_pre_voiced_assimilation(text)
-
-        return text
+        tokens = tokenize(text)
+        self.process_tokens(tokens)
+        return serialize(tokens)
 
     @staticmethod
     def _preserve_case(original: str, corrected: str) -> str:
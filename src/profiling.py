@@ -0,0 +1,185 @@
+"""Opt-in per-call profiling of transcription and model loading.
+
+When a user reports "it got slow", set TRANSKRIBATOR_PROFILE=1 (or enable
+profile_transcription in the config) and every Transcriber.transcribe and
+model load writes, into <crash_dir>/profiles:
+
+- <stamp>_<name>.prof       cProfile stats (snakeviz, pstats)
+- <stamp>_<name>.collapsed  sampled stacks of the profiled thread in
+                            collapsed format (flamegraph.pl, speedscope)
+- <stamp>_<name>.txt        top functions by cumulative time
+
+Only the newest MAX_PROFILES calls are kept. CrashReporter attaches the
+latest summary to crash reports. Disabled, profile() is a shared no-op.
+"""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+logger = logging.getLogger("transkribator")
+
+PROFILE_ENV = "TRANSKRIBATOR_PROFILE"
+PROFILE_SUBDIR = "profiles"
+MAX_PROFILES = 20
+SAMPLE_INTERVAL_SEC = 0.005
+SUMMARY_LINES = 30
+EXTENSIONS = (".prof", ".collapsed", ".txt")
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval.
+
+    Unlike cProfile this also shows where time goes while native code
+    (ONNX Runtime, torch) holds the thread: the calling Python frame.
+    """
+
+    def __init__(self, target_ident: int, interval: float = SAMPLE_INTERVAL_SEC):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.target_ident = target_ident
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_ident)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(timeout=1.0)
+
+
+class CallProfiler:
+    """Writes one profile per profiled call, keeping the newest `keep`."""
+
+    def __init__(self, output_dir: str, enabled: bool = False, keep: int = MAX_PROFILES,
+                 sample_interval: float = SAMPLE_INTERVAL_SEC):
+        self.output_dir = output_dir
+        self.enabled = enabled
+        self.keep = keep
+        self.sample_interval = sample_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def profile(self, name: str, **meta):
+        """Profile the enclosed block as one call (nested calls are folded
+        into the outermost one)."""
+        if not self.enabled or getattr(self._local, "active", False):
+            yield
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # Python 3.12+: another thread is already profiling
+            yield
+            return
+        self._local.active = True
+        sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+        sampler.start()
+        t0 = time.time()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            sampler.stop()
+            self._local.active = False
+            try:
+                self._write(name, profiler, sampler.stacks, time.time() - t0, meta)
+            except Exception as e:
+                logger.warning("PROFILE_WRITE_FAILED | name=%s | error=%s", name, e)
+
+    def _write(self, name: str, profiler: cProfile.Profile, stacks: Counter, elapsed: float, meta: dict):
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        base = os.path.join(self.output_dir, f"{stamp}_{name}")
+
+        profiler.dump_stats(base + ".prof")
+        with open(base + ".collapsed", "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        summary = io.StringIO()
+        header = " | ".join([f"{name}", f"elapsed={elapsed:.3f}s"] + [f"{k}={v}" for k, v in meta.items()])
+        summary.write(header + "\n")
+        stats = pstats.Stats(profiler, stream=summary)
+        stats.sort_stats("cumulative").print_stats(SUMMARY_LINES)
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(summary.getvalue())
+
+        logger.info("PROFILE_WRITTEN | name=%s | elapsed=%.2fs | samples=%d | path=%s",
+                    name, elapsed, sum(stacks.values()), base + ".prof")
+        self._rotate()
+
+    def _rotate(self):
+        """Delete all but the newest `keep` profiled calls."""
+        with self._lock:
+            stems = sorted({
+                os.path.splitext(f)[0] for f in os.listdir(self.output_dir) if f.endswith(EXTENSIONS)
+            })
+            for stem in stems[:-self.keep] if self.keep > 0 else stems:
+                for ext in EXTENSIONS:
+                    try:
+                        os.remove(os.path.join(self.output_dir, stem + ext))
+                    except FileNotFoundError:
+                        pass
+
+
+def latest_profile(profile_dir: str) -> Optional[dict]:
+    """Paths and summary text of the newest profile in profile_dir (or None)."""
+    try:
+        summaries = sorted(f for f in os.listdir(profile_dir) if f.endswith(".txt"))
+    except OSError:
+        return None
+    if not summaries:
+        return None
+    stem = os.path.join(profile_dir, os.path.splitext(summaries[-1])[0])
+    with open(stem + ".txt", "r", encoding="utf-8", errors="replace") as f:
+        summary = f.read()
+    return {
+        "prof": stem + ".prof",
+        "collapsed": stem + ".collapsed",
+        "summary": summary,
+    }
+
+
+_profiler: Optional[CallProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def _env_enabled() -> bool:
+    return os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def get_profiler() -> CallProfiler:
+    """The process-wide CallProfiler, writing into <crash_dir>/profiles."""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            from crash_reporter import default_crash_dir, get_reporter
+            reporter = get_reporter()
+            crash_dir = reporter.crash_dir if reporter else default_crash_dir()
+            _profiler = CallProfiler(os.path.join(crash_dir, PROFILE_SUBDIR), enabled=_env_enabled())
+        return _profiler
+
+
+def configure_profiler(enabled: bool):
+    """Enable profiling from the config (the env switch always wins)."""
+    get_profiler().enabled = enabled or _env_enabled()
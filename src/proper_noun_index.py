@@ -0,0 +1,242 @@
+"""Compiled proper noun index.
+
+Maps phrases (lowercase words joined by single spaces) to their canonical
+spelling: "москва" -> "Москва", "нижний новгород" -> "Нижний Новгород",
+"спб" -> "Санкт-Петербург", and, when built with pymorphy2 by
+scripts/build_proper_noun_index.py, inflected forms: "москве" -> "Москве",
+"нижнем новгороде" -> "Нижнем Новгороде". Every proper prefix of a
+multi-word phrase is stored too, with an empty value, so a scan stops as
+soon as the words read so far start no entry.
+
+The file is an open-addressing hash table (CRC32 of the phrase, linear
+probing), memory-mapped and probed in place: opening it is instant and a
+lookup reads one or two records.
+
+File layout (little-endian):
+    MAGIC                   8 bytes
+    header                  uint32 slots, records, entries, max_words,
+                            cities, names, countries
+    slots[slots]            uint32 record index + 1, 0 = empty
+    offsets[records + 1]    uint32, record i is blob[offsets[i]:offsets[i + 1]]
+    blob                    UTF-8 "phrase\\tvalue" records
+"""
+import json
+import logging
+import mmap
+import struct
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger("transkribator")
+
+MAGIC = b"TKPNIDX1"
+_HEADER = struct.Struct("<8s7I")
+_U32 = struct.Struct("<I")
+
+SOURCES = ("cities", "names", "countries")
+
+DEFAULT_INDEX_PATH = Path(__file__).parent / "data" / "proper_nouns.idx"
+
+# Names that are also everyday words; left alone wherever they come from
+# (variants like "верочка" still map to "Вера")
+COMMON_WORD_NAMES = frozenset({
+    "вера", "надежда", "любовь", "роман", "лилия", "майя", "дина", "регина", "белла",
+    "орел", "шахты", "находка", "курган", "судак", "грозный", "железнодорожный",
+    "чили", "перу", "панама", "гана",
+})
+
+
+def phrase_key(text: str) -> str:
+    """Lookup key of a word or phrase: lowercase, single spaces."""
+    return " ".join(text.lower().split())
+
+
+def match_case(form: str, canonical: str) -> str:
+    """Spell an inflected form with the canonical name's capitalization,
+    word by word and hyphen part by hyphen part ("ростове-на-дону" with
+    "Ростов-на-Дону" -> "Ростове-на-Дону")."""
+    form_words, canonical_words = form.split(), canonical.split()
+    if len(form_words) != len(canonical_words):
+        return form[:1].upper() + form[1:]
+    result = []
+    for word, pattern in zip(form_words, canonical_words):
+        parts, pattern_parts = word.split("-"), pattern.split("-")
+        if len(parts) != len(pattern_parts):
+            parts, pattern_parts = [word], [pattern]
+        cased = []
+        for part, pattern_part in zip(parts, pattern_parts):
+            if len(pattern_part) > 1 and pattern_part.isupper():
+                cased.append(part.upper())
+            elif pattern_part[:1].isupper():
+                cased.append(part[:1].upper() + part[1:])
+            else:
+                cased.append(part)
+        result.append("-".join(cased))
+    return " ".join(result)
+
+
+def load_sources(data_dir: Union[str, Path]) -> Dict[str, List[Dict]]:
+    """The cities/names/countries JSON lists of data_dir (missing or broken
+    files count as empty)."""
+    data_dir = Path(data_dir)
+    sources = {}
+    for source in SOURCES:
+        path = data_dir / f"{source}.json"
+        entries = []
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+            except Exception as e:
+                logger.warning("PROPER_NOUNS_LOAD_FAILED | path=%s | error=%s", path, e)
+        else:
+            logger.warning("PROPER_NOUNS_FILE_MISSING | path=%s", path)
+        sources[source] = entries
+    return sources
+
+
+def compile_entries(
+    sources: Dict[str, List[Dict]],
+    inflect: Optional[Callable[[str], Iterable[str]]] = None,
+    is_ambiguous: Optional[Callable[[str], bool]] = None,
+) -> Dict[str, str]:
+    """Phrase table of the dictionary entries, prefixes included.
+
+    Args:
+        sources: {"cities": [{"name": ..., "variants": [...]}, ...], ...}
+        inflect: Inflected forms of a canonical name (any case), if available
+        is_ambiguous: Whether a single lowercase word is also a common word;
+                      such words are never rewritten
+
+    Returns:
+        {phrase: canonical spelling}, plus {prefix: ""} for every proper
+        prefix of a multi-word phrase. The first entry for a phrase wins.
+    """
+    def ambiguous(key: str) -> bool:
+        if " " in key:
+            return False
+        return key in COMMON_WORD_NAMES or (is_ambiguous is not None and is_ambiguous(key))
+
+    table: Dict[str, str] = {}
+    for source in SOURCES:
+        for entry in sources.get(source, []):
+            name = entry.get("name", "")
+            name_key = phrase_key(name)
+            if not name_key:
+                continue
+            if not ambiguous(name_key):
+                table.setdefault(name_key, name)
+            for variant in entry.get("variants", []):
+                key = phrase_key(variant)
+                if key and key != name_key and not ambiguous(key):
+                    table.setdefault(key, name)
+            for form in (inflect(name) if inflect else ()):
+                key = phrase_key(form)
+                if key and key != name_key and not ambiguous(key):
+                    table.setdefault(key, match_case(key, name))
+
+    for key in list(table):
+        words = key.split(" ")
+        for n in range(1, len(words)):
+            table.setdefault(" ".join(words[:n]), "")
+    return table
+
+
+def build_index(table: Dict[str, str], path: Union[str, Path],
+                counts: Optional[Dict[str, int]] = None) -> int:
+    """Write a compiled index of a compile_entries() table.
+
+    Args:
+        table: {phrase: value}; empty values mark phrase prefixes
+        path: Index file to write
+        counts: Dictionary entries per source, kept for get_stats()
+
+    Returns:
+        Number of phrases with a value
+    """
+    counts = counts or {}
+    records = [f"{key}\t{value}".encode("utf-8") for key, value in table.items()]
+    entries = sum(1 for value in table.values() if value)
+    max_words = max((key.count(" ") + 1 for key in table), default=0)
+
+    slots = 8
+    while slots < 2 * len(records):
+        slots *= 2
+    mask = slots - 1
+    slot_table = [0] * slots
+    for i, key in enumerate(table):
+        h = zlib.crc32(key.encode("utf-8")) & mask
+        while slot_table[h]:
+            h = (h + 1) & mask
+        slot_table[h] = i + 1
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, slots, len(records), entries, max_words,
+                             *(counts.get(source, 0) for source in SOURCES)))
+        f.write(struct.pack(f"<{slots}I", *slot_table))
+        offset = 0
+        f.write(_U32.pack(offset))
+        for record in records:
+            offset += len(record)
+            f.write(_U32.pack(offset))
+        for record in records:
+            f.write(record)
+    tmp.replace(path)
+    return entries
+
+
+class ProperNounIndex:
+    """Read-only memory-mapped phrase table written by build_index()."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < _HEADER.size or self._map[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"not a proper noun index: {self.path}")
+            (_, self._slots, self._records, self.entries, self.max_words,
+             *counts) = _HEADER.unpack_from(self._map, 0)
+            if self._slots & (self._slots - 1):
+                raise ValueError(f"corrupt proper noun index: {self.path}")
+            self.counts = dict(zip(SOURCES, counts))
+            self._offsets = _HEADER.size + self._slots * _U32.size
+            self._blob = self._offsets + (self._records + 1) * _U32.size
+            if len(self._map) < self._blob:
+                raise ValueError(f"truncated proper noun index: {self.path}")
+        except Exception:
+            self._map.close()
+            raise
+
+    def _record(self, i: int) -> bytes:
+        start, end = struct.unpack_from("<2I", self._map, self._offsets + i * _U32.size)
+        return self._map[self._blob + start:self._blob + end]
+
+    def get(self, phrase: str) -> Optional[str]:
+        """Value of a phrase key ("" for a prefix), None if unknown."""
+        key = phrase.encode("utf-8") + b"\t"
+        mask = self._slots - 1
+        h = zlib.crc32(key[:-1]) & mask
+        while True:
+            (slot,) = _U32.unpack_from(self._map, _HEADER.size + h * _U32.size)
+            if not slot:
+                return None
+            record = self._record(slot - 1)
+            if record.startswith(key):
+                return record[len(key):].decode("utf-8")
+            h = (h + 1) & mask
+
+    def items(self) -> Iterable[Tuple[str, str]]:
+        for i in range(self._records):
+            key, value = self._record(i).decode("utf-8").split("\t", 1)
+            yield key, value
+
+    def __len__(self) -> int:
+        return self._records
+
+    def close(self):
+        self._map.close()
@@ -1,130 +1,83 @@
 """Proper noun recognition and capitalization."""
-import json
-import re
+import logging
+import threading
+import time
 from pathlib import Path
-from typing import Set, Dict, List
+from typing import Dict, List, Optional, Union
+
+from proper_noun_index import (
+    DEFAULT_INDEX_PATH, SOURCES, ProperNounIndex, compile_entries, load_sources, phrase_key,
+)
+from text_tokens import Token, serialize, tokenize
+
+logger = logging.getLogger("transkribator")
+
+DEFAULT_DATA_DIR = Path(__file__).parent / "data"
 
 
 class ProperNounDict:
     """Load and manage proper noun dictionaries for ASR post-processing.
 
-    Provides fast O(1) lookup for proper nouns (cities, names, countries)
-    to capitalize known entities that ASR outputs in lowercase.
+    Capitalizes known entities (cities, names, countries) that ASR outputs
+    in lowercase, including multi-word ones ("нижний новгород"). Lookups go
+    to the compiled index (scripts/build_proper_noun_index.py), which also
+    covers inflected forms ("в нижнем новгороде"); without it the JSON
+    files are compiled in memory, covering the dictionary spellings only.
     """
 
-    def __init__(self, data_dir: str = None):
+    def __init__(self, data_dir: str = None, index_path: Union[str, Path, None] = None):
         """
         Initialize proper noun dictionary.
 
         Args:
             data_dir: Path to data directory containing JSON files.
                      If None, uses src/data/ relative to this file.
+            index_path: Compiled index to use. If None, the default index is
+                     used for the default data directory when it is up to date.
         """
-        if data_dir is None:
-            data_dir = Path(__file__).parent / "data"
-        else:
-            data_dir = Path(data_dir)
-
-        self._lookup: Set[str] = set()
-        self._variants: Dict[str, str] = {}  # variant -> canonical
-        self._stats = {
-            "cities": 0,
-            "names": 0,
-            "countries": 0,
-            "total": 0
-        }
-
-        # Load all dictionaries
-        self._load_cities(data_dir / "cities.json")
-        self._load_names(data_dir / "names.json")
-        self._load_countries(data_dir / "countries.json")
-
-        print(f"[INFO] ProperNounDict loaded: {self._stats}")
-
-    def _load_json(self, path: Path) -> List[Dict]:
-        """
-        Load JSON file or return empty list.
-
-        Args:
-            path: Path to JSON file
+        t0 = time.perf_counter()
+        if index_path is None and data_dir is None and self._index_current(DEFAULT_INDEX_PATH):
+            index_path = DEFAULT_INDEX_PATH
+        data_dir = Path(data_dir) if data_dir is not None else DEFAULT_DATA_DIR
 
-        Returns:
-            Parsed JSON content or empty list if file not found
-        """
-        if path.exists():
+        self._table = None
+        if index_path is not None:
             try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"[WARNING] Failed to load {path}: {e}")
-                return []
-        else:
-            print(f"[WARNING] File not found: {path}")
-            return []
-
-    def _load_cities(self, path: Path):
-        """Load cities from JSON and populate lookup sets."""
-        entries = self._load_json(path)
-        self._stats["cities"] = len(entries)
-
-        for entry in entries:
-            name = entry.get("name", "")
-            variants = entry.get("variants", [])
-
-            # Add canonical name
-            self._lookup.add(name.lower())
-
-            # Add all variants
-            for variant in variants:
-                self._lookup.add(variant.lower())
-                # Map variant to canonical form for capitalization
-                if variant.lower() != name.lower():
-                    self._variants[variant.lower()] = name
-
-    def _load_names(self, path: Path):
-        """Load names from JSON and populate lookup sets."""
-        entries = self._load_json(path)
-        self._stats["names"] = len(entries)
-
-        for entry in entries:
-            name = entry.get("name", "")
-            variants = entry.get("variants", [])
-
-            # Add canonical name
-            self._lookup.add(name.lower())
-
-            # Add all variants
-            for variant in variants:
-                self._lookup.add(variant.lower())
-                # Map variant to canonical form for capitalization
-                if variant.lower() != name.lower():
-                    self._variants[variant.lower()] = name
-
-    def _load_countries(self, path: Path):
-        """Load countries from JSON and populate lookup sets."""
-        entries = self._load_json(path)
-        self._stats["countries"] = len(entries)
-
-        for entry in entries:
-            name = entry.get("name", "")
-            variants = entry.get("variants", [])
-
-            # Add canonical name
-            self._lookup.add(name.lower())
-
-            # Add all variants
-            for variant in variants:
-                self._lookup.add(variant.lower())
-                # Map variant to canonical form for capitalization
-                if variant.lower() != name.lower():
-                    self._variants[variant.lower()] = name
-
-        # Update total
-        self._stats["total"] = len(self._lookup)
+                index = ProperNounIndex(index_path)
+                self._table = index
+                self._max_words = index.max_words
+                self._stats = {**index.counts, "total": index.entries}
+                source = str(index_path)
+            except (OSError, ValueError) as e:
+                logger.warning("PROPER_NOUNS_INDEX_FAILED | path=%s | error=%s", index_path, e)
+        if self._table is None:
+            sources = load_sources(data_dir)
+            self._table = compile_entries(sources)
+            self._max_words = max((key.count(" ") + 1 for key in self._table), default=0)
+            self._stats = {name: len(sources[name]) for name in SOURCES}
+            self._stats["total"] = sum(1 for value in self._table.values() if value)
+            source = str(data_dir)
+
+        logger.info("PROPER_NOUNS_LOADED | source=%s | entries=%d | load_ms=%.1f",
+                    source, self._stats["total"], (time.perf_counter() - t0) * 1000)
+
+    @staticmethod
+    def _index_current(path: Path) -> bool:
+        """The index exists and is newer than the JSON files it was built from."""
+        try:
+            built = path.stat().st_mtime
+        except OSError:
+            return False
+        for name in SOURCES:
+            source = DEFAULT_DATA_DIR / f"{name}.json"
+            if source.exists() and source.stat().st_mtime > built:
+                logger.warning("PROPER_NOUNS_INDEX_STALE | path=%s | newer=%s", path, source)
+                return False
+        return True
 
     def is_proper_noun(self, word: str) -> bool:
         """
-        Check if word is a known proper noun.
+        Check if word (or phrase) is a known proper noun.
 
         Args:
             word: Word to check (case-insensitive)
@@ -132,22 +85,19 @@ class ProperNounDict:
         Returns:
             True if word is in proper noun dictionary
         """
-        return word.lower() in self._lookup
+        return bool(self._table.get(phrase_key(word)))
 
     def get_canonical(self, word: str) -> str:
         """
         Get canonical form of proper noun.
 
         Args:
-            word: Word to canonicalize
+            word: Word (or phrase) to canonicalize
 
         Returns:
-            Canonical form with proper capitalization
+            Canonical form with proper capitalization, or word if unknown
         """
-        lower = word.lower()
-        if lower in self._variants:
-            return self._variants[lower]
-        return word
+        return self._table.get(phrase_key(word)) or word
 
     def capitalize_known(self, text: str) -> str:
         """
@@ -166,29 +116,54 @@ class ProperNounDict:
             >>> pn = ProperNounDict()
             >>> pn.capitalize_known("я живу в москве")
             'я живу в Москве'
-            >>> pn.capitalize_known("привет меня зовут денис")
-            'привет меня зовут Denis'
+            >>> pn.capitalize_known("я из нижнего новгорода")
+            'я из Нижнего Новгорода'
         """
-        words = text.split()
-
-        for i, word in enumerate(words):
-            # Remove punctuation for checking (but preserve for output)
-            clean = re.sub(r'[^\w]', '', word)
+        tokens = tokenize(text)
+        self.capitalize_tokens(tokens)
+        return serialize(tokens)
 
-            if clean and self.is_proper_noun(clean):
-                # Get canonical form
-                canonical = self.get_canonical(clean)
+    def capitalize_tokens(self, tokens: List[Token]):
+        """Replace known proper nouns in tokens with their canonical form, in place.
 
-                # Capitalize preserving punctuation
-                # Find where the clean word starts in the original word
-                clean_start = word.lower().find(clean.lower())
-                if clean_start != -1:
-                    # Reconstruct word with canonical form
-                    prefix = word[:clean_start]
-                    suffix = word[clean_start + len(clean):]
-                    words[i] = prefix + canonical + suffix
-
-        return ' '.join(words)
+        The longest known phrase starting at each word wins; a phrase never
+        spans punctuation ("нижний, новгород"). A phrase of several tokens
+        becomes one token ("санкт петербург" -> "Санкт-Петербург").
+        """
+        table = self._table
+        i = 0
+        while i < len(tokens):
+            match = self._longest_match(table, tokens, i)
+            if match is not None:
+                n, value = match
+                first = tokens[i]
+                if n > 1:
+                    first.trail = tokens[i + n - 1].trail
+                    del tokens[i + 1:i + n]
+                if value != first.word:
+                    first.set_word(value)
+            i += 1
+
+    def _longest_match(self, table, tokens: List[Token], i: int) -> Optional[tuple]:
+        """(token count, canonical) of the longest phrase at tokens[i], if any."""
+        if not tokens[i].word:
+            return None
+        best = None
+        key = tokens[i].lower
+        n = 1
+        while True:
+            value = table.get(key)
+            if value is None:
+                return best
+            if value:
+                best = (n, value)
+            if n >= self._max_words or i + n >= len(tokens):
+                return best
+            nxt = tokens[i + n]
+            if tokens[i + n - 1].trail or nxt.lead or not nxt.word:
+                return best
+            key += " " + nxt.lower
+            n += 1
 
     def get_stats(self) -> Dict[str, int]:
         """
@@ -202,6 +177,7 @@ class ProperNounDict:
 
 # Singleton instance for reuse
 _instance = None
+_instance_lock = threading.Lock()
 
 
 def get_proper_noun_dict() -> ProperNounDict:
@@ -212,6 +188,7 @@ def get_proper_noun_dict() -> ProperNounDict:
         Shared ProperNounDict instance
     """
     global _instance
-    if _instance is None:
-        _instance = ProperNounDict()
-    return _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = ProperNounDict()
+        return _instance
@@ -0,0 +1,221 @@
+"""Punctuation restoration with an exported ONNX token classifier.
+
+Runs the same kind of model as deepmultilingualpunctuation (a token
+classifier predicting the punctuation mark after each word) through
+onnxruntime instead of torch/transformers, so loading takes a fraction of
+the time and memory. The model directory (see
+scripts/export_punctuation_onnx.py) holds:
+
+    model.int8.onnx (or model.onnx)   token classifier, logits [batch, seq, labels]
+    tokenizer.json                    HuggingFace fast tokenizer
+    config.json                       id2label of the classifier
+
+Long texts are split into overlapping windows of subword tokens, which are
+run in batches; each token takes its label from the window where it is
+furthest from the edges.
+"""
+import json
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger("transkribator")
+
+try:
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+    ONNX_PUNCTUATION_AVAILABLE = True
+except ImportError:
+    ort = None
+    Tokenizer = None
+    ONNX_PUNCTUATION_AVAILABLE = False
+
+MODEL_NAME = "fullstop-multilang-int8"
+MODEL_FILES = ("model.int8.onnx", "model.onnx")
+
+WINDOW_TOKENS = 256   # per window, including the two special tokens
+OVERLAP_TOKENS = 32   # shared by neighbouring windows
+BATCH_SIZE = 8        # windows per session run
+NUM_THREADS = 2       # intra-op threads; keep the UI and decoder responsive
+
+# Punctuation the model predicts is stripped from the input first
+_EXISTING_PUNCT = re.compile(r"(?<!\d)[.,;:!?](?!\d)")
+
+_SPECIAL_TOKENS = (("<s>", "</s>", "<pad>"), ("[CLS]", "[SEP]", "[PAD]"))
+
+
+def default_model_dir() -> Path:
+    """models/punctuation/<MODEL_NAME> next to the sherpa models."""
+    if getattr(sys, "frozen", False):
+        base_dir = Path(sys._MEIPASS) / "models" / "punctuation"
+    else:
+        base_dir = Path(__file__).parent.parent / "models" / "punctuation"
+    return base_dir / MODEL_NAME
+
+
+def find_model(model_dir: Union[str, Path, None] = None) -> Optional[Path]:
+    """The ONNX model file in model_dir, if the directory is complete."""
+    model_dir = Path(model_dir) if model_dir else default_model_dir()
+    if not (model_dir / "tokenizer.json").exists() or not (model_dir / "config.json").exists():
+        return None
+    for name in MODEL_FILES:
+        if (model_dir / name).exists():
+            return model_dir / name
+    return None
+
+
+def windows(length: int, size: int, overlap: int) -> List[Tuple[int, int, int, int]]:
+    """Split range(length) into windows of at most size items.
+
+    Returns:
+        (start, end, keep_start, keep_end) per window: the window covers
+        [start, end) and owns the predictions for [keep_start, keep_end).
+        Owned ranges are contiguous and cover range(length) exactly once.
+    """
+    if length <= size:
+        return [(0, length, 0, length)]
+    step = size - overlap
+    head = overlap // 2          # dropped at the start of every window but the first
+    tail = overlap - head        # dropped at the end of every window but the last
+    result = []
+    start = 0
+    while True:
+        end = min(start + size, length)
+        last = end == length
+        keep_start = start if not result else start + head
+        keep_end = end if last else end - tail
+        result.append((start, end, keep_start, keep_end))
+        if last:
+            return result
+        start += step
+
+
+class OnnxPunctuationModel:
+    """ONNX token classifier restoring punctuation, batched over sliding windows.
+
+    load_seconds is the session/tokenizer load time; last_inference_seconds
+    and inference_seconds (total) cover restore_punctuation() calls only.
+    """
+
+    def __init__(self, session, tokenizer, labels: List[str], window: int = WINDOW_TOKENS,
+                 overlap: int = OVERLAP_TOKENS, batch_size: int = BATCH_SIZE):
+        if window - 2 <= overlap:
+            raise ValueError(f"window ({window}) must exceed overlap ({overlap}) + 2 special tokens")
+        self.session = session
+        self.tokenizer = tokenizer
+        self.labels = labels
+        self.window = window
+        self.overlap = overlap
+        self.batch_size = batch_size
+        self._input_names = {i.name for i in session.get_inputs()}
+        self._cls_id, self._sep_id, self._pad_id = self._special_ids(tokenizer)
+
+        self.load_seconds = 0.0
+        self.inference_seconds = 0.0
+        self.last_inference_seconds = 0.0
+        self.last_windows = 0
+        self.last_batches = 0
+
+    @classmethod
+    def load(cls, model_dir: Union[str, Path, None] = None, num_threads: int = NUM_THREADS,
+             **kwargs) -> "OnnxPunctuationModel":
+        """Load the model from model_dir (default_model_dir() by default).
+
+        Raises:
+            RuntimeError: onnxruntime/tokenizers missing or model directory incomplete
+        """
+        if not ONNX_PUNCTUATION_AVAILABLE:
+            raise RuntimeError("onnxruntime and tokenizers are required for ONNX punctuation")
+        model_path = find_model(model_dir)
+        if model_path is None:
+            raise RuntimeError(f"ONNX punctuation model not found in {model_dir or default_model_dir()}")
+
+        t0 = time.perf_counter()
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(str(model_path), sess_options=options,
+                                       providers=["CPUExecutionProvider"])
+        tokenizer = Tokenizer.from_file(str(model_path.parent / "tokenizer.json"))
+        with open(model_path.parent / "config.json", encoding="utf-8") as f:
+            id2label = json.load(f)["id2label"]
+        labels = [id2label[str(i)] for i in range(len(id2label))]
+
+        model = cls(session, tokenizer, labels, **kwargs)
+        model.load_seconds = time.perf_counter() - t0
+        logger.info("PUNCTUATION_ONNX_LOADED | model=%s | threads=%d | load_ms=%.0f",
+                    model_path, num_threads, model.load_seconds * 1000)
+        return model
+
+    @staticmethod
+    def _special_ids(tokenizer) -> Tuple[int, int, int]:
+        for names in _SPECIAL_TOKENS:
+            ids = [tokenizer.token_to_id(name) for name in names]
+            if None not in ids:
+                return tuple(ids)
+        raise ValueError("tokenizer has no known CLS/SEP/PAD tokens")
+
+    def predict_labels(self, words: List[str]) -> List[str]:
+        """The predicted label (punctuation mark or "0") after each word."""
+        if not words:
+            self.last_windows = self.last_batches = 0
+            return []
+        encoding = self.tokenizer.encode(words, is_pretokenized=True, add_special_tokens=False)
+        ids = encoding.ids
+        word_ids = encoding.word_ids
+
+        spans = windows(len(ids), self.window - 2, self.overlap)
+        predictions = np.zeros(len(ids), dtype=np.int64)
+        batches = 0
+        for b in range(0, len(spans), self.batch_size):
+            batch = spans[b:b + self.batch_size]
+            logits = self._run(ids, batch)
+            batches += 1
+            for row, (start, end, keep_start, keep_end) in enumerate(batch):
+                # +1: the CLS token precedes the window's tokens
+                owned = logits[row, 1 + keep_start - start:1 + keep_end - start]
+                predictions[keep_start:keep_end] = owned.argmax(axis=-1)
+        self.last_windows = len(spans)
+        self.last_batches = batches
+
+        # A word's label is the prediction for its first subword
+        labels = ["0"] * len(words)
+        seen = set()
+        for pos, word_id in enumerate(word_ids):
+            if word_id is not None and word_id not in seen:
+                seen.add(word_id)
+                labels[word_id] = self.labels[predictions[pos]]
+        return labels
+
+    def _run(self, ids: List[int], batch: List[Tuple[int, int, int, int]]) -> np.ndarray:
+        width = max(end - start for start, end, _, _ in batch) + 2
+        input_ids = np.full((len(batch), width), self._pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(batch), width), dtype=np.int64)
+        for row, (start, end, _, _) in enumerate(batch):
+            input_ids[row, :end - start + 2] = [self._cls_id, *ids[start:end], self._sep_id]
+            attention_mask[row, :end - start + 2] = 1
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        return self.session.run(None, feeds)[0]
+
+    def restore_punctuation(self, text: str) -> str:
+        """Text with punctuation predicted after each word (same contract as
+        deepmultilingualpunctuation.PunctuationModel.restore_punctuation)."""
+        t0 = time.perf_counter()
+        words = _EXISTING_PUNCT.sub("", text).split()
+        labels = self.predict_labels(words)
+        result = " ".join(word if label == "0" else word + label for word, label in zip(words, labels))
+        elapsed = time.perf_counter() - t0
+        self.last_inference_seconds = elapsed
+        self.inference_seconds += elapsed
+        logger.debug("PUNCTUATION_ONNX_INFER | words=%d | windows=%d | batches=%d | infer_ms=%.1f",
+                     len(words), self.last_windows, self.last_batches, elapsed * 1000)
+        return result
@@ -103,12 +103,13 @@ class RemoteTranscriptionClient:
         logger.warning("No healthy servers available")
         return False
 
-    def transcribe_remote(self, audio: np.ndarray, sample_rate: int) -> str:
+    def transcribe_remote(self, audio: np.ndarray, sample_rate: int, cancel_event=None) -> str:
         """Transcribe audio using remote server.
 
         Args:
             audio: Audio data as numpy array
             sample_rate: Sample rate in Hz
+            cancel_event: Optional threading.Event; polling stops when set
 
         Returns:
             Transcribed text
@@ -132,7 +133,7 @@ class RemoteTranscriptionClient:
             logger.info(f"Saved audio to temporary file: {wav_path}")
 
             # Upload and wait for result
-            text = self._upload_and_wait(wav_path)
+            text = self._upload_and_wait(wav_path, cancel_event=cancel_event)
 
             logger.info(f"Remote transcription completed, text length: {len(text)}")
             return text
@@ -168,11 +169,12 @@ class RemoteTranscriptionClient:
         logger.debug(f"Saved temporary WAV: {path}")
         return Path(path)
 
-    def _upload_and_wait(self, wav_path: Path) -> str:
+    def _upload_and_wait(self, wav_path: Path, cancel_event=None) -> str:
         """Upload file to server and wait for transcription result.
 
         Args:
             wav_path: Path to WAV file
+            cancel_event: Optional threading.Event; polling stops when set
 
         Returns:
             Transcribed text
@@ -212,6 +214,9 @@ class RemoteTranscriptionClient:
         check_interval = 2.0  # seconds
 
         while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise Exception("Remote transcription cancelled")
+
             # Check timeout
             if time.time() - start_time > 300:  # 5 minute timeout
                 raise Exception("Transcription timeout (5 minutes)")
@@ -236,8 +241,11 @@ class RemoteTranscriptionClient:
                 error_msg = status.get("error", "Unknown error")
                 raise Exception(f"Transcription failed: {error_msg}")
 
-            # Wait before next check
-            time.sleep(check_interval)
+            # Wait before next check (wakes up early on cancellation)
+            if cancel_event is not None:
+                cancel_event.wait(check_interval)
+            else:
+                time.sleep(check_interval)
 
         # Step 3: Download result
         logger.info(f"Downloading result from {server_url}/result/{task_id}")
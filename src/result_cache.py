@@ -0,0 +1,111 @@
+"""LRU cache of transcription results keyed by audio content.
+
+Raw backend text is stored separately from post-processed text: the raw
+entry is keyed by the audio hash plus everything that affects decoding
+(backend, model, VAD settings), and each raw entry holds processed
+variants keyed by the post-processing settings. Changing the user
+dictionary therefore only reruns post-processing, and retrying unchanged
+audio with unchanged settings returns instantly.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict
+
+import numpy as np
+
+MAX_PROCESSED_VARIANTS = 4  # per raw entry (e.g. a few dictionary revisions)
+
+
+def hash_audio(audio: np.ndarray, sample_rate: int) -> str:
+    """Fast content hash of an audio buffer (blake2b, 128 bit)."""
+    data = np.ascontiguousarray(audio)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{data.dtype.str}|{data.shape}|{sample_rate}|".encode())
+    h.update(memoryview(data).cast("B"))
+    return h.hexdigest()
+
+
+def settings_key(settings: dict) -> str:
+    """Stable short key for a settings dictionary."""
+    blob = json.dumps(settings, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=8).hexdigest()
+
+
+@dataclass
+class _Entry:
+    raw_text: str
+    used_fallback: bool
+    processed: "OrderedDict[str, str]" = field(default_factory=OrderedDict)
+
+
+class ResultCache:
+    """Thread-safe LRU of raw and post-processed transcription results."""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits_processed = 0
+        self.hits_raw = 0
+        self.misses = 0
+
+    def get(self, audio_hash: str, decode_key: str, post_key: str):
+        """Look up a result.
+
+        Returns:
+            (raw_text, processed_text or None, used_fallback) on a raw hit,
+            None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get((audio_hash, decode_key))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((audio_hash, decode_key))
+            processed = entry.processed.get(post_key)
+            if processed is None:
+                self.hits_raw += 1
+            else:
+                entry.processed.move_to_end(post_key)
+                self.hits_processed += 1
+            return entry.raw_text, processed, entry.used_fallback
+
+    def put_raw(self, audio_hash: str, decode_key: str, raw_text: str, used_fallback: bool = False):
+        with self._lock:
+            key = (audio_hash, decode_key)
+            entry = self._entries.get(key)
+            if entry is None or entry.raw_text != raw_text:
+                self._entries[key] = _Entry(raw_text, used_fallback)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def put_processed(self, audio_hash: str, decode_key: str, post_key: str, text: str):
+        with self._lock:
+            entry = self._entries.get((audio_hash, decode_key))
+            if entry is None:
+                return
+            entry.processed[post_key] = text
+            entry.processed.move_to_end(post_key)
+            while len(entry.processed) > MAX_PROCESSED_VARIANTS:
+                entry.processed.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits_processed": self.hits_processed,
+                "hits_raw": self.hits_raw,
+                "misses": self.misses,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -477,6 +477,12 @@ class SettingsDialog(QDialog):
             case_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
             self.dictionary_table.setItem(row, 2, case_item)
 
+    def _sync_user_dictionary(self, added=(), removed=()):
+        """Push dictionary edits to the running transcriber (owned by the main window)."""
+        transcriber = getattr(self.parent(), "transcriber", None)
+        if transcriber is not None:
+            transcriber.update_user_dictionary(self.config.user_dictionary, added=added, removed=removed)
+
     def _filter_dictionary(self, text: str):
         search_text = text.lower()
         for row in range(self.dictionary_table.rowCount()):
@@ -495,8 +501,7 @@ class SettingsDialog(QDialog):
             self.config.user_dictionary.append(entry)
             self.config.save()
             self._update_dictionary_display()
-            if hasattr(self, 'transcriber'):
-                self.transcriber.set_user_dictionary(self.config.user_dictionary)
+            self._sync_user_dictionary(added=[entry])
 
     def _edit_dictionary_entry(self):
         selected = self.dictionary_table.selectedItems()
@@ -512,11 +517,11 @@ class SettingsDialog(QDialog):
         dialog = DictionaryEntryDialog(self, wrong, correct, case_sensitive)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             entry = dialog.get_entry()
+            old_entry = self.config.user_dictionary[row]
             self.config.user_dictionary[row] = entry
             self.config.save()
             self._update_dictionary_display()
-            if hasattr(self, 'transcriber'):
-                self.transcriber.set_user_dictionary(self.config.user_dictionary)
+            self._sync_user_dictionary(added=[entry], removed=[old_entry])
 
     def _delete_dictionary_entry(self):
         selected = self.dictionary_table.selectedItems()
@@ -534,11 +539,10 @@ class SettingsDialog(QDialog):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            del self.config.user_dictionary[row]
+            old_entry = self.config.user_dictionary.pop(row)
             self.config.save()
             self._update_dictionary_display()
-            if hasattr(self, 'transcriber'):
-                self.transcriber.set_user_dictionary(self.config.user_dictionary)
+            self._sync_user_dictionary(removed=[old_entry])
 
     def _import_dictionary(self):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -550,16 +554,17 @@ class SettingsDialog(QDialog):
                     imported = json.load(f)
 
                 existing_wrongs = {e.get("wrong") for e in self.config.user_dictionary}
+                added = []
                 for entry in imported:
                     wrong = entry.get("wrong")
                     if wrong and wrong not in existing_wrongs:
                         self.config.user_dictionary.append(entry)
                         existing_wrongs.add(wrong)
+                        added.append(entry)
 
                 self.config.save()
                 self._update_dictionary_display()
-                if hasattr(self, 'transcriber'):
-                    self.transcriber.set_user_dictionary(self.config.user_dictionary)
+                self._sync_user_dictionary(added=added)
 
                 QMessageBox.information(self, "Успех", f"Импортировано записей: {len(imported)}")
             except Exception as e:
@@ -0,0 +1,148 @@
+"""Per-stage timing of the transcription pipeline.
+
+Every pipeline stage (recorder stop, preprocessing, VAD, each decode chunk,
+each post-processing step, paste) is wrapped in stage("name"). Durations go
+into a rolling histogram per backend/model, queryable as p50/p95/p99 and
+exportable as JSON. A transcription wrapped in trace() additionally logs
+all of its stages in one compact STAGE_TIMINGS line.
+
+Stages run on several threads (UI, worker, hedge pool); the trace is
+thread-local, so only stages on the transcribing thread appear in the
+line, while the histograms see all of them.
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import numpy as np
+
+try:
+    from tracing import get_tracer
+except ImportError:  # imported as src.stage_timing (src not on sys.path)
+    from .tracing import get_tracer
+
+logger = logging.getLogger("transkribator")
+
+WINDOW = 1000          # samples kept per backend/model/stage
+PERCENTILES = (50, 95, 99)
+
+
+class StageTimings:
+    """Rolling per-stage duration samples, grouped by backend/model."""
+
+    def __init__(self, window: int = WINDOW):
+        self.window = window
+        self._samples: Dict[tuple, deque] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._labels = ("unknown", "unknown")
+
+    # --- recording -------------------------------------------------------
+
+    def set_labels(self, backend: str, model: str):
+        """Backend/model that stages outside a trace are attributed to."""
+        self._labels = (backend, model)
+
+    def record(self, stage: str, elapsed: float, backend: Optional[str] = None, model: Optional[str] = None):
+        current = getattr(self._local, "trace", None)
+        if backend is None or model is None:
+            backend, model = current["labels"] if current is not None else self._labels
+        with self._lock:
+            samples = self._samples.get((backend, model, stage))
+            if samples is None:
+                samples = self._samples[(backend, model, stage)] = deque(maxlen=self.window)
+            samples.append(elapsed)
+        if current is not None:
+            total, count = current["stages"].get(stage, (0.0, 0))
+            current["stages"][stage] = (total + elapsed, count + 1)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as stage `name` (recorded even on error).
+
+        Also a span of the thread's bound dictation trace when tracing is on.
+        """
+        t0 = time.perf_counter()
+        try:
+            with get_tracer().span(name):
+                yield
+        finally:
+            self.record(name, time.perf_counter() - t0)
+
+    @contextmanager
+    def trace(self, backend: str, model: str):
+        """Collect this thread's stages and log them as one STAGE_TIMINGS line.
+
+        Yields the stage dict {name: (total_sec, count)} so callers can inspect it.
+        """
+        outer = getattr(self._local, "trace", None)
+        current = {"labels": (backend, model), "stages": OrderedDict()}
+        self._local.trace = current
+        t0 = time.perf_counter()
+        try:
+            yield current["stages"]
+        finally:
+            self._local.trace = outer
+            if current["stages"]:
+                logger.info("STAGE_TIMINGS | backend=%s | model=%s | total=%.3fs | %s",
+                            backend, model, time.perf_counter() - t0,
+                            format_stages(current["stages"]))
+
+    # --- querying --------------------------------------------------------
+
+    def summary(self, backend: Optional[str] = None, model: Optional[str] = None) -> dict:
+        """Percentiles per backend/model and stage.
+
+        Returns:
+            {"backend/model": {stage: {"count", "mean", "p50", "p95", "p99"}}}
+            (seconds), optionally filtered to one backend and/or model
+        """
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._samples.items()]
+        result: Dict[str, dict] = {}
+        for (b, m, stage), samples in sorted(items):
+            if (backend is not None and b != backend) or (model is not None and m != model) or not samples:
+                continue
+            values = np.percentile(samples, PERCENTILES)
+            stats = {"count": len(samples), "mean": float(np.mean(samples))}
+            stats.update({f"p{p}": float(v) for p, v in zip(PERCENTILES, values)})
+            result.setdefault(f"{b}/{m}", {})[stage] = stats
+        return result
+
+    def export_json(self, path, include_samples: bool = True):
+        """Write the summary (and raw samples) to a JSON file."""
+        data = {"exported_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "summary": self.summary()}
+        if include_samples:
+            with self._lock:
+                data["samples"] = {f"{b}/{m}/{s}": list(v) for (b, m, s), v in self._samples.items()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+def format_stages(stages: Dict[str, tuple]) -> str:
+    """Compact 'name=0.123 chunk=0.700x3' rendering (seconds, xN if repeated)."""
+    parts = []
+    for name, (total, count) in stages.items():
+        parts.append(f"{name}={total:.3f}" + (f"x{count}" if count > 1 else ""))
+    return " ".join(parts)
+
+
+_timings = StageTimings()
+
+
+def get_stage_timings() -> StageTimings:
+    """The process-wide StageTimings instance."""
+    return _timings
+
+
+def stage(name: str):
+    """Time a block as a pipeline stage: `with stage("vad"): ...`"""
+    return _timings.stage(name)
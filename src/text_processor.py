@@ -1,6 +1,302 @@
 """Text post-processing module for improving transcription accuracy."""
+import functools
+import heapq
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from stage_timing import stage
+except ImportError:  # imported as src.text_processor (src not on sys.path)
+    from .stage_timing import stage
+
+
+# Rules up to this length only match whole words (\b...\b)
+WORD_BOUNDARY_MAX_LEN = 10
+
+_WORD_CHAR = re.compile(r'\w')
+
+
+class CorrectionMatcher:
+    """A corrections dictionary compiled into one prefix-trie regex.
+
+    The rules share prefixes in one pattern, so the text is scanned once
+    (one trie walk per position) instead of once per rule. Within the trie,
+    longer continuations are tried before ending, so at each position the
+    longest rule wins. Long rules (> WORD_BOUNDARY_MAX_LEN) are tried before
+    short ones, and short rules keep their \\b...\\b anchors. Replacements
+    are looked up by the lowercased match.
+
+    The rule-by-rule loop applies the rules longest first, each to the
+    previous one's output, so rules can interact: an output can complete a
+    later rule's match ("котик" -> "кот" -> ...), and of two overlapping
+    matches the longer rule wins, not the leftmost ("в в тече ние": "в в"
+    and "в тече ние"). Rules that can interact with another are worked out
+    per rule on first use. The single pass replaces the matches of the
+    other rules (whose order doesn't matter) and leaves interacting ones
+    for a second, rule-by-rule pass limited to the interacting rules found
+    in the text and the rules their outputs can feed. The result is the
+    loop's.
+    """
+
+    def __init__(self, corrections: Tuple[Tuple[str, str], ...]):
+        self.rule_count = len(corrections)
+        # Rule-by-rule order: longest first, ties in dictionary order
+        self._rules: List[Tuple[str, str]] = [
+            (wrong, correct) for wrong, correct in sorted(corrections, key=lambda x: len(x[0]), reverse=True)
+            if wrong
+        ]
+        self._keys = [wrong.lower() for wrong, _ in self._rules]
+        self._ids: Dict[str, List[int]] = {}  # lowercased rule -> its indices in _rules
+        for i, key in enumerate(self._keys):
+            self._ids.setdefault(key, []).append(i)
+        self._compiled: Dict[int, re.Pattern] = {}               # rule-by-rule patterns, on demand
+        self._links: Dict[int, Tuple[bool, List[int]]] = {}      # see _link()
+        long_rules = [w for w in self._ids if len(w) > WORD_BOUNDARY_MAX_LEN]
+        short_rules = [w for w in self._ids if len(w) <= WORD_BOUNDARY_MAX_LEN]
+        alternatives = []
+        if long_rules:
+            alternatives.append(_trie_regex(long_rules, end=''))
+        if short_rules:
+            alternatives.append(r'\b' + _trie_regex(short_rules, end=r'\b'))
+        self._pattern = self._scan = None
+        if alternatives:
+            regex = '|'.join(alternatives)
+            self._pattern = re.compile(regex, re.IGNORECASE)
+            # Longest rule at every position, overlapping matches included
+            self._scan = re.compile(f'(?=({regex}))', re.IGNORECASE)
+
+    def _rule_id(self, found: str) -> int:
+        """Index of the first rule (in loop order) matching the text found."""
+        ids = self._ids.get(found.lower())
+        if ids is None:  # case-insensitive match that str.lower() doesn't map back
+            for key, ids in self._ids.items():
+                if re.fullmatch(re.escape(key), found, re.IGNORECASE):
+                    break
+        return ids[0]
+
+    def sub(self, text: str) -> str:
+        """Apply all rules to text: one pass, plus one for interacting rules found."""
+        if self._pattern is None:
+            return text
+        deferred = False
+
+        def replace(match: re.Match) -> str:
+            nonlocal deferred
+            i = self._rule_id(match.group())
+            if self._link(i)[0]:
+                deferred = True
+                return match.group()
+            return self._rules[i][1]
+
+        text = self._pattern.sub(replace, text)
+        return self._sub_in_order(text) if deferred else text
+
+    def _sub_in_order(self, text: str) -> str:
+        """The rule-by-rule loop over the interacting rules in text (and the
+        rules they feed)."""
+        pending = set()
+        for match in self._scan.finditer(text):
+            # Rules matching here: the longest one and those it starts with
+            key = self._keys[self._rule_id(match.group(1))]
+            for n in range(1, len(key) + 1):
+                pending.update(i for i in self._ids.get(key[:n], ()) if self._link(i)[0])
+        heap = list(pending)
+        heapq.heapify(heap)
+        while heap:
+            i = heapq.heappop(heap)
+            replaced = self._rule_pattern(i).sub(self._rules[i][1], text)
+            if replaced != text:
+                text = replaced
+                for j in self._link(i)[1]:
+                    if j not in pending:
+                        pending.add(j)
+                        heapq.heappush(heap, j)
+        return text
+
+    def _anchored(self, i: int) -> bool:
+        return len(self._rules[i][0]) <= WORD_BOUNDARY_MAX_LEN
+
+    def _rule_pattern(self, i: int) -> re.Pattern:
+        pattern = self._compiled.get(i)
+        if pattern is None:
+            regex = re.escape(self._rules[i][0])
+            if self._anchored(i):
+                regex = r'\b' + regex + r'\b'
+            pattern = self._compiled[i] = re.compile(regex, re.IGNORECASE)
+        return pattern
+
+    def _link(self, i: int) -> Tuple[bool, List[int]]:
+        """(whether rule i can interact with any rule, the later rules its
+        output can make match). O(rules), cached.
+
+        Rule i interacts if its matches can overlap another rule's, or an
+        output can make or break a match: its output and any rule's match
+        (its own included), or an earlier rule's output and its match.
+        Otherwise applying it out of order is safe.
+        """
+        link = self._links.get(i)
+        if link is not None:
+            return link
+        key, anchored = self._keys[i], self._anchored(i)
+        left, right = self._match_context(i)
+        interacts = False
+        feeds = []
+        for j, other in enumerate(self._keys):
+            other_anchored = self._anchored(j)
+            touches = self._output_touches(i, other, other_anchored)
+            if touches and j > i:
+                feeds.append(j)
+            if not interacts:
+                interacts = (touches
+                             or (j != i and can_overlap(key, left, right, other, other_anchored))
+                             or (j < i and self._output_touches(j, key, anchored)))
+        link = self._links[i] = (interacts, feeds)
+        return link
+
+    def _match_context(self, i: int) -> Tuple[Optional[bool], Optional[bool]]:
+        """Word-ness of the characters around a match of rule i, if known."""
+        if not self._anchored(i):
+            return None, None
+        key = self._keys[i]
+        return not _is_word(key[0]), not _is_word(key[-1])
+
+    def _output_touches(self, i: int, key: str, anchored: bool) -> bool:
+        """Whether rule i's output can make or break a match of key."""
+        wrong, out = self._keys[i], self._rules[i][1].lower()
+        # An output whose edges differ in word-ness from the rule can make
+        # or break a whole-word match next to it
+        if anchored and (not out or _is_word(out[0]) != _is_word(wrong[0])
+                         or _is_word(out[-1]) != _is_word(wrong[-1])):
+            return True
+        return can_overlap(out, *self._match_context(i), key, anchored)
+
+
+def _is_word(ch: str) -> bool:
+    return _WORD_CHAR.match(ch) is not None
+
+
+def can_overlap(text: str, left: Optional[bool], right: Optional[bool], key: str, anchored: bool) -> bool:
+    """Whether a match of key can share characters with text.
+
+    left/right: word-ness of the characters just outside text (None if
+    unknown). A whole-word key needs a possible \\b at both of its ends.
+    """
+    if not text or not set(text) & set(key):
+        return False
+    n, m = len(text), len(key)
+
+    def word_at(pos: int, offset: int) -> Optional[bool]:
+        if 0 <= pos < n:
+            return _is_word(text[pos])
+        if 0 <= pos - offset < m:
+            return _is_word(key[pos - offset])
+        return left if pos == -1 else right if pos == n else None
+
+    for offset in range(1 - m, n):  # key starts at text[offset]
+        lo, hi = max(0, offset), min(n, offset + m)
+        if text[lo:hi] != key[lo - offset:hi - offset]:
+            continue
+        if offset < 0 and left is not None and _is_word(key[-1 - offset]) != left:
+            continue
+        if offset + m > n and right is not None and _is_word(key[n - offset]) != right:
+            continue
+        if anchored:
+            before, after = word_at(offset - 1, offset), word_at(offset + m, offset)
+            if before is not None and before == _is_word(key[0]):
+                continue
+            if after is not None and after == _is_word(key[-1]):
+                continue
+        return True
+    return False
+
+
+def _trie_regex(words: List[str], end: str) -> str:
+    """Regex matching the longest of `words` (followed by `end`) at a position."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[None] = True
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in node.items() if ch is not None]
+        if None in node:
+            branches.append(end)  # tried last: longer rules win
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return build(trie)
+
+
+_QUANTIFIERS = '*+?{'
+_SPECIAL = '.^$[]|\\'
+
+
+def required_literal(pattern: str) -> str:
+    """Longest literal substring any match of `pattern` must contain ('' if unknown).
+
+    Used to skip a regex cheaply (`literal not in text`) when it can't match.
+    Conservative: only text outside groups counts; escapes other than \\b,
+    classes and quantified chars end a literal run; alternation gives up.
+    """
+    if '|' in pattern:
+        return ''
+    runs, current = [], []
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\':
+            nxt = pattern[i + 1:i + 2]
+            i += 2
+            if nxt != 'b':  # \b is zero-width and doesn't break the run
+                runs.append(''.join(current))
+                current = []
+            continue
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == '[':
+            end = pattern.find(']', i + 2)
+            i = end if end != -1 else len(pattern)
+        elif ch in _QUANTIFIERS:
+            if current:
+                current.pop()  # the quantified char is optional/repeated
+            if ch == '{':
+                i = pattern.find('}', i) if '}' in pattern[i:] else len(pattern)
+        elif ch not in _SPECIAL and depth == 0:
+            current.append(ch)
+            i += 1
+            continue
+        runs.append(''.join(current))
+        current = []
+        i += 1
+    runs.append(''.join(current))
+    return max(runs, key=len)
+
+
+def compile_pattern_rules(patterns: List[Tuple]) -> List[Tuple]:
+    """(compiled, replacement, required literal) for (pattern, replacement) rules."""
+    rules = []
+    for pattern, replacement in patterns:
+        compiled = re.compile(pattern)
+        literal = '' if compiled.flags & re.IGNORECASE else required_literal(pattern)
+        rules.append((compiled, replacement, literal))
+    return rules
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_corrections(corrections: Tuple[Tuple[str, str], ...]) -> CorrectionMatcher:
+    return CorrectionMatcher(corrections)
+
+
+def compile_corrections(corrections: Dict[str, str]) -> CorrectionMatcher:
+    """CorrectionMatcher for a corrections dict, shared by processors with
+    the same rules."""
+    return _compile_corrections(tuple(corrections.items()))
 
 
 class TextProcessor:
@@ -134,16 +430,20 @@ class TextProcessor:
             return text
 
         # Step 1: Fix common errors
-        text = self._fix_errors(text)
+        with stage("fix_errors"):
+            text = self._fix_errors(text)
 
         # Step 2: Fix punctuation
-        text = self._fix_punctuation(text)
+        with stage("fix_punctuation"):
+            text = self._fix_punctuation(text)
 
         # Step 3: Fix capitalization
-        text = self._fix_capitalization(text)
+        with stage("capitalization"):
+            text = self._fix_capitalization(text)
 
         # Step 4: Final cleanup
-        text = self._cleanup(text)
+        with stage("cleanup"):
+            text = self._cleanup(text)
 
         return text
 
@@ -283,7 +583,8 @@ class AdvancedTextProcessor(TextProcessor):
             return text
 
         # Apply contextual corrections first
-        text = self._fix_contextual_errors(text)
+        with stage("contextual"):
+            text = self._fix_contextual_errors(text)
 
         # Then apply standard processing
         return super().process(text)
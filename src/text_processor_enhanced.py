@@ -1,11 +1,17 @@
 """Enhanced text post-processing with punctuation restoration for Sherpa-ONNX."""
 import logging
-import re
-from typing import Dict, List, Tuple, Optional
+import threading
+import time
+from typing import Callable, Dict, List, Tuple, Optional
 
 logger = logging.getLogger("transkribator")
 
-from text_processor import TextProcessor
+from morph_singleton import release_morph
+from punctuation_onnx import ONNX_PUNCTUATION_AVAILABLE, OnnxPunctuationModel, find_model
+from stage_timing import stage
+from text_processor import TextProcessor, compile_corrections, compile_pattern_rules
+from text_tokens import capitalize_sentences, serialize, tokenize
+from user_dictionary import UserDictionaryMatcher
 
 try:
     from deepmultilingualpunctuation import PunctuationModel
@@ -34,18 +40,18 @@ except ImportError:
 
 # Import proper noun corrections
 try:
-    from proper_nouns import ProperNounDict
+    from proper_nouns import get_proper_noun_dict
     PROPER_NOUNS_AVAILABLE = True
 except ImportError:
     PROPER_NOUNS_AVAILABLE = False
-    ProperNounDict = None
+    get_proper_noun_dict = None
     logger.info("PROPER_NOUNS_MODULE_NOT_AVAILABLE")
 
 
 class EnhancedTextProcessor(TextProcessor):
     """Enhanced text processor with punctuation restoration and Sherpa-specific corrections."""
 
-    def __init__(self, language: str = "ru", enable_corrections: bool = True, enable_punctuation: bool = True, enable_phonetics: bool = True, enable_morphology: bool = True, enable_proper_nouns: bool = True, backend: str = "sherpa", user_dictionary: list = None):
+    def __init__(self, language: str = "ru", enable_corrections: bool = True, enable_punctuation: bool = True, enable_phonetics: bool = True, enable_morphology: bool = True, enable_proper_nouns: bool = True, backend: str = "sherpa", user_dictionary: list = None, capabilities=None):
         """
         Initialize enhanced text processor.
 
@@ -58,41 +64,56 @@ class EnhancedTextProcessor(TextProcessor):
             enable_proper_nouns: Whether to enable proper noun capitalization
             backend: Backend type for adaptive processing ("whisper", "sherpa", "podlodkaturbo")
             user_dictionary: User-defined correction entries [{"wrong": str, "correct": str, "case_sensitive": bool}]
+            capabilities: BackendCapabilities of the model producing the text; stages
+                its output already covers are skipped (None = judge by backend name)
         """
         self.language = language
         self.backend = backend.lower()
         self.enable_corrections = enable_corrections
         self.user_dictionary = user_dictionary or []
+        self._user_matcher = UserDictionaryMatcher(self.user_dictionary)
 
         # Configure processing flags based on backend type
-        self._configure_for_backend(enable_phonetics, enable_morphology, enable_proper_nouns)
+        self._configure_for_backend(enable_phonetics, enable_morphology, enable_proper_nouns, capabilities)
 
         self._load_corrections()
 
         # Pre-compile regex patterns for performance
         self._compile_patterns()
 
-        # Punctuation model will be loaded lazily on first use
+        # Punctuation model is loaded by preload_punctuation() or on first use
         self.punctuation_model = None
 
-        # Lazy-init: components created on first process() call to avoid
-        # ~200ms pymorphy2 startup cost at application launch
+        # Lazy-init: components created on first process() call (or by the
+        # background warmup, see warmup_steps()) to avoid ~200ms pymorphy2
+        # startup cost at application launch
         self.phonetic_corrector = None
         self.morphology_corrector = None
         self.proper_nouns = None
         self._components_initialized = False
+        self._initialized_components = set()
+        # Held while a component or the punctuation model loads, so the
+        # warmup thread and process() never load the same one twice
+        self._load_lock = threading.RLock()
 
-    def _configure_for_backend(self, enable_phonetics: bool, enable_morphology: bool, enable_proper_nouns: bool):
-        """Configure processing flags based on backend type.
+    def _configure_for_backend(self, enable_phonetics: bool, enable_morphology: bool, enable_proper_nouns: bool,
+                               capabilities=None):
+        """Configure processing flags based on backend type and capabilities.
 
         Different backends produce different output quality:
         - Whisper: Has punctuation, capitalization (minimal processing needed)
         - Sherpa/Podlodka: Raw lowercase text (full processing needed)
+        - Models declaring punctuation (e.g. giga-am-v3-ru-punct) skip
+          punctuation restoration
+
+        Capitalization always runs: corrections replace words case-insensitively
+        with lowercase forms, which can lowercase a sentence start.
 
         Args:
             enable_phonetics: Base preference for phonetic corrections
             enable_morphology: Base preference for morphological corrections
             enable_proper_nouns: Base preference for proper noun capitalization
+            capabilities: BackendCapabilities of the model (None = unknown)
         """
         if self.backend == "whisper":
             # Whisper already provides punctuation and capitalization
@@ -108,6 +129,10 @@ class EnhancedTextProcessor(TextProcessor):
             self.enable_phonetics = enable_phonetics and PHONETICS_AVAILABLE
             self.enable_morphology = enable_morphology and MORPHOLOGY_AVAILABLE
 
+        # Never restore punctuation on already punctuated output
+        if capabilities is not None and capabilities.punctuation:
+            self.enable_punctuation = False
+
         # Proper nouns are useful for all backends
         self.enable_proper_nouns = enable_proper_nouns and PROPER_NOUNS_AVAILABLE
 
@@ -420,34 +445,48 @@ class EnhancedTextProcessor(TextProcessor):
     # _english_corrections() inherited from TextProcessor
 
     def _compile_patterns(self):
-        """Pre-compile regex patterns for error correction to improve performance."""
-        self._compiled_patterns = []
-
-        # Sort corrections by length (longest first) for proper matching
-        sorted_corrections = sorted(self.corrections.items(), key=lambda x: len(x[0]), reverse=True)
-
-        # Pre-compile all patterns
-        for wrong, correct in sorted_corrections:
-            if len(wrong) <= 10:
-                pattern = re.compile(r'\b' + re.escape(wrong) + r'\b', re.IGNORECASE)
-            else:
-                pattern = re.compile(re.escape(wrong), re.IGNORECASE)
-            self._compiled_patterns.append((pattern, correct))
+        """Compile the corrections into one single-pass matcher (cached across
+        instances) and the punctuation/phrase patterns once per instance."""
+        self._corrections_matcher = compile_corrections(self.corrections)
+        self._pattern_rules = compile_pattern_rules(self.pattern_corrections)
 
     def _ensure_components(self):
         """Lazy-init phonetic, morphology, and proper noun components on first use."""
         if self._components_initialized:
             return
+        for name in ("phonetics", "morphology", "proper_nouns"):
+            self._ensure_component(name)
         self._components_initialized = True
 
-        if self.enable_phonetics and PhoneticCorrector is not None:
-            self.phonetic_corrector = PhoneticCorrector(enable_validation=True)
-
-        if self.enable_morphology and MorphologyCorrector is not None:
-            self.morphology_corrector = MorphologyCorrector()
-
-        if self.enable_proper_nouns and ProperNounDict is not None:
-            self.proper_nouns = ProperNounDict()
+    def _ensure_component(self, name: str):
+        """Create one lazily initialized component (thread-safe)."""
+        with self._load_lock:
+            if name in self._initialized_components:
+                return
+            if name == "phonetics" and self.enable_phonetics and PhoneticCorrector is not None:
+                self.phonetic_corrector = PhoneticCorrector(enable_validation=True)
+            elif name == "morphology" and self.enable_morphology and MorphologyCorrector is not None:
+                self.morphology_corrector = MorphologyCorrector()
+            elif name == "proper_nouns" and self.enable_proper_nouns and get_proper_noun_dict is not None:
+                self.proper_nouns = get_proper_noun_dict()
+            self._initialized_components.add(name)
+
+    def warmup_steps(self) -> List[Tuple[str, Callable[[], object]]]:
+        """(name, load) for each heavy component not loaded yet, in the order
+        process() needs them; run by warmup.ComponentWarmup in the background."""
+        steps = []
+        enabled = {
+            "phonetics": self.enable_phonetics and PhoneticCorrector is not None,
+            "morphology": self.enable_morphology and MorphologyCorrector is not None,
+            "proper_nouns": self.enable_proper_nouns and get_proper_noun_dict is not None,
+        }
+        for name, needed in enabled.items():
+            if needed and name not in self._initialized_components:
+                steps.append((name, lambda name=name: self._ensure_component(name)))
+        punctuation_available = ONNX_PUNCTUATION_AVAILABLE or PUNCTUATION_AVAILABLE
+        if self.enable_punctuation and punctuation_available and self.punctuation_model is None:
+            steps.append(("punctuation", self.preload_punctuation))
+        return steps
 
     def process(self, text: str) -> str:
         """
@@ -465,32 +504,53 @@ class EnhancedTextProcessor(TextProcessor):
         self._ensure_components()
 
         # Step 1: Fix common errors
-        text = self._fix_errors(text)
+        with stage("fix_errors"):
+            text = self._fix_errors(text)
+
+        # Steps 2-3 work on words: tokenize once for both
+        run_phonetics = self.enable_phonetics and self.phonetic_corrector
+        run_morphology = self.enable_morphology and self.morphology_corrector
+        if run_phonetics or run_morphology:
+            tokens = tokenize(text)
 
-        # Step 2: Phonetic corrections (voiced/unvoiced consonants)
-        if self.enable_phonetics and self.phonetic_corrector:
-            text = self.phonetic_corrector.process(text)
+            # Step 2: Phonetic corrections (voiced/unvoiced consonants)
+            if run_phonetics:
+                with stage("phonetics"):
+                    self.phonetic_corrector.process_tokens(tokens)
 
-        # Step 3: Morphological corrections (gender agreement, case endings)
-        if self.enable_morphology and self.morphology_corrector:
-            text = self._fix_morphology(text)
+            # Step 3: Morphological corrections (gender agreement, case endings)
+            if run_morphology:
+                with stage("morphology"):
+                    self.morphology_corrector.process_tokens(tokens)
 
-        # Step 4: Add punctuation (for CTC models like Sherpa)
+            text = serialize(tokens)
+
+        # Step 4: Add punctuation (for CTC models like Sherpa); a model
+        # not preloaded yet is loaded (and timed) separately from inference
         if self.enable_punctuation:
-            text = self._add_punctuation(text)
+            self.preload_punctuation()
+            with stage("punctuation"):
+                text = self._add_punctuation(text)
 
         # Step 5: Fix punctuation placement
-        text = self._fix_punctuation(text)
+        with stage("fix_punctuation"):
+            text = self._fix_punctuation(text)
+
+        # Steps 6-8 work on words again
+        tokens = tokenize(text)
 
         # Step 6: Fix capitalization
-        text = self._fix_capitalization(text)
+        with stage("capitalization"):
+            capitalize_sentences(tokens)
 
         # Step 7: Proper noun capitalization
         if self.enable_proper_nouns and self.proper_nouns:
-            text = self.proper_nouns.capitalize_known(text)
+            with stage("proper_nouns"):
+                self.proper_nouns.capitalize_tokens(tokens)
 
         # Step 8: Final cleanup
-        text = self._cleanup(text)
+        with stage("cleanup"):
+            text = self._cleanup(serialize(tokens))
 
         return text
 
@@ -502,11 +562,8 @@ class EnhancedTextProcessor(TextProcessor):
         # Apply user dictionary corrections FIRST (highest priority)
         text = self._apply_user_dictionary(text)
 
-        # Apply pre-compiled corrections (already sorted by length)
-        for pattern, correct in self._compiled_patterns:
-            text = pattern.sub(correct, text)
-
-        return text
+        # Apply built-in corrections in one pass, longest match first
+        return self._corrections_matcher.sub(text)
 
     def _apply_user_dictionary(self, text: str) -> str:
         """Apply user-defined correction entries.
@@ -520,33 +577,59 @@ class EnhancedTextProcessor(TextProcessor):
         Returns:
             Text with user corrections applied
         """
-        if not self.user_dictionary:
-            return text
+        return self._user_matcher.apply(text)
+
+    def release_models(self):
+        """Drop the punctuation model, the phonetic and morphology correctors
+        and the shared pymorphy2 analyzer and parse cache; all are lazily
+        reloaded on next use (or by the warmup, see warmup_steps())."""
+        with self._load_lock:
+            self.punctuation_model = None
+            self.phonetic_corrector = None
+            self.morphology_corrector = None
+            self._initialized_components -= {"phonetics", "morphology"}
+            self._components_initialized = False
+        release_morph()
+
+    def preload_punctuation(self) -> bool:
+        """Load the punctuation model now (e.g. at startup) instead of during
+        the first dictation. The load is timed as stage "punctuation_load".
 
-        for entry in self.user_dictionary:
-            wrong = entry.get("wrong", "")
-            correct = entry.get("correct", "")
-            case_sensitive = entry.get("case_sensitive", False)
+        Returns:
+            Whether a punctuation model is ready
+        """
+        if not self.enable_punctuation or not (ONNX_PUNCTUATION_AVAILABLE or PUNCTUATION_AVAILABLE):
+            return False
+        if self.punctuation_model is None:
+            with self._load_lock:
+                if self.punctuation_model is None:
+                    with stage("punctuation_load"):
+                        self.punctuation_model = self._load_punctuation_model()
+        return self.punctuation_model is not None
 
-            if not wrong or not correct:
-                continue
+    def _load_punctuation_model(self):
+        """The exported ONNX model if present, else deepmultilingualpunctuation.
 
-            if case_sensitive:
-                # Case-sensitive exact replacement
-                text = text.replace(wrong, correct)
-            else:
-                # Case-insensitive replacement
-                # Use word boundaries for single words, no boundaries for phrases
-                if " " in wrong:
-                    # Phrase replacement - no word boundaries
-                    pattern = re.compile(re.escape(wrong), re.IGNORECASE)
-                    text = pattern.sub(correct, text)
-                else:
-                    # Single word - use word boundaries
-                    pattern = re.compile(r'\b' + re.escape(wrong) + r'\b', re.IGNORECASE)
-                    text = pattern.sub(correct, text)
+        Returns:
+            Model with restore_punctuation(text), or None if none could be loaded
+        """
+        if ONNX_PUNCTUATION_AVAILABLE and find_model() is not None:
+            try:
+                return OnnxPunctuationModel.load()
+            except Exception as e:
+                logger.warning("PUNCTUATION_ONNX_LOAD_FAILED | %s", e)
 
-        return text
+        if not PUNCTUATION_AVAILABLE:
+            return None
+        try:
+            logger.info("PUNCTUATION_MODEL_LOADING")
+            t0 = time.perf_counter()
+            model = PunctuationModel()
+            logger.info("PUNCTUATION_MODEL_LOADED | load_ms=%.0f", (time.perf_counter() - t0) * 1000)
+            return model
+        except Exception as e:
+            logger.warning("PUNCTUATION_MODEL_LOAD_FAILED | %s", e)
+            return None
 
     def set_user_dictionary(self, user_dictionary: list):
         """Update user dictionary entries.
@@ -555,6 +638,18 @@ class EnhancedTextProcessor(TextProcessor):
             user_dictionary: List of {"wrong": str, "correct": str, "case_sensitive": bool} entries
         """
         self.user_dictionary = user_dictionary or []
+        self._user_matcher = UserDictionaryMatcher(self.user_dictionary)
+
+    def update_user_dictionary(self, user_dictionary: list, added: list = (), removed: list = ()):
+        """Apply user dictionary edits to the compiled matcher without rebuilding it.
+
+        Args:
+            user_dictionary: The full, already updated entry list
+            added: Entries added (an edit is the old entry removed and the new one added)
+            removed: Entries removed
+        """
+        self.user_dictionary = user_dictionary or []
+        self._user_matcher.update(self.user_dictionary, added, removed)
 
     def _fix_morphology(self, text: str) -> str:
         """Apply morphological corrections using pymorphy2.
@@ -583,19 +678,9 @@ class EnhancedTextProcessor(TextProcessor):
 
     def _add_punctuation(self, text: str) -> str:
         """Restore punctuation using ML model."""
-        if not self.enable_punctuation or not PUNCTUATION_AVAILABLE:
-            return text
-
         # Lazy load punctuation model on first use
-        if self.punctuation_model is None:
-            try:
-                logger.info("PUNCTUATION_MODEL_LOADING")
-                self.punctuation_model = PunctuationModel()
-                logger.info("PUNCTUATION_MODEL_LOADED")
-            except Exception as e:
-                logger.warning("PUNCTUATION_MODEL_LOAD_FAILED | %s", e)
-                self.punctuation_model = None
-                return text
+        if not self.preload_punctuation():
+            return text
 
         try:
             # Process with punctuation model
@@ -606,12 +691,15 @@ class EnhancedTextProcessor(TextProcessor):
             return text
 
     def _fix_punctuation(self, text: str) -> str:
-        """Fix punctuation issues."""
-        for pattern, replacement in self.pattern_corrections:
-            if callable(replacement):
-                text = re.sub(pattern, replacement, text)
-            else:
-                text = re.sub(pattern, replacement, text)
+        """Fix punctuation issues and phrase patterns.
+
+        Patterns whose required literal isn't in the text are skipped
+        without running the regex.
+        """
+        for pattern, replacement, literal in self._pattern_rules:
+            if literal and literal not in text:
+                continue
+            text = pattern.sub(replacement, text)
 
         return text
 
@@ -624,54 +712,18 @@ class EnhancedTextProcessor(TextProcessor):
         - Capitalization after sentence-ending punctuation (., !, ?)
         - Multiple punctuation (!!, ??, !?)
         - Ellipsis (...)
-        - Quotes/parens after punctuation
-        - Multiple spaces after punctuation
+        - Opening quotes/parens
+        - Punctuation without a space after it ("слово.другое")
+        - Multiple spaces (normalized to one)
+
+        See text_tokens.capitalize_sentences.
         """
         if not text:
             return text
 
-        # Step 1: Ensure first letter is capitalized
-        text = text[0].upper() + text[1:] if text else text
-
-        # Step 2: Capitalize after sentence endings with proper space handling
-        # Pattern: punctuation followed by space(s) and lowercase letter
-
-        # Single sentence endings (. ! ?)
-        # Match: punctuation + spaces + lowercase letter
-        text = re.sub(r'([.!?])\s+([а-яa-z])', lambda m: m.group(1) + ' ' + m.group(2).upper(), text)
-
-        # Multiple punctuation (!!, ??, !?!, ???, etc.)
-        # Match: multiple punctuation + spaces + lowercase letter
-        text = re.sub(r'([.!?]{2,})\s+([а-яa-z])', lambda m: m.group(1) + ' ' + m.group(2).upper(), text)
-
-        # Step 3: Handle ellipsis (...) as sentence ending
-        # Ellipsis followed by space and lowercase letter should capitalize
-        text = re.sub(r'(\.\.\.)\s+([а-яa-z])', lambda m: m.group(1) + ' ' + m.group(2).upper(), text)
-
-        # Step 4: Handle punctuation without space (e.g., "word.Next")
-        # This adds space and capitalizes
-        text = re.sub(r'([.!?])([а-яa-z])', lambda m: m.group(1) + ' ' + m.group(2).upper(), text)
-
-        # Step 5: Handle multiple spaces after punctuation (normalize to single space)
-        text = re.sub(r'([.!?])\s{2,}', r'\1 ', text)
-
-        # Step 6: Ensure first letter after opening quote/paren is capitalized
-        # e.g., ("hello") -> ("Hello")
-        text = re.sub(r'([("\'])\s*([а-яa-z])', lambda m: m.group(1) + m.group(2).upper(), text)
-
-        # Step 7: Handle quotes/parens immediately after punctuation without space
-        # e.g., "word."next" -> "word." Next"
-        # e.g., "word!"next" -> "word!" Next"
-        text = re.sub(r'([.!?])([)"\'])([а-яa-z])', lambda m: m.group(1) + m.group(2) + ' ' + m.group(3).upper(), text)
-
-        # Step 8: Handle parentheses after punctuation with space
-        # e.g., "word. (hello)" -> "word. (Hello)"
-        text = re.sub(r'([.!?])\s+(\()([а-яa-z])', lambda m: m.group(1) + ' ' + m.group(2) + m.group(3).upper(), text)
-
-        # Final cleanup: normalize multiple spaces to single space
-        text = re.sub(r'\s{2,}', ' ', text)
-
-        return text
+        tokens = tokenize(text)
+        capitalize_sentences(tokens)
+        return serialize(tokens)
 
     def _cleanup(self, text: str) -> str:
         """Final cleanup of text."""
@@ -686,7 +738,9 @@ class EnhancedTextProcessor(TextProcessor):
     def add_correction(self, wrong: str, correct: str):
         """Add a custom correction rule."""
         self.corrections[wrong] = correct
+        self._compile_patterns()
 
     def add_corrections(self, corrections: Dict[str, str]):
         """Add multiple custom correction rules."""
         self.corrections.update(corrections)
+        self._compile_patterns()
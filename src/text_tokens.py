@@ -0,0 +1,119 @@
+"""Shared tokenization for word-level post-processing stages.
+
+The text is split once on whitespace into Tokens; word-level stages
+(phonetics, morphology, capitalization, proper nouns) annotate and rewrite
+the tokens in place, and serialize() joins them back with single spaces.
+
+Each token separates the punctuation around a word from the word itself:
+"(москве)," -> lead "(", word "москве", trail "),". Punctuation inside a
+word stays part of it ("кто-то", "т.е").
+"""
+import re
+from typing import List
+
+# Leading non-word chars, the word, trailing non-word chars
+_PARTS = re.compile(r'(\W*)(.*?)(\W*)', re.DOTALL)
+
+# Places inside a chunk where a new sentence starts without a space:
+# "слово.другое", "(слово.)другое"
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])(?=[а-яa-z])|(?<=[.!?]\))(?=[а-яa-z])')
+
+_CYRILLIC_WORD = re.compile(r'[а-яА-ЯёЁ]+')
+_PLAIN_WORD = re.compile(r'\w+')
+
+SENTENCE_END = '.!?'
+OPENING = '("\''
+
+
+class Token:
+    """One whitespace-separated chunk: lead + word + trail."""
+
+    __slots__ = ('lead', 'word', 'trail', 'lower', 'sentence_start')
+
+    def __init__(self, lead: str, word: str, trail: str):
+        self.lead = lead
+        self.word = word
+        self.trail = trail
+        self.lower = word.lower()
+        self.sentence_start = False
+
+    @classmethod
+    def parse(cls, chunk: str) -> 'Token':
+        lead, word, trail = _PARTS.fullmatch(chunk).groups()
+        return cls(lead, word, trail)
+
+    def set_word(self, word: str):
+        self.word = word
+        self.lower = word.lower()
+
+    @property
+    def is_cyrillic(self) -> bool:
+        """Word is Cyrillic letters only (candidate for phonetic fixes)."""
+        return _CYRILLIC_WORD.fullmatch(self.word) is not None
+
+    @property
+    def is_plain(self) -> bool:
+        """Word has no punctuation inside (candidate for dictionary lookups)."""
+        return _PLAIN_WORD.fullmatch(self.word) is not None
+
+    def last_char(self) -> str:
+        return (self.trail or self.word or self.lead)[-1:]
+
+    def __str__(self) -> str:
+        return self.lead + self.word + self.trail
+
+    def __repr__(self) -> str:
+        return f"Token({self.lead!r}, {self.word!r}, {self.trail!r})"
+
+
+def tokenize(text: str) -> List[Token]:
+    """Split text on whitespace into Tokens."""
+    return [Token.parse(chunk) for chunk in text.split()]
+
+
+def serialize(tokens: List[Token]) -> str:
+    """Join tokens back into text with single spaces."""
+    return ' '.join(str(tok) for tok in tokens)
+
+
+def split_sentences(tokens: List[Token]):
+    """Split tokens where a sentence starts without a space ("слово.другое"),
+    in place."""
+    if not _SENTENCE_SPLIT.search(serialize(tokens)):  # split points never touch a space
+        return
+    result = []
+    for tok in tokens:
+        chunk = str(tok)
+        if _SENTENCE_SPLIT.search(chunk):
+            result.extend(Token.parse(part) for part in _SENTENCE_SPLIT.split(chunk))
+        else:
+            result.append(tok)
+    tokens[:] = result
+
+
+def capitalize_sentences(tokens: List[Token]):
+    """Mark sentence starts and capitalize their first letter, in place.
+
+    A word starts a sentence when it opens the text, follows sentence-ending
+    punctuation (optionally closed by a paren), or follows an opening paren
+    or quote. Quotes are opening when they lead a word or stand alone, so
+    a closing quote ('"да" и') or one inside a word ("д'артаньян") doesn't
+    start a sentence.
+    """
+    split_sentences(tokens)
+    previous = None
+    for tok in tokens:
+        if tok.lead:
+            start = tok.lead[-1] in OPENING
+        elif previous is None:
+            start = True
+        else:
+            before = previous.last_char()
+            tail = previous.trail[-2:]
+            start = (before in SENTENCE_END
+                     or (before in OPENING and not previous.word)
+                     or (len(tail) == 2 and tail[0] in SENTENCE_END and tail[1] == ')'))
+        tok.sentence_start = start
+        if start and tok.word[:1].islower():
+            tok.set_word(tok.word[0].upper() + tok.word[1:])
+        previous = tok
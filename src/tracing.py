@@ -0,0 +1,213 @@
+"""Lightweight end-to-end latency tracing.
+
+One trace per dictation, from the stop hotkey through AudioRecorder.stop,
+the worker thread, Transcriber.transcribe and the pipeline stages, back to
+_done and the paste. Spans carry the thread they ran on, so Qt signal hops
+and thread handoffs are visible. The last N traces are kept in memory and
+can be exported in Chrome trace-event format (chrome://tracing, Perfetto);
+each trace shows up as its own process row.
+
+Enable with TRANSKRIBATOR_TRACE=1. When disabled, span() returns a shared
+no-op context manager, so instrumented code pays one attribute check.
+
+Spans find their trace either from an explicit trace_id or from the id
+bound to the current thread with bind(); threads that pick up work for a
+dictation (worker, hedge pool) bind its id.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List, Optional
+
+logger = logging.getLogger("transkribator")
+
+TRACE_ENV = "TRANSKRIBATOR_TRACE"
+MAX_TRACES = 20
+MAX_EVENTS_PER_TRACE = 2000
+
+
+class _NullSpan:
+    """No-op span used when tracing is disabled or there is no trace."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Trace:
+    def __init__(self, trace_id: int, name: str, start_us: float, args: dict):
+        self.trace_id = trace_id
+        self.name = name
+        self.start_us = start_us
+        self.end_us: Optional[float] = None
+        self.args = args
+        self.events: List[dict] = []
+        self.threads = {}  # tid -> thread name
+
+
+class _Span:
+    def __init__(self, tracer: "Tracer", trace_id: int, name: str, args: dict):
+        self._tracer = tracer
+        self._trace_id = trace_id
+        self._name = name
+        self._args = args
+
+    def __enter__(self):
+        self._start = self._tracer.now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        args = self._args
+        if exc_type is not None:
+            args = dict(args, error=exc_type.__name__)
+        self._tracer._add(self._trace_id, {
+            "name": self._name, "ph": "X", "ts": self._start,
+            "dur": self._tracer.now_us() - self._start, "args": args,
+        })
+        return False
+
+
+class Tracer:
+    """Ring buffer of per-dictation traces."""
+
+    def __init__(self, enabled: bool = False, max_traces: int = MAX_TRACES):
+        self.enabled = enabled
+        self.max_traces = max_traces
+        self._traces: "OrderedDict[int, _Trace]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_id = 1
+        self._epoch = time.perf_counter()
+
+    def now_us(self) -> float:
+        return (time.perf_counter() - self._epoch) * 1e6
+
+    # --- traces ----------------------------------------------------------
+
+    def start_trace(self, name: str = "dictation", start_us: Optional[float] = None, **args) -> Optional[int]:
+        """Open a new trace; returns its id (None when disabled).
+
+        start_us (now_us() clock) backdates the start, e.g. to a key press
+        noted on another thread before the trace could be opened.
+        """
+        if not self.enabled:
+            return None
+        if start_us is None:
+            start_us = self.now_us()
+        with self._lock:
+            trace_id = self._next_id
+            self._next_id += 1
+            self._traces[trace_id] = _Trace(trace_id, name, start_us, args)
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+        self._add(trace_id, {"name": "trace_start", "ph": "i", "s": "t", "ts": start_us, "args": args})
+        return trace_id
+
+    def end_trace(self, trace_id: Optional[int], **args):
+        """Close a trace and log its total latency."""
+        if trace_id is None or not self.enabled:
+            return
+        self.instant("trace_end", trace_id, **args)
+        with self._lock:
+            trace = self._traces.get(trace_id)
+            if trace is None or trace.end_us is not None:
+                return
+            trace.end_us = self.now_us()
+            total_ms = (trace.end_us - trace.start_us) / 1000
+            spans = len(trace.events)
+        logger.info("TRACE_DONE | trace=%d | name=%s | total=%.1fms | events=%d",
+                    trace_id, trace.name, total_ms, spans)
+
+    # --- spans -----------------------------------------------------------
+
+    def current_trace_id(self) -> Optional[int]:
+        return getattr(self._local, "trace_id", None)
+
+    @contextmanager
+    def bind(self, trace_id: Optional[int]):
+        """Attribute spans opened on this thread to trace_id."""
+        previous = getattr(self._local, "trace_id", None)
+        self._local.trace_id = trace_id
+        try:
+            yield
+        finally:
+            self._local.trace_id = previous
+
+    def span(self, name: str, trace_id: Optional[int] = None, **args):
+        """Context manager timing a span of the given (or bound) trace."""
+        if not self.enabled:
+            return _NULL_SPAN
+        if trace_id is None:
+            trace_id = getattr(self._local, "trace_id", None)
+            if trace_id is None:
+                return _NULL_SPAN
+        return _Span(self, trace_id, name, args)
+
+    def instant(self, name: str, trace_id: Optional[int] = None, **args):
+        """Record a point-in-time event."""
+        if not self.enabled:
+            return
+        if trace_id is None:
+            trace_id = getattr(self._local, "trace_id", None)
+            if trace_id is None:
+                return
+        self._add(trace_id, {"name": name, "ph": "i", "s": "t", "ts": self.now_us(), "args": args})
+
+    def _add(self, trace_id: int, event: dict):
+        thread = threading.current_thread()
+        event["tid"] = thread.ident
+        with self._lock:
+            trace = self._traces.get(trace_id)
+            if trace is None or len(trace.events) >= MAX_EVENTS_PER_TRACE:
+                return  # evicted from the ring buffer, or runaway
+            trace.threads[thread.ident] = thread.name
+            trace.events.append(event)
+
+    # --- export ----------------------------------------------------------
+
+    def chrome_events(self, last_n: Optional[int] = None) -> List[dict]:
+        """Trace events of the last N traces (pid = trace id)."""
+        with self._lock:
+            traces = list(self._traces.values())
+            if last_n is not None:
+                traces = traces[-last_n:] if last_n > 0 else []
+            snapshot = [(t, list(t.events), dict(t.threads)) for t in traces]
+        events = []
+        for trace, trace_events, threads in snapshot:
+            label = f"{trace.name} #{trace.trace_id}"
+            events.append({"name": "process_name", "ph": "M", "pid": trace.trace_id,
+                           "args": {"name": label}})
+            for tid, thread_name in threads.items():
+                events.append({"name": "thread_name", "ph": "M", "pid": trace.trace_id,
+                               "tid": tid, "args": {"name": thread_name}})
+            for event in trace_events:
+                events.append(dict(event, pid=trace.trace_id, cat="transkribator"))
+        return events
+
+    def export_chrome(self, path, last_n: Optional[int] = None) -> int:
+        """Write the last N traces as Chrome trace JSON. Returns the event count."""
+        events = self.chrome_events(last_n)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        return len(events)
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+
+
+_tracer = Tracer(enabled=os.environ.get(TRACE_ENV, "").lower() in ("1", "true", "yes"))
+
+
+def get_tracer() -> Tracer:
+    """The process-wide Tracer (enabled by TRANSKRIBATOR_TRACE=1)."""
+    return _tracer
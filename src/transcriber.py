@@ -4,15 +4,23 @@ Supports multiple speech recognition backends:
 - WhisperBackend: OpenAI Whisper (faster-whisper or openai-whisper)
 - SherpaBackend: Sherpa-ONNX with GigaAM models (optimized for Russian)
 """
+import functools
 import gc
 import logging
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable, Optional, Tuple
 import numpy as np
 
 from crash_reporter import get_reporter
+from backends.model_manager import get_model_manager
+from result_cache import ResultCache, hash_audio, settings_key
+from stage_timing import get_stage_timings, stage
+from profiling import get_profiler
+from tracing import get_tracer
 
 logger = logging.getLogger("transkribator")
 
@@ -25,6 +33,39 @@ try:
 except ImportError:
     ENHANCED_PROCESSOR_AVAILABLE = False
 from backends import get_backend, BaseBackend
+from backends.base import PartialTranscription, TranscriptionCheckpoint
+from backends.segmentation import StreamingSegmenter
+from incremental_processor import IncrementalTextProcessor
+
+
+def _traced(method):
+    """Log the per-stage timings of one Transcriber call as STAGE_TIMINGS
+    (and record it as a span of the thread's dictation trace, and as a
+    profile when profiling is enabled)."""
+    name = method.__name__.lstrip("_")
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with get_tracer().span(name, backend=self.backend_name), \
+                get_profiler().profile(name, backend=self.backend_name, model=self.model_size), \
+                get_stage_timings().trace(self.backend_name, self.model_size):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+@dataclass
+class _SegmentSession:
+    """State of one speculative recording session."""
+    segmenter: StreamingSegmenter
+    sample_rate: int
+    segments: list = field(default_factory=list)
+    futures: list = field(default_factory=list)
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    audio_sec: float = 0.0
+    used_fallback: bool = False
+    stop_time: float = 0.0
+    decoded_before_stop: int = 0
+    preview: Optional[IncrementalTextProcessor] = None
 
 
 class Transcriber:
@@ -46,6 +87,15 @@ class Transcriber:
         min_speech_duration_ms: int = 500,
         # User dictionary
         user_dictionary: list = None,
+        # Podlodka assisted decoding
+        assistant_model: Optional[str] = None,
+        # Host the backend in a child process
+        out_of_process: bool = False,
+        worker_timeout_sec: Optional[float] = None,
+        # Result cache (0 = disabled)
+        result_cache_size: int = 32,
+        # RAM budget for resident models (None = leave the manager's budget)
+        model_ram_budget_mb: Optional[float] = None,
     ):
         """
         Initialize transcriber with specified backend.
@@ -63,6 +113,13 @@ class Transcriber:
             min_silence_duration_ms: Min silence duration for VAD (ms)
             min_speech_duration_ms: Min speech duration for VAD (ms)
             user_dictionary: User-defined correction entries
+            assistant_model: Draft model id for Podlodka assisted decoding (None = off)
+            out_of_process: Run the backend in a persistent child process that
+                can be killed on timeout (see inference_worker)
+            worker_timeout_sec: Per-request timeout for the child (None = scale with audio)
+            result_cache_size: Number of clips whose results are cached (0 = off)
+            model_ram_budget_mb: RAM budget of the shared ModelManager; models
+                of previous backends stay loaded within it (0 = unload them)
         """
         self.backend_name = backend
         self.model_size = model_size
@@ -80,53 +137,84 @@ class Transcriber:
         # User dictionary for custom corrections
         self.user_dictionary = user_dictionary or []
 
+        # Draft model for assisted decoding (podlodka-turbo only)
+        self.assistant_model = assistant_model
+
+        # Out-of-process inference
+        self.out_of_process = out_of_process
+        self.worker_timeout_sec = worker_timeout_sec
+
         # Fallback tracking
         self.last_used_fallback = False
 
         self._backend = None
+        self._backend_key = None  # ModelManager key of self._backend (pinned)
+        self._models = get_model_manager()
+        if model_ram_budget_mb is not None:
+            self._models.set_budget(model_ram_budget_mb)
         self._lock = threading.Lock()
         self._cancel_event = threading.Event()
+        # Held around every backend decode: a cancelled call still running in
+        # the background finishes before the next one starts on the model
+        self._decode_lock = threading.Lock()
+        self._preload_thread: Optional[threading.Thread] = None
 
-        # Initialize text processor
-        lang_code = language if language != "auto" else "ru"
+        # Speculative segment pipeline (see start_segmented)
+        self._segment_executor: Optional[ThreadPoolExecutor] = None
+        self._segment_session: Optional[_SegmentSession] = None
 
-        # Use EnhancedTextProcessor for Sherpa backend (better punctuation)
-        # Use AdvancedTextProcessor for Whisper (already has punctuation)
-        if backend == "sherpa" and ENHANCED_PROCESSOR_AVAILABLE:
-            self.text_processor = EnhancedTextProcessor(
-                language=lang_code,
-                enable_corrections=enable_post_processing,
-                enable_punctuation=True,  # Enable punctuation restoration
-                user_dictionary=self.user_dictionary,
-            )
-        else:
-            self.text_processor = AdvancedTextProcessor(
-                language=lang_code,
-                enable_corrections=enable_post_processing
-            )
+        # Raw/post-processed results of recent clips (retries, repeated audio)
+        self._result_cache = ResultCache(result_cache_size) if result_cache_size > 0 else None
+
+        # Initialize text processor
+        self.text_processor = self._make_text_processor(
+            enhanced=backend == "sherpa",
+            capabilities=get_backend(backend).capabilities_for(model_size),
+            enable_corrections=enable_post_processing,
+        )
 
         # NOW set enable_post_processing (after text_processor is initialized)
         self._enable_post_processing = enable_post_processing
 
         # Create backend instance
         self._create_backend()
+        get_stage_timings().set_labels(self.backend_name, self.model_size)
 
     def _create_backend(self):
         """Create backend instance based on configuration."""
         try:
             backend_class = get_backend(self.backend_name)
-            self._backend = backend_class(
+            extra_kwargs = {}
+            if self.backend_name == "podlodka-turbo":
+                extra_kwargs["assistant_model"] = self.assistant_model
+            backend_kwargs = dict(
                 model_size=self.model_size,
                 device=self.device,
                 compute_type=self.compute_type,
                 language=self.language or "auto",
-                on_progress=self.on_progress,
                 # VAD config
                 vad_enabled=self.vad_enabled,
                 vad_threshold=self.vad_threshold,
                 min_silence_duration_ms=self.min_silence_duration_ms,
                 min_speech_duration_ms=self.min_speech_duration_ms,
+                **extra_kwargs,
             )
+            def factory():
+                if self.out_of_process:
+                    from inference_worker import ProcessBackend
+                    return ProcessBackend(
+                        backend_class,
+                        backend_kwargs,
+                        on_progress=self.on_progress,
+                        request_timeout=self.worker_timeout_sec,
+                    )
+                return backend_class(on_progress=self.on_progress, **backend_kwargs)
+
+            # Same class and settings -> same (possibly still loaded) instance
+            key = (backend_class, "out-of-process" if self.out_of_process else "in-process",
+                   settings_key(backend_kwargs))
+            self._backend = self._models.get(key, factory, pin=True)
+            self._backend_key = key
 
         except Exception as e:
             if self.on_progress:
@@ -143,7 +231,8 @@ class Transcriber:
 
         Saves old state before switching. If new backend fails to load,
         restores old backend, processor, and config. Old backend is only
-        unloaded after new one is confirmed working.
+        released after new one is confirmed working; the ModelManager keeps
+        it loaded while the RAM budget allows, so switching back is instant.
 
         Args:
             backend: New backend name (whisper, sherpa, podlodka-turbo)
@@ -154,6 +243,7 @@ class Transcriber:
             old_backend_name = self.backend_name
             old_model_size = self.model_size
             old_backend_instance = self._backend
+            old_backend_key = self._backend_key
             old_processor = self.text_processor
 
             cr = get_reporter()
@@ -169,19 +259,11 @@ class Transcriber:
                     self.model_size = model_size
 
                 # Recreate text processor for new backend
-                lang_code = self.language or "ru"
-                if backend == "sherpa" and ENHANCED_PROCESSOR_AVAILABLE:
-                    self.text_processor = EnhancedTextProcessor(
-                        language=lang_code,
-                        enable_corrections=self._enable_post_processing,
-                        enable_punctuation=True,
-                        user_dictionary=self.user_dictionary,
-                    )
-                else:
-                    self.text_processor = AdvancedTextProcessor(
-                        language=lang_code,
-                        enable_corrections=self._enable_post_processing
-                    )
+                self.text_processor = self._make_text_processor(
+                    enhanced=backend == "sherpa",
+                    capabilities=get_backend(backend).capabilities_for(self.model_size),
+                    enable_corrections=self._enable_post_processing,
+                )
 
                 # Create new backend (may raise)
                 self._create_backend()
@@ -193,24 +275,254 @@ class Transcriber:
                 self.backend_name = old_backend_name
                 self.model_size = old_model_size
                 self._backend = old_backend_instance
+                self._backend_key = old_backend_key
                 self.text_processor = old_processor
                 raise
 
-            # Success: unload old backend now
-            if old_backend_instance and old_backend_instance is not self._backend:
-                try:
-                    old_backend_instance.unload_model()
-                except Exception as e:
-                    logger.warning("UNLOAD_OLD_BACKEND_FAILED | error=%s", e)
+            get_stage_timings().set_labels(self.backend_name, self.model_size)
+
+            # Success: release old backend (unloaded now or when evicted)
+            if old_backend_key is not None:
+                self._models.unpin(old_backend_key)
+
+    def _switch_processor_for_fallback(self):
+        """If Groq fell back to Sherpa, use EnhancedTextProcessor for proper
+        punctuation restoration (Sherpa CTC output has no punctuation)."""
+        if self.last_used_fallback and self.backend_name == "groq" and ENHANCED_PROCESSOR_AVAILABLE:
+            if not isinstance(self.text_processor, EnhancedTextProcessor):
+                self.text_processor = self._make_text_processor(
+                    enhanced=True,
+                    capabilities=getattr(self._backend, "fallback_capabilities", None),
+                    enable_corrections=self._enable_post_processing,
+                )
+                logger.info("GROQ_FALLBACK_PROCESSOR_SWITCH | switched to EnhancedTextProcessor")
+
+    def _make_text_processor(self, enhanced: bool, capabilities, enable_corrections: bool):
+        """Build the post-processing pipeline for a backend's output.
+
+        EnhancedTextProcessor (Russian corrections, user dictionary) for Sherpa
+        output, AdvancedTextProcessor otherwise. Stages the model's output
+        already covers (its BackendCapabilities) are skipped, so the
+        punctuation model never runs on punctuated output.
+        """
+        lang_code = self.language or "ru"
+        if enhanced and ENHANCED_PROCESSOR_AVAILABLE:
+            return EnhancedTextProcessor(
+                language=lang_code,
+                enable_corrections=enable_corrections,
+                user_dictionary=self.user_dictionary,
+                capabilities=capabilities,
+            )
+        return AdvancedTextProcessor(
+            language=lang_code,
+            enable_corrections=enable_corrections
+        )
+
+    def _post_process(self, text: str) -> str:
+        """Apply post-processing to improve text quality."""
+        if self.enable_post_processing and self.text_processor:
+            with stage("post_process"):
+                return self.text_processor.process(text)
+        return text
+
+    def _decode_key(self) -> str:
+        """Everything that changes the raw backend output for the same audio."""
+        return settings_key({
+            "backend": self.backend_name,
+            "model": self.model_size,
+            "device": self.device,
+            "compute_type": self.compute_type,
+            "language": self.language,
+            "vad": [self.vad_enabled, self.vad_threshold,
+                    self.min_silence_duration_ms, self.min_speech_duration_ms],
+            "assistant_model": self.assistant_model,
+        })
+
+    def _post_key(self) -> str:
+        """Everything that changes post-processing of the same raw text."""
+        return settings_key({
+            "enabled": self._enable_post_processing,
+            "processor": type(self.text_processor).__name__ if self.text_processor else None,
+            "punctuation": getattr(self.text_processor, "enable_punctuation", None),
+            "language": self.language,
+            "user_dictionary": self.user_dictionary,
+        })
+
+    def _cache_result(self, audio_hash: Optional[str], raw_text: str, text: str):
+        """Store a finished result (fallback output is not cached, so a retry
+        gets another chance at the primary backend)."""
+        if self._result_cache is None or audio_hash is None or not raw_text or self.last_used_fallback:
+            return
+        decode_key = self._decode_key()
+        self._result_cache.put_raw(audio_hash, decode_key, raw_text)
+        self._result_cache.put_processed(audio_hash, decode_key, self._post_key(), text)
 
     def cancel(self):
-        """Signal cancellation for long-running transcription."""
+        """Signal cancellation for long-running transcription.
+
+        Only the transcribe() call in progress is affected; a segment session
+        belongs to one dictation and is cancelled with cancel_segmented(session).
+        """
         self._cancel_event.set()
 
+    # --- Speculative segment pipeline ---------------------------------------
+    #
+    # While recording, closed speech segments are decoded in the background
+    # (raw backend text only). At stop only the last open segment remains;
+    # the texts are merged in order and post-processed once, so the wait
+    # after stop no longer grows with the dictation length.
+
+    def start_segmented(self, sample_rate: int = 16000):
+        """Begin a speculative session; feed it with feed_audio()."""
+        self.cancel_segmented()
+        if self._backend is None:
+            self._create_backend()
+        if self._segment_executor is None:
+            # One thread: backends are not used concurrently
+            self._segment_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="segment-decode")
+        self._segment_session = _SegmentSession(StreamingSegmenter(sample_rate), sample_rate)
+        logger.info("SEGMENTED_START | backend=%s | sr=%d", self.backend_name, sample_rate)
+
+    @property
+    def segmented_active(self) -> bool:
+        return self._segment_session is not None
+
+    def feed_audio(self, chunk: np.ndarray):
+        """Feed recorder audio; closed segments start decoding immediately."""
+        session = self._segment_session
+        if session is None:
+            return
+        for segment in session.segmenter.feed(chunk):
+            self._submit_segment(session, segment)
+
+    def _submit_segment(self, session: "_SegmentSession", segment: np.ndarray):
+        index = len(session.futures)
+        session.audio_sec += len(segment) / session.sample_rate
+        session.segments.append(segment)
+        session.futures.append(
+            self._segment_executor.submit(self._decode_segment, session, index, segment)
+        )
+
+    def _decode_segment(self, session: "_SegmentSession", index: int, segment: np.ndarray) -> Optional[str]:
+        """Raw backend text for one segment (None on failure)."""
+        if session.cancel_event.is_set():
+            return ""
+        self._wait_for_preload()
+        t0 = time.time()
+        try:
+            with self._decode_lock:
+                text, _ = self._backend.transcribe(segment, session.sample_rate, cancel_event=session.cancel_event)
+                used_fallback = getattr(self._backend, 'last_used_fallback', False)
+        except Exception as e:
+            logger.warning("SEGMENT_DECODE_FAILED | segment=%d | error=%s", index, e)
+            return None
+        if used_fallback:
+            session.used_fallback = True
+        logger.info("SEGMENT_DECODED | segment=%d | audio=%.1fs | elapsed=%.2fs | chars=%d",
+                    index, len(segment) / session.sample_rate, time.time() - t0, len(text))
+        return text
+
+    def preview_segmented(self) -> str:
+        """Post-processed text of the segments decoded so far, for a live
+        preview while recording.
+
+        Only the text after the last stable sentence boundary is processed
+        again on each call; finish_segmented() still post-processes the
+        whole text once, so the final result is unaffected.
+        """
+        session = self._segment_session
+        if session is None:
+            return ""
+        texts = []
+        for future in session.futures:
+            if not future.done() or future.result() is None:
+                break  # keep the preview append-only: stop at the first gap
+            texts.append(future.result())
+        raw_text = " ".join(t for t in texts if t)
+        if not (self.enable_post_processing and self.text_processor):
+            return raw_text
+        if session.preview is None or session.preview.processor is not self.text_processor:
+            session.preview = IncrementalTextProcessor(self.text_processor)
+        with stage("post_process_preview"):
+            return session.preview.update(raw_text)
+
+    def stop_segmented(self) -> Optional[_SegmentSession]:
+        """End input: queue the open tail and detach the session.
+
+        A new session may start right away; finish the returned one with
+        finish_segmented(session).
+        """
+        session = self._segment_session
+        if session is None:
+            return None
+        self._segment_session = None
+        session.stop_time = time.time()
+        session.decoded_before_stop = sum(1 for f in session.futures if f.done())
+        tail = session.segmenter.flush()
+        if len(tail) >= 0.1 * session.sample_rate:
+            self._submit_segment(session, tail)
+        return session
+
+    @_traced
+    def finish_segmented(
+        self,
+        session: Optional[_SegmentSession] = None,
+        audio: Optional[np.ndarray] = None,
+    ) -> Tuple[str, float]:
+        """Wait for all segments, merge them in order and post-process once.
+
+        Args:
+            session: Session from stop_segmented() (default: stop the current one)
+            audio: Full recording; if given, the result is cached for it so a
+                retry of the same clip returns instantly
+
+        Returns:
+            Tuple of (text, seconds spent after stop)
+        """
+        if session is None:
+            session = self.stop_segmented()
+            if session is None:
+                return "", 0.0
+        texts = [f.result() for f in session.futures]
+        for i, text in enumerate(texts):
+            if text is None and not session.cancel_event.is_set():
+                # One synchronous retry for segments that failed in the background
+                logger.info("SEGMENT_RETRY | segment=%d", i)
+                texts[i] = self._decode_segment(session, i, session.segments[i]) or ""
+
+        if session.cancel_event.is_set():
+            logger.info("SEGMENTED_CANCELLED | segments=%d", len(texts))
+            return "", 0.0
+
+        self.last_used_fallback = session.used_fallback
+        self._switch_processor_for_fallback()
+        raw_text = " ".join(t for t in texts if t)
+        text = self._post_process(raw_text)
+        if audio is not None and self._result_cache is not None:
+            self._cache_result(hash_audio(audio, session.sample_rate), raw_text, text)
+
+        elapsed = time.time() - session.stop_time
+        logger.info("SEGMENTED_DONE | backend=%s | segments=%d | decoded_before_stop=%d | audio=%.1fs | "
+                    "after_stop=%.2fs | words=%d",
+                    self.backend_name, len(texts), session.decoded_before_stop, session.audio_sec,
+                    elapsed, len(text.split()))
+        return text, elapsed
+
+    def cancel_segmented(self, session: Optional[_SegmentSession] = None):
+        """Drop a speculative session (default: the one being recorded)."""
+        if session is None:
+            session = self._segment_session
+            self._segment_session = None
+        if session is not None:
+            session.cancel_event.set()
+            logger.info("SEGMENTED_DROPPED | segments=%d", len(session.futures))
+
+    @_traced
     def transcribe(
         self,
         audio: np.ndarray,
-        sample_rate: int = 16000
+        sample_rate: int = 16000,
+        cancel_event: Optional[threading.Event] = None,
     ) -> Tuple[str, float]:
         """
         Transcribe audio data.
@@ -218,14 +530,19 @@ class Transcriber:
         Args:
             audio: Audio data as numpy array
             sample_rate: Sample rate of the audio
+            cancel_event: Cancels this call only (default: the shared event
+                set by cancel(), cleared on entry)
 
         Returns:
             Tuple of (transcribed text, processing time in seconds)
         """
-        self._cancel_event.clear()
+        if cancel_event is None:
+            cancel_event = self._cancel_event
+            cancel_event.clear()
 
         if self._backend is None:
             self._create_backend()
+        self._wait_for_preload()
 
         audio_duration = len(audio) / sample_rate
         cr = get_reporter()
@@ -237,33 +554,31 @@ class Transcriber:
         start_time = time.time()
 
         try:
-            # Transcribe using backend (pass cancel event for chunked processing)
-            text, backend_time = self._backend.transcribe(audio, sample_rate, cancel_event=self._cancel_event)
+            audio_hash = hash_audio(audio, sample_rate) if self._result_cache is not None else None
+            if audio_hash is not None:
+                cached = self._result_cache.get(audio_hash, self._decode_key(), self._post_key())
+                if cached is not None:
+                    return self._from_cache(audio_hash, cached, start_time)
 
-            # Track if Groq fell back to Sherpa
-            self.last_used_fallback = getattr(self._backend, 'last_used_fallback', False)
-
-            # If Groq fell back to Sherpa, use EnhancedTextProcessor for proper
-            # punctuation restoration (Sherpa CTC output has no punctuation)
-            if self.last_used_fallback and self.backend_name == "groq" and ENHANCED_PROCESSOR_AVAILABLE:
-                if not isinstance(self.text_processor, EnhancedTextProcessor):
-                    lang_code = self.language or "ru"
-                    self.text_processor = EnhancedTextProcessor(
-                        language=lang_code,
-                        enable_corrections=self._enable_post_processing,
-                        enable_punctuation=True,
-                        user_dictionary=self.user_dictionary,
-                    )
-                    logger.info("GROQ_FALLBACK_PROCESSOR_SWITCH | switched to EnhancedTextProcessor")
+            # Transcribe using backend (pass cancel event for chunked processing)
+            with self._decode_lock:
+                if cancel_event.is_set():
+                    logger.info("TRANSCRIBE_CANCELLED | backend=%s", self.backend_name)
+                    return "", 0.0
+                text, backend_time = self._backend.transcribe(audio, sample_rate, cancel_event=cancel_event)
+                # Track if Groq fell back to Sherpa
+                self.last_used_fallback = getattr(self._backend, 'last_used_fallback', False)
+            raw_text = text
+            self._switch_processor_for_fallback()
 
             # Check cancellation after transcription
-            if self._cancel_event.is_set():
+            if cancel_event.is_set():
                 logger.info("TRANSCRIBE_CANCELLED | backend=%s", self.backend_name)
                 return "", 0.0
 
             # Apply post-processing to improve text quality
-            if self.enable_post_processing and self.text_processor:
-                text = self.text_processor.process(text)
+            text = self._post_process(text)
+            self._cache_result(audio_hash, raw_text, text)
 
             process_time = time.time() - start_time
             logger.info("TRANSCRIBE_DONE | backend=%s | audio=%.1fs | elapsed=%.2fs (RTF=%.2f) | words=%d | \"%s\"",
@@ -280,6 +595,96 @@ class Transcriber:
                 self.on_progress(f"Error: {e}")
             return "", 0.0
 
+    def _from_cache(self, audio_hash: str, cached, start_time: float) -> Tuple[str, float]:
+        """Serve a cache hit; rerun only post-processing if its settings changed."""
+        raw_text, text, used_fallback = cached
+        self.last_used_fallback = used_fallback
+        kind = "processed"
+        if text is None:
+            kind = "raw"
+            text = self._post_process(raw_text)
+            self._result_cache.put_processed(audio_hash, self._decode_key(), self._post_key(), text)
+        elapsed = time.time() - start_time
+        logger.info("TRANSCRIBE_CACHE_HIT | backend=%s | kind=%s | elapsed=%.3fs | words=%d",
+                    self.backend_name, kind, elapsed, len(text.split()))
+        return text, elapsed
+
+    def transcribe_with_deadline(
+        self,
+        audio: np.ndarray,
+        sample_rate: int = 16000,
+        timeout_sec: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> PartialTranscription:
+        """
+        Transcribe, keeping finished work if the deadline passes or the call is cancelled.
+
+        Args:
+            audio: Audio data as numpy array
+            sample_rate: Sample rate of the audio
+            timeout_sec: Time budget in seconds from the call (None = no deadline)
+            cancel_event: Cancels this call only (default: the shared event
+                set by cancel(), cleared on entry)
+
+        Returns:
+            PartialTranscription with post-processed text of the completed
+            chunks, completeness ratio, and a checkpoint for resume() unless
+            everything was decoded
+        """
+        return self._run_partial(audio, sample_rate, timeout_sec, None, cancel_event)
+
+    def resume(
+        self,
+        checkpoint: TranscriptionCheckpoint,
+        timeout_sec: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> PartialTranscription:
+        """Continue a partial transcription from its checkpoint.
+
+        The returned text covers all chunks decoded so far, including those
+        from earlier calls.
+        """
+        return self._run_partial(None, checkpoint.sample_rate, timeout_sec, checkpoint, cancel_event)
+
+    @_traced
+    def _run_partial(self, audio, sample_rate, timeout_sec, checkpoint, cancel_event=None) -> PartialTranscription:
+        # The budget includes waiting for the model
+        deadline = time.monotonic() + timeout_sec if timeout_sec is not None else None
+        if cancel_event is None:
+            cancel_event = self._cancel_event
+            cancel_event.clear()
+        if self._backend is None:
+            self._create_backend()
+        self._wait_for_preload()
+        resumed_from = checkpoint.completeness if checkpoint is not None else 0.0
+
+        start_time = time.time()
+        audio_hash = None
+        if checkpoint is None and self._result_cache is not None:
+            audio_hash = hash_audio(audio, sample_rate)
+            cached = self._result_cache.get(audio_hash, self._decode_key(), self._post_key())
+            if cached is not None:
+                text, elapsed = self._from_cache(audio_hash, cached, start_time)
+                return PartialTranscription(text=text, completeness=1.0, elapsed=elapsed)
+
+        with self._decode_lock:
+            result = self._backend.transcribe_partial(
+                audio, sample_rate, deadline=deadline, cancel_event=cancel_event, checkpoint=checkpoint
+            )
+            self.last_used_fallback = getattr(self._backend, 'last_used_fallback', False)
+        self._switch_processor_for_fallback()
+        raw_text = result.text
+        if result.text:
+            result.text = self._post_process(result.text)
+        if result.complete:
+            self._cache_result(audio_hash, raw_text, result.text)
+
+        logger.info("TRANSCRIBE_PARTIAL | backend=%s | completeness=%.0f%% (from %.0f%%) | elapsed=%.2fs | "
+                    "complete=%s | words=%d",
+                    self.backend_name, result.completeness * 100, resumed_from * 100,
+                    result.elapsed, result.complete, len(result.text.split()))
+        return result
+
     def transcribe_file(self, filepath: Path) -> Tuple[str, float]:
         """Transcribe an audio file."""
         try:
@@ -302,7 +707,11 @@ class Transcriber:
         t0 = time.time()
         try:
             if self._backend:
-                self._backend.load_model()
+                with get_profiler().profile("load_model", backend=self.backend_name, model=self.model_size):
+                    if self._backend_key is not None and self._models.contains(self._backend_key):
+                        self._models.ensure_loaded(self._backend_key)
+                    else:
+                        self._backend.load_model()
                 logger.info("MODEL_LOAD_DONE | backend=%s | elapsed=%.2fs", self.backend_name, time.time() - t0)
                 return True
             return False
@@ -311,6 +720,53 @@ class Transcriber:
                           self.backend_name, time.time() - t0, e, exc_info=True)
             return False
 
+    def preload(self, on_done: Optional[Callable[[bool, float], None]] = None) -> bool:
+        """Load the model in the background (e.g. while the user is recording).
+
+        Decoding waits for the load instead of starting a second one.
+
+        Args:
+            on_done: Called from the loader thread with (success, elapsed_sec)
+
+        Returns:
+            False if the model is already loaded or a load is in progress
+        """
+        with self._lock:
+            if self.is_loaded or (self._preload_thread is not None and self._preload_thread.is_alive()):
+                return False
+
+            def _load():
+                t0 = time.time()
+                success = self.load_model()
+                if on_done is not None:
+                    on_done(success, time.time() - t0)
+
+            self._preload_thread = threading.Thread(target=_load, name="model-preload", daemon=True)
+            self._preload_thread.start()
+            return True
+
+    def warmup_steps(self) -> list:
+        """(name, load) steps warming the post-processing components in the
+        background (see warmup.ComponentWarmup)."""
+        processor = self.text_processor
+        if processor is None or not hasattr(processor, "warmup_steps"):
+            return []
+        return processor.warmup_steps()
+
+    def _wait_for_preload(self):
+        thread = self._preload_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def trim_memory(self) -> None:
+        """Free everything that can be reloaded on demand: the backend model,
+        models of previous backends and the post-processing ML models."""
+        self._wait_for_preload()
+        self.unload_model()
+        self._models.evict_unpinned()
+        if self.text_processor and hasattr(self.text_processor, 'release_models'):
+            self.text_processor.release_models()
+
     def unload_model(self) -> None:
         """Unload the backend model to free memory."""
         with self._lock:
@@ -353,6 +809,35 @@ class Transcriber:
         if self.text_processor and hasattr(self.text_processor, 'set_user_dictionary'):
             self.text_processor.set_user_dictionary(self.user_dictionary)
 
+    def update_user_dictionary(self, user_dictionary: list, added: list = (), removed: list = ()):
+        """Apply user dictionary edits incrementally (see EnhancedTextProcessor.update_user_dictionary).
+
+        Args:
+            user_dictionary: The full, already updated entry list
+            added: Entries added
+            removed: Entries removed
+        """
+        self.user_dictionary = user_dictionary or []
+        if self.text_processor and hasattr(self.text_processor, 'update_user_dictionary'):
+            self.text_processor.update_user_dictionary(self.user_dictionary, added, removed)
+        elif self.text_processor and hasattr(self.text_processor, 'set_user_dictionary'):
+            self.text_processor.set_user_dictionary(self.user_dictionary)
+
+    def get_memory_stats(self) -> dict:
+        """Resident models and RAM budget of the shared ModelManager."""
+        return self._models.stats()
+
+    def get_stage_stats(self, all_backends: bool = False) -> dict:
+        """p50/p95/p99 per pipeline stage for the current backend/model
+        (or for every backend/model seen)."""
+        if all_backends:
+            return get_stage_timings().summary()
+        return get_stage_timings().summary(self.backend_name, self.model_size)
+
+    def get_cache_stats(self) -> dict:
+        """Result cache counters (empty if the cache is disabled)."""
+        return self._result_cache.stats() if self._result_cache is not None else {}
+
     def get_user_dictionary(self) -> list:
         """Get current user dictionary."""
         return self.user_dictionary
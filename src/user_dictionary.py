@@ -0,0 +1,266 @@
+"""Compiled matcher for user dictionary corrections.
+
+Entries ({"wrong", "correct", "case_sensitive"}) are kept in two character
+tries, one case-sensitive and one case-insensitive, so a dictation is
+scanned once per trie whatever the dictionary size, and adding, editing or
+deleting an entry only touches that entry's path in its trie.
+
+Matching rules:
+- case-sensitive entries: exact substring
+- case-insensitive phrases (containing a space): substring, any case
+- case-insensitive single words: whole word (\\b...\\b), any case
+
+Entries apply one after another in list order, each to the previous one's
+output: a later entry can match what an earlier one produced, and where
+entries overlap the earlier one goes first. The scan finds the entries
+present in the text; only those, and the entries a replacement can create
+a match for, are applied, in list order.
+"""
+import heapq
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+from text_processor import can_overlap
+
+_END = ""  # trie key holding the entries that end at a node
+
+Rule = Tuple[str, str, bool]  # (wrong, correct, case_sensitive)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _is_boundary(text: str, i: int) -> bool:
+    """Whether regex \\b matches at position i of text."""
+    before = i > 0 and _is_word_char(text[i - 1])
+    after = i < len(text) and _is_word_char(text[i])
+    return before != after
+
+
+def _whole_word(rule: Rule) -> bool:
+    wrong, _, case_sensitive = rule
+    return not case_sensitive and " " not in wrong
+
+
+class _Trie:
+    """Character trie of corrections, scanned for all entries in a text."""
+
+    def __init__(self, fold_case: bool):
+        self.fold_case = fold_case
+        self.root: Dict[str, dict] = {}
+        self.size = 0
+        self._starts: Optional[Pattern] = None
+
+    def _chars(self, text: str) -> List[str]:
+        return [ch.lower() for ch in text] if self.fold_case else list(text)
+
+    def insert(self, rule: Rule):
+        node = self.root
+        for ch in self._chars(rule[0]):
+            node = node.setdefault(ch, {})
+        node.setdefault(_END, []).append(rule)
+        self.size += 1
+        self._starts = None
+
+    def remove(self, rule: Rule) -> bool:
+        node = self.root
+        path = []
+        for ch in self._chars(rule[0]):
+            child = node.get(ch)
+            if child is None:
+                return False
+            path.append((node, ch))
+            node = child
+        values = node.get(_END)
+        if not values or rule not in values:
+            return False
+        values.remove(rule)
+        if not values:
+            del node[_END]
+        # Prune the branch back to the last node still in use
+        for parent, ch in reversed(path):
+            if parent[ch]:
+                break
+            del parent[ch]
+        self.size -= 1
+        self._starts = None
+        return True
+
+    def _start_pattern(self) -> Pattern:
+        """Regex finding positions where some entry could start."""
+        starts = self._starts
+        if starts is None:
+            chars = sorted(self.root, key=len, reverse=True)
+            starts = re.compile("|".join(re.escape(ch) for ch in chars),
+                                re.IGNORECASE if self.fold_case else 0)
+            self._starts = starts
+        return starts
+
+    def find(self, text: str, found: Set[Rule]):
+        """Add every entry matching anywhere in text to found."""
+        if not self.root:
+            return
+        starts = self._start_pattern()
+        match = starts.search(text)
+        while match:
+            i = match.start()
+            node = self.root
+            starts_word = None
+            j = i
+            while j < len(text):
+                node = node.get(text[j].lower() if self.fold_case else text[j])
+                if node is None:
+                    break
+                j += 1
+                for rule in node.get(_END, ()):
+                    if _whole_word(rule):
+                        if starts_word is None:
+                            starts_word = _is_boundary(text, i)
+                        if not (starts_word and _is_boundary(text, j)):
+                            continue
+                    found.add(rule)
+            match = starts.search(text, i + 1)
+
+
+class UserDictionaryMatcher:
+    """User dictionary entries compiled for replacement in list order."""
+
+    def __init__(self, entries: Iterable[dict] = ()):
+        self._exact = _Trie(fold_case=False)
+        self._folded = _Trie(fold_case=True)
+        self._entries: List[dict] = []
+        self._counts: Dict[Rule, int] = {}
+        self._order: Optional[Dict[Rule, List[int]]] = None  # list positions per rule
+        self._patterns: Dict[Rule, Pattern] = {}
+        self._touches: Dict[Rule, Set[Rule]] = {}  # see _touched()
+        for entry in entries:
+            self.add(entry)
+
+    @staticmethod
+    def _rule(entry: dict) -> Optional[Rule]:
+        """The rule of an entry, or None if incomplete."""
+        wrong = entry.get("wrong", "")
+        correct = entry.get("correct", "")
+        if not wrong or not correct:
+            return None
+        return wrong, correct, bool(entry.get("case_sensitive", False))
+
+    def _trie(self, rule: Rule) -> _Trie:
+        return self._exact if rule[2] else self._folded
+
+    def add(self, entry: dict) -> bool:
+        """Append an entry."""
+        self._entries.append(entry)
+        self._order = None
+        rule = self._rule(entry)
+        if rule is None:
+            return False
+        self._trie(rule).insert(rule)
+        if rule not in self._counts:
+            self._counts[rule] = 0
+            for source, touched in self._touches.items():
+                if _output_touches(source, rule):
+                    touched.add(rule)
+        self._counts[rule] += 1
+        return True
+
+    def remove(self, entry: dict) -> bool:
+        """Remove the first entry equal to entry."""
+        rule = self._rule(entry)
+        for i, current in enumerate(self._entries):
+            if current == entry:
+                del self._entries[i]
+                self._order = None
+                break
+        if rule is None or not self._trie(rule).remove(rule):
+            return False
+        self._counts[rule] -= 1
+        if not self._counts[rule]:
+            del self._counts[rule]
+            self._patterns.pop(rule, None)
+            self._touches.pop(rule, None)  # stale members elsewhere have no positions
+        return True
+
+    def update(self, entries: List[dict], added: Iterable[dict] = (), removed: Iterable[dict] = ()):
+        """Apply edits to the tries and take the order of entries, the full,
+        already updated list (an edit keeps its entry's place)."""
+        for entry in removed:
+            self.remove(entry)
+        for entry in added:
+            self.add(entry)
+        self._entries = list(entries)
+        self._order = None
+
+    def _positions(self) -> Dict[Rule, List[int]]:
+        order = self._order
+        if order is None:
+            order = {}
+            for i, entry in enumerate(self._entries):
+                rule = self._rule(entry)
+                if rule is not None:
+                    order.setdefault(rule, []).append(i)
+            self._order = order
+        return order
+
+    def _touched(self, rule: Rule) -> Set[Rule]:
+        """Rules whose matches rule's output can make. O(rules), cached and
+        kept up to date by add()."""
+        touched = self._touches.get(rule)
+        if touched is None:
+            touched = {other for other in self._counts if _output_touches(rule, other)}
+            self._touches[rule] = touched
+        return touched
+
+    def _apply_rule(self, rule: Rule, text: str) -> str:
+        wrong, correct, case_sensitive = rule
+        if case_sensitive:
+            return text.replace(wrong, correct)
+        pattern = self._patterns.get(rule)
+        if pattern is None:
+            regex = re.escape(wrong)
+            if _whole_word(rule):
+                regex = r'\b' + regex + r'\b'
+            pattern = self._patterns[rule] = re.compile(regex, re.IGNORECASE)
+        return pattern.sub(correct, text)
+
+    def apply(self, text: str) -> str:
+        found: Set[Rule] = set()
+        self._exact.find(text, found)
+        self._folded.find(text, found)
+        if not found:
+            return text
+        positions = self._positions()
+        queue = [(i, rule) for rule in found for i in positions.get(rule, ())]
+        queued = set(queue)
+        heapq.heapify(queue)
+        while queue:
+            pos, rule = heapq.heappop(queue)
+            replaced = self._apply_rule(rule, text)
+            if replaced == text:
+                continue
+            text = replaced
+            for other in self._touched(rule):
+                for i in positions.get(other, ()):
+                    if i > pos and (i, other) not in queued:
+                        queued.add((i, other))
+                        heapq.heappush(queue, (i, other))
+        return text
+
+    def __len__(self) -> int:
+        return self._exact.size + self._folded.size
+
+
+def _output_touches(rule: Rule, other: Rule) -> bool:
+    """Whether rule's output can make a match of other."""
+    key, out = rule[0].lower(), rule[1].lower()
+    other_whole = _whole_word(other)
+    # An output whose edges differ in word-ness from the entry can make a
+    # whole-word match next to it
+    if other_whole and (_is_word_char(out[0]) != _is_word_char(key[0])
+                        or _is_word_char(out[-1]) != _is_word_char(key[-1])):
+        return True
+    left = right = None  # word-ness of the chars around a match, if known
+    if _whole_word(rule):
+        left, right = not _is_word_char(key[0]), not _is_word_char(key[-1])
+    return can_overlap(out, left, right, other[0].lower(), other_whole)
@@ -0,0 +1,116 @@
+"""Precomputed Russian vocabulary index for phonetic validation.
+
+PhoneticCorrector only needs to know whether a word is valid Russian, so
+instead of loading pymorphy2 it can check a sorted word list exported once
+by scripts/build_vocabulary_index.py. The file is memory-mapped and
+searched in place: opening it is instant and pages are shared with the OS
+cache instead of being loaded into Python objects.
+
+File layout (little-endian):
+    MAGIC                 8 bytes
+    count                 uint32
+    offsets[count + 1]    uint32, word i is blob[offsets[i]:offsets[i + 1]]
+    blob                  UTF-8 words, sorted by bytes, no separators
+"""
+import logging
+import mmap
+import struct
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+logger = logging.getLogger("transkribator")
+
+MAGIC = b"TKVOCAB1"
+_HEADER = struct.Struct("<8sI")
+_OFFSET = struct.Struct("<I")
+
+DEFAULT_INDEX_PATH = Path(__file__).parent / "data" / "ru_vocabulary.idx"
+
+
+def build_index(words: Iterable[str], path: Union[str, Path]) -> int:
+    """Write a vocabulary index of the (lowercased, deduplicated) words.
+
+    Returns:
+        Number of words written
+    """
+    encoded = sorted({w.strip().lower().encode("utf-8") for w in words if w.strip()})
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(encoded)))
+        offset = 0
+        f.write(_OFFSET.pack(offset))
+        for word in encoded:
+            offset += len(word)
+            f.write(_OFFSET.pack(offset))
+        for word in encoded:
+            f.write(word)
+    tmp.replace(path)
+    return len(encoded)
+
+
+class VocabularyIndex:
+    """Read-only memory-mapped vocabulary with binary-search lookups."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < _HEADER.size or self._map[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"not a vocabulary index: {self.path}")
+            _, self._count = _HEADER.unpack_from(self._map, 0)
+            self._blob = _HEADER.size + (self._count + 1) * _OFFSET.size
+            if len(self._map) < self._blob:
+                raise ValueError(f"truncated vocabulary index: {self.path}")
+        except Exception:
+            self._map.close()
+            raise
+
+    def _word(self, i: int) -> bytes:
+        start, end = struct.unpack_from("<2I", self._map, _HEADER.size + i * _OFFSET.size)
+        return self._map[self._blob + start:self._blob + end]
+
+    def __contains__(self, word: str) -> bool:
+        if not word:
+            return False
+        key = word.lower().encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = self._word(mid)
+            if current < key:
+                lo = mid + 1
+            elif current > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self):
+        self._map.close()
+
+
+_index: Optional[VocabularyIndex] = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+
+def get_vocabulary_index() -> Optional[VocabularyIndex]:
+    """Get the shared vocabulary index, or None if it hasn't been built."""
+    global _index, _index_loaded
+    with _index_lock:
+        if not _index_loaded:
+            _index_loaded = True
+            if DEFAULT_INDEX_PATH.exists():
+                try:
+                    _index = VocabularyIndex(DEFAULT_INDEX_PATH)
+                    logger.info("VOCAB_INDEX_LOADED words=%d path=%s", len(_index), DEFAULT_INDEX_PATH)
+                except (OSError, ValueError) as e:
+                    logger.warning("VOCAB_INDEX_FAILED path=%s error=%s", DEFAULT_INDEX_PATH, e)
+        return _index
@@ -0,0 +1,153 @@
+"""Background warmup of post-processing components.
+
+EnhancedTextProcessor creates its heavy components (pymorphy2-backed
+correctors, the proper noun dictionary, the punctuation model) lazily, so
+startup stays fast, but then the first dictation pays for them. The warmup
+loads them one by one on a background thread once the window is up.
+
+It yields to the user: before each step it waits while is_busy() (recording
+or transcribing) is true, so loading never competes with a dictation. A
+step that already started runs to the end; a process() call needing that
+component meanwhile waits for it instead of loading it a second time.
+
+Qt-free: status changes are reported through on_change(status) from the
+warmup thread; the main window forwards them to the UI.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger("transkribator")
+
+BUSY_POLL_SEC = 0.2  # how often a paused warmup checks whether the user is done
+
+
+@dataclass(frozen=True)
+class WarmupStatus:
+    """Readiness of the post-processing components."""
+    state: str                   # "pending", "warming", "paused" or "ready"
+    done: Tuple[str, ...] = ()
+    failed: Tuple[str, ...] = ()
+    pending: Tuple[str, ...] = ()
+    current: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        """All steps finished (failed steps load on demand as before)."""
+        return self.state == "ready"
+
+    @property
+    def progress(self) -> Tuple[int, int]:
+        """(finished steps, all steps)."""
+        finished = len(self.done) + len(self.failed)
+        return finished, finished + len(self.pending)
+
+
+class ComponentWarmup:
+    """Runs warmup steps on a background thread, pausing while the app is busy."""
+
+    def __init__(
+        self,
+        steps: List[Tuple[str, Callable[[], object]]],
+        is_busy: Callable[[], bool] = lambda: False,
+        on_change: Optional[Callable[[WarmupStatus], None]] = None,
+        poll_sec: float = BUSY_POLL_SEC,
+    ):
+        """
+        Args:
+            steps: (name, load) pairs, run in order; load() may raise
+            is_busy: Whether the user is recording or a dictation is processing
+            on_change: Called with the new WarmupStatus (from the warmup thread)
+            poll_sec: Interval of busy checks while paused
+        """
+        self._steps = list(steps)
+        self._is_busy = is_busy
+        self._on_change = on_change
+        self._poll_sec = poll_sec
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._finished = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._status = WarmupStatus("pending", pending=tuple(name for name, _ in self._steps))
+        self.paused_sec = 0.0
+        if not self._steps:
+            self._status = WarmupStatus("ready")
+            self._finished.set()
+
+    @property
+    def status(self) -> WarmupStatus:
+        with self._lock:
+            return self._status
+
+    @property
+    def ready(self) -> bool:
+        return self.status.ready
+
+    def start(self) -> bool:
+        """Start warming in the background; False if already started or nothing to do."""
+        with self._lock:
+            if self._thread is not None or self._finished.is_set():
+                return False
+            self._thread = threading.Thread(target=self._run, name="postprocess-warmup", daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self):
+        """Skip the steps not started yet (e.g. the processor was replaced)."""
+        self._stop.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the warmup to finish; False on timeout."""
+        return self._finished.wait(timeout)
+
+    def _set_status(self, **changes):
+        with self._lock:
+            self._status = WarmupStatus(**{**self._status.__dict__, **changes})
+            status = self._status
+        if self._on_change is not None:
+            try:
+                self._on_change(status)
+            except Exception as e:
+                logger.warning("WARMUP_CALLBACK_FAILED | %s", e)
+
+    def _wait_until_idle(self) -> bool:
+        """Block while the app is busy; False if stopped meanwhile."""
+        if not self._is_busy():
+            return not self._stop.is_set()
+        t0 = time.monotonic()
+        self._set_status(state="paused")
+        while self._is_busy():
+            if self._stop.wait(self._poll_sec):
+                return False
+        self.paused_sec += time.monotonic() - t0
+        return not self._stop.is_set()
+
+    def _run(self):
+        t0 = time.monotonic()
+        try:
+            for index, (name, load) in enumerate(self._steps):
+                if not self._wait_until_idle():
+                    logger.info("WARMUP_STOPPED | remaining=%s", ",".join(n for n, _ in self._steps[index:]))
+                    return
+                self._set_status(state="warming", current=name)
+                step_start = time.monotonic()
+                failed = False
+                try:
+                    load()
+                except Exception as e:
+                    failed = True
+                    logger.warning("WARMUP_STEP_FAILED | step=%s | error=%s", name, e)
+                status = self.status
+                pending = tuple(n for n, _ in self._steps[index + 1:])
+                if failed:
+                    self._set_status(failed=status.failed + (name,), pending=pending, current=None)
+                else:
+                    logger.info("WARMUP_STEP | step=%s | elapsed_ms=%.0f", name, (time.monotonic() - step_start) * 1000)
+                    self._set_status(done=status.done + (name,), pending=pending, current=None)
+            self._set_status(state="ready")
+            logger.info("WARMUP_DONE | steps=%d | elapsed=%.2fs | paused=%.2fs",
+                        len(self._steps), time.monotonic() - t0, self.paused_sec)
+        finally:
+            self._finished.set()
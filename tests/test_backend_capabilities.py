@@ -0,0 +1,62 @@
+"""Tests for backend capability flags and the pipeline assembled from them."""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from backends import BackendCapabilities, BaseBackend, GroqBackend, PodlodkaTurboBackend, SherpaBackend, WhisperBackend
+from text_processor_enhanced import EnhancedTextProcessor
+
+PUNCTUATED = BackendCapabilities(punctuation=True, casing=True)
+
+
+class TestCapabilities:
+    def test_defaults_are_raw_text(self):
+        assert BaseBackend.CAPABILITIES == BackendCapabilities()
+        assert not any(vars(BackendCapabilities()).values())
+
+    def test_sherpa_depends_on_model(self):
+        assert SherpaBackend.capabilities_for("giga-am-v3-ru-punct") == PUNCTUATED
+        assert SherpaBackend.capabilities_for("giga-am-v3-ru") == BackendCapabilities()
+        assert SherpaBackend.capabilities_for("unknown") == BackendCapabilities()
+        assert SherpaBackend(model_size="giga-am-v3-ru-punct").capabilities.punctuation
+
+    @pytest.mark.parametrize("backend", [WhisperBackend, PodlodkaTurboBackend, GroqBackend])
+    def test_whisper_family_punctuates(self, backend):
+        caps = backend.capabilities_for("any")
+        assert caps.punctuation and caps.casing
+
+    def test_groq_fallback_capabilities(self):
+        assert GroqBackend(model_size="whisper-large-v3-turbo").fallback_capabilities == PUNCTUATED
+
+    def test_frozen(self):
+        with pytest.raises(AttributeError):
+            BackendCapabilities().punctuation = True
+
+
+class TestPipelineFromCapabilities:
+    def test_punctuated_output_skips_punctuation(self):
+        processor = EnhancedTextProcessor(language="ru", backend="sherpa", capabilities=PUNCTUATED)
+        assert not processor.enable_punctuation
+        processor.punctuation_model = MagicMock()
+        assert processor.process("привет, как дела? нормально.") == "Привет, как дела? Нормально"
+        processor.punctuation_model.restore_punctuation.assert_not_called()
+
+    def test_raw_output_keeps_punctuation(self):
+        assert EnhancedTextProcessor(language="ru", backend="sherpa",
+                                     capabilities=BackendCapabilities()).enable_punctuation
+        assert EnhancedTextProcessor(language="ru", backend="sherpa").enable_punctuation
+
+    @pytest.mark.parametrize("model, punctuation", [("giga-am-v3-ru-punct", False), ("giga-am-v3-ru", True)])
+    def test_transcriber_uses_model_capabilities(self, model, punctuation):
+        backend_class = MagicMock(capabilities_for=SherpaBackend.capabilities_for)
+        with patch("transcriber.get_backend", return_value=backend_class):
+            with patch("transcriber.get_reporter", return_value=None):
+                from transcriber import Transcriber
+                t = Transcriber(backend="sherpa", model_size=model, result_cache_size=0)
+        assert isinstance(t.text_processor, EnhancedTextProcessor)
+        assert t.text_processor.enable_punctuation is punctuation
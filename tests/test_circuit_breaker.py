@@ -0,0 +1,164 @@
+"""Tests for CircuitBreaker and GroqBackend breaker/fallback integration."""
+
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backends.circuit_breaker import CircuitBreaker
+from src.backends.groq_backend import GroqBackend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(window_size=4, failure_rate_threshold=0.5, min_calls=2,
+                          open_duration_sec=10.0, clock=clock)
+
+
+class TestCircuitBreaker:
+    def test_starts_closed(self, breaker):
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request()
+
+    def test_opens_on_failure_rate(self, breaker):
+        """Failure rate at threshold with enough calls opens the circuit."""
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+    def test_min_calls_respected(self, breaker):
+        """A single failure is not enough evidence."""
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_single_probe(self, breaker, clock):
+        """After cool-down exactly one probe is let through."""
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now = 10.0
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+    def test_probe_success_closes(self, breaker, clock):
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now = 10.0
+        breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.snapshot()["failure_rate"] == 0.0
+
+    def test_probe_failure_reopens(self, breaker, clock):
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now = 10.0
+        breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        snap = breaker.snapshot()
+        assert snap["times_opened"] == 2
+        assert snap["retry_in_sec"] == pytest.approx(10.0)
+
+
+class FakeFallback:
+    """Stand-in for SherpaBackend."""
+
+    def __init__(self, load_delay_event=None):
+        self.loaded = False
+        self.load_calls = 0
+        self.transcribe_calls = 0
+        self._gate = load_delay_event
+
+    def load_model(self):
+        if self._gate is not None:
+            self._gate.wait(timeout=5)
+        self.load_calls += 1
+        self.loaded = True
+
+    def is_model_loaded(self):
+        return self.loaded
+
+    def unload_model(self):
+        self.loaded = False
+
+    def transcribe(self, audio, sample_rate=16000, cancel_event=None):
+        self.transcribe_calls += 1
+        return "sherpa text", 0.1
+
+
+@pytest.fixture
+def groq_backend(clock):
+    b = GroqBackend()
+    b._client = MagicMock()
+    b._client.audio.transcriptions.create.side_effect = ConnectionError("groq down")
+    b._fallback = FakeFallback()
+    b._breaker = CircuitBreaker(window_size=4, min_calls=2, open_duration_sec=10.0, clock=clock)
+    return b
+
+
+class TestGroqBreakerIntegration:
+    def test_failure_falls_back_and_prewarms(self, groq_backend):
+        audio = np.zeros(16000, dtype=np.float32)
+        text, _ = groq_backend.transcribe(audio, 16000)
+        assert text == "sherpa text"
+        assert groq_backend.last_used_fallback
+        # Pre-warm loaded the fallback exactly once (no second load in foreground)
+        assert groq_backend._fallback.load_calls == 1
+
+    def test_open_circuit_skips_groq(self, groq_backend):
+        audio = np.zeros(16000, dtype=np.float32)
+        groq_backend.transcribe(audio, 16000)
+        groq_backend.transcribe(audio, 16000)
+        create = groq_backend._client.audio.transcriptions.create
+        assert create.call_count == 2
+        assert groq_backend.get_model_info()["circuit_state"] == CircuitBreaker.OPEN
+
+        text, _ = groq_backend.transcribe(audio, 16000)
+        assert text == "sherpa text"
+        assert create.call_count == 2  # Skipped while open
+
+    def test_half_open_probe_recovers(self, groq_backend, clock):
+        audio = np.zeros(16000, dtype=np.float32)
+        groq_backend.transcribe(audio, 16000)
+        groq_backend.transcribe(audio, 16000)
+        clock.now = 10.0
+        create = groq_backend._client.audio.transcriptions.create
+        create.side_effect = None
+        create.return_value = MagicMock(text=" groq text ")
+
+        text, _ = groq_backend.transcribe(audio, 16000)
+        assert text == "groq text"
+        assert not groq_backend.last_used_fallback
+        assert groq_backend.get_model_info()["circuit"]["state"] == CircuitBreaker.CLOSED
+
+    def test_fallback_waits_for_prewarm(self, groq_backend):
+        """Foreground fallback waits for the in-flight pre-warm instead of loading twice."""
+        gate = threading.Event()
+        groq_backend._fallback = FakeFallback(load_delay_event=gate)
+        groq_backend._prewarm_fallback("test")
+        threading.Timer(0.1, gate.set).start()
+        groq_backend._client = None
+        text, _ = groq_backend.transcribe(np.zeros(16000, dtype=np.float32), 16000)
+        assert text == "sherpa text"
+        assert groq_backend._fallback.load_calls == 1
@@ -0,0 +1,124 @@
+"""Tests for the single-pass corrections matcher."""
+
+import os
+import random
+import re
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from text_processor import CorrectionMatcher, compile_corrections
+from text_processor_enhanced import EnhancedTextProcessor
+
+
+def _sequential(corrections, text):
+    """The previous rule-by-rule implementation, used as the reference."""
+    for wrong, correct in sorted(corrections.items(), key=lambda x: len(x[0]), reverse=True):
+        if len(wrong) <= 10:
+            pattern = re.compile(r'\b' + re.escape(wrong) + r'\b', re.IGNORECASE)
+        else:
+            pattern = re.compile(re.escape(wrong), re.IGNORECASE)
+        text = pattern.sub(correct, text)
+    return text
+
+
+@pytest.fixture(scope="module")
+def processor():
+    return EnhancedTextProcessor(language="ru", enable_punctuation=False, enable_phonetics=False,
+                                 enable_morphology=False, enable_proper_nouns=False)
+
+
+class TestCorrectionMatcher:
+    def test_longest_match_wins(self):
+        m = CorrectionMatcher((("по этому", "поэтому"), ("по этому поводу", "поэтому")))
+        assert m.sub("по этому поводу и по этому") == "поэтому и поэтому"
+
+    def test_word_boundaries_for_short_rules(self):
+        m = CorrectionMatcher((("котор", "который"), ("заканчиваес", "заканчивается")))
+        assert m.sub("котор которого") == "который которого"
+        # Longer rules match inside words, as before
+        assert m.sub("xзаканчиваесx") == "xзаканчиваетсяx"
+
+    def test_case_insensitive(self):
+        m = CorrectionMatcher((("класок", "колосок"),))
+        assert m.sub("Класок и КЛАСОК") == "колосок и колосок"
+
+    def test_empty_rules(self):
+        assert CorrectionMatcher(()).sub("текст") == "текст"
+
+    def test_chained_rules(self):
+        """A rule's output feeds later rules, as in the rule-by-rule loop."""
+        m = CorrectionMatcher((("котик", "кот"), ("кот", "пёс")))
+        assert m.sub("котик и кот") == "пёс и пёс"
+
+    def test_overlap_goes_to_longer_rule(self):
+        m = CorrectionMatcher((("а б", "а"), ("б в г", "бвг")))
+        assert m.sub("а б в г") == "а бвг"
+
+    def test_independent_rules_take_single_pass(self, processor):
+        m = processor._corrections_matcher
+        with patch.object(m, "_sub_in_order", side_effect=AssertionError):
+            assert m.sub("класок и котор") == "колосок и который"
+
+    def test_compiled_form_shared_across_instances(self, processor):
+        other = EnhancedTextProcessor(language="ru", backend="whisper")
+        assert other._corrections_matcher is processor._corrections_matcher
+        assert compile_corrections(dict(processor.corrections)) is processor._corrections_matcher
+
+    def test_add_correction_recompiles(self):
+        p = EnhancedTextProcessor(language="ru", enable_punctuation=False, enable_phonetics=False,
+                                  enable_morphology=False, enable_proper_nouns=False)
+        p.add_correction("трнскрибатор", "транскрибатор")
+        assert p._fix_errors("трнскрибатор") == "транскрибатор"
+
+
+class TestEquivalence:
+    def test_each_rule_in_context(self, processor):
+        corrections = processor.corrections
+        for wrong in corrections:
+            for text in (wrong, f"и {wrong} мир", wrong.upper(), f"{wrong.capitalize()}, {wrong}."):
+                assert processor._corrections_matcher.sub(text) == _sequential(corrections, text), text
+
+    def test_interacting_rules(self, processor):
+        """Texts where real rules overlap or feed each other."""
+        corrections = processor.corrections
+        keys = list(corrections)
+        texts = ["в в тече ние", "В в те чение.", "проснутся", "рассещё раз"]
+        for a in keys:
+            for b in keys:
+                words_a, words_b = a.split(), b.split()
+                for n in range(1, min(len(words_a), len(words_b)) + 1):
+                    if a != b and words_a[-n:] == words_b[:n]:
+                        texts.append(" ".join(words_a + words_b[n:]))
+        assert len(texts) > 4
+        for text in texts:
+            assert processor._corrections_matcher.sub(text) == _sequential(corrections, text), text
+        assert processor._corrections_matcher.sub("в в тече ние") == "в течение"
+
+    def test_random_rule_sets(self):
+        """Small alphabets make rules overlap, chain and move word boundaries."""
+        rnd = random.Random(7)
+        alphabet = "аб -Б"
+        for _ in range(300):
+            corrections = {}
+            for _ in range(rnd.randint(1, 6)):
+                wrong = "".join(rnd.choice(alphabet) for _ in range(rnd.choice([1, 2, 3, 4, 11, 12])))
+                corrections[wrong] = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 4)))
+            m = CorrectionMatcher(tuple(corrections.items()))
+            for _ in range(10):
+                text = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 25)))
+                assert m.sub(text) == _sequential(corrections, text), (corrections, text)
+
+    def test_random_sentences(self, processor):
+        corrections = processor.corrections
+        vocab = [w for k in corrections for w in k.split()] + list(corrections.values())
+        vocab += ["и", "мир", "привет", "на", "в", "не", "с"]
+        rnd = random.Random(41)
+        for _ in range(3000):
+            words = [rnd.choice(vocab) for _ in range(rnd.randint(1, 12))]
+            words = [w.upper() if rnd.random() < 0.1 else w for w in words]
+            text = " ".join(words)
+            assert processor._corrections_matcher.sub(text) == _sequential(corrections, text), text
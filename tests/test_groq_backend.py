@@ -0,0 +1,257 @@
+"""Tests for GroqBackend against a local HTTP stand-in for the Groq API."""
+
+import io
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backends.groq_backend import GroqBackend
+
+
+def _extract_file_part(body: bytes, content_type: str):
+    """Return (filename, payload) of the multipart 'file' field."""
+    boundary = content_type.split("boundary=", 1)[1].strip().strip('"').encode()
+    for part in body.split(b"--" + boundary):
+        if b'name="file"' not in part:
+            continue
+        headers, _, payload = part.partition(b"\r\n\r\n")
+        filename = headers.split(b'filename="', 1)[1].split(b'"', 1)[0].decode()
+        return filename, payload[:-2] if payload.endswith(b"\r\n") else payload
+    return None, b""
+
+
+class _StandInServer:
+    """Records uploaded files and answers with a fixed transcription.
+
+    An optional responder(filename, payload) -> (status, text, delay_sec)
+    lets tests inject latency and errors per upload.
+    """
+
+    def __init__(self, text="привет мир", responder=None):
+        self.text = text
+        self.responder = responder
+        self.uploads = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                filename, payload = _extract_file_part(body, self.headers["Content-Type"])
+                with server._lock:
+                    server.uploads.append((filename, payload))
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                status, text = 200, server.text
+                try:
+                    if server.responder is not None:
+                        status, text, delay = server.responder(filename, payload)
+                        time.sleep(delay)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+                if status != 200:
+                    reply = json.dumps({"error": {"message": "injected failure"}}).encode()
+                else:
+                    reply = json.dumps({"text": text}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(reply)))
+                self.end_headers()
+                self.wfile.write(reply)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    server = _StandInServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def backend(stand_in):
+    groq = pytest.importorskip("groq")
+    b = GroqBackend()
+    b._client = groq.Groq(api_key="test", base_url=stand_in.url, max_retries=0)
+    return b
+
+
+def _speech_like(seconds: float, sr: int = 16000) -> np.ndarray:
+    t = np.arange(int(seconds * sr)) / sr
+    return (0.3 * np.sin(2 * np.pi * 220 * t) * np.sin(2 * np.pi * 3 * t)).astype(np.float32)
+
+
+class TestCompressedUpload:
+    def test_short_clip_uploads_flac(self, backend, stand_in):
+        """Short clips go up as lossless FLAC, smaller than WAV."""
+        sf = pytest.importorskip("soundfile")
+        audio = _speech_like(3.0)
+        text, _ = backend.transcribe(audio, 16000)
+
+        assert text == "привет мир"
+        filename, payload = stand_in.uploads[-1]
+        assert filename == "audio.flac"
+        assert payload[:4] == b"fLaC"
+        assert len(payload) < len(GroqBackend._numpy_to_wav_bytes(audio, 16000))
+
+        decoded, sr = sf.read(io.BytesIO(payload), dtype="int16")
+        assert sr == 16000
+        assert np.array_equal(decoded, GroqBackend._to_pcm16(audio))
+
+    def test_slow_uplink_switches_to_opus(self, backend, stand_in):
+        """When FLAC would blow the upload budget, Opus is used."""
+        backend._uplink_bytes_per_sec = 10_000  # ~80 kbit/s
+        audio = _speech_like(10.0)
+        backend.transcribe(audio, 16000)
+
+        filename, payload = stand_in.uploads[-1]
+        assert filename == "audio.ogg"
+        assert payload[:4] == b"OggS"
+        assert len(payload) < len(GroqBackend._numpy_to_wav_bytes(audio, 16000)) / 5
+
+    def test_uplink_estimate_updated(self, backend):
+        """Short requests measure the latency floor, longer ones the uplink."""
+        before = backend._uplink_bytes_per_sec
+        backend.transcribe(_speech_like(1.0), 16000)
+        assert backend._latency_floor_sec is not None
+        assert backend._uplink_bytes_per_sec == before
+        backend.transcribe(_speech_like(10.0), 16000)
+        assert backend._uplink_bytes_per_sec != before
+
+    def test_fast_link_with_latency_keeps_flac(self, stand_in):
+        """Server latency is not counted as upload time: a 60 s clip stays FLAC."""
+        groq = pytest.importorskip("groq")
+        pytest.importorskip("soundfile")
+        stand_in.responder = lambda filename, payload: (200, "привет мир", 1.0)
+        b = GroqBackend()
+        b._client = groq.Groq(api_key="test", base_url=stand_in.url, max_retries=0)
+        b.transcribe(_speech_like(1.0), 16000)
+        b.transcribe(_speech_like(10.0), 16000)
+        assert stand_in.uploads[-1][0] == "audio.flac"
+        assert b._latency_floor_sec >= 1.0
+        assert b._choose_upload_format(60 * 16000, 16000) == "flac"
+
+    def test_unsupported_opus_rate_keeps_flac(self, backend):
+        """Opus only supports fixed rates; other rates stay on FLAC."""
+        backend._uplink_bytes_per_sec = 1
+        assert backend._choose_upload_format(441000, 44100) == "flac"
+        assert backend._choose_upload_format(160000, 16000) == "opus"
+
+
+def _segment_id(samples: np.ndarray) -> int:
+    """Segments in these tests are tones whose amplitude encodes the index."""
+    return int(round(float(np.max(np.abs(samples))) * 20)) - 1
+
+
+def _numbered_clip(n_segments: int, seg_sec: float = 20.0, gap_sec: float = 1.0, sr: int = 16000):
+    """Tones with amplitude (i + 1) / 20 separated by silent gaps."""
+    t = np.arange(int(seg_sec * sr)) / sr
+    parts = []
+    for i in range(n_segments):
+        parts.append(((i + 1) / 20 * np.sin(2 * np.pi * 220 * t)).astype(np.float32))
+        parts.append(np.zeros(int(gap_sec * sr), dtype=np.float32))
+    return np.concatenate(parts)
+
+
+class _LocalDecoder:
+    """Stand-in for the Sherpa fallback: names the segment it decoded."""
+
+    def __init__(self):
+        self.calls = []
+
+    def is_model_loaded(self):
+        return True
+
+    def load_model(self):
+        pass
+
+    def unload_model(self):
+        pass
+
+    def transcribe(self, audio, sample_rate=16000, cancel_event=None):
+        self.calls.append(len(audio))
+        return f"local{_segment_id(audio)}", 0.01
+
+
+@pytest.fixture
+def segmented_server():
+    sf = pytest.importorskip("soundfile")
+    state = {"fail": set()}
+
+    def responder(filename, payload):
+        samples, _ = sf.read(io.BytesIO(payload), dtype="float32")
+        seg = _segment_id(samples)
+        if seg in state["fail"]:
+            return 500, "", 0.0
+        # Earlier segments answer slower, so completion order is reversed
+        return 200, f"seg{seg}", 0.4 - 0.1 * seg
+
+    server = _StandInServer(responder=responder)
+    server.state = state
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def segmented_backend(segmented_server):
+    groq = pytest.importorskip("groq")
+    b = GroqBackend()
+    b._client = groq.Groq(api_key="test", base_url=segmented_server.url, max_retries=0)
+    b._uplink_bytes_per_sec = 10_000_000  # keep FLAC so timing reflects concurrency only
+    b._fallback = _LocalDecoder()
+    yield b
+    b.unload_model()
+
+
+class TestSegmentedUpload:
+    def test_segments_sent_concurrently_and_reassembled_in_order(self, segmented_backend, segmented_server):
+        from src.backends.groq_backend import GROQ_MAX_CONCURRENCY
+
+        audio = _numbered_clip(4)
+        start = time.time()
+        text, _ = segmented_backend.transcribe(audio, 16000)
+        elapsed = time.time() - start
+
+        assert text == "seg0 seg1 seg2 seg3"
+        assert len(segmented_server.uploads) == 4
+        assert 1 < segmented_server.max_in_flight <= GROQ_MAX_CONCURRENCY
+        assert elapsed < 0.4 + 0.3 + 0.2 + 0.1  # faster than serial
+        assert not segmented_backend.last_used_fallback
+
+    def test_failed_segment_falls_back_alone(self, segmented_backend, segmented_server):
+        segmented_server.state["fail"] = {2}
+        text, _ = segmented_backend.transcribe(_numbered_clip(4), 16000)
+
+        assert text == "seg0 seg1 local2 seg3"
+        assert segmented_backend.last_used_fallback
+        assert segmented_backend.last_fallback_segments == 1
+        assert len(segmented_backend._fallback.calls) == 1
+
+    def test_short_clip_not_segmented(self, segmented_backend, segmented_server):
+        text, _ = segmented_backend.transcribe(_numbered_clip(1), 16000)
+        assert text == "seg0"
+        assert len(segmented_server.uploads) == 1
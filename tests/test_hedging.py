@@ -0,0 +1,144 @@
+"""Tests for the hedged execution policy."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hedging import HedgedExecutor, HedgePath, HedgingPolicy, LatencyTracker
+
+
+def _path(name, delay, value=None, error=None, log=None):
+    """Path that sleeps (cancellably) and returns value or raises error."""
+    def run(cancel_event):
+        if cancel_event.wait(delay):
+            if log is not None:
+                log.append(name)
+            raise Exception(f"{name} cancelled")
+        if error:
+            raise error
+        return value
+    return HedgePath(name, run)
+
+
+@pytest.fixture
+def executor():
+    tracker = LatencyTracker(min_samples=3)
+    ex = HedgedExecutor(HedgingPolicy(min_delay_sec=0.0, legacy_min_sec=0.3, legacy_ratio=0.0), tracker)
+    yield ex
+    ex.shutdown()
+
+
+class TestLatencyTracker:
+    def test_needs_min_samples(self):
+        tracker = LatencyTracker(min_samples=3)
+        tracker.record("local", 1.0, 10.0)
+        assert tracker.p95("local", 10.0) is None
+
+    def test_p95_scales_with_duration(self):
+        tracker = LatencyTracker(min_samples=3)
+        for elapsed in (1.0, 1.0, 1.0, 2.0):
+            tracker.record("local", elapsed, 10.0)
+        assert tracker.p95("local", 10.0) == pytest.approx(2.0)
+        assert tracker.p95("local", 20.0) == pytest.approx(4.0)
+
+
+class TestHedgingPolicy:
+    def test_legacy_delay_until_samples(self):
+        policy = HedgingPolicy(min_delay_sec=3.0)
+        assert policy.hedge_delay(LatencyTracker(), "local", 100.0) == pytest.approx(40.0)
+
+    def test_disabled_uses_legacy(self):
+        tracker = LatencyTracker(min_samples=1)
+        tracker.record("local", 1.0, 10.0)
+        assert HedgingPolicy(enabled=False).hedge_delay(tracker, "local", 10.0) == pytest.approx(30.0)
+
+    def test_floor(self):
+        tracker = LatencyTracker(min_samples=1)
+        tracker.record("local", 0.1, 10.0)
+        assert HedgingPolicy(min_delay_sec=3.0).hedge_delay(tracker, "local", 10.0) == pytest.approx(3.0)
+
+
+class TestHedgedExecutor:
+    def test_fast_primary_not_hedged(self, executor):
+        result = executor.run([_path("local", 0.0, "a"), _path("remote", 0.0, "b")], audio_sec=1.0)
+        assert result.path == "local"
+        assert not result.hedged
+        assert result.launched == ["local"]
+
+    def test_slow_primary_hedged_and_loser_cancelled(self, executor):
+        cancelled = []
+        start = time.time()
+        result = executor.run(
+            [_path("local", 5.0, "a", log=cancelled), _path("remote", 0.1, "b")], audio_sec=1.0
+        )
+        assert result.path == "remote"
+        assert result.hedged
+        assert time.time() - start < 1.0  # not local's 5s
+        for _ in range(50):
+            if cancelled:
+                break
+            time.sleep(0.01)
+        assert cancelled == ["local"]
+        stats = executor.stats()
+        assert stats["hedge_wins"] == 1
+        assert stats["wins"] == {"remote": 1}
+
+    def test_primary_failure_launches_next_immediately(self, executor):
+        start = time.time()
+        result = executor.run(
+            [_path("local", 0.0, error=RuntimeError("boom")), _path("remote", 0.0, "b")], audio_sec=1.0
+        )
+        assert result.path == "remote"
+        assert time.time() - start < 0.3  # did not wait for hedge delay
+
+    def test_unacceptable_result_skipped(self, executor):
+        result = executor.run(
+            [_path("local", 0.0, ""), _path("remote", 0.0, "b")], audio_sec=1.0
+        )
+        assert result.value == "b"
+
+    def test_all_fail_raises_last_error(self, executor):
+        with pytest.raises(RuntimeError, match="remote down"):
+            executor.run(
+                [_path("local", 0.0, error=RuntimeError("local down")),
+                 _path("remote", 0.0, error=RuntimeError("remote down"))],
+                audio_sec=1.0,
+            )
+
+    def test_learned_p95_triggers_earlier_hedge(self, executor):
+        for _ in range(3):
+            executor.tracker.record("local", 0.05, 1.0)
+        start = time.time()
+        result = executor.run([_path("local", 5.0, "a"), _path("remote", 0.0, "b")], audio_sec=1.0)
+        assert result.path == "remote"
+        assert time.time() - start < 0.25  # hedged after ~0.05s, not legacy 0.3s
+
+    def test_cancel_path_callback_called(self, executor):
+        called = threading.Event()
+        slow = _path("local", 5.0, "a")
+        slow.cancel = called.set
+        executor.run([slow, _path("remote", 0.0, "b")], audio_sec=1.0)
+        assert called.is_set()
+
+    def test_single_path_times_out_and_is_cancelled(self, executor):
+        """With nothing left to launch, a hung path is given up after the legacy timeout."""
+        hung = threading.Event()
+        cancelled = threading.Event()
+        stuck = HedgePath("local", lambda event: hung.wait(), cancel=cancelled.set)
+        start = time.time()
+        with pytest.raises(TimeoutError, match="local"):
+            executor.run([stuck], audio_sec=1.0)
+        assert 0.25 < time.time() - start < 1.0  # legacy_min_sec=0.3
+        assert cancelled.is_set()
+        hung.set()
+
+    def test_external_cancel(self, executor):
+        cancel = threading.Event()
+        threading.Timer(0.1, cancel.set).start()
+        with pytest.raises(Exception, match="Cancelled"):
+            executor.run([_path("local", 5.0, "a")], audio_sec=1.0, cancel_event=cancel)
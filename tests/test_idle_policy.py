@@ -0,0 +1,237 @@
+"""Tests for idle model unloading and predictive reload."""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from idle_policy import IdleUnloadPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeModel:
+    """Stands in for the transcriber: preload completes when finish() is called."""
+
+    def __init__(self):
+        self.loaded = True
+        self.unload_calls = 0
+        self.preload_calls = 0
+        self._on_done = None
+
+    def unload(self):
+        self.unload_calls += 1
+        self.loaded = False
+
+    def preload(self, on_done):
+        if self.loaded:
+            return False
+        self.preload_calls += 1
+        self._on_done = on_done
+        return True
+
+    def finish(self, elapsed):
+        self.loaded = True
+        self._on_done(True, elapsed)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def model():
+    return FakeModel()
+
+
+@pytest.fixture
+def policy(clock, model):
+    return IdleUnloadPolicy(
+        idle_minutes=10,
+        unload=model.unload,
+        preload=model.preload,
+        is_loaded=lambda: model.loaded,
+        clock=clock,
+    )
+
+
+class TestIdleUnload:
+    def test_unloads_after_idle(self, policy, model, clock):
+        clock.now = 599
+        assert not policy.check()
+        clock.now = 601
+        assert policy.check()
+        assert model.unload_calls == 1
+        assert not policy.check()  # only once per idle period
+
+    def test_busy_resets_idle_timer(self, policy, model, clock):
+        clock.now = 601
+        assert not policy.check(busy=True)
+        clock.now = 1000
+        assert not policy.check()
+        assert model.unload_calls == 0
+
+    def test_activity_resets_idle_timer(self, policy, model, clock):
+        clock.now = 500
+        policy.touch()
+        clock.now = 900
+        assert not policy.check()
+
+    def test_disabled(self, model, clock):
+        policy = IdleUnloadPolicy(0, model.unload, model.preload, lambda: model.loaded, clock=clock)
+        clock.now = 10_000
+        assert not policy.check()
+        assert model.unload_calls == 0
+
+
+class TestPredictiveReload:
+    def _unload(self, policy, clock):
+        clock.now = 601
+        assert policy.check()
+
+    def test_reload_starts_with_recording(self, policy, model, clock):
+        self._unload(policy, clock)
+        policy.on_recording_start()
+        assert model.preload_calls == 1
+
+    def test_no_reload_when_loaded(self, policy, model):
+        policy.on_recording_start()
+        policy.on_recording_stop()
+        assert model.preload_calls == 0
+        assert policy.stats()["reloads"] == 0
+
+    def test_reload_hidden_by_recording(self, policy, model, clock):
+        self._unload(policy, clock)
+        policy.on_recording_start()
+        model.finish(elapsed=2.0)
+        clock.now += 5.0
+        policy.on_recording_stop()
+        stats = policy.stats()
+        assert stats["reloads"] == 1
+        assert stats["hidden_reloads"] == 1
+
+    def test_reload_longer_than_recording(self, policy, model, clock):
+        self._unload(policy, clock)
+        policy.on_recording_start()
+        clock.now += 1.0
+        policy.on_recording_stop()
+        assert policy.stats()["reloads"] == 0  # reported once the reload ends
+        model.finish(elapsed=3.0)
+        stats = policy.stats()
+        assert stats["reloads"] == 1
+        assert stats["hidden_reloads"] == 0
+
+    def test_no_unload_during_reload(self, policy, model, clock):
+        self._unload(policy, clock)
+        policy.on_recording_start()
+        clock.now += 10_000
+        assert not policy.check()
+
+    def test_recording_during_unload_reloads_after_it(self, model, clock):
+        """A recording that starts mid-unload must not have its model dropped."""
+        entered, release = threading.Event(), threading.Event()
+
+        def slow_unload():
+            entered.set()
+            release.wait(5)
+            model.unload()
+
+        policy = IdleUnloadPolicy(10, slow_unload, model.preload, lambda: model.loaded, clock=clock)
+        clock.now = 601
+        checker = threading.Thread(target=policy.check)
+        checker.start()
+        assert entered.wait(5)
+        policy.on_recording_start()
+        assert model.preload_calls == 0  # would race the unload
+        release.set()
+        checker.join(5)
+        assert model.preload_calls == 1
+        model.finish(elapsed=1.0)
+        clock.now += 3.0
+        policy.on_recording_stop()
+        assert model.loaded
+        assert policy.stats()["reloads"] == 1
+
+    def test_recording_before_unload_skips_it(self, model, clock):
+        policy = None
+        started = []
+
+        def is_loaded():
+            if not started:  # user starts recording right after the idle decision
+                started.append(True)
+                policy.on_recording_start()
+            return model.loaded
+
+        policy = IdleUnloadPolicy(10, model.unload, model.preload, is_loaded, clock=clock)
+        clock.now = 601
+        assert not policy.check()
+        assert model.unload_calls == 0 and model.loaded
+        assert model.preload_calls == 0
+
+
+class _SlowLoadBackend:
+    def __init__(self, **kwargs):
+        self.loaded = False
+        self.load_calls = 0
+        self.last_used_fallback = False
+
+    def load_model(self):
+        self.load_calls += 1
+        time.sleep(0.2)
+        self.loaded = True
+
+    def unload_model(self):
+        self.loaded = False
+
+    def is_model_loaded(self):
+        return self.loaded
+
+    def transcribe(self, audio, sample_rate=16000, cancel_event=None):
+        if not self.loaded:
+            self.load_model()  # real backends load lazily
+        return "text", 0.0
+
+
+class TestTranscriberPreload:
+    def test_transcribe_waits_for_preload(self):
+        backend = _SlowLoadBackend()
+        with patch("transcriber.get_backend", return_value=MagicMock(return_value=backend)):
+            with patch("transcriber.get_reporter", return_value=None):
+                from transcriber import Transcriber
+                t = Transcriber(backend="sherpa", model_size="v3",
+                                enable_post_processing=False, result_cache_size=0)
+        done = threading.Event()
+        results = []
+        assert t.preload(lambda ok, elapsed: (results.append(ok), done.set()))
+        assert not t.preload()  # already in progress
+
+        text, _ = t.transcribe(np.zeros(16000, dtype=np.float32), 16000)
+        assert text == "text"
+        assert backend.load_calls == 1
+        assert done.wait(1.0) and results == [True]
+        assert not t.preload()  # already loaded
+
+    def test_trim_memory_unloads(self):
+        backend = _SlowLoadBackend()
+        backend.loaded = True
+        with patch("transcriber.get_backend", return_value=MagicMock(return_value=backend)):
+            with patch("transcriber.get_reporter", return_value=None):
+                from transcriber import Transcriber
+                t = Transcriber(backend="sherpa", model_size="v3", enable_post_processing=False)
+        t.text_processor = MagicMock()
+        t.trim_memory()
+        assert not backend.loaded
+        t.text_processor.release_models.assert_called_once()
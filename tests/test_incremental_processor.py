@@ -0,0 +1,113 @@
+"""Tests for incremental post-processing of growing partial transcripts."""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from incremental_processor import IncrementalTextProcessor
+
+DICTATION = ("привет это тест. я живу в москва и нижний новгород. сегодня хорошая погода? "
+             "завтра тоже будет хорошая погода. конец текста здесь")
+
+
+@pytest.fixture(scope="module")
+def processor():
+    from text_processor_enhanced import EnhancedTextProcessor
+    return EnhancedTextProcessor(language="ru", backend="whisper", enable_phonetics=False,
+                                 enable_morphology=False)
+
+
+def _prefixes(text):
+    words = text.split()
+    return [" ".join(words[:i]) for i in range(1, len(words) + 1)]
+
+
+class TestIncrementalTextProcessor:
+    def test_every_update_matches_full_run(self, processor):
+        incremental = IncrementalTextProcessor(processor)
+        for text in _prefixes(DICTATION):
+            assert incremental.update(text) == processor.process(text)
+        assert incremental.committed_words > 0
+        total = sum(len(text.split()) for text in _prefixes(DICTATION))
+        assert incremental.processed_words < total * 0.7
+
+    def test_finish_is_full_run(self, processor):
+        incremental = IncrementalTextProcessor(processor)
+        for text in _prefixes(DICTATION):
+            incremental.update(text)
+        assert incremental.finish(DICTATION) == processor.process(DICTATION)
+        assert incremental.committed_words == 0
+
+    def test_repeated_update_reuses_result(self):
+        fake = MagicMock()
+        fake.process.side_effect = str.upper
+        incremental = IncrementalTextProcessor(fake)
+        assert incremental.update("а б") == "А Б"
+        assert incremental.update("а б") == "А Б"
+        fake.process.assert_called_once()
+
+    def test_revised_hypothesis_starts_over(self, processor):
+        incremental = IncrementalTextProcessor(processor)
+        incremental.update("раз два три. четыре пять шесть семь")
+        assert incremental.committed_words == 3
+        revised = "раз два тринадцать. четыре пять шесть"
+        assert incremental.update(revised) == processor.process(revised)
+
+    def test_sentence_end_near_the_end_not_committed(self, processor):
+        incremental = IncrementalTextProcessor(processor, min_tail_words=3)
+        incremental.update("раз два три. четыре пять")
+        assert incremental.committed_words == 0
+
+    def test_context_dependent_tail_not_committed(self):
+        """A tail processed differently on its own keeps being reprocessed."""
+        def process(text):
+            words = text.split()
+            return " ".join(words) + (" (long)" if len(words) > 4 else "")
+
+        fake = MagicMock()
+        fake.process.side_effect = process
+        incremental = IncrementalTextProcessor(fake, min_tail_words=1)
+        assert incremental.update("а б. в г д") == "а б. в г д (long)"
+        assert incremental.committed_words == 0
+        assert incremental.update("а б. в г д е") == "а б. в г д е (long)"
+
+
+class TestTranscriberPreview:
+    @pytest.fixture
+    def transcriber(self):
+        backend = MagicMock(last_used_fallback=False)
+        texts = iter(["привет это тест.", "я живу в москва.", "сегодня хорошая погода"])
+        backend.transcribe.side_effect = lambda audio, sr, cancel_event=None: (next(texts), 0.1)
+        with patch("transcriber.get_backend", return_value=MagicMock(return_value=backend)):
+            with patch("transcriber.get_reporter", return_value=None):
+                from transcriber import Transcriber
+                t = Transcriber(backend="whisper", model_size="preview-test", enable_post_processing=False,
+                                result_cache_size=0)
+        t._enable_post_processing = True
+        return t
+
+    def test_preview_follows_decoded_segments(self, transcriber, processor):
+        transcriber.text_processor = processor
+        assert transcriber.preview_segmented() == ""
+        transcriber.start_segmented(16000)
+        session = transcriber._segment_session
+        for _ in range(3):
+            transcriber._submit_segment(session, np.zeros(16000, dtype=np.float32))
+            session.futures[-1].result(timeout=5)
+            raw = " ".join(f.result() for f in session.futures)
+            assert transcriber.preview_segmented() == processor.process(raw)
+        text, _ = transcriber.finish_segmented()
+        assert text == processor.process(raw)
+
+    def test_preview_is_raw_without_post_processing(self, transcriber):
+        transcriber._enable_post_processing = False
+        transcriber.start_segmented(16000)
+        transcriber._submit_segment(transcriber._segment_session, np.zeros(16000, dtype=np.float32))
+        transcriber._segment_session.futures[-1].result(timeout=5)
+        assert transcriber.preview_segmented() == "привет это тест."
+        transcriber.cancel_segmented()
@@ -0,0 +1,127 @@
+"""Tests for the out-of-process inference worker."""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from backends.base import BaseBackend
+from inference_worker import ProcessBackend, WorkerError
+
+
+class _FakeBackend(BaseBackend):
+    """Reports what it received; behaviour is selected by model_size."""
+
+    def __init__(self, model_size="echo", on_progress=None, **kwargs):
+        super().__init__(model_size=model_size, on_progress=on_progress)
+        self.loaded = False
+
+    def load_model(self):
+        if self.on_progress:
+            self.on_progress("fake loading")
+        self.loaded = True
+
+    def unload_model(self):
+        self.loaded = False
+
+    def is_model_loaded(self):
+        return self.loaded
+
+    def transcribe(self, audio, sample_rate=16000, cancel_event=None):
+        if self.model_size == "stuck":
+            time.sleep(60)  # uninterruptible, like a native call
+        elif self.model_size == "cooperative":
+            cancel_event.wait(60)
+            return "", 0.0
+        elif self.model_size == "crash":
+            os._exit(3)
+        zero_copy = not audio.flags.owndata
+        return f"{len(audio)}|{float(audio.sum()):.1f}|{os.getpid()}|{zero_copy}", 0.01
+
+
+@pytest.fixture
+def make_worker():
+    workers = []
+
+    def make(mode="echo", **kwargs):
+        w = ProcessBackend(_FakeBackend, {"model_size": mode}, **kwargs)
+        workers.append(w)
+        return w
+
+    yield make
+    for w in workers:
+        w.unload_model()
+
+
+def _pid(text):
+    return int(text.split("|")[2])
+
+
+class TestProcessBackend:
+    def test_round_trip_through_shared_memory(self, make_worker):
+        """Audio is mapped (not copied) in the child; the model stays loaded."""
+        worker = make_worker()
+        progress = []
+        worker.on_progress = progress.append
+
+        first, _ = worker.transcribe(np.full(16000, 0.5, dtype=np.float32), 16000)
+        length, total, pid, zero_copy = first.split("|")
+        assert (length, total, zero_copy) == ("16000", "8000.0", "True")
+        assert int(pid) != os.getpid()
+        assert progress == ["fake loading"]
+
+        second, _ = worker.transcribe(np.ones(100, dtype=np.float32))
+        assert _pid(second) == _pid(first)
+        assert worker.is_model_loaded()
+        assert worker.restarts == 0
+
+        worker.unload_model()
+        assert not worker.is_model_loaded()
+        assert worker.get_model_info()["worker_pid"] is None
+
+    def test_timeout_kills_and_respawns(self, make_worker):
+        worker = make_worker("stuck", request_timeout=0.5)
+        worker.load_model()
+        old_pid = worker.get_model_info()["worker_pid"]
+
+        start = time.time()
+        with pytest.raises(WorkerError, match="timed out"):
+            worker.transcribe(np.zeros(100, dtype=np.float32))
+        assert time.time() - start < 5
+        assert worker.restarts == 1
+        new_pid = worker.get_model_info()["worker_pid"]
+        assert new_pid is not None and new_pid != old_pid
+
+    def test_cooperative_cancel(self, make_worker):
+        worker = make_worker("cooperative")
+        worker.load_model()
+        cancel = threading.Event()
+        threading.Timer(0.2, cancel.set).start()
+
+        text, _ = worker.transcribe(np.zeros(100, dtype=np.float32), cancel_event=cancel)
+        assert text == ""
+        assert worker.restarts == 0
+
+    def test_stuck_cancel_is_hard_killed(self, make_worker, monkeypatch):
+        import inference_worker
+        monkeypatch.setattr(inference_worker, "CANCEL_GRACE_SEC", 0.3)
+        worker = make_worker("stuck")
+        worker.load_model()
+        cancel = threading.Event()
+        threading.Timer(0.2, cancel.set).start()
+
+        with pytest.raises(WorkerError, match="Cancelled"):
+            worker.transcribe(np.zeros(100, dtype=np.float32), cancel_event=cancel)
+        assert worker.restarts == 1
+
+    def test_native_crash_does_not_kill_parent(self, make_worker):
+        worker = make_worker("crash")
+        with pytest.raises(WorkerError, match="died"):
+            worker.transcribe(np.zeros(100, dtype=np.float32))
+        assert worker.restarts == 1
@@ -0,0 +1,100 @@
+"""Tests for the transcription job queue."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from job_queue import JobPriority, JobQueue
+
+
+@pytest.fixture
+def jq():
+    return JobQueue()
+
+
+class TestJobQueue:
+    def test_live_served_before_retry_and_background(self, jq):
+        jq.submit("bg", JobPriority.BACKGROUND)
+        jq.submit("retry", JobPriority.RETRY)
+        jq.submit("live", JobPriority.LIVE)
+        assert [jq.get(timeout=0).payload for _ in range(3)] == ["live", "retry", "bg"]
+
+    def test_fifo_within_priority(self, jq):
+        for name in ("a", "b", "c"):
+            jq.submit(name)
+        assert [jq.get(timeout=0).payload for _ in range(3)] == ["a", "b", "c"]
+
+    def test_cancelled_job_skipped(self, jq):
+        first = jq.submit("first")
+        jq.submit("second")
+        assert jq.cancel(first.job_id)
+        assert jq.get(timeout=0).payload == "second"
+        assert len(jq) == 1
+
+    def test_cancel_is_per_job(self, jq):
+        a = jq.submit("a")
+        b = jq.submit("b")
+        a.token.cancel()
+        assert a.token.cancelled
+        assert not b.token.cancelled
+
+    def test_cancel_all_respects_priority(self, jq):
+        live = jq.submit("live", JobPriority.LIVE)
+        bg = jq.submit("bg", JobPriority.BACKGROUND)
+        jq.cancel_all(JobPriority.RETRY)
+        assert live.token.cancelled
+        assert not bg.token.cancelled
+
+    def test_finish_forgets_job(self, jq):
+        job = jq.submit("x")
+        jq.finish(jq.get(timeout=0))
+        assert len(jq) == 0
+        assert not jq.cancel(job.job_id)
+
+    def test_get_timeout_returns_none(self, jq):
+        assert jq.get(timeout=0.01) is None
+
+    def test_close_wakes_blocked_worker(self, jq):
+        pending = jq.submit("pending")
+        results = []
+        worker = threading.Thread(target=lambda: results.append(jq.get()))
+        jq.close()
+        worker.start()
+        worker.join(timeout=2)
+        assert results == [None]
+        assert pending.token.cancelled
+        assert jq.get(timeout=0) is None
+        with pytest.raises(RuntimeError):
+            jq.submit("late")
+
+    def test_worker_loop_processes_in_priority_order(self, jq):
+        """A single consumer thread drains jobs in priority order."""
+        gate = threading.Event()
+        seen = []
+
+        def loop():
+            while True:
+                job = jq.get()
+                if job is None:
+                    return
+                gate.wait()
+                seen.append(job.payload)
+                jq.finish(job)
+
+        worker = threading.Thread(target=loop)
+        worker.start()
+        jq.submit("first")  # picked up immediately, blocks on gate
+        jq.submit("bg", JobPriority.BACKGROUND)
+        jq.submit("retry", JobPriority.RETRY)
+        jq.submit("live", JobPriority.LIVE)
+        gate.set()
+        while len(jq):
+            time.sleep(0.01)
+        jq.close()
+        worker.join(timeout=2)
+        assert seen[1:] == ["live", "retry", "bg"]
@@ -0,0 +1,186 @@
+"""Tests for the memory-budgeted model manager."""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from backends.model_manager import ModelManager
+
+
+class _FakeRSS:
+    """Process RSS in MB that grows/shrinks as fake models load/unload."""
+
+    def __init__(self):
+        self.mb = 200.0
+
+    def __call__(self, pid=None):
+        return self.mb if pid is None else 0.0
+
+
+class _FakeModel:
+    def __init__(self, rss, size_mb):
+        self.rss = rss
+        self.size_mb = size_mb
+        self.loaded = False
+        self.load_calls = 0
+        self.unload_calls = 0
+
+    def load_model(self):
+        self.load_calls += 1
+        self.loaded = True
+        self.rss.mb += self.size_mb
+
+    def unload_model(self):
+        self.unload_calls += 1
+        if self.loaded:
+            self.rss.mb -= self.size_mb
+        self.loaded = False
+
+    def is_model_loaded(self):
+        return self.loaded
+
+
+@pytest.fixture
+def rss():
+    return _FakeRSS()
+
+
+def _load(manager, rss, key, size_mb, pin=False):
+    model = manager.get(key, lambda: _FakeModel(rss, size_mb), pin=pin)
+    manager.ensure_loaded(key)
+    return model
+
+
+class TestModelManager:
+    def test_same_key_same_instance(self, rss):
+        manager = ModelManager(budget_mb=1000, rss_fn=rss)
+        a = _load(manager, rss, "a", 100)
+        b = _load(manager, rss, "a", 100)
+        assert a is b
+        assert a.load_calls == 1
+
+    def test_footprint_measured_from_rss(self, rss):
+        manager = ModelManager(budget_mb=1000, rss_fn=rss)
+        _load(manager, rss, "a", 300)
+        _load(manager, rss, "b", 150)
+        assert manager.resident_mb() == pytest.approx(450)
+        assert [m["footprint_mb"] for m in manager.stats()["models"]] == [300, 150]
+
+    def test_lru_evicted_beyond_budget(self, rss):
+        manager = ModelManager(budget_mb=500, rss_fn=rss)
+        a = _load(manager, rss, "a", 200)
+        b = _load(manager, rss, "b", 200)
+        manager.touch("a")  # b is now least recently used
+        _load(manager, rss, "c", 200)
+
+        assert not manager.contains("b")
+        assert b.unload_calls == 1
+        assert a.loaded
+        assert manager.resident_mb() == pytest.approx(400)
+        assert manager.stats()["evictions"] == 1
+
+    def test_pinned_never_evicted(self, rss):
+        manager = ModelManager(budget_mb=300, rss_fn=rss)
+        a = _load(manager, rss, "a", 250, pin=True)
+        b = _load(manager, rss, "b", 250)
+        # Over budget, but the only evictable model is the one just loaded
+        assert a.loaded
+        assert not b.loaded and not manager.contains("b")
+
+    def test_zero_budget_keeps_only_pinned(self, rss):
+        manager = ModelManager(budget_mb=0, rss_fn=rss)
+        a = _load(manager, rss, "a", 100, pin=True)
+        manager.unpin("a")
+        assert a.unload_calls == 1
+        assert not manager.contains("a")
+
+    def test_unpin_keeps_resident_within_budget(self, rss):
+        manager = ModelManager(budget_mb=1000, rss_fn=rss)
+        a = _load(manager, rss, "a", 100, pin=True)
+        manager.unpin("a")
+        assert a.loaded
+        manager.set_budget(50)
+        assert not a.loaded
+
+    def test_factory_error_registers_nothing(self, rss):
+        manager = ModelManager(budget_mb=1000, rss_fn=rss)
+        with pytest.raises(RuntimeError):
+            manager.get("a", MagicMock(side_effect=RuntimeError("boom")))
+        assert not manager.contains("a")
+
+    def test_unload_all(self, rss):
+        manager = ModelManager(budget_mb=1000, rss_fn=rss)
+        a = _load(manager, rss, "a", 100, pin=True)
+        manager.unload_all()
+        assert not a.loaded
+        assert manager.stats()["models"] == []
+
+
+class TestTranscriberIntegration:
+    def test_switch_back_reuses_loaded_model(self, rss):
+        manager = ModelManager(budget_mb=1000, rss_fn=rss)
+        sherpa_cls = MagicMock(side_effect=lambda **kw: _FakeModel(rss, 300))
+        whisper_cls = MagicMock(side_effect=lambda **kw: _FakeModel(rss, 400))
+        classes = {"sherpa": sherpa_cls, "whisper": whisper_cls}
+
+        with patch("transcriber.get_model_manager", return_value=manager), \
+                patch("transcriber.get_backend", side_effect=classes.get), \
+                patch("transcriber.get_reporter", return_value=None):
+            from transcriber import Transcriber
+            t = Transcriber(backend="sherpa", model_size="v3", enable_post_processing=False)
+            t.load_model()
+            sherpa = t._backend
+            t.switch_backend("whisper", "base")
+            t.load_model()
+            t.switch_backend("sherpa", "v3")
+            t.load_model()
+
+        assert t._backend is sherpa
+        assert sherpa.load_calls == 1
+        assert sherpa_cls.call_count == 1
+        assert t.get_memory_stats()["resident_mb"] == pytest.approx(700)
+
+    def test_previous_backend_evicted_over_budget(self, rss):
+        manager = ModelManager(budget_mb=500, rss_fn=rss)
+        classes = {
+            "sherpa": MagicMock(side_effect=lambda **kw: _FakeModel(rss, 300)),
+            "whisper": MagicMock(side_effect=lambda **kw: _FakeModel(rss, 400)),
+        }
+        with patch("transcriber.get_model_manager", return_value=manager), \
+                patch("transcriber.get_backend", side_effect=classes.get), \
+                patch("transcriber.get_reporter", return_value=None):
+            from transcriber import Transcriber
+            t = Transcriber(backend="sherpa", model_size="v3", enable_post_processing=False)
+            t.load_model()
+            sherpa = t._backend
+            t.switch_backend("whisper", "base")
+            t.load_model()
+
+        assert not sherpa.loaded
+        assert t._backend.loaded
+
+
+class TestGroqFallback:
+    def test_fallback_shared_and_kept_resident(self, rss):
+        from backends.groq_backend import GroqBackend
+
+        manager = ModelManager(budget_mb=1000, rss_fn=rss)
+        fake_sherpa = MagicMock(side_effect=lambda **kw: _FakeModel(rss, 500))
+        with patch("backends.groq_backend.get_model_manager", return_value=manager), \
+                patch("backends.sherpa_backend.SherpaBackend", fake_sherpa):
+            first = GroqBackend()
+            fallback = first._get_fallback()
+            first._load_fallback(fallback)
+            first.unload_model()
+            assert fallback.loaded  # released, but within budget
+
+            second = GroqBackend()
+            assert second._get_fallback() is fallback
+            second._load_fallback(fallback)
+
+        assert fallback.load_calls == 1
+        assert fake_sherpa.call_count == 1
@@ -0,0 +1,175 @@
+"""Tests for the shared bounded morphological parse cache."""
+
+import os
+import sys
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from morph_singleton import MorphCache, get_morph_cache
+from morphology import MorphologyCorrector
+from phonetics import PhoneticCorrector
+
+
+def _parse(word, score, pos=None, gender=None, normal_form=None, inflections=None):
+    inflections = inflections or {}
+
+    def inflect(grammemes):
+        form = inflections.get(frozenset(grammemes))
+        return SimpleNamespace(word=form) if form else None
+
+    return SimpleNamespace(word=word, score=score, normal_form=normal_form or word,
+                           tag=SimpleNamespace(POS=pos, gender=gender), inflect=inflect)
+
+
+class FakeAnalyzer:
+    """pymorphy2-like analyzer over a fixed table, counting parse() calls."""
+
+    def __init__(self, table):
+        self.table = table
+        self.calls = 0
+
+    def parse(self, word):
+        self.calls += 1
+        return self.table.get(word, [])
+
+
+@pytest.fixture
+def analyzer():
+    return FakeAnalyzer({
+        "кот": [_parse("кот", 0.9, "NOUN", "masc")],
+        "кошка": [_parse("кошка", 0.9, "NOUN", "femn")],
+        "большой": [_parse("большой", 0.8, "ADJF", "masc",
+                           inflections={frozenset({"femn"}): "большая"})],
+        "котов": [_parse("котов", 0.3, "NOUN", "masc", normal_form="кот")],
+        "шум": [_parse("шум", 0.05), _parse("шум", 0.2)],
+        "ыыы": [_parse("ыыы", 0.05)],
+    })
+
+
+class TestMorphCache:
+    def test_facts_are_compact_and_cached(self, analyzer):
+        cache = MorphCache(analyzer=analyzer)
+        facts = cache.facts("Кот")
+        assert facts == (True, 0.9, "NOUN", "masc", "кот")
+        assert cache.facts("кот") is facts
+        assert analyzer.calls == 1
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_validity_uses_any_parse(self, analyzer):
+        cache = MorphCache(analyzer=analyzer)
+        assert cache.is_valid("шум")
+        assert not cache.is_valid("ыыы")
+        assert not cache.is_valid("нет-такого")
+        assert not cache.is_valid("")
+        assert cache.facts("нет-такого") is None
+
+    def test_lru_bound_evicts_oldest(self, analyzer):
+        cache = MorphCache(maxsize=2, analyzer=analyzer)
+        cache.facts("кот")
+        cache.facts("кошка")
+        cache.facts("кот")  # refresh: "кошка" is now the oldest
+        cache.facts("шум")
+        assert cache.stats()["size"] == 2
+        calls = analyzer.calls
+        cache.facts("кот")
+        assert analyzer.calls == calls
+        cache.facts("кошка")
+        assert analyzer.calls == calls + 1
+
+    def test_inflect_cached(self, analyzer):
+        cache = MorphCache(analyzer=analyzer)
+        femn = frozenset({"femn"})
+        assert cache.inflect("большой", femn) == "большая"
+        assert cache.inflect("большой", femn) == "большая"
+        assert cache.inflect("большой", frozenset({"neut"})) is None
+        assert analyzer.calls == 2
+
+    def test_stats_and_clear(self, analyzer):
+        cache = MorphCache(analyzer=analyzer)
+        for word in ("кот", "кот", "кот", "кошка"):
+            cache.facts(word)
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 2, 0.5)
+        cache.clear()
+        assert cache.stats() == {"size": 0, "maxsize": cache.maxsize, "hits": 0,
+                                 "misses": 0, "hit_rate": 0.0}
+
+    def test_concurrent_lookups(self, analyzer):
+        cache = MorphCache(maxsize=3, analyzer=analyzer)
+        words = list(analyzer.table)
+
+        def worker():
+            for i in range(500):
+                cache.facts(words[i % len(words)])
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = cache.stats()
+        assert stats["size"] <= 3
+        assert stats["hits"] + stats["misses"] == 2000
+
+    def test_release_forgets_shared_analyzer(self, analyzer):
+        with patch("morph_singleton.PYMORPHY2_AVAILABLE", True), \
+                patch("morph_singleton.get_morph", return_value=analyzer) as get_morph:
+            cache = MorphCache()
+            cache.facts("кот")
+            cache.release()
+            assert cache.stats()["size"] == 0
+            cache.facts("кот")
+        assert get_morph.call_count == 2
+        assert analyzer.calls == 2
+
+    def test_release_keeps_injected_analyzer(self, analyzer):
+        cache = MorphCache(analyzer=analyzer)
+        cache.facts("кот")
+        cache.release()
+        assert cache.facts("кот") is not None
+        assert analyzer.calls == 2
+
+    def test_unavailable_without_pymorphy2(self):
+        with patch("morph_singleton.PYMORPHY2_AVAILABLE", False):
+            cache = MorphCache()
+            assert cache.facts("кот") is None
+            assert cache.inflect("кот", frozenset({"femn"})) is None
+
+    def test_singleton(self):
+        assert get_morph_cache() is get_morph_cache()
+
+
+class TestCorrectorsShareCache:
+    @pytest.fixture
+    def cache(self, analyzer):
+        return MorphCache(analyzer=analyzer)
+
+    @pytest.fixture
+    def morphology(self, cache):
+        with patch("morphology.PYMORPHY2_AVAILABLE", True), \
+                patch("morphology.get_morph_cache", return_value=cache):
+            corrector = MorphologyCorrector()
+            yield corrector
+
+    def test_gender_agreement(self, morphology):
+        assert morphology.fix_gender_agreement("большой кошка, кот") == "большая кошка, кот"
+
+    def test_case_endings_use_normal_form(self, morphology):
+        assert morphology.fix_case_endings("котов кот") == "кот кот"
+
+    def test_phonetics_reuses_morphology_parses(self, morphology, cache, analyzer):
+        morphology.process("кот кошка")
+        calls = analyzer.calls
+        with patch("phonetics.PYMORPHY_AVAILABLE", True), \
+                patch("phonetics.get_vocabulary_index", return_value=None), \
+                patch("phonetics.get_morph", return_value=analyzer), \
+                patch("phonetics.get_morph_cache", return_value=cache):
+            phonetics = PhoneticCorrector(enable_validation=True)
+        assert phonetics._is_valid_russian_word("кот")
+        assert phonetics._is_valid_russian_word("кошка")
+        assert analyzer.calls == calls
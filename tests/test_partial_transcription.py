@@ -0,0 +1,169 @@
+"""Tests for deadline-aware partial transcription and resume."""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from backends.base import BaseBackend
+from hedging import HedgedExecutor, HedgePath, HedgingPolicy
+
+SR = 16000
+
+
+class _ChunkBackend(BaseBackend):
+    """Names each chunk by its tone amplitude; decode takes `delay` seconds."""
+
+    PARTIAL_CHUNK_THRESHOLD_SEC = 10.0
+    PARTIAL_CHUNK_MIN_SEC = 3.0
+    PARTIAL_CHUNK_MAX_SEC = 6.0
+
+    def __init__(self, delay=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.calls = 0
+
+    def load_model(self):
+        pass
+
+    def unload_model(self):
+        pass
+
+    def is_model_loaded(self):
+        return True
+
+    def transcribe(self, audio, sample_rate=16000, cancel_event=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        return f"c{int(round(float(np.max(np.abs(audio))) * 10))}", self.delay
+
+
+def _long_clip(n_chunks):
+    """n 4-second tones with amplitude (i + 1) / 10, separated by 1s pauses."""
+    t = np.arange(4 * SR) / SR
+    parts = []
+    for i in range(n_chunks):
+        parts += [((i + 1) / 10 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), np.zeros(SR, np.float32)]
+    return np.concatenate(parts[:-1])
+
+
+class TestBackendPartial:
+    def test_short_audio_single_chunk(self):
+        result = _ChunkBackend().transcribe_partial(np.zeros(SR, np.float32), SR)
+        assert result.complete
+        assert result.completeness == 1.0
+
+    def test_full_run_complete(self):
+        result = _ChunkBackend().transcribe_partial(_long_clip(4), SR)
+        assert result.text == "c1 c2 c3 c4"
+        assert result.complete
+        assert result.checkpoint is None
+
+    def test_cancel_keeps_completed_chunks(self):
+        backend = _ChunkBackend(delay=0.1)
+        cancel = threading.Event()
+        threading.Timer(0.15, cancel.set).start()
+
+        result = backend.transcribe_partial(_long_clip(4), SR, cancel_event=cancel)
+        assert result.text == "c1 c2"
+        assert not result.complete
+        assert 0.0 < result.completeness < 1.0
+        assert result.checkpoint.next_index == 2
+
+    def test_deadline_then_resume(self):
+        backend = _ChunkBackend(delay=0.1)
+        first = backend.transcribe_partial(_long_clip(4), SR, deadline=time.monotonic() + 0.15)
+        assert first.text.split() == ["c1", "c2"][:len(first.text.split())]
+        assert not first.complete
+        calls_before = backend.calls
+
+        rest = backend.transcribe_partial(checkpoint=first.checkpoint)
+        assert rest.text == "c1 c2 c3 c4"
+        assert rest.complete
+        assert backend.calls - calls_before == 4 - first.checkpoint.next_index  # no chunk decoded twice
+
+    def test_deadline_skips_chunk_predicted_to_overrun(self):
+        """After one chunk the observed speed predicts the next would miss the deadline."""
+        backend = _ChunkBackend(delay=0.2)
+        result = backend.transcribe_partial(_long_clip(4), SR, deadline=time.monotonic() + 0.3)
+        assert backend.calls == 1
+        assert result.text == "c1"
+
+
+@pytest.fixture
+def transcriber():
+    backend = _ChunkBackend(delay=0.1)
+    with patch("transcriber.get_backend", return_value=MagicMock(return_value=backend)):
+        with patch("transcriber.get_reporter", return_value=None):
+            from transcriber import Transcriber
+            t = Transcriber(backend="sherpa", model_size="v3", enable_post_processing=False)
+    t.text_processor = MagicMock()
+    t.text_processor.process.side_effect = lambda text: text.upper()
+    t._enable_post_processing = True
+    return t
+
+
+class TestTranscriberPartial:
+    def test_timeout_returns_processed_partial_and_resumes(self, transcriber):
+        partial = transcriber.transcribe_with_deadline(_long_clip(4), SR, timeout_sec=0.15)
+        assert not partial.complete
+        assert partial.text.startswith("C1")
+
+        final = transcriber.resume(partial.checkpoint)
+        assert final.complete
+        assert final.text == "C1 C2 C3 C4"
+        assert final.completeness == 1.0
+
+    def test_cancel_keeps_work(self, transcriber):
+        threading.Timer(0.15, transcriber.cancel).start()
+        partial = transcriber.transcribe_with_deadline(_long_clip(4), SR)
+        assert partial.text == "C1 C2"
+        assert partial.completeness == pytest.approx(partial.checkpoint.completeness)
+
+    def test_own_cancel_event(self, transcriber):
+        cancel = threading.Event()
+        threading.Timer(0.15, cancel.set).start()
+        partial = transcriber.transcribe_with_deadline(_long_clip(4), SR, cancel_event=cancel)
+        assert partial.text == "C1 C2"
+        assert not transcriber._cancel_event.is_set()
+
+    def test_complete_result_cached(self, transcriber):
+        first = transcriber.transcribe_with_deadline(_long_clip(4), SR)
+        calls = transcriber._backend.calls
+        second = transcriber.transcribe_with_deadline(_long_clip(4), SR)
+        assert second.text == first.text == "C1 C2 C3 C4"
+        assert second.complete
+        assert transcriber._backend.calls == calls
+
+    def test_partial_result_not_cached(self, transcriber):
+        transcriber.transcribe_with_deadline(_long_clip(4), SR, timeout_sec=0.15)
+        calls = transcriber._backend.calls
+        assert transcriber.transcribe_with_deadline(_long_clip(4), SR).complete
+        assert transcriber._backend.calls - calls == 4
+
+    def test_hedged_timeout_returns_partial(self, transcriber):
+        """The worker's local path stops before the hedger's legacy timeout,
+        so the run ends with the decoded chunks instead of a TimeoutError."""
+        executor = HedgedExecutor(HedgingPolicy(legacy_min_sec=0.35, legacy_ratio=0.0))
+        timeout_sec = executor.policy.legacy_delay(20.0) - 0.1
+
+        def run_local(cancel_event):
+            partial = transcriber.transcribe_with_deadline(
+                _long_clip(4), SR, timeout_sec, cancel_event=cancel_event)
+            return partial.text, partial.elapsed, partial.checkpoint
+
+        try:
+            result = executor.run([HedgePath("sherpa", run_local)], audio_sec=20.0,
+                                  is_acceptable=lambda r: bool(r and r[0]))
+        finally:
+            executor.shutdown()
+        text, _, checkpoint = result.value
+        assert text.startswith("C1")
+        assert checkpoint is not None
+        assert transcriber.resume(checkpoint).text == "C1 C2 C3 C4"
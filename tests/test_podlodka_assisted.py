@@ -0,0 +1,106 @@
+"""Tests for Podlodka assisted (speculative) decoding."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backends import podlodka_turbo_backend
+from src.backends.podlodka_turbo_backend import (
+    PodlodkaTurboBackend,
+    assisted_decoding_stats,
+)
+
+
+class TestAssistedStats:
+    def test_acceptance_rate(self):
+        """Accepted tokens = new tokens minus one own token per target pass."""
+        stats = assisted_decoding_stats(new_tokens=20, target_passes=5, draft_passes=20, elapsed=1.0)
+        assert stats["acceptance_rate"] == pytest.approx(15 / 20)
+        assert stats["tokens_per_pass"] == pytest.approx(4.0)
+        assert stats["ms_per_token"] == pytest.approx(50.0)
+        assert stats["speedup"] is None
+
+    def test_speedup_against_plain_baseline(self):
+        """Speedup is reported once a plain greedy baseline exists."""
+        stats = assisted_decoding_stats(
+            new_tokens=10, target_passes=5, draft_passes=8, elapsed=0.5, plain_ms_per_token=100.0
+        )
+        assert stats["speedup"] == pytest.approx(2.0)
+
+    def test_no_tokens(self):
+        """Empty generation does not divide by zero."""
+        stats = assisted_decoding_stats(new_tokens=0, target_passes=0, draft_passes=0, elapsed=0.1)
+        assert stats["acceptance_rate"] == 0.0
+        assert stats["tokens_per_pass"] == 0.0
+
+
+class TestAssistedMatchesGreedy:
+    """Assisted output must equal plain greedy decoding (tiny random models)."""
+
+    @pytest.fixture
+    def tiny_models(self):
+        torch = pytest.importorskip("torch")
+        transformers = pytest.importorskip("transformers")
+        torch.manual_seed(0)
+        cfg = dict(
+            vocab_size=96, d_model=16, encoder_layers=1, decoder_layers=2,
+            encoder_attention_heads=2, decoder_attention_heads=2,
+            encoder_ffn_dim=32, decoder_ffn_dim=32, num_mel_bins=8,
+            max_source_positions=20, max_target_positions=64,
+            decoder_start_token_id=1, eos_token_id=2, pad_token_id=0, bos_token_id=1,
+        )
+        target = transformers.WhisperForConditionalGeneration(
+            transformers.WhisperConfig(**cfg)
+        ).eval()
+        draft = transformers.WhisperForCausalLM(
+            transformers.WhisperConfig(**{**cfg, "decoder_layers": 1})
+        ).eval()
+        return torch, target, draft
+
+    def test_output_identical(self, tiny_models):
+        torch, target, draft = tiny_models
+        backend = PodlodkaTurboBackend()
+        backend._model = target
+
+        for seed in range(3):
+            torch.manual_seed(seed)
+            inputs = {"input_features": torch.randn(1, 8, 40)}
+
+            backend._assistant_model = None
+            plain = backend._generate(inputs, max_new_tokens=16)
+
+            backend._assistant_model = draft
+            assisted = backend._generate(inputs, max_new_tokens=16)
+
+            assert torch.equal(plain, assisted)
+            stats = backend.last_assisted_stats
+            assert stats["target_passes"] >= 1
+            assert stats["draft_passes"] >= 1
+            assert 0.0 <= stats["acceptance_rate"] <= 1.0
+
+    def test_plain_baseline_gives_speedup(self, tiny_models, monkeypatch):
+        """With a draft model configured, periodic plain calls provide the baseline."""
+        torch, target, draft = tiny_models
+        monkeypatch.setattr(podlodka_turbo_backend, "PLAIN_BASELINE_EVERY", 2)
+        backend = PodlodkaTurboBackend()
+        backend._model = target
+        backend._assistant_model = draft
+        inputs = {"input_features": torch.randn(1, 8, 40)}
+
+        outputs, assisted, tokens = [], [], []
+        for _ in range(4):
+            backend.last_assisted_stats = None
+            outputs.append(backend._generate(inputs, max_new_tokens=16))
+            assisted.append(backend.last_assisted_stats is not None)
+            tokens.append(backend.last_new_tokens)
+
+        assert assisted == [False, True, True, False]
+        assert all(torch.equal(outputs[0], out) for out in outputs)
+        # Same decoder prompt subtracted on both paths
+        assert len(set(tokens)) == 1 and 0 < tokens[0] < outputs[0].shape[-1]
+        backend._generate(inputs, max_new_tokens=16)
+        assert backend.last_assisted_stats["speedup"] is not None
@@ -0,0 +1,132 @@
+"""Tests for the opt-in per-call profiler."""
+
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import profiling
+from crash_reporter import CrashReporter
+from profiling import CallProfiler, latest_profile
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+
+def _stems(path):
+    return sorted({os.path.splitext(f)[0] for f in os.listdir(path)})
+
+
+class TestCallProfiler:
+    def test_disabled_writes_nothing(self, tmp_path):
+        p = CallProfiler(str(tmp_path / "profiles"), enabled=False)
+        with p.profile("transcribe"):
+            _busy(0.01)
+        assert not (tmp_path / "profiles").exists()
+
+    def test_writes_prof_collapsed_and_summary(self, tmp_path):
+        out = tmp_path / "profiles"
+        p = CallProfiler(str(out), enabled=True, sample_interval=0.001)
+        with p.profile("transcribe", backend="whisper", model="base"):
+            _busy(0.05)
+
+        [stem] = _stems(out)
+        assert stem.endswith("_transcribe")
+        assert {f.suffix for f in out.iterdir()} == {".prof", ".collapsed", ".txt"}
+        summary = (out / f"{stem}.txt").read_text(encoding="utf-8")
+        assert summary.startswith("transcribe | elapsed=")
+        assert "backend=whisper | model=base" in summary
+        assert "_busy" in summary
+        collapsed = (out / f"{stem}.collapsed").read_text(encoding="utf-8")
+        assert "_busy" in collapsed
+        stack, count = collapsed.splitlines()[0].rsplit(" ", 1)
+        assert ";" in stack and int(count) > 0
+
+    def test_nested_calls_fold_into_outer(self, tmp_path):
+        out = tmp_path / "profiles"
+        p = CallProfiler(str(out), enabled=True)
+        with p.profile("outer"):
+            with p.profile("inner"):
+                pass
+        assert [s.split("_", 1)[1] for s in _stems(out)] == ["outer"]
+
+    def test_rotation_keeps_newest(self, tmp_path):
+        out = tmp_path / "profiles"
+        p = CallProfiler(str(out), enabled=True, keep=3)
+        for i in range(5):
+            with p.profile(f"call{i}"):
+                pass
+        assert [s.split("_", 1)[1] for s in _stems(out)] == ["call2", "call3", "call4"]
+        assert len(os.listdir(out)) == 9
+
+    def test_profiled_error_propagates(self, tmp_path):
+        p = CallProfiler(str(tmp_path), enabled=True)
+        with pytest.raises(RuntimeError):
+            with p.profile("transcribe"):
+                raise RuntimeError("boom")
+        assert latest_profile(str(tmp_path)) is not None
+
+
+class TestCrashReportAttachment:
+    def test_latest_profile_attached(self, tmp_path):
+        reporter = CrashReporter(crash_dir=str(tmp_path))
+        assert "profile" not in reporter._build_report(RuntimeError, RuntimeError("x"), None)
+
+        p = CallProfiler(str(tmp_path / profiling.PROFILE_SUBDIR), enabled=True)
+        for name in ("load_model", "transcribe"):
+            with p.profile(name):
+                pass
+        report = reporter._build_report(RuntimeError, RuntimeError("x"), None)
+        assert report["profile"]["prof"].endswith("_transcribe.prof")
+        assert os.path.exists(report["profile"]["collapsed"])
+        assert report["profile"]["summary"].startswith("transcribe")
+
+
+class _EchoBackend:
+    def __init__(self, **kwargs):
+        self.last_used_fallback = False
+
+    def load_model(self):
+        pass
+
+    def unload_model(self):
+        pass
+
+    def is_model_loaded(self):
+        return True
+
+    def transcribe(self, audio, sample_rate=16000, cancel_event=None):
+        return "привет", 0.0
+
+
+class TestTranscriberProfiling:
+    def test_transcribe_and_load_profiled(self, tmp_path):
+        with patch("transcriber.get_backend", return_value=MagicMock(side_effect=_EchoBackend)):
+            with patch("transcriber.get_reporter", return_value=None):
+                from transcriber import Transcriber
+                t = Transcriber(backend="whisper", model_size="profile-test", result_cache_size=0)
+
+        out = tmp_path / "profiles"
+        with patch.object(profiling, "_profiler", CallProfiler(str(out), enabled=True)):
+            t.load_model()
+            t.transcribe(np.zeros(16000, dtype=np.float32), 16000)
+
+        assert [s.split("_", 1)[1] for s in _stems(out)] == ["load_model", "transcribe"]
+        summary = latest_profile(str(out))["summary"]
+        assert "backend=whisper | model=profile-test" in summary
+
+    def test_env_switch(self, monkeypatch):
+        monkeypatch.setenv(profiling.PROFILE_ENV, "1")
+        with patch.object(profiling, "_profiler", None):
+            with patch("crash_reporter.get_reporter", return_value=None):
+                assert profiling.get_profiler().enabled
+                profiling.configure_profiler(False)
+                assert profiling.get_profiler().enabled
@@ -0,0 +1,176 @@
+"""Tests for the compiled proper noun index and multi-word capitalization."""
+
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import proper_nouns
+from proper_noun_index import ProperNounIndex, build_index, compile_entries, match_case
+from proper_nouns import ProperNounDict
+
+SOURCES = {
+    "cities": [
+        {"name": "Москва", "variants": ["москва", "мск"]},
+        {"name": "Нижний Новгород", "variants": ["нижний новгород", "нижний"]},
+        {"name": "Санкт-Петербург", "variants": ["санкт петербург", "спб"]},
+        {"name": "Ростов-на-Дону", "variants": []},
+    ],
+    "names": [
+        {"name": "Денис", "variants": ["ден"]},
+        {"name": "Вера", "variants": ["верочка"]},
+        {"name": "Vera", "variants": ["вера"]},
+    ],
+    "countries": [
+        {"name": "США", "variants": ["соединенные штаты америки"]},
+    ],
+}
+
+FORMS = {
+    "Москва": ["москвы", "москве", "москвой"],
+    "Нижний Новгород": ["нижнего новгорода", "нижнем новгороде"],
+    "Ростов-на-Дону": ["ростове-на-дону"],
+    "Вера": ["веры"],
+}
+
+
+def _inflect(name):
+    return FORMS.get(name, [])
+
+
+@pytest.fixture
+def table():
+    return compile_entries(SOURCES, inflect=_inflect, is_ambiguous=lambda word: word == "веры")
+
+
+@pytest.fixture
+def index_path(tmp_path, table):
+    path = tmp_path / "proper_nouns.idx"
+    build_index(table, path, {"cities": 4, "names": 3, "countries": 1})
+    return path
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name, entries in SOURCES.items():
+        (tmp_path / f"{name}.json").write_text(json.dumps(entries, ensure_ascii=False), encoding="utf-8")
+    return tmp_path
+
+
+class TestCompile:
+    def test_entries_and_prefixes(self, table):
+        assert table["москве"] == "Москве"
+        assert table["нижнем новгороде"] == "Нижнем Новгороде"
+        assert table["ростове-на-дону"] == "Ростове-на-Дону"
+        assert table["спб"] == "Санкт-Петербург"
+        assert table["нижний"] == "Нижний Новгород"        # a variant, not just a prefix
+        assert table["нижнем"] == "" and table["соединенные штаты"] == ""
+
+    def test_common_words_left_out(self, table):
+        assert "вера" not in table and "веры" not in table
+        assert table["верочка"] == "Вера"
+
+    def test_match_case(self):
+        assert match_case("нижнем новгороде", "Нижний Новгород") == "Нижнем Новгороде"
+        assert match_case("ростове-на-дону", "Ростов-на-Дону") == "Ростове-на-Дону"
+        assert match_case("сша", "США") == "США"
+        assert match_case("санкт петербурге", "Санкт-Петербург") == "Санкт петербурге"
+
+
+class TestProperNounIndex:
+    def test_matches_table(self, index_path, table):
+        index = ProperNounIndex(index_path)
+        assert dict(index.items()) == table
+        for key, value in table.items():
+            assert index.get(key) == value
+        for key in ("москв", "москвах", "", "новгород", "нижнем новгороде и"):
+            assert index.get(key) is None
+        assert index.max_words == 3
+        assert index.counts == {"cities": 4, "names": 3, "countries": 1}
+        index.close()
+
+    def test_empty_index(self, tmp_path):
+        path = tmp_path / "empty.idx"
+        assert build_index({}, path) == 0
+        index = ProperNounIndex(path)
+        assert index.get("москва") is None
+        index.close()
+
+    @pytest.mark.parametrize("content", [b"", b"not an index", b"TKPNIDX1" + b"\x03" * 28])
+    def test_invalid_file_rejected(self, tmp_path, content):
+        path = tmp_path / "bad.idx"
+        path.write_bytes(content)
+        with pytest.raises(ValueError):
+            ProperNounIndex(path)
+
+
+class TestCapitalization:
+    @pytest.fixture(params=["index", "json"])
+    def pn(self, request, index_path, data_dir):
+        if request.param == "index":
+            return ProperNounDict(index_path=index_path)
+        return ProperNounDict(data_dir=str(data_dir))
+
+    def test_single_and_multi_word(self, pn):
+        assert pn.capitalize_known("из москва в санкт петербург, потом спб") == \
+            "из Москва в Санкт-Петербург, потом Санкт-Петербург"
+        assert pn.capitalize_known("нижний новгород и нижний") == "Нижний Новгород и Нижний Новгород"
+
+    def test_phrase_does_not_span_punctuation(self, pn):
+        assert pn.capitalize_known("нижний, новгород") == "Нижний Новгород, новгород"
+        assert pn.capitalize_known("(санкт) петербург") == "(санкт) петербург"
+
+    def test_phrase_keeps_outer_punctuation(self, pn):
+        assert pn.capitalize_known("в (санкт петербург), да") == "в (Санкт-Петербург), да"
+
+    def test_inflected_forms_from_index_only(self, index_path, data_dir):
+        text = "в москве и нижнем новгороде"
+        assert ProperNounDict(index_path=index_path).capitalize_known(text) == \
+            "в Москве и Нижнем Новгороде"
+        assert ProperNounDict(data_dir=str(data_dir)).capitalize_known(text) == text
+
+    def test_common_words_untouched(self, pn):
+        assert pn.capitalize_known("вера и верочка") == "вера и Вера"
+
+    def test_lookup_helpers(self, pn):
+        assert pn.is_proper_noun("Москва") and pn.is_proper_noun("Нижний  Новгород")
+        assert not pn.is_proper_noun("нижнем") and not pn.is_proper_noun("вера")
+        assert pn.get_canonical("мск") == "Москва"
+        assert pn.get_canonical("кот") == "кот"
+        assert pn.get_stats()["cities"] == 4
+
+
+class TestLoading:
+    def test_missing_index_falls_back_to_json(self, tmp_path):
+        with patch("proper_nouns.DEFAULT_INDEX_PATH", tmp_path / "missing.idx"):
+            pn = ProperNounDict()
+        assert isinstance(pn._table, dict)
+        assert pn.capitalize_known("в москве") == "в москве"
+
+    def test_current_index_used_by_default(self, index_path):
+        os.utime(index_path, (4e9, 4e9))  # newer than the JSON files
+        with patch("proper_nouns.DEFAULT_INDEX_PATH", index_path):
+            pn = ProperNounDict()
+        assert isinstance(pn._table, ProperNounIndex)
+        assert pn.capitalize_known("в москве") == "в Москве"
+
+    def test_broken_index_falls_back_to_json(self, tmp_path, data_dir):
+        path = tmp_path / "bad.idx"
+        path.write_bytes(b"garbage")
+        pn = ProperNounDict(data_dir=str(data_dir), index_path=path)
+        assert pn.capitalize_known("мск") == "Москва"
+
+    def test_processor_uses_shared_instance(self):
+        from text_processor_enhanced import EnhancedTextProcessor
+        shared = ProperNounDict(data_dir=os.path.join(os.path.dirname(__file__), "..", "src", "data"))
+        with patch.object(proper_nouns, "_instance", shared):
+            processors = [EnhancedTextProcessor(language="ru", backend="sherpa", enable_phonetics=False,
+                                                enable_morphology=False) for _ in range(2)]
+            for processor in processors:
+                processor._ensure_components()
+        assert all(processor.proper_nouns is shared for processor in processors)
+        assert processors[0].process("я живу в нижний новгород") == "Я живу в Нижний Новгород"
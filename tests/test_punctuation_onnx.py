@@ -0,0 +1,167 @@
+"""Tests for the ONNX punctuation restoration stage (fake session/tokenizer)."""
+
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import punctuation_onnx
+from punctuation_onnx import OnnxPunctuationModel, windows
+
+LABELS = ["0", ".", ",", "?"]
+CLS, SEP, PAD = 0, 2, 1
+SPECIAL = {"<s>": CLS, "</s>": SEP, "<pad>": PAD}
+
+
+class FakeTokenizer:
+    """Words split into 2-char subwords; ids encode the word's label.
+
+    A word ending in "_" gets "," after it, "ъ" -> "?", "~" -> ".";
+    the id of the word's first subword is 10 * label index + 3, later
+    subwords get id 3 (label "0"), so only first-subword labels count.
+    """
+
+    def token_to_id(self, token):
+        return SPECIAL.get(token)
+
+    def encode(self, words, is_pretokenized, add_special_tokens):
+        assert is_pretokenized and not add_special_tokens
+        ids, word_ids = [], []
+        for w, word in enumerate(words):
+            label = {"_": 2, "ъ": 3, "~": 1}.get(word[-1], 0)
+            pieces = max(1, (len(word) + 1) // 2)
+            ids.extend([10 * label + 3] + [3] * (pieces - 1))
+            word_ids.extend([w] * pieces)
+        return SimpleNamespace(ids=ids, word_ids=word_ids)
+
+
+class FakeSession:
+    """Logits picking LABELS[id // 10] per token; records every batch."""
+
+    def __init__(self, inputs=("input_ids", "attention_mask")):
+        self._inputs = [SimpleNamespace(name=name) for name in inputs]
+        self.batches = []
+
+    def get_inputs(self):
+        return self._inputs
+
+    def run(self, output_names, feeds):
+        input_ids, mask = feeds["input_ids"], feeds["attention_mask"]
+        self.batches.append(feeds)
+        for row, row_mask in zip(input_ids, mask):
+            n = int(row_mask.sum())
+            assert row[0] == CLS and row[n - 1] == SEP and (row[n:] == PAD).all()
+        logits = np.zeros(input_ids.shape + (len(LABELS),), dtype=np.float32)
+        labels = np.where(input_ids >= 3, input_ids // 10, 0)
+        np.put_along_axis(logits, labels[..., None], 1.0, axis=-1)
+        return [logits]
+
+
+def _model(session=None, **kwargs):
+    return OnnxPunctuationModel(session or FakeSession(), FakeTokenizer(), LABELS, **kwargs)
+
+
+def _expected(words):
+    labels = [{"_": 2, "ъ": 3, "~": 1}.get(w[-1], 0) for w in words]
+    return [LABELS[label] for label in labels]
+
+
+class TestWindows:
+    @pytest.mark.parametrize("length", [0, 1, 7, 8, 9, 30, 101])
+    def test_owned_ranges_cover_everything_once(self, length):
+        spans = windows(length, size=8, overlap=3)
+        owned = [i for _, _, ks, ke in spans for i in range(ks, ke)]
+        assert owned == list(range(length))
+        for start, end, keep_start, keep_end in spans:
+            assert end - start <= 8
+            assert start <= keep_start <= keep_end <= end
+
+    def test_overlap_is_split_between_neighbours(self):
+        assert windows(20, size=8, overlap=4) == [
+            (0, 8, 0, 6), (4, 12, 6, 10), (8, 16, 10, 14), (12, 20, 14, 20)]
+
+
+class TestOnnxPunctuationModel:
+    def test_sliding_windows_match_single_window(self):
+        words = [f"слово{i}" + "_ъ~"[i % 4] if i % 4 < 3 else f"сл{i}" for i in range(200)]
+        session = FakeSession()
+        small = _model(session, window=12, overlap=4, batch_size=3)
+        assert small.predict_labels(words) == _model(window=4096).predict_labels(words) == _expected(words)
+        assert small.last_windows > 1
+        assert small.last_batches == len(session.batches) == -(-small.last_windows // 3)
+        assert all(len(batch["input_ids"]) <= 3 for batch in session.batches)
+
+    def test_restore_punctuation(self):
+        model = _model()
+        assert model.restore_punctuation("привет_ как, делаъ ок~") == "привет_, как делаъ? ок~."
+        assert model.restore_punctuation("") == ""
+        assert model.last_inference_seconds >= 0
+        assert model.inference_seconds >= model.last_inference_seconds
+
+    def test_token_type_ids_only_when_expected(self):
+        session = FakeSession(inputs=("input_ids", "attention_mask", "token_type_ids"))
+        _model(session).predict_labels(["а", "б"])
+        assert (session.batches[0]["token_type_ids"] == 0).all()
+        session = FakeSession()
+        _model(session).predict_labels(["а"])
+        assert "token_type_ids" not in session.batches[0]
+
+    def test_invalid_window(self):
+        with pytest.raises(ValueError):
+            _model(window=10, overlap=8)
+
+    def test_load_requires_runtime_and_model(self, tmp_path):
+        with patch("punctuation_onnx.ONNX_PUNCTUATION_AVAILABLE", False):
+            with pytest.raises(RuntimeError):
+                OnnxPunctuationModel.load(tmp_path)
+        with patch("punctuation_onnx.ONNX_PUNCTUATION_AVAILABLE", True):
+            with pytest.raises(RuntimeError):
+                OnnxPunctuationModel.load(tmp_path)
+
+    def test_find_model_prefers_int8(self, tmp_path):
+        assert punctuation_onnx.find_model(tmp_path) is None
+        for name in ("tokenizer.json", "config.json", "model.onnx"):
+            (tmp_path / name).write_text("{}")
+        assert punctuation_onnx.find_model(tmp_path) == tmp_path / "model.onnx"
+        (tmp_path / "model.int8.onnx").write_text("")
+        assert punctuation_onnx.find_model(tmp_path) == tmp_path / "model.int8.onnx"
+
+
+class TestProcessorIntegration:
+    @pytest.fixture
+    def processor(self):
+        from text_processor_enhanced import EnhancedTextProcessor
+        return EnhancedTextProcessor(language="ru", backend="sherpa", enable_phonetics=False,
+                                     enable_morphology=False, enable_proper_nouns=False)
+
+    def test_onnx_model_preferred_and_preloaded(self, processor):
+        model = _model()
+        with patch("text_processor_enhanced.ONNX_PUNCTUATION_AVAILABLE", True), \
+                patch("text_processor_enhanced.find_model", return_value="model.int8.onnx"), \
+                patch("text_processor_enhanced.OnnxPunctuationModel.load", return_value=model) as load:
+            assert processor.preload_punctuation()
+            assert processor.preload_punctuation()
+            assert processor.process("привет_ как, делаъ") == "Привет_, как делаъ?"
+        load.assert_called_once()
+        assert processor.punctuation_model is model
+
+    def test_without_any_model_text_is_unchanged(self, processor):
+        with patch("text_processor_enhanced.ONNX_PUNCTUATION_AVAILABLE", False), \
+                patch("text_processor_enhanced.PUNCTUATION_AVAILABLE", False):
+            assert not processor.preload_punctuation()
+            assert processor._add_punctuation("привет как дела") == "привет как дела"
+
+    def test_warmup_step_preloads_punctuation(self, processor):
+        model = _model()
+        with patch("text_processor_enhanced.ONNX_PUNCTUATION_AVAILABLE", True), \
+                patch("text_processor_enhanced.find_model", return_value="model.int8.onnx"), \
+                patch("text_processor_enhanced.OnnxPunctuationModel.load", return_value=model):
+            steps = dict(processor.warmup_steps())
+            assert steps["punctuation"]()
+            assert "punctuation" not in dict(processor.warmup_steps())
+        assert processor.punctuation_model is model
@@ -0,0 +1,160 @@
+"""Tests for the content-hash result cache."""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from backends.base import BaseBackend
+from result_cache import ResultCache, hash_audio, settings_key
+
+SR = 16000
+
+
+def _clip(seed=0, seconds=1.0):
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(int(SR * seconds)) * 0.1).astype(np.float32)
+
+
+class TestHashing:
+    def test_same_audio_same_hash(self):
+        assert hash_audio(_clip(1), SR) == hash_audio(_clip(1).copy(), SR)
+
+    def test_content_sample_rate_and_dtype_matter(self):
+        audio = _clip(1)
+        assert hash_audio(audio, SR) != hash_audio(_clip(2), SR)
+        assert hash_audio(audio, SR) != hash_audio(audio, 8000)
+        assert hash_audio(audio, SR) != hash_audio(audio.astype(np.float64), SR)
+
+    def test_settings_key_ignores_order(self):
+        assert settings_key({"a": 1, "b": [2]}) == settings_key({"b": [2], "a": 1})
+        assert settings_key({"a": 1}) != settings_key({"a": 2})
+
+
+class TestResultCache:
+    def test_miss_raw_hit_processed_hit(self):
+        cache = ResultCache()
+        assert cache.get("h", "d", "p") is None
+        cache.put_raw("h", "d", "raw")
+        assert cache.get("h", "d", "p") == ("raw", None, False)
+        cache.put_processed("h", "d", "p", "Raw.")
+        assert cache.get("h", "d", "p") == ("raw", "Raw.", False)
+        assert cache.stats() == {"entries": 1, "hits_processed": 1, "hits_raw": 1, "misses": 1}
+
+    def test_decode_key_separates_entries(self):
+        cache = ResultCache()
+        cache.put_raw("h", "d1", "one")
+        assert cache.get("h", "d2", "p") is None
+
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+        cache.put_raw("a", "d", "A")
+        cache.put_raw("b", "d", "B")
+        cache.get("a", "d", "p")  # a is now most recent
+        cache.put_raw("c", "d", "C")
+        assert len(cache) == 2
+        assert cache.get("b", "d", "p") is None
+        assert cache.get("a", "d", "p") is not None
+
+    def test_processed_without_raw_is_ignored(self):
+        cache = ResultCache()
+        cache.put_processed("h", "d", "p", "text")
+        assert len(cache) == 0
+
+    def test_new_raw_text_drops_processed_variants(self):
+        cache = ResultCache()
+        cache.put_raw("h", "d", "old")
+        cache.put_processed("h", "d", "p", "Old.")
+        cache.put_raw("h", "d", "new")
+        assert cache.get("h", "d", "p") == ("new", None, False)
+
+
+class _CountingBackend(BaseBackend):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+        self.text = "hello world"
+        self.last_used_fallback = False
+
+    def load_model(self):
+        pass
+
+    def unload_model(self):
+        pass
+
+    def is_model_loaded(self):
+        return True
+
+    def transcribe(self, audio, sample_rate=16000, cancel_event=None):
+        self.calls += 1
+        return self.text, 0.01
+
+
+@pytest.fixture
+def transcriber():
+    backend = _CountingBackend()
+    with patch("transcriber.get_backend", return_value=MagicMock(return_value=backend)):
+        with patch("transcriber.get_reporter", return_value=None):
+            from transcriber import Transcriber
+            t = Transcriber(backend="sherpa", model_size="v3", enable_post_processing=False)
+    t.text_processor = MagicMock()
+    t.text_processor.process.side_effect = lambda text: text.capitalize() + "."
+    t._enable_post_processing = True
+    return t
+
+
+class TestTranscriberCache:
+    def test_retry_served_from_cache(self, transcriber):
+        audio = _clip(3)
+        first, _ = transcriber.transcribe(audio, SR)
+        second, _ = transcriber.transcribe(audio.copy(), SR)
+
+        assert first == second == "Hello world."
+        assert transcriber._backend.calls == 1
+        assert transcriber.text_processor.process.call_count == 1
+        assert transcriber.get_cache_stats()["hits_processed"] == 1
+
+    def test_dictionary_change_reruns_post_processing_only(self, transcriber):
+        audio = _clip(3)
+        transcriber.transcribe(audio, SR)
+        transcriber.set_user_dictionary([{"wrong": "helo", "correct": "hello", "case_sensitive": False}])
+        transcriber.transcribe(audio, SR)
+
+        assert transcriber._backend.calls == 1
+        assert transcriber.text_processor.process.call_count == 2
+        assert transcriber.get_cache_stats()["hits_raw"] == 1
+
+    def test_decode_setting_change_misses(self, transcriber):
+        audio = _clip(3)
+        transcriber.transcribe(audio, SR)
+        transcriber.vad_threshold = 0.9
+        transcriber.transcribe(audio, SR)
+        assert transcriber._backend.calls == 2
+
+    def test_fallback_and_empty_results_not_cached(self, transcriber):
+        audio = _clip(3)
+        transcriber._backend.last_used_fallback = True
+        transcriber._switch_processor_for_fallback = lambda: None
+        transcriber.transcribe(audio, SR)
+        transcriber._backend.last_used_fallback = False
+        transcriber._backend.text = ""
+        transcriber.transcribe(audio, SR)
+        transcriber.transcribe(audio, SR)
+        assert transcriber._backend.calls == 3
+
+    def test_disabled(self):
+        backend = _CountingBackend()
+        with patch("transcriber.get_backend", return_value=MagicMock(return_value=backend)):
+            with patch("transcriber.get_reporter", return_value=None):
+                from transcriber import Transcriber
+                t = Transcriber(backend="sherpa", model_size="v3",
+                                enable_post_processing=False, result_cache_size=0)
+        audio = _clip(3)
+        t.transcribe(audio, SR)
+        t.transcribe(audio, SR)
+        assert backend.calls == 2
+        assert t.get_cache_stats() == {}
@@ -0,0 +1,95 @@
+"""Tests for silence-aware audio segmentation."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backends.segmentation import StreamingSegmenter, split_at_silence
+
+SR = 16000
+
+
+def _tone(seconds, amp=0.3):
+    t = np.arange(int(seconds * SR)) / SR
+    return (amp * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _silence(seconds):
+    return np.zeros(int(seconds * SR), dtype=np.float32)
+
+
+class TestSplitAtSilence:
+    def test_short_audio_single_segment(self):
+        audio = _tone(10)
+        assert split_at_silence(audio, SR, 15, 30) == [(0, len(audio))]
+
+    def test_cuts_land_in_pauses(self):
+        # Pauses at 20-21s and 41-42s
+        audio = np.concatenate([_tone(20), _silence(1), _tone(20), _silence(1), _tone(20)])
+        bounds = split_at_silence(audio, SR, 15, 30)
+
+        assert len(bounds) == 3
+        for _, end in bounds[:-1]:
+            assert 20 * SR <= end <= 21 * SR or 41 * SR <= end <= 42 * SR
+
+    def test_bounds_cover_input_contiguously(self):
+        audio = np.concatenate([_tone(25), _silence(0.5), _tone(25), _silence(0.5), _tone(25)])
+        bounds = split_at_silence(audio, SR, 15, 30)
+
+        assert bounds[0][0] == 0
+        assert bounds[-1][1] == len(audio)
+        for (_, end), (start, _) in zip(bounds, bounds[1:]):
+            assert end == start
+
+    def test_no_pause_cuts_at_max(self):
+        rng = np.random.default_rng(0)
+        audio = (0.3 * rng.standard_normal(70 * SR)).astype(np.float32)
+        bounds = split_at_silence(audio, SR, 15, 30)
+        assert all(end - start <= 30 * SR for start, end in bounds)
+
+
+def _feed_blocks(segmenter, audio, block=1024):
+    closed = []
+    for i in range(0, len(audio), block):
+        closed.extend(segmenter.feed(audio[i:i + block]))
+    return closed
+
+
+class TestStreamingSegmenter:
+    def test_closes_on_pause(self):
+        audio = np.concatenate([_tone(4), _silence(1), _tone(5), _silence(1), _tone(2)])
+        seg = StreamingSegmenter(SR)
+        closed = _feed_blocks(seg, audio)
+
+        assert len(closed) == 2
+        assert 4 * SR < len(closed[0]) < 5 * SR  # cut inside the first pause
+        tail = seg.flush()
+        assert sum(len(c) for c in closed) + len(tail) == len(audio)
+
+    def test_short_speech_not_closed(self):
+        """A pause before min_segment_sec does not close a segment."""
+        audio = np.concatenate([_tone(1), _silence(1), _tone(1)])
+        seg = StreamingSegmenter(SR, min_segment_sec=3.0)
+        assert _feed_blocks(seg, audio) == []
+        assert len(seg.flush()) == len(audio)
+
+    def test_force_close_at_max(self):
+        seg = StreamingSegmenter(SR, min_segment_sec=3.0, max_segment_sec=10.0)
+        closed = _feed_blocks(seg, _tone(25))
+        assert len(closed) >= 2
+        assert all(len(c) <= 10 * SR for c in closed)
+
+    def test_silence_only_segments_dropped(self):
+        seg = StreamingSegmenter(SR, min_segment_sec=3.0, max_segment_sec=10.0)
+        assert _feed_blocks(seg, _silence(25)) == []
+
+    def test_stereo_blocks_downmixed(self):
+        audio = np.concatenate([_tone(4), _silence(1), _tone(1)])
+        seg = StreamingSegmenter(SR)
+        closed = _feed_blocks(seg, np.stack([audio, audio], axis=1))
+        assert len(closed) == 1
+        assert closed[0].ndim == 1
@@ -0,0 +1,174 @@
+"""Tests for speculative segment-level transcription in Transcriber."""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+SR = 16000
+DECODE_SEC = 0.3
+
+
+def _tone(seconds, amp):
+    t = np.arange(int(seconds * SR)) / SR
+    return (amp * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _silence(seconds):
+    return np.zeros(int(seconds * SR), dtype=np.float32)
+
+
+def _dictation(n_segments):
+    """Tones with amplitude (i + 1) / 10 separated by 1s pauses."""
+    parts = []
+    for i in range(n_segments):
+        parts += [_tone(4, (i + 1) / 10), _silence(1)]
+    return np.concatenate(parts[:-1])
+
+
+class _SlowBackend:
+    """Names the loudest tone in the clip; takes DECODE_SEC per call."""
+
+    def __init__(self):
+        self.calls = []
+        self.last_used_fallback = False
+
+    def transcribe(self, audio, sample_rate=16000, cancel_event=None):
+        time.sleep(DECODE_SEC)
+        self.calls.append(len(audio))
+        seg = int(round(float(np.max(np.abs(audio))) * 10)) - 1
+        return f"seg{seg}", DECODE_SEC
+
+
+@pytest.fixture
+def transcriber():
+    backend = _SlowBackend()
+    with patch("transcriber.get_backend", return_value=MagicMock(return_value=backend)):
+        with patch("transcriber.get_reporter", return_value=None):
+            from transcriber import Transcriber
+            t = Transcriber(backend="sherpa", model_size="v3", enable_post_processing=False)
+    t.text_processor = MagicMock()
+    t.text_processor.process.side_effect = lambda text: text.upper()
+    t._enable_post_processing = True
+    return t
+
+
+def _record(transcriber, audio, block=1024):
+    for i in range(0, len(audio), block):
+        transcriber.feed_audio(audio[i:i + block])
+
+
+class TestSpeculativeSegments:
+    def test_segments_merged_in_order_and_post_processed_once(self, transcriber):
+        transcriber.start_segmented(SR)
+        _record(transcriber, _dictation(4))
+        text, _ = transcriber.finish_segmented()
+
+        assert text == "SEG0 SEG1 SEG2 SEG3"
+        transcriber.text_processor.process.assert_called_once_with("seg0 seg1 seg2 seg3")
+
+    def test_only_tail_decoded_after_stop(self, transcriber):
+        """Wait after stop is one segment, not the whole dictation."""
+        transcriber.start_segmented(SR)
+        _record(transcriber, _dictation(5))
+        time.sleep(DECODE_SEC * 5)  # user is still talking/pausing meanwhile
+
+        session = transcriber.stop_segmented()
+        assert session.decoded_before_stop == 4
+        text, after_stop = transcriber.finish_segmented(session)
+        assert text.split() == ["SEG0", "SEG1", "SEG2", "SEG3", "SEG4"]
+        assert after_stop < DECODE_SEC * 2
+
+    def test_new_session_can_start_before_previous_finishes(self, transcriber):
+        transcriber.start_segmented(SR)
+        _record(transcriber, _dictation(2))
+        first = transcriber.stop_segmented()
+
+        transcriber.start_segmented(SR)
+        _record(transcriber, _dictation(1))
+
+        assert transcriber.finish_segmented(first)[0] == "SEG0 SEG1"
+        assert transcriber.finish_segmented()[0] == "SEG0"
+
+    def test_cancel_during_finish(self, transcriber):
+        transcriber.start_segmented(SR)
+        _record(transcriber, _dictation(3))
+        session = transcriber.stop_segmented()
+        threading.Timer(0.05, transcriber.cancel_segmented, args=(session,)).start()
+
+        assert transcriber.finish_segmented(session) == ("", 0.0)
+
+    def test_cancel_does_not_touch_later_session(self, transcriber):
+        """A loser/superseded cancel for dictation A leaves B's segment decodes alone."""
+        transcriber.start_segmented(SR)
+        _record(transcriber, _dictation(2))
+        first = transcriber.stop_segmented()
+        transcriber.start_segmented(SR)
+        second = transcriber._segment_session
+        _record(transcriber, _dictation(2))
+
+        transcriber.cancel()  # A's hedge path lost
+        transcriber.cancel_segmented(first)
+
+        assert not second.cancel_event.is_set()
+        assert transcriber.finish_segmented()[0] == "SEG0 SEG1"
+
+    def test_loser_cancel_leaves_next_job_alone(self, transcriber):
+        """A hedge loser's cancel, even a late one, only stops its own call,
+        and the loser finishes on the backend before the next job decodes."""
+        backend = transcriber._backend
+        original = backend.transcribe
+        active = []
+        overlaps = []
+
+        def tracked(audio, sample_rate=16000, cancel_event=None):
+            overlaps.append(len(active))
+            active.append(1)
+            try:
+                return original(audio, sample_rate, cancel_event)
+            finally:
+                active.pop()
+
+        backend.transcribe = tracked
+        loser_event, next_event = threading.Event(), threading.Event()
+        results = {}
+        loser = threading.Thread(target=lambda: results.setdefault(
+            "loser", transcriber.transcribe(_tone(2, 0.1), SR, cancel_event=loser_event)))
+        loser.start()
+        time.sleep(0.05)
+        loser_event.set()  # lost the hedge, still decoding
+        result = transcriber.transcribe(_tone(2, 0.2), SR, cancel_event=next_event)
+        loser_event.set()  # late cancel of the loser
+        loser.join()
+
+        assert results["loser"] == ("", 0.0)
+        assert result[0] == "SEG1"
+        assert not next_event.is_set()
+        assert overlaps == [0, 0]
+
+    def test_failed_segment_retried(self, transcriber):
+        backend = transcriber._backend
+        original = backend.transcribe
+        failures = {"left": 1}
+
+        def flaky(audio, sample_rate=16000, cancel_event=None):
+            if failures["left"]:
+                failures["left"] -= 1
+                raise RuntimeError("decoder hiccup")
+            return original(audio, sample_rate, cancel_event)
+
+        backend.transcribe = flaky
+        transcriber.start_segmented(SR)
+        _record(transcriber, _dictation(2))
+        assert transcriber.finish_segmented()[0] == "SEG0 SEG1"
+
+    def test_feed_without_session_is_noop(self, transcriber):
+        transcriber.feed_audio(_tone(1, 0.1))
+        assert transcriber.finish_segmented() == ("", 0.0)
+        assert not transcriber.segmented_active
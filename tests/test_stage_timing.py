@@ -0,0 +1,124 @@
+"""Tests for per-stage pipeline timing."""
+
+import json
+import logging
+import os
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stage_timing import StageTimings, format_stages, get_stage_timings
+
+
+@pytest.fixture
+def timings():
+    t = StageTimings()
+    t.set_labels("sherpa", "v3")
+    return t
+
+
+class TestStageTimings:
+    def test_percentiles_per_backend_model(self, timings):
+        for ms in range(1, 101):
+            timings.record("decode", ms / 1000)
+        timings.record("decode", 5.0, backend="groq", model="turbo")
+
+        summary = timings.summary()
+        decode = summary["sherpa/v3"]["decode"]
+        assert decode["count"] == 100
+        assert decode["p50"] == pytest.approx(0.0505)
+        assert decode["p95"] == pytest.approx(0.09505)
+        assert decode["p99"] == pytest.approx(0.09901)
+        assert summary["groq/turbo"]["decode"]["count"] == 1
+        assert list(timings.summary(backend="groq")) == ["groq/turbo"]
+
+    def test_stage_recorded_on_error(self, timings):
+        with pytest.raises(ValueError):
+            with timings.stage("vad"):
+                raise ValueError("boom")
+        assert timings.summary()["sherpa/v3"]["vad"]["count"] == 1
+
+    def test_window_bounds_samples(self):
+        timings = StageTimings(window=10)
+        for _ in range(50):
+            timings.record("paste", 0.01)
+        assert timings.summary()["unknown/unknown"]["paste"]["count"] == 10
+
+    def test_trace_logs_compact_line(self, timings, caplog):
+        with caplog.at_level(logging.INFO, logger="transkribator"):
+            with timings.trace("whisper", "base") as stages:
+                with timings.stage("preprocess"):
+                    pass
+                for _ in range(3):
+                    with timings.stage("decode_chunk"):
+                        pass
+
+        assert list(stages) == ["preprocess", "decode_chunk"]
+        assert stages["decode_chunk"][1] == 3
+        line = [r.getMessage() for r in caplog.records if r.getMessage().startswith("STAGE_TIMINGS")]
+        assert len(line) == 1
+        assert "backend=whisper | model=base" in line[0]
+        assert "decode_chunk=" in line[0] and "x3" in line[0]
+        # Stages inside a trace are attributed to the trace's backend/model
+        assert "whisper/base" in timings.summary()
+
+    def test_trace_is_thread_local(self, timings):
+        def other_thread():
+            with timings.stage("paste"):
+                pass
+
+        with timings.trace("sherpa", "v3") as stages:
+            t = threading.Thread(target=other_thread)
+            t.start()
+            t.join()
+        assert "paste" not in stages
+        assert timings.summary()["sherpa/v3"]["paste"]["count"] == 1
+
+    def test_export_json(self, timings, tmp_path):
+        timings.record("decode", 0.5)
+        path = tmp_path / "timings.json"
+        timings.export_json(path)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["summary"]["sherpa/v3"]["decode"]["count"] == 1
+        assert data["samples"]["sherpa/v3/decode"] == [0.5]
+
+    def test_format_stages(self):
+        assert format_stages({"vad": (0.01234, 1), "decode_chunk": (1.5, 2)}) == "vad=0.012 decode_chunk=1.500x2"
+
+
+class _EchoBackend:
+    def __init__(self, **kwargs):
+        self.last_used_fallback = False
+
+    def load_model(self):
+        pass
+
+    def unload_model(self):
+        pass
+
+    def is_model_loaded(self):
+        return True
+
+    def transcribe(self, audio, sample_rate=16000, cancel_event=None):
+        return "привет мир", 0.0
+
+
+class TestTranscriberStages:
+    def test_post_processing_steps_timed(self):
+        with patch("transcriber.get_backend", return_value=MagicMock(side_effect=_EchoBackend)):
+            with patch("transcriber.get_reporter", return_value=None):
+                from transcriber import Transcriber
+                t = Transcriber(backend="whisper", model_size="stage-test", result_cache_size=0)
+        t.transcribe(np.zeros(16000, dtype=np.float32), 16000)
+
+        stats = t.get_stage_stats()
+        assert set(stats) == {"whisper/stage-test"}
+        stages = stats["whisper/stage-test"]
+        for name in ("post_process", "fix_errors", "fix_punctuation", "capitalization", "cleanup"):
+            assert stages[name]["count"] == 1
+        assert "whisper/stage-test" in get_stage_timings().summary()
@@ -0,0 +1,111 @@
+"""Tests for the shared token pipeline of post-processing."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from phonetics import PhoneticCorrector
+from proper_nouns import ProperNounDict
+from text_tokens import Token, capitalize_sentences, serialize, split_sentences, tokenize
+
+
+def _capitalize(text):
+    tokens = tokenize(text)
+    capitalize_sentences(tokens)
+    return serialize(tokens)
+
+
+class TestTokenize:
+    def test_lead_word_trail(self):
+        tok = Token.parse('(Москве),')
+        assert (tok.lead, tok.word, tok.trail, tok.lower) == ("(", "Москве", "),", "москве")
+
+    def test_inner_punctuation_stays_in_word(self):
+        assert [t.word for t in tokenize("кто-то т.е. ... 2024.")] == ["кто-то", "т.е", "", "2024"]
+
+    def test_serialize_normalizes_whitespace(self):
+        assert serialize(tokenize("  привет,\n  мир!  ")) == "привет, мир!"
+
+    def test_set_word_updates_lower(self):
+        tok = Token.parse("москва.")
+        tok.set_word("МОСКВА")
+        assert tok.lower == "москва" and str(tok) == "МОСКВА."
+
+    def test_word_flags(self):
+        assert Token.parse("слово,").is_cyrillic
+        assert not Token.parse("word").is_cyrillic
+        assert Token.parse("word2").is_plain
+        assert not Token.parse("санкт-петербург").is_plain
+
+
+class TestCapitalizeSentences:
+    def test_sentence_starts_marked(self):
+        tokens = tokenize("привет. как дела? хорошо")
+        capitalize_sentences(tokens)
+        assert [t.sentence_start for t in tokens] == [True, True, False, True]
+        assert serialize(tokens) == "Привет. Как дела? Хорошо"
+
+    def test_split_without_space(self):
+        tokens = tokenize("слово.другое (конец.)начало")
+        split_sentences(tokens)
+        assert [str(t) for t in tokens] == ["слово.", "другое", "(конец.)", "начало"]
+
+    def test_opening_quotes_and_parens(self):
+        assert _capitalize('он сказал "да" и ушёл') == 'Он сказал "Да" и ушёл'
+        assert _capitalize("слово ( как то) слово") == "Слово ( Как то) слово"
+
+    def test_quote_inside_word_does_not_capitalize(self):
+        assert _capitalize("д'артаньян пришёл") == "Д'артаньян пришёл"
+
+    def test_paren_closing_a_sentence(self):
+        assert _capitalize("(это пример.) дальше") == "(Это пример.) Дальше"
+
+    def test_yo_capitalized(self):
+        assert _capitalize("так. ёлка") == "Так. Ёлка"
+
+
+class TestTokenStages:
+    def test_phonetics_without_validation_is_noop(self):
+        corrector = PhoneticCorrector(enable_validation=False)
+        tokens = tokenize("гриб, кото")
+        corrector.process_tokens(tokens)
+        assert serialize(tokens) == "гриб, кото"
+
+    def test_phonetics_keeps_punctuation_and_case(self):
+        corrector = PhoneticCorrector(enable_validation=False)
+        corrector.enable_validation = True
+        valid = {"грип", "лодга"}
+        corrector._is_valid_russian_word = lambda word: word in valid
+        tokens = tokenize("(Гриб), лодка! гриб-гриб")
+        corrector.process_tokens(tokens)
+        assert serialize(tokens) == "(Грип), лодга! гриб-гриб"
+        assert corrector.process("(Гриб), лодка!") == "(Грип), лодга!"
+
+    def test_proper_nouns_on_tokens(self, tmp_path):
+        (tmp_path / "cities.json").write_text('[{"name": "Москве", "variants": []}]', encoding="utf-8")
+        (tmp_path / "names.json").write_text('[{"name": "Денис", "variants": []}]', encoding="utf-8")
+        pn = ProperNounDict(data_dir=str(tmp_path))
+        tokens = tokenize("в (москве), денис2 денис-")
+        pn.capitalize_tokens(tokens)
+        assert serialize(tokens) == "в (Москве), денис2 Денис-"
+        assert pn.capitalize_known("в москве") == "в Москве"
+
+
+class TestProcessorPipeline:
+    @pytest.fixture
+    def processor(self):
+        from text_processor_enhanced import EnhancedTextProcessor
+        return EnhancedTextProcessor(language="ru", backend="sherpa", enable_proper_nouns=False)
+
+    def test_process_end_to_end(self, processor):
+        text = "привет  ,мир. еще раз спасибо!как дела"
+        assert processor.process(text) == "Привет, мир. Ещё раз спасибо! Как дела"
+
+    def test_phrase_patterns_skipped_by_literal(self, processor):
+        rules = {pattern.pattern: literal for pattern, _, literal in processor._pattern_rules}
+        assert rules[r'\bеще раз\b'] == "еще раз"
+        assert rules[r'(\w+) голубой (\w+)'] == " голубой "
+        assert rules[r'\s+'] == ""
@@ -0,0 +1,150 @@
+"""Tests for end-to-end dictation tracing."""
+
+import json
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import tracing
+from tracing import Tracer
+
+
+@pytest.fixture
+def tracer():
+    return Tracer(enabled=True, max_traces=3)
+
+
+def _spans(tracer, trace_id=None):
+    return [e for e in tracer.chrome_events() if e["ph"] == "X"
+            and (trace_id is None or e["pid"] == trace_id)]
+
+
+class TestTracer:
+    def test_disabled_is_noop(self):
+        t = Tracer(enabled=False)
+        assert t.start_trace() is None
+        span = t.span("x", 1)
+        assert span is t.span("y")  # shared no-op object
+        with span:
+            pass
+        t.instant("x", 1)
+        t.end_trace(None)
+        assert t.chrome_events() == []
+
+    def test_spans_across_threads(self, tracer):
+        trace_id = tracer.start_trace("dictation", trigger="hotkey")
+        with tracer.span("recorder_stop", trace_id):
+            pass
+
+        def worker():
+            with tracer.bind(trace_id), tracer.span("transcribe"):
+                with tracer.span("decode"):
+                    pass
+
+        t = threading.Thread(target=worker, name="worker")
+        t.start()
+        t.join()
+        with tracer.span("paste", trace_id):
+            pass
+        tracer.end_trace(trace_id)
+
+        spans = _spans(tracer, trace_id)
+        assert [s["name"] for s in spans] == ["recorder_stop", "decode", "transcribe", "paste"]
+        assert spans[0]["tid"] != spans[1]["tid"]
+        assert spans[1]["tid"] == spans[2]["tid"]
+        # Nested span lies within its parent
+        decode, transcribe = spans[1], spans[2]
+        assert transcribe["ts"] <= decode["ts"]
+        assert decode["ts"] + decode["dur"] <= transcribe["ts"] + transcribe["dur"] + 1
+
+        names = {e["args"]["name"] for e in tracer.chrome_events() if e["name"] == "thread_name"}
+        assert "worker" in names
+
+    def test_backdated_start(self, tracer):
+        pressed = tracer.now_us()
+        time.sleep(0.01)
+        trace_id = tracer.start_trace("dictation", start_us=pressed, trigger="hotkey")
+        tracer.end_trace(trace_id)
+        start = [e for e in tracer.chrome_events() if e["name"] == "trace_start"][0]
+        assert start["ts"] == pressed and start["args"] == {"trigger": "hotkey"}
+        trace = tracer._traces[trace_id]
+        assert trace.start_us == pressed and trace.end_us - trace.start_us >= 10000
+
+    def test_unbound_span_is_dropped(self, tracer):
+        tracer.start_trace()
+        with tracer.span("orphan"):
+            pass
+        assert _spans(tracer) == []
+
+    def test_error_recorded_on_span(self, tracer):
+        trace_id = tracer.start_trace()
+        with pytest.raises(RuntimeError):
+            with tracer.span("decode", trace_id):
+                raise RuntimeError("boom")
+        assert _spans(tracer)[0]["args"]["error"] == "RuntimeError"
+
+    def test_ring_buffer_keeps_last_traces(self, tracer):
+        ids = [tracer.start_trace() for _ in range(5)]
+        for trace_id in ids:
+            with tracer.span("s", trace_id):
+                pass
+        assert {s["pid"] for s in _spans(tracer)} == set(ids[-3:])
+        assert {e["pid"] for e in tracer.chrome_events(last_n=1)} == {ids[-1]}
+
+    def test_export_chrome_format(self, tracer, tmp_path):
+        trace_id = tracer.start_trace()
+        with tracer.span("decode", trace_id, chunk=0):
+            time.sleep(0.001)
+        tracer.end_trace(trace_id)
+
+        path = tmp_path / "trace.json"
+        count = tracer.export_chrome(path)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert len(data["traceEvents"]) == count
+        span = [e for e in data["traceEvents"] if e["name"] == "decode"][0]
+        assert span["ph"] == "X" and span["dur"] >= 1000
+        assert span["args"] == {"chunk": 0}
+        assert {"pid", "tid", "ts", "cat"} <= set(span)
+        meta = [e for e in data["traceEvents"] if e["name"] == "process_name"]
+        assert meta[0]["args"]["name"] == f"dictation #{trace_id}"
+
+
+class _EchoBackend:
+    def __init__(self, **kwargs):
+        self.last_used_fallback = False
+
+    def load_model(self):
+        pass
+
+    def unload_model(self):
+        pass
+
+    def is_model_loaded(self):
+        return True
+
+    def transcribe(self, audio, sample_rate=16000, cancel_event=None):
+        return "привет", 0.0
+
+
+class TestTranscriberSpans:
+    def test_transcribe_and_stages_in_bound_trace(self, tracer):
+        with patch("transcriber.get_backend", return_value=MagicMock(side_effect=_EchoBackend)):
+            with patch("transcriber.get_reporter", return_value=None):
+                from transcriber import Transcriber
+                t = Transcriber(backend="whisper", model_size="trace-test", result_cache_size=0)
+
+        with patch.object(tracing, "_tracer", tracer):
+            trace_id = tracer.start_trace()
+            with tracer.bind(trace_id):
+                t.transcribe(np.zeros(16000, dtype=np.float32), 16000)
+
+        names = [s["name"] for s in _spans(tracer, trace_id)]
+        assert "transcribe" in names
+        assert "post_process" in names and "fix_errors" in names
@@ -0,0 +1,182 @@
+"""Tests for the compiled user dictionary matcher."""
+
+import os
+import random
+import re
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from text_processor_enhanced import EnhancedTextProcessor
+from user_dictionary import UserDictionaryMatcher
+
+
+def _entry(wrong, correct, case_sensitive=False):
+    return {"wrong": wrong, "correct": correct, "case_sensitive": case_sensitive}
+
+
+def _per_entry(entries, text):
+    """The previous per-entry implementation, used as the reference."""
+    for entry in entries:
+        wrong, correct = entry["wrong"], entry["correct"]
+        if entry["case_sensitive"]:
+            text = text.replace(wrong, correct)
+        elif " " in wrong:
+            text = re.sub(re.escape(wrong), correct, text, flags=re.IGNORECASE)
+        else:
+            text = re.sub(r'\b' + re.escape(wrong) + r'\b', correct, text, flags=re.IGNORECASE)
+    return text
+
+
+class TestUserDictionaryMatcher:
+    def test_single_word_needs_word_boundaries(self):
+        m = UserDictionaryMatcher([_entry("гпт", "GPT")])
+        assert m.apply("Гпт и гптшка, ГПТ.") == "GPT и гптшка, GPT."
+
+    def test_phrase_matches_anywhere_any_case(self):
+        m = UserDictionaryMatcher([_entry("чат гпт", "ChatGPT")])
+        assert m.apply("Чат Гпт и ЧАТ ГПТшка") == "ChatGPT и ChatGPTшка"
+
+    def test_case_sensitive_is_exact_substring(self):
+        m = UserDictionaryMatcher([_entry("Пайтон", "Python", case_sensitive=True)])
+        assert m.apply("Пайтону пайтон Пайтон") == "Pythonу пайтон Python"
+
+    def test_earlier_entry_wins_overlap(self):
+        m = UserDictionaryMatcher([_entry("пай", "Py"), _entry("пай торч", "PyTorch")])
+        assert m.apply("модель на пай торч") == "модель на Py торч"
+        m = UserDictionaryMatcher([_entry("пай торч", "PyTorch"), _entry("пай", "Py")])
+        assert m.apply("модель на пай торч и пай") == "модель на PyTorch и Py"
+
+    def test_later_entry_matches_earlier_output(self):
+        m = UserDictionaryMatcher([_entry("гит", "git"), _entry("git хаб", "GitHub")])
+        assert m.apply("залей на гит хаб") == "залей на GitHub"
+        m = UserDictionaryMatcher([_entry("джанго", "Django"),
+                                   _entry("Django", "Django 5", case_sensitive=True)])
+        assert m.apply("я пишу на джанго") == "я пишу на Django 5"
+
+    def test_earlier_entry_does_not_see_later_output(self):
+        m = UserDictionaryMatcher([_entry("git хаб", "GitHub"), _entry("гит", "git")])
+        assert m.apply("залей на гит хаб") == "залей на git хаб"
+
+    def test_incomplete_entries_ignored(self):
+        m = UserDictionaryMatcher([_entry("", "x"), _entry("y", ""), {"wrong": "z"}])
+        assert len(m) == 0
+        assert m.apply("x y z") == "x y z"
+
+    def test_matches_per_entry_reference(self):
+        # Entries that can't overlap each other, with replacements that
+        # don't feed other entries: single pass == the per-entry loop
+        entries = [
+            _entry("гпт", "GPT"),
+            _entry("Пайтон", "Python", case_sensitive=True),
+            _entry("нейро сеть", "нейросеть"),
+            _entry("чат бот", "чат-бот"),
+            _entry("тест", "ТЕСТ"),
+        ]
+        words = ["гпт", "Гпт", "Пайтон", "пайтон", "нейро", "сеть", "чат", "бот", "тест", "тесты", "и", ","]
+        m = UserDictionaryMatcher(entries)
+        rnd = random.Random(42)
+        for _ in range(1000):
+            text = " ".join(rnd.choice(words) for _ in range(rnd.randint(1, 10)))
+            assert m.apply(text) == _per_entry(entries, text), text
+
+    def test_random_overlapping_entries(self):
+        """Small alphabets make entries overlap, chain and move word boundaries."""
+        rnd = random.Random(42)
+        alphabet = "аб -БА"
+
+        def word():
+            return "".join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 4)))
+
+        for _ in range(300):
+            entries = [_entry(word(), word(), rnd.random() < 0.3) for _ in range(rnd.randint(1, 6))]
+            m = UserDictionaryMatcher(entries)
+            for _ in range(10):
+                text = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 20)))
+                assert m.apply(text) == _per_entry(entries, text), (entries, text)
+
+
+class TestIncrementalUpdates:
+    def test_add_edit_delete_equal_fresh_build(self):
+        entries = [_entry(f"слово{i}", f"word{i}", i % 3 == 0) for i in range(50)]
+        m = UserDictionaryMatcher(entries)
+
+        new = _entry("нейро сеть", "нейросеть")
+        m.add(new)
+        edited = _entry("слово7", "WORD7")
+        assert m.remove(entries[7])
+        m.add(edited)
+        assert m.remove(entries[3])
+        current = entries[:3] + entries[4:7] + [edited] + entries[8:] + [new]
+
+        fresh = UserDictionaryMatcher(current)
+        text = "слово3 слово7 Нейро сеть слово10 слово33"
+        assert m.apply(text) == fresh.apply(text) == "слово3 WORD7 нейросеть word10 word33"
+        assert len(m) == len(fresh) == 50
+
+    def test_remove_prunes_and_keeps_prefixes(self):
+        m = UserDictionaryMatcher([_entry("нейро", "A"), _entry("нейросеть", "B")])
+        assert m.remove(_entry("нейросеть", "B"))
+        assert m.apply("нейросеть нейро") == "нейросеть A"
+        assert not m.remove(_entry("нейросеть", "B"))
+        assert m.remove(_entry("нейро", "A"))
+        assert m._folded.root == {}
+
+    def test_edit_keeps_list_position(self):
+        entries = [_entry("гит", "git"), _entry("git хаб", "GitHub")]
+        m = UserDictionaryMatcher(entries)
+        old, new = entries[0], _entry("гитт", "git")
+        entries[0] = new
+        m.update(entries, added=[new], removed=[old])
+        assert m.apply("гитт хаб") == _per_entry(entries, "гитт хаб") == "GitHub"
+        assert m.apply("гит хаб") == "гит хаб"
+
+    def test_added_entry_chains_from_existing(self):
+        m = UserDictionaryMatcher([_entry("гит", "git")])
+        assert m.apply("гит хаб") == "git хаб"  # caches what "гит" can feed
+        m.add(_entry("git хаб", "GitHub"))
+        assert m.apply("гит хаб") == "GitHub"
+
+    def test_duplicates_first_added_wins(self):
+        first, second = _entry("гпт", "GPT"), _entry("гпт", "ГПТ")
+        m = UserDictionaryMatcher([first, second])
+        assert m.apply("гпт") == "GPT"
+        m.remove(first)
+        assert m.apply("гпт") == "ГПТ"
+
+
+class TestProcessorIntegration:
+    @pytest.fixture
+    def processor(self):
+        return EnhancedTextProcessor(language="ru", enable_punctuation=False, enable_phonetics=False,
+                                     enable_morphology=False, enable_proper_nouns=False,
+                                     user_dictionary=[_entry("трнскрибатор", "Транскрибатор")])
+
+    def test_user_dictionary_applied_before_builtins(self, processor):
+        assert processor._fix_errors("трнскрибатор") == "Транскрибатор"
+
+    def test_update_user_dictionary(self, processor):
+        entries = list(processor.user_dictionary)
+        new = _entry("виспер", "Whisper")
+        entries.append(new)
+        processor.update_user_dictionary(entries, added=[new])
+        assert processor._fix_errors("виспер") == "Whisper"
+
+        entries.remove(new)
+        processor.update_user_dictionary(entries, removed=[new])
+        assert processor._fix_errors("виспер") == "виспер"
+        assert processor.user_dictionary is entries
+
+    def test_transcriber_forwards_updates(self):
+        with patch("transcriber.get_backend", return_value=MagicMock()):
+            with patch("transcriber.get_reporter", return_value=None):
+                from transcriber import Transcriber
+                t = Transcriber(backend="whisper", model_size="dict-test", result_cache_size=0)
+        t.text_processor = MagicMock()
+        entries = [_entry("виспер", "Whisper")]
+        t.update_user_dictionary(entries, added=entries)
+        t.text_processor.update_user_dictionary.assert_called_once_with(entries, entries, ())
+        assert t.get_user_dictionary() is entries
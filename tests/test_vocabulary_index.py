@@ -0,0 +1,77 @@
+"""Tests for the precomputed vocabulary index used by phonetic correction."""
+
+import os
+import random
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from phonetics import PhoneticCorrector
+from vocabulary_index import VocabularyIndex, build_index
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = tmp_path / "vocab.idx"
+    build_index(["грип", "Лодга", "ёлка", "елка", "кот", "кот", " ", "я"], path)
+    return path
+
+
+class TestVocabularyIndex:
+    def test_lookup(self, index_path):
+        index = VocabularyIndex(index_path)
+        assert len(index) == 6
+        for word in ("грип", "лодга", "ЛОДГА", "ёлка", "елка", "кот", "я"):
+            assert word in index
+        for word in ("гриб", "ко", "кота", "", "а", "яя"):
+            assert word not in index
+        index.close()
+
+    def test_matches_set_membership(self, tmp_path):
+        rnd = random.Random(0)
+        letters = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"
+        words = {"".join(rnd.choice(letters) for _ in range(rnd.randint(1, 8))) for _ in range(3000)}
+        path = tmp_path / "random.idx"
+        assert build_index(words, path) == len(words)
+        index = VocabularyIndex(path)
+        for _ in range(3000):
+            probe = "".join(rnd.choice(letters) for _ in range(rnd.randint(1, 4)))
+            assert (probe in index) == (probe in words), probe
+        assert all(word in index for word in words)
+        index.close()
+
+    def test_empty_index(self, tmp_path):
+        path = tmp_path / "empty.idx"
+        assert build_index([], path) == 0
+        index = VocabularyIndex(path)
+        assert "кот" not in index
+        index.close()
+
+    @pytest.mark.parametrize("content", [b"", b"not an index", b"TKVOCAB1\xff\xff\x00\x00"])
+    def test_invalid_file_rejected(self, tmp_path, content):
+        path = tmp_path / "bad.idx"
+        path.write_bytes(content)
+        with pytest.raises(ValueError):
+            VocabularyIndex(path)
+
+
+class TestPhoneticValidation:
+    def test_index_replaces_pymorphy(self, index_path):
+        index = VocabularyIndex(index_path)
+        with patch("phonetics.get_vocabulary_index", return_value=index), \
+                patch("phonetics.get_morph") as get_morph:
+            corrector = PhoneticCorrector(enable_validation=True)
+        get_morph.assert_not_called()
+        assert corrector.enable_validation
+        assert corrector.process("(Гриб), лодка!") == "(Грип), лодга!"
+        index.close()
+
+    def test_without_index_or_pymorphy_validation_is_off(self):
+        with patch("phonetics.get_vocabulary_index", return_value=None), \
+                patch("phonetics.PYMORPHY_AVAILABLE", False):
+            corrector = PhoneticCorrector(enable_validation=True)
+        assert not corrector.enable_validation
+        assert corrector.process("гриб") == "гриб"
@@ -0,0 +1,155 @@
+"""Tests for the background warmup of post-processing components."""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from warmup import ComponentWarmup, WarmupStatus
+
+
+def _recorder():
+    calls = []
+    return calls, lambda name: (name, lambda: calls.append(name))
+
+
+class TestComponentWarmup:
+    def test_runs_steps_in_order_and_reports(self):
+        calls, step = _recorder()
+        statuses = []
+        warmup = ComponentWarmup([step("a"), step("b")], on_change=statuses.append)
+        assert warmup.status == WarmupStatus("pending", pending=("a", "b"))
+        assert warmup.start()
+        assert not warmup.start()
+        assert warmup.wait(5)
+        assert calls == ["a", "b"]
+        assert warmup.ready
+        assert warmup.status.done == ("a", "b") and warmup.status.progress == (2, 2)
+        assert [s.current for s in statuses if s.state == "warming"] == ["a", None, "b", None]
+        assert statuses[-1].ready
+
+    def test_yields_while_busy(self):
+        busy = threading.Event()
+        busy.set()
+        calls, step = _recorder()
+        warmup = ComponentWarmup([step("a")], is_busy=busy.is_set, poll_sec=0.01)
+        warmup.start()
+        time.sleep(0.1)
+        assert calls == [] and warmup.status.state == "paused"
+        busy.clear()
+        assert warmup.wait(5)
+        assert calls == ["a"]
+        assert warmup.paused_sec > 0
+
+    def test_busy_between_steps(self):
+        busy = threading.Event()
+        calls = []
+
+        def first():
+            calls.append("a")
+            busy.set()  # user starts recording during the first step
+
+        warmup = ComponentWarmup([("a", first), ("b", lambda: calls.append("b"))],
+                                 is_busy=busy.is_set, poll_sec=0.01)
+        warmup.start()
+        time.sleep(0.1)
+        assert calls == ["a"] and warmup.status.pending == ("b",)
+        busy.clear()
+        assert warmup.wait(5)
+        assert calls == ["a", "b"]
+
+    def test_failed_step_does_not_stop_others(self):
+        calls, step = _recorder()
+
+        def broken():
+            raise RuntimeError("no model")
+
+        warmup = ComponentWarmup([("bad", broken), step("b")])
+        warmup.start()
+        assert warmup.wait(5)
+        assert warmup.ready
+        assert warmup.status.failed == ("bad",) and warmup.status.done == ("b",)
+
+    def test_stop_skips_remaining_steps(self):
+        busy = threading.Event()
+        busy.set()
+        calls, step = _recorder()
+        warmup = ComponentWarmup([step("a")], is_busy=busy.is_set, poll_sec=0.01)
+        warmup.start()
+        warmup.stop()
+        assert warmup.wait(5)
+        assert calls == [] and not warmup.ready
+
+    def test_nothing_to_warm_is_ready(self):
+        warmup = ComponentWarmup([])
+        assert warmup.ready and not warmup.start()
+
+    def test_callback_errors_are_contained(self):
+        calls, step = _recorder()
+        warmup = ComponentWarmup([step("a")], on_change=MagicMock(side_effect=RuntimeError))
+        warmup.start()
+        assert warmup.wait(5) and calls == ["a"] and warmup.ready
+
+
+class TestProcessorWarmup:
+    @pytest.fixture
+    def processor(self):
+        from text_processor_enhanced import EnhancedTextProcessor
+        return EnhancedTextProcessor(language="ru", backend="sherpa", enable_phonetics=False,
+                                     enable_morphology=False)
+
+    def test_steps_cover_missing_components_only(self, processor):
+        names = [name for name, _ in processor.warmup_steps()]
+        assert "proper_nouns" in names and "phonetics" not in names
+        processor._ensure_components()
+        assert "proper_nouns" not in [name for name, _ in processor.warmup_steps()]
+
+    def test_component_loaded_once_across_threads(self, processor):
+        created = []
+
+        def slow_dict():
+            created.append(threading.current_thread().name)
+            time.sleep(0.2)
+            return MagicMock(capitalize_tokens=lambda tokens: None)
+
+        with patch("text_processor_enhanced.get_proper_noun_dict", side_effect=slow_dict):
+            steps = dict(processor.warmup_steps())
+            warmup = ComponentWarmup([("proper_nouns", steps["proper_nouns"])])
+            warmup.start()
+            time.sleep(0.05)  # warmup is inside the slow load
+            assert processor.process("привет мир") == "Привет мир"
+            assert warmup.wait(5)
+        assert created == ["postprocess-warmup"]
+
+    def test_release_models_drops_morphology(self):
+        from text_processor_enhanced import EnhancedTextProcessor
+        with patch("text_processor_enhanced.MorphologyCorrector") as corrector, \
+                patch("text_processor_enhanced.release_morph") as release_morph:
+            processor = EnhancedTextProcessor(language="ru", backend="sherpa",
+                                              enable_phonetics=False)
+            processor._ensure_components()
+            assert "morphology" not in dict(processor.warmup_steps())
+
+            processor.release_models()
+            assert processor.morphology_corrector is None
+            release_morph.assert_called_once()
+            steps = dict(processor.warmup_steps())
+            assert "morphology" in steps and "proper_nouns" not in steps
+            steps["morphology"]()
+        assert processor.morphology_corrector is corrector.return_value
+        assert corrector.call_count == 2
+
+    def test_transcriber_exposes_steps(self):
+        with patch("transcriber.get_backend", return_value=MagicMock()):
+            with patch("transcriber.get_reporter", return_value=None):
+                from transcriber import Transcriber
+                t = Transcriber(backend="whisper", model_size="warmup-test", result_cache_size=0)
+        assert t.warmup_steps() == []
+        t.text_processor = MagicMock()
+        t.text_processor.warmup_steps.return_value = [("x", None)]
+        assert t.warmup_steps() == [("x", None)]
@@ -8,6 +8,7 @@ Build command:
 Output: dist/transkribator/ directory with executable
 """
 
+import os
 import sys
 from PyInstaller.utils.hooks import collect_data_files, collect_submodules
 
@@ -17,6 +18,15 @@ datas += collect_data_files('sherpa_onnx')
 # Project models (sherpa ONNX models for transcription)
 datas += [('models/sherpa/giga-am-v2-ru', 'models/sherpa/giga-am-v2-ru')]
 datas += [('models/sherpa/giga-am-v3-ru', 'models/sherpa/giga-am-v3-ru')]
+# Vocabulary index for phonetic correction (scripts/build_vocabulary_index.py)
+if os.path.exists('src/data/ru_vocabulary.idx'):
+    datas += [('src/data/ru_vocabulary.idx', 'src/data')]
+# Compiled proper noun index (scripts/build_proper_noun_index.py)
+if os.path.exists('src/data/proper_nouns.idx'):
+    datas += [('src/data/proper_nouns.idx', 'src/data')]
+# ONNX punctuation model (scripts/export_punctuation_onnx.py)
+if os.path.isdir('models/punctuation'):
+    datas += [('models/punctuation', 'models/punctuation')]
 
 # Collect all submodules to ensure complete packaging
 hiddenimports = []
@@ -51,6 +61,11 @@ hiddenimports += [
     'src.widgets',
     'src.settings_dialog',
     'src.morph_singleton',
+    'src.vocabulary_index',
+    'src.proper_noun_index',
+    'src.punctuation_onnx',
+    'src.warmup',
+    'src.incremental_processor',
 ]
 
 # Additional dependencies